@@ -1,23 +1,29 @@
 #!/usr/local/bin/python3.12 -u
 
+import codecs
 import json
 import os
 import re
+import select
 import subprocess
 import sys
+import time
 import yaml
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QTextEdit, QLineEdit, QLabel, QMessageBox,
                              QSplitter, QShortcut, QDialog, QFormLayout, QDialogButtonBox,
                              QCheckBox, QComboBox, QTabWidget, QScrollArea, QGroupBox,
-                             QTableWidget, QTableWidgetItem, QHeaderView, QSizePolicy)
+                             QTableWidget, QTableWidgetItem, QHeaderView, QSizePolicy,
+                             QPlainTextEdit)
 from PyQt5.QtCore import Qt, QPropertyAnimation, QEasingCurve, QThread, pyqtSignal, QTimer, QDateTime
-from PyQt5.QtGui import QFont, QColor, QKeySequence
+from PyQt5.QtGui import QFont, QColor, QKeySequence, QTextCursor
 from prettytable import PrettyTable
 from PyQt5 import QtWidgets, QtCore, QtGui
 
 import random
 
+from fm_logtail import RingBuffer, parse_log_message
+
 # Add Hawkeye import
 try:
     from hawkeye_casino.core.analyzer import HawkeyeAnalyzer
@@ -55,6 +61,23 @@ DEEP_BLUE = "#050A30"
 MIDNIGHT = "#050A30"
 SCARLET = "#A92420"
 
+# Console output pipeline
+CONSOLE_MAX_BLOCKS = 20000        # oldest console lines are dropped beyond this
+CONSOLE_BATCH_INTERVAL = 0.05     # seconds between console updates from a running command
+CONSOLE_READ_CHUNK = 65536        # bytes per os.read() of the command's stdout
+CONSOLE_MAX_BATCH_CHARS = 262144  # flush a batch early once it grows past this
+
+def console_spill_path(manager_name):
+    """Full-output log file for a command, when $casino_console_spill names a directory"""
+    spill_dir = os.getenv('casino_console_spill')
+    if not spill_dir:
+        return None
+    try:
+        os.makedirs(spill_dir, exist_ok=True)
+    except OSError:
+        return None
+    return os.path.join(spill_dir, f"{manager_name}_{time.strftime('%Y%m%d_%H%M%S')}_{os.getpid()}.log")
+
 # Default hotkey mappings (can be customized by user)
 DEFAULT_HOTKEYS = {
     'dk_mgr': 'Ctrl+D',
@@ -164,13 +187,20 @@ class CommandExecutionThread(QThread):
     flow_start_signal = pyqtSignal(str, str)          # flow_id, flow_name
     task_status_signal = pyqtSignal(str, str, str, str)  # flow_id, task_name, status, time
     flow_done_signal = pyqtSignal(str, str, int, int)    # flow_id, flow_name, succeeded, failed
+    task_log_signal = pyqtSignal(str, str, str)          # flow_id, task_name, log chunk
 
-    def __init__(self, command, manager_name):
+    def __init__(self, command, manager_name, spill_path=None):
         super().__init__()
         self.command = command
         self.manager_name = manager_name
         self.process = None
         self.captured_run_dir = None
+        self.spill_path = spill_path
+        self._spill = None
+        self._pending = []        # console text waiting for the next batch
+        self._pending_chars = 0
+        self._pending_logs = {}   # (flow_id, task_name) -> [log chunks]
+        self._last_flush = 0.0
 
     def run(self):
         try:
@@ -195,7 +225,7 @@ class CommandExecutionThread(QThread):
                     self.command,
                     stdout=subprocess.PIPE,
                     stdin=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
+                    stderr=subprocess.STDOUT,  # Drained with stdout (warnings, tracebacks)
                     encoding='utf-8',
                     errors='replace',
                     shell=True,
@@ -209,7 +239,7 @@ class CommandExecutionThread(QThread):
                         self.command,
                         stdout=subprocess.PIPE,
                         stdin=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,  # Drained with stdout (warnings, tracebacks)
                         encoding='utf-8',
                         errors='replace',
                         shell=True,
@@ -222,7 +252,7 @@ class CommandExecutionThread(QThread):
                         self.command,
                         stdout=subprocess.PIPE,
                         stdin=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
+                        stderr=subprocess.STDOUT,  # Drained with stdout (warnings, tracebacks)
                         encoding='utf-8',
                         errors='replace',
                         shell=True,
@@ -231,55 +261,31 @@ class CommandExecutionThread(QThread):
                         env=env
                     )
 
-            output_buffer = []
-            buffer_size = 10 if is_buffered else 1
-
-            while True:
-                output = self.process.stdout.readline()
-                if output == '' and self.process.poll() is not None:
-                    break
-
-                if output:
-                    if output.startswith("CASINO_RUN_DIR: "):
-                        self.captured_run_dir = output[len("CASINO_RUN_DIR: "):].strip()
-                    elif output.startswith("CASINO_FLOW_START: "):
-                        p = output[len("CASINO_FLOW_START: "):].strip().split("|")
-                        if len(p) >= 2:
-                            self.flow_start_signal.emit(p[0], p[1])
-                    elif output.startswith("CASINO_TASK_START: "):
-                        p = output[len("CASINO_TASK_START: "):].strip().split("|")
-                        if len(p) >= 2:
-                            self.task_status_signal.emit(p[0], p[1], "RUNNING", p[3] if len(p) > 3 else "")
-                    elif output.startswith("CASINO_TASK_STATUS: "):
-                        p = output[len("CASINO_TASK_STATUS: "):].strip().split("|")
-                        if len(p) >= 3:
-                            self.task_status_signal.emit(p[0], p[1], p[2], p[3] if len(p) > 3 else "")
-                    elif output.startswith("CASINO_FLOW_DONE: "):
-                        p = output[len("CASINO_FLOW_DONE: "):].strip().split("|")
-                        if len(p) >= 4:
-                            try:
-                                self.flow_done_signal.emit(p[0], p[0].rsplit("_", 1)[0], int(p[2]), int(p[3]))
-                            except (ValueError, IndexError):
-                                pass
-                    if "Press 'y' to continue with the execution" in output:
-                        if '-y' in self.command:
-                            self.process.stdin.write('y\n')
-                            self.process.stdin.flush()
-                            self.output_signal.emit(output)
-                            self.output_signal.emit("y\n")
-                        else:
-                            self.output_signal.emit(output)
-                            self.output_signal.emit("Waiting for user input... Type 'y' to continue or 'n' to abort, then press Enter.\n")
-                    elif not is_buffered:
-                        self.output_signal.emit(output)
-                    else:
-                        output_buffer.append(output)
-                        if len(output_buffer) >= buffer_size:
-                            self.output_signal.emit(''.join(output_buffer))
-                            output_buffer = []
-
-            if output_buffer:
-                self.output_signal.emit(''.join(output_buffer))
+            if self.spill_path:
+                try:
+                    self._spill = open(self.spill_path, 'a', encoding='utf-8', errors='replace')
+                except OSError as e:
+                    self.output_signal.emit(f"Warning: cannot write console log {self.spill_path}: {e}\n")
+
+            # Drain stdout in large chunks and hand the GUI one batch per interval,
+            # instead of one signal (and one QTextEdit insert) per line
+            self._last_flush = time.monotonic()
+            partial = ''
+            for chunk in self._read_stdout():
+                if chunk:
+                    lines = (partial + chunk).split('\n')
+                    partial = lines.pop()
+                    for line in lines:
+                        self._handle_line(line + '\n')
+                elif partial and not partial.startswith('CASINO_'):
+                    # Pipe idle on an unterminated line (e.g. an input() prompt): show it now
+                    self._handle_line(partial)
+                    partial = ''
+                self._flush_batch(force=not chunk)
+
+            if partial:
+                self._handle_line(partial)
+            self._flush_batch(force=True)
 
             self.process.stdout.close()
             self.process.wait()
@@ -291,6 +297,95 @@ class CommandExecutionThread(QThread):
 
         except Exception as e:
             self.error_signal.emit(f"\nError executing the command: {e}\n")
+        finally:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = None
+
+    def _read_stdout(self):
+        """Yield decoded stdout text in large chunks; yields '' whenever the pipe stays idle for a batch interval"""
+        fd = self.process.stdout.fileno()
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        use_select = sys.platform != 'win32'
+        while True:
+            if use_select:
+                ready, _, _ = select.select([fd], [], [], CONSOLE_BATCH_INTERVAL)
+                if not ready:
+                    yield ''
+                    continue
+            data = os.read(fd, CONSOLE_READ_CHUNK)
+            if not data:
+                tail = decoder.decode(b'', final=True)
+                if tail:
+                    yield tail
+                return
+            yield decoder.decode(data)
+
+    def _handle_line(self, output):
+        """Route one stdout line: CASINO_* control lines to signals, everything else to the console batch"""
+        if output.startswith("CASINO_TASK_LOG: "):
+            # Live task log chunk - routed to the flow monitor, never the console
+            parsed = parse_log_message(output[len("CASINO_TASK_LOG: "):].rstrip("\n"))
+            if parsed:
+                self._pending_logs.setdefault(parsed[:2], []).append(parsed[2])
+            return
+        if output.startswith("CASINO_RUN_DIR: "):
+            self.captured_run_dir = output[len("CASINO_RUN_DIR: "):].strip()
+        elif output.startswith("CASINO_FLOW_START: "):
+            p = output[len("CASINO_FLOW_START: "):].strip().split("|")
+            if len(p) >= 2:
+                self.flow_start_signal.emit(p[0], p[1])
+        elif output.startswith("CASINO_TASK_START: "):
+            p = output[len("CASINO_TASK_START: "):].strip().split("|")
+            if len(p) >= 2:
+                self.task_status_signal.emit(p[0], p[1], "RUNNING", p[3] if len(p) > 3 else "")
+        elif output.startswith("CASINO_TASK_STATUS: "):
+            p = output[len("CASINO_TASK_STATUS: "):].strip().split("|")
+            if len(p) >= 3:
+                self.task_status_signal.emit(p[0], p[1], p[2], p[3] if len(p) > 3 else "")
+        elif output.startswith("CASINO_FLOW_DONE: "):
+            p = output[len("CASINO_FLOW_DONE: "):].strip().split("|")
+            if len(p) >= 4:
+                try:
+                    self.flow_done_signal.emit(p[0], p[0].rsplit("_", 1)[0], int(p[2]), int(p[3]))
+                except (ValueError, IndexError):
+                    pass
+
+        if "Press 'y' to continue with the execution" in output:
+            self._append(output)
+            if '-y' in self.command:
+                self.process.stdin.write('y\n')
+                self.process.stdin.flush()
+                self._append("y\n")
+            else:
+                self._append("Waiting for user input... Type 'y' to continue or 'n' to abort, then press Enter.\n")
+            self._flush_batch(force=True)
+        else:
+            self._append(output)
+
+    def _append(self, text):
+        self._pending.append(text)
+        self._pending_chars += len(text)
+
+    def _flush_batch(self, force=False):
+        """Emit the pending console text and log chunks if the batch interval elapsed (or force)"""
+        now = time.monotonic()
+        if not force and now - self._last_flush < CONSOLE_BATCH_INTERVAL \
+                and self._pending_chars < CONSOLE_MAX_BATCH_CHARS:
+            return
+        self._last_flush = now
+        if self._pending:
+            text = ''.join(self._pending)
+            self._pending = []
+            self._pending_chars = 0
+            if self._spill is not None:
+                self._spill.write(text)
+                self._spill.flush()
+            self.output_signal.emit(text)
+        if self._pending_logs:
+            for (flow_id, task_name), chunks in self._pending_logs.items():
+                self.task_log_signal.emit(flow_id, task_name, ''.join(chunks))
+            self._pending_logs = {}
 
     def send_input(self, input_text):
         if self.process:
@@ -1272,11 +1367,15 @@ class FlowStatusWidget(QWidget):
 
     COL_TASK, COL_STATUS, COL_START, COL_END, COL_RUNTIME, COL_ACCUM = 0, 1, 2, 3, 4, 5
 
+    LOG_RING_KB = 64            # per-task log history kept in memory
+    LOG_VIEW_MAX_BLOCKS = 2000  # lines kept in the visible log view
+
     STATUS_COLORS = {
         "RUNNING":     "#d4a017",   # amber
         "SUCCESS":     "#2e8b57",   # sea green
         "FAILED":      "#cc3333",   # red
         "INTERRUPTED": "#888888",   # gray
+        "QUEUED":      "#4a9eff",   # blue - waiting for host resources
         "PENDING":     "#555555",   # dark gray
     }
 
@@ -1289,6 +1388,9 @@ class FlowStatusWidget(QWidget):
         self._start_times = {}      # task_name -> QDateTime
         self._finished_secs = 0     # cumulative secs of all finished tasks
         self._was_killed = False    # set True when Kill is confirmed by user
+        self._log_buffers = {}      # task_name -> RingBuffer (last LOG_RING_KB of its log)
+        self._log_task = None       # task currently shown in the log view
+        self._log_pinned = False    # True once the user picked a row (stop auto-follow)
         self._timer = QTimer(self)
         self._timer.timeout.connect(self._tick_runtimes)
         self._timer.start(1000)
@@ -1365,7 +1467,31 @@ class FlowStatusWidget(QWidget):
             QTableWidget::item:alternate { background: #16213e; }
             QHeaderView::section { background: #0f3460; color: #e0e0e0; padding: 2px 4px; }
         """)
-        layout.addWidget(self.table)
+        self.table.currentCellChanged.connect(self._on_row_selected)
+
+        # Live log of the selected (or most recently started) task
+        log_pane = QWidget(self)
+        log_layout = QVBoxLayout(log_pane)
+        log_layout.setContentsMargins(0, 0, 0, 0)
+        log_layout.setSpacing(0)
+        self._log_label = QLabel("Log: ─")
+        self._log_label.setFont(QFont("Terminus", 7))
+        self._log_label.setStyleSheet("color: #888888; padding-left: 4px;")
+        log_layout.addWidget(self._log_label)
+        self.log_view = QPlainTextEdit(log_pane)
+        self.log_view.setReadOnly(True)
+        self.log_view.setMaximumBlockCount(self.LOG_VIEW_MAX_BLOCKS)
+        self.log_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.log_view.setFont(QFont("Terminus", 7))
+        self.log_view.setStyleSheet("QPlainTextEdit { background: #0d0d1a; color: #b0b0b0; border: none; }")
+        log_layout.addWidget(self.log_view)
+
+        splitter = QSplitter(Qt.Vertical, self)
+        splitter.addWidget(self.table)
+        splitter.addWidget(log_pane)
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 1)
+        layout.addWidget(splitter)
 
     def update_task(self, task_name: str, status: str, time_str: str):
         """Add or update a task row. Called from main thread via signal."""
@@ -1385,7 +1511,8 @@ class FlowStatusWidget(QWidget):
         color = self.STATUS_COLORS[status_key]
 
         label = {"RUNNING": "> Running", "SUCCESS": "* Done",
-                 "FAILED": "X Failed", "INTERRUPTED": "- Stop"}.get(status_key, status)
+                 "FAILED": "X Failed", "INTERRUPTED": "- Stop",
+                 "QUEUED": "~ Queued"}.get(status_key, status)
 
         item = QTableWidgetItem(label)
         item.setForeground(QColor(color))
@@ -1397,6 +1524,8 @@ class FlowStatusWidget(QWidget):
             start_str = time_str.strip() if time_str and time_str.strip() else now.toString("yyyy-MM-dd HH:mm:ss")
             self.table.item(row, self.COL_START).setText(start_str)
             self._start_times[task_name] = now
+            if not self._log_pinned:
+                self._show_log(task_name)
         elif task_name in self._start_times:
             # Freeze end time and elapsed; remove from ticker
             start_dt = self._start_times.pop(task_name)
@@ -1408,6 +1537,35 @@ class FlowStatusWidget(QWidget):
             if accum_item:
                 accum_item.setText(self._fmt_elapsed(self._finished_secs))
 
+    def append_log(self, task_name: str, text: str):
+        """Buffer a live log chunk; append it to the view if that task is shown."""
+        buf = self._log_buffers.get(task_name)
+        if buf is None:
+            buf = self._log_buffers[task_name] = RingBuffer(self.LOG_RING_KB * 1024)
+        buf.append(text)
+        if self._log_task is None and not self._log_pinned:
+            self._show_log(task_name)
+        elif task_name == self._log_task:
+            at_bottom = self.log_view.verticalScrollBar().value() == self.log_view.verticalScrollBar().maximum()
+            cursor = self.log_view.textCursor()
+            cursor.movePosition(cursor.End)
+            cursor.insertText(text)
+            if at_bottom:
+                self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
+
+    def _show_log(self, task_name: str):
+        self._log_task = task_name
+        self._log_label.setText(f"Log: {task_name}")
+        buf = self._log_buffers.get(task_name)
+        self.log_view.setPlainText(buf.getvalue() if buf else "")
+        self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
+
+    def _on_row_selected(self, row: int, _col: int, _prev_row: int, _prev_col: int):
+        item = self.table.item(row, self.COL_TASK) if row >= 0 else None
+        if item is not None and item.text() != self._log_task:
+            self._log_pinned = True
+            self._show_log(item.text())
+
     def _tick_runtimes(self):
         now = QDateTime.currentDateTime()
         for task_name, start_dt in self._start_times.items():
@@ -1560,6 +1718,12 @@ class FlowMonitorPanel(QWidget):
         if widget:
             widget.update_task(task_name, status, time_str)
 
+    def route_task_log(self, flow_id: str, task_name: str, text: str):
+        """Route a live log chunk to the correct tab's widget."""
+        widget = self._flow_widgets.get(flow_id)
+        if widget:
+            widget.append_log(task_name, text)
+
     def finish_flow_tab(self, flow_id: str, _flow_name: str, _succeeded: int, failed: int):
         """Update tab title when flow completes."""
         widget = self._flow_widgets.get(flow_id)
@@ -1912,6 +2076,7 @@ class CasinoGUI(QtWidgets.QWidget):
         self.console_output = QTextEdit(self)
         self.console_output.setReadOnly(True)
         self.console_output.setFont(QFont("Terminus", 8))
+        self.console_output.document().setMaximumBlockCount(CONSOLE_MAX_BLOCKS)
         self.console_splitter.addWidget(self.console_output)
 
         # Flow monitor panel — shown only when flow_mgr is active
@@ -2340,7 +2505,10 @@ class CasinoGUI(QtWidgets.QWidget):
 
         self.scroll_to_bottom()
 
-        self.command_thread = CommandExecutionThread(full_command, self.selected_manager[0])
+        self.command_thread = CommandExecutionThread(full_command, self.selected_manager[0],
+                                                     console_spill_path(self.selected_manager[0]))
+        if self.command_thread.spill_path:
+            self.console_output.insertHtml(f"<span style='color: gray;'>[LOG] Full output: {self.command_thread.spill_path}</span><br>")
         self.command_thread.output_signal.connect(self.update_console_output)
         self.command_thread.error_signal.connect(self.handle_execution_error)
         self.command_thread.task_done_signal.connect(self.notify_task_done)
@@ -2373,6 +2541,7 @@ class CasinoGUI(QtWidgets.QWidget):
                     self.flow_monitor.add_flow_tab(fid, fname, cmd, cb, gcb)
             )
             self.command_thread.task_status_signal.connect(self.flow_monitor.route_task_update)
+            self.command_thread.task_log_signal.connect(self.flow_monitor.route_task_log)
             self.command_thread.flow_done_signal.connect(self.flow_monitor.finish_flow_tab)
 
         self.command_thread.start()
@@ -2439,7 +2608,11 @@ class CasinoGUI(QtWidgets.QWidget):
             QMessageBox.warning(self, "Error", "Input is empty!")
 
     def update_console_output(self, text):
-        self.console_output.insertPlainText(text)
+        # Append at the end regardless of where the user clicked; the document drops
+        # its oldest blocks beyond CONSOLE_MAX_BLOCKS
+        cursor = QTextCursor(self.console_output.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
         self.scroll_to_bottom()
         self.input_field.setFocus()
 
@@ -0,0 +1,450 @@
+#!/usr/local/bin/python3.12
+"""
+Host-wide admission control for fm_casino tasks.
+
+Several fm_casino instances (one per run directory) usually share the same
+workstation. Before a task is launched, fm_casino reserves the CPU slots,
+memory and licenses the task declares in flow_casino.yaml from a token store
+that every fm_casino process on the host shares. Tasks that do not fit are
+queued until enough resources are released, and admission also backs off
+while the host's available memory (psutil) is below the configured floor.
+
+Per-task declaration (flow_casino.yaml):
+
+    - name: place_inn
+      command: "..."
+      resources:
+        cpus: 8
+        mem_gb: 64
+        licenses: {innovus: 1}
+
+Optional host limits (top level of flow_casino.yaml):
+
+    admission:
+      max_cpus: 32           # default: os.cpu_count()
+      max_mem_gb: 256        # default: 90% of physical memory
+      min_free_mem_gb: 8     # back off while available memory is below this
+      licenses: {innovus: 4, primetime: 2}
+
+The token store is a small JSON file in /tmp (override with
+$casino_admission_store) protected by an fcntl lock, so it is shared by all
+fm_casino processes on one host and needs no daemon. Reservations held by
+processes that no longer exist are pruned on every access. Waiting tasks
+take a ticket in the store's queue and are admitted in arrival order, so a
+large request is not starved by a stream of small ones.
+"""
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+import fcntl
+import json
+import os
+import random
+import socket
+import sys
+import time
+
+import psutil
+
+DEFAULT_STORE_PATH = "/tmp/casino_admission.json"
+DEFAULT_MEM_FRACTION = 0.9
+POLL_INTERVAL_MIN = 2.0     # seconds between admission attempts (initial)
+POLL_INTERVAL_MAX = 10.0    # cap for exponential back-off
+QUEUE_STALE_AGE = 60.0      # queued tickets not polled for this long are dropped
+
+GB = 1024 ** 3
+
+
+@dataclass
+class ResourceRequest:
+    """Resources a task reserves while it runs."""
+    cpus: int = 1
+    mem_gb: float = 0.0
+    licenses: Dict[str, int] = field(default_factory=dict)
+
+    def describe(self) -> str:
+        parts = [f"cpus={self.cpus}", f"mem={self.mem_gb:g}G"]
+        parts.extend(f"{name}={count}" for name, count in sorted(self.licenses.items()))
+        return ", ".join(parts)
+
+
+def parse_task_resources(task: dict) -> ResourceRequest:
+    """Build a ResourceRequest from a flow task's optional 'resources' block."""
+    spec = task.get('resources') or {}
+    return ResourceRequest(
+        cpus=int(spec.get('cpus', 1)),
+        mem_gb=float(spec.get('mem_gb', 0)),
+        licenses={str(k): int(v) for k, v in (spec.get('licenses') or {}).items()}
+    )
+
+
+def validate_resources(data: dict) -> list:
+    """Return a list of error strings for malformed resources/admission blocks."""
+    errors = []
+    for task in data.get('tasks', []):
+        spec = task.get('resources')
+        if spec is None:
+            continue
+        name = task.get('name', '?')
+        if not isinstance(spec, dict):
+            errors.append(f"Task '{name}' has non-mapping 'resources'")
+            continue
+        try:
+            request = parse_task_resources(task)
+        except (TypeError, ValueError, AttributeError) as e:
+            errors.append(f"Task '{name}' has invalid 'resources': {e}")
+            continue
+        if request.cpus < 0 or request.mem_gb < 0 or any(v < 0 for v in request.licenses.values()):
+            errors.append(f"Task '{name}' has negative resource values")
+
+    limits = data.get('admission')
+    if limits is not None and not isinstance(limits, dict):
+        errors.append("Top-level 'admission' must be a mapping")
+    return errors
+
+
+def flow_uses_admission(data: dict) -> bool:
+    """True if the flow declares per-task resources or host admission limits."""
+    if data.get('admission'):
+        return True
+    return any(task.get('resources') for task in data.get('tasks', []))
+
+
+def _print_warning(message: str):
+    print(message, file=sys.stderr)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        proc = psutil.Process(pid)
+        return proc.status() != psutil.STATUS_ZOMBIE
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return psutil.pid_exists(pid)
+
+
+class AdmissionController:
+    """Reserve/release task resources against the host-wide token store.
+
+    Warnings go to `warn` (fm_casino passes safe_print: its stderr is not read).
+    """
+
+    def __init__(self, limits: Optional[dict] = None, store_path: Optional[str] = None,
+                 owner: str = "", warn: Callable[[str], None] = _print_warning):
+        limits = limits or {}
+        self._warn = warn
+        total_mem_gb = psutil.virtual_memory().total / GB
+
+        self.store_path = store_path or os.getenv('casino_admission_store', DEFAULT_STORE_PATH)
+        self.owner = owner
+        self.max_cpus = int(limits.get('max_cpus') or os.cpu_count() or 1)
+        self.max_mem_gb = float(limits.get('max_mem_gb') or total_mem_gb * DEFAULT_MEM_FRACTION)
+        self.min_free_mem_gb = float(limits.get('min_free_mem_gb', 0))
+        self.license_limits = {str(k): int(v) for k, v in (limits.get('licenses') or {}).items()}
+
+    @classmethod
+    def from_flow(cls, data: dict, owner: str = "",
+                  warn: Callable[[str], None] = _print_warning) -> 'AdmissionController':
+        return cls(limits=data.get('admission'), owner=owner, warn=warn)
+
+    # ------------------------------------------------------------------
+    # Token store
+    # ------------------------------------------------------------------
+
+    def _open_store(self) -> int:
+        """Open the store, creating it (world-writable) only if it does not exist yet.
+
+        O_CREAT is left out for an existing file: with fs.protected_regular
+        (the default on current distros) it fails with EACCES on another
+        user's file in sticky /tmp even though the mode allows writing.
+        """
+        try:
+            return os.open(self.store_path, os.O_RDWR)
+        except FileNotFoundError:
+            pass
+        try:
+            fd = os.open(self.store_path, os.O_RDWR | os.O_CREAT | os.O_EXCL, 0o666)
+        except FileExistsError:
+            return os.open(self.store_path, os.O_RDWR)  # Created by another process meanwhile
+        try:
+            os.fchmod(fd, 0o666)   # shared by every user's fm_casino on this host (umask)
+        except OSError:
+            pass
+        return fd
+
+    @contextmanager
+    def _locked_store(self):
+        """Yield the store dict under an exclusive lock; write it back on exit."""
+        fd = self._open_store()
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            with os.fdopen(os.dup(fd), 'r+') as f:
+                raw = f.read()
+                try:
+                    store = json.loads(raw) if raw.strip() else {}
+                except json.JSONDecodeError:
+                    self._warn(f"Warning: admission store {self.store_path} is corrupted - resetting")
+                    store = {}
+                store.setdefault('reservations', {})
+                store.setdefault('queue', {})
+                self._prune_stale(store)
+
+                yield store
+
+                f.seek(0)
+                f.truncate()
+                json.dump(store, f)
+                f.flush()
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    @staticmethod
+    def _prune_stale(store: dict):
+        host = socket.gethostname()
+        reservations = store['reservations']
+        for token, entry in list(reservations.items()):
+            if entry.get('host', host) == host and not _pid_alive(int(entry.get('pid', 0))):
+                del reservations[token]
+        queue = store['queue']
+        now = time.time()
+        for ticket, entry in list(queue.items()):
+            if (now - entry.get('seen', 0) > QUEUE_STALE_AGE
+                    or entry.get('host', host) == host and not _pid_alive(int(entry.get('pid', 0)))):
+                del queue[ticket]
+
+    @staticmethod
+    def _usage(store: dict):
+        cpus, mem_gb, licenses = 0, 0.0, {}
+        for entry in store['reservations'].values():
+            cpus += entry.get('cpus', 0)
+            mem_gb += entry.get('mem_gb', 0.0)
+            for name, count in entry.get('licenses', {}).items():
+                licenses[name] = licenses.get(name, 0) + count
+        return cpus, mem_gb, licenses
+
+    # ------------------------------------------------------------------
+    # Admission
+    # ------------------------------------------------------------------
+
+    def _clamp(self, request: ResourceRequest) -> ResourceRequest:
+        """Never ask for more than the host limit, otherwise the task could never run."""
+        licenses = {}
+        for name, count in request.licenses.items():
+            limit = self.license_limits.get(name)
+            licenses[name] = min(count, limit) if limit is not None else count
+        return ResourceRequest(
+            cpus=min(request.cpus, self.max_cpus),
+            mem_gb=min(request.mem_gb, self.max_mem_gb),
+            licenses=licenses
+        )
+
+    def _blocking_reason(self, store: dict, request: ResourceRequest) -> Optional[str]:
+        used_cpus, used_mem, used_licenses = self._usage(store)
+
+        if used_cpus and used_cpus + request.cpus > self.max_cpus:
+            return f"cpus {used_cpus}+{request.cpus} > {self.max_cpus}"
+        if used_mem and used_mem + request.mem_gb > self.max_mem_gb:
+            return f"mem {used_mem:g}G+{request.mem_gb:g}G > {self.max_mem_gb:.0f}G"
+        for name, count in request.licenses.items():
+            limit = self.license_limits.get(name)
+            if limit is not None and used_licenses.get(name, 0) + count > limit:
+                return f"license {name} {used_licenses.get(name, 0)}+{count} > {limit}"
+
+        available_gb = psutil.virtual_memory().available / GB
+        if self.min_free_mem_gb and available_gb - request.mem_gb < self.min_free_mem_gb:
+            # Only back off when someone else holds a reservation; a lone task
+            # must still be able to start on a busy host.
+            if store['reservations']:
+                return f"available mem {available_gb:.1f}G below floor {self.min_free_mem_gb:g}G"
+        return None
+
+    def try_acquire(self, task_name: str, request: ResourceRequest, ticket: Optional[str] = None):
+        """Single non-blocking attempt. Returns (token, None) or (None, reason).
+
+        With a ticket the request joins the wait queue on its first attempt
+        and is only admitted once no earlier ticket is waiting; without one
+        it is admitted only while nobody is queued.
+        """
+        request = self._clamp(request)
+        with self._locked_store() as store:
+            queue = store['queue']
+            now = time.time()
+            if ticket is not None:
+                entry = queue.setdefault(ticket, {'host': socket.gethostname(), 'pid': os.getpid(),
+                                                  'owner': self.owner, 'task': task_name, 'since': now})
+                entry['seen'] = now
+                ahead = sum(1 for other, e in queue.items()
+                            if (e['since'], other) < (entry['since'], ticket))
+            else:
+                ahead = len(queue)
+            if ahead:
+                return None, f"{ahead} earlier request{'s' if ahead > 1 else ''} queued"
+            reason = self._blocking_reason(store, request)
+            if reason:
+                return None, reason
+
+            queue.pop(ticket, None)
+            token = f"{socket.gethostname()}:{os.getpid()}:{task_name}:{time.time():.6f}"
+            store['reservations'][token] = {
+                'host': socket.gethostname(),
+                'pid': os.getpid(),
+                'owner': self.owner,
+                'task': task_name,
+                'cpus': request.cpus,
+                'mem_gb': request.mem_gb,
+                'licenses': request.licenses,
+                'since': time.time()
+            }
+            return token, None
+
+    def acquire(self, task_name: str, request: ResourceRequest,
+                should_abort: Optional[Callable[[], bool]] = None,
+                on_wait: Optional[Callable[[str], None]] = None) -> Optional[str]:
+        """
+        Block until the task is admitted.
+
+        Args:
+            task_name: Flow task name (recorded in the store for diagnostics)
+            request: Resources to reserve
+            should_abort: Polled between attempts; returning True gives up
+            on_wait: Called with the blocking reason whenever it changes
+
+        Returns:
+            Reservation token, or None if should_abort() stopped the wait
+        """
+        delay = POLL_INTERVAL_MIN
+        last_reason = None
+        ticket = f"{socket.gethostname()}:{os.getpid()}:{task_name}:{time.time():.6f}"
+        while True:
+            if should_abort and should_abort():
+                self._leave_queue(ticket)
+                return None
+            try:
+                token, reason = self.try_acquire(task_name, request, ticket)
+            except OSError as e:
+                # A broken store must never stop the flow - run unthrottled.
+                self._warn(f"Warning: admission store unavailable ({e}) - launching '{task_name}' without reservation")
+                return ""
+            if token:
+                return token
+
+            if reason != last_reason:
+                if on_wait:
+                    on_wait(reason)
+                delay = POLL_INTERVAL_MIN  # Moved up the queue or blocked on something else: look again soon
+            last_reason = reason
+
+            # Jitter keeps several fm_casino processes from polling in lock-step
+            time.sleep(delay * random.uniform(0.8, 1.2))
+            delay = min(delay * 1.5, POLL_INTERVAL_MAX)
+
+    def _leave_queue(self, ticket: str):
+        try:
+            with self._locked_store() as store:
+                store['queue'].pop(ticket, None)
+        except OSError:
+            pass  # Pruned once it is no longer polled
+
+    def release(self, token: Optional[str]):
+        if not token:
+            return
+        try:
+            with self._locked_store() as store:
+                store['reservations'].pop(token, None)
+        except OSError as e:
+            self._warn(f"Warning: could not release admission token {token}: {e}")
+
+    def snapshot(self) -> dict:
+        """Return a copy of the current (pruned) reservations."""
+        with self._locked_store() as store:
+            return json.loads(json.dumps(store['reservations']))
+
+    def queued(self) -> list:
+        """Return the waiting tickets' entries in admission order."""
+        with self._locked_store() as store:
+            return [entry for _, entry in sorted(store['queue'].items(), key=lambda item: (item[1]['since'], item[0]))]
+
+
+# Example usage and stress testing
+if __name__ == "__main__":
+    import argparse
+    import multiprocessing
+    import tempfile
+
+    def _stress_flow(flow_idx, n_tasks, store_path, limits, sleep_s, log_path):
+        controller = AdmissionController(limits=limits, store_path=store_path, owner=f"flow{flow_idx}")
+        for task_idx in range(n_tasks):
+            request = ResourceRequest(cpus=random.choice([1, 2, 4]),
+                                      mem_gb=random.choice([1, 2, 4]),
+                                      licenses={'innovus': 1})
+            name = f"flow{flow_idx}_task{task_idx}"
+            token = controller.acquire(name, request)
+            try:
+                proc = psutil.Popen(['sleep', str(sleep_s)])
+                proc.wait()
+            finally:
+                controller.release(token)
+            with open(log_path, 'a') as f:
+                f.write(f"{name} done\n")
+
+    def _stress(args):
+        limits = {'max_cpus': args.cpus, 'max_mem_gb': args.mem_gb, 'licenses': {'innovus': args.licenses}}
+        workdir = tempfile.mkdtemp(prefix='casino_admission_')
+        store_path = os.path.join(workdir, 'store.json')
+        log_path = os.path.join(workdir, 'done.log')
+        watcher = AdmissionController(limits=limits, store_path=store_path)
+
+        print(f"Stress: {args.flows} flows x {args.tasks} tasks, limits={limits}")
+        procs = [multiprocessing.Process(target=_stress_flow,
+                                         args=(i, args.tasks, store_path, limits, args.sleep, log_path))
+                 for i in range(args.flows)]
+        for p in procs:
+            p.start()
+
+        peak = {'cpus': 0, 'mem_gb': 0.0, 'innovus': 0}
+        violations = 0
+        while any(p.is_alive() for p in procs):
+            cpus, mem_gb, licenses = watcher._usage({'reservations': watcher.snapshot()})
+            peak['cpus'] = max(peak['cpus'], cpus)
+            peak['mem_gb'] = max(peak['mem_gb'], mem_gb)
+            peak['innovus'] = max(peak['innovus'], licenses.get('innovus', 0))
+            if cpus > args.cpus or mem_gb > args.mem_gb or licenses.get('innovus', 0) > args.licenses:
+                violations += 1
+            time.sleep(0.2)
+        for p in procs:
+            p.join()
+
+        with open(log_path) as f:
+            done = len(f.readlines())
+        print(f"Completed tasks : {done}/{args.flows * args.tasks}")
+        print(f"Peak usage      : {peak}")
+        print(f"Limit violations: {violations}")
+        return 0 if violations == 0 and done == args.flows * args.tasks else 1
+
+    parser = argparse.ArgumentParser(description="fm_casino admission control utility")
+    sub = parser.add_subparsers(dest='cmd')
+    sub.add_parser('status', help="Show current host reservations")
+    stress = sub.add_parser('stress', help="Run dummy sleep tasks across several flows")
+    stress.add_argument('--flows', type=int, default=4)
+    stress.add_argument('--tasks', type=int, default=5)
+    stress.add_argument('--cpus', type=int, default=4)
+    stress.add_argument('--mem-gb', type=float, default=6)
+    stress.add_argument('--licenses', type=int, default=2)
+    stress.add_argument('--sleep', type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.cmd == 'stress':
+        raise SystemExit(_stress(args))
+
+    controller = AdmissionController()
+    reservations = controller.snapshot()
+    print(f"Admission store: {controller.store_path}")
+    print(f"Host limits    : cpus={controller.max_cpus}, mem={controller.max_mem_gb:.0f}G")
+    if not reservations:
+        print("No active reservations.")
+    for token, entry in reservations.items():
+        print(f"  {entry['owner']:<30} {entry['task']:<20} pid={entry['pid']:<8} "
+              f"cpus={entry['cpus']} mem={entry['mem_gb']:g}G licenses={entry['licenses']}")
+    for position, entry in enumerate(controller.queued(), 1):
+        print(f"  queued #{position:<3} {entry['owner']:<22} {entry['task']:<20} pid={entry['pid']:<8} "
+              f"waiting {time.time() - entry['since']:.0f}s")
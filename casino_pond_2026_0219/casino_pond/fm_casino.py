@@ -18,6 +18,7 @@ import rlcompleter
 readline.parse_and_bind("tab: complete")
 import sys
 import signal
+import threading
 import psutil
 from prettytable import PrettyTable
 
@@ -25,6 +26,22 @@ from prettytable import PrettyTable
 import argcomplete
 from argcomplete.completers import FilesCompleter
 
+from fm_admission import (AdmissionController, flow_uses_admission,
+                          parse_task_resources, validate_resources)
+from fm_logtail import LogTailer, format_log_message, guess_task_log
+
+# Every stdout write goes through safe_print: monitor threads and the log tailer
+# print concurrently, and casino_gui parses CASINO_* control lines from stdout,
+# so each call is written as one piece under a single lock.
+_stdout_lock = threading.Lock()
+
+def safe_print(*values, sep=' ', end='\n', flush=False):
+    text = sep.join(str(value) for value in values) + end
+    with _stdout_lock:
+        sys.stdout.write(text)
+        if flush:
+            sys.stdout.flush()
+
 class TerminalType(Enum):
     XTERM = "xterm"
     GNOME_TERMINAL = "gnome-terminal"
@@ -91,6 +108,8 @@ parser.add_argument(
 parser.add_argument('-y', action='store_true', help="Automatically proceed with execution without confirmation prompt")
 parser.add_argument('-singleTerm', action='store_true', help="Execute all tasks sequentially in a single terminal window instead of separate terminals. Useful for debugging or when you want to see all task output in one place.")
 parser.add_argument('--interactive', action='store_true', help="Enable interactive mode for single terminal execution. Allows real-time output and user input for interactive tasks, including tool shells (vim, htop, etc.). Only works with -singleTerm.")
+parser.add_argument('-no_log_stream', action='store_true', help="Do not stream running task log files to the GUI (streaming is only active when stdout is piped)")
+parser.add_argument('-no_admission', action='store_true', help="Disable host-wide resource admission control (task 'resources' in the flow YAML are ignored)")
 
 # Enable argcomplete auto-completion (for bash/zsh)
 argcomplete.autocomplete(parser)
@@ -103,7 +122,7 @@ if len(sys.argv) == 1:
     available_terminals = detect_available_terminals()
     terminal_list = ", ".join([t.value for t in available_terminals])
 
-    print(f"""
+    safe_print(f"""
 Options:
     -start       : Set the start task
     -end         : Set the end task
@@ -115,6 +134,7 @@ Options:
     -terminal    : Choose terminal (auto, xterm, gnome-terminal)
                    Available terminals: {terminal_list}
     -y           : Automatically proceed with execution without confirmation prompt
+    -no_admission: Ignore task 'resources' (no host-wide CPU/memory/license queuing)
     """)
     sys.exit(1)
 
@@ -129,16 +149,16 @@ elif args.terminal == 'gnome-terminal':
 if selected_terminal is None:
     available = detect_available_terminals()
     if available:
-        print(f"Warning: Requested terminal '{args.terminal}' not available. Using {available[0].value}")
+        safe_print(f"Warning: Requested terminal '{args.terminal}' not available. Using {available[0].value}")
         selected_terminal = available[0]
     else:
-        print("Error: No supported terminal emulator found (xterm or gnome-terminal)")
+        safe_print("Error: No supported terminal emulator found (xterm or gnome-terminal)")
         sys.exit(1)
 
-print(f"Using terminal: {selected_terminal.value}")
+safe_print(f"Using terminal: {selected_terminal.value}")
 
 if not args.flow:
-    print("Warning: 'flow' is not provided. Please provide a flow YAML file.")
+    safe_print("Warning: 'flow' is not provided. Please provide a flow YAML file.")
     sys.exit(1)
 
 if args.only and (args.start or args.end):
@@ -149,7 +169,7 @@ if args.interactive and not args.singleTerm:
 
 # Auto-enable interactive mode when singleTerm is used
 if args.singleTerm and not args.interactive:
-    print("Auto-enabling --interactive mode for -singleTerm execution")
+    safe_print("Auto-enabling --interactive mode for -singleTerm execution")
     args.interactive = True
 
 # Determine the filename suffix based on the arguments
@@ -172,6 +192,8 @@ current_process = None
 monitor_process = None
 active_task_processes = []   # list of (process, pid_file, task_name) — all running tasks
 execution_id = str(int(time.time()))  # Unique execution ID
+# execution_id has one-second resolution; the PID keeps flows started in the same second apart
+execution_key = f"{execution_id}_{os.getpid()}"
 flow_id = f"{Path(args.flow).stem}_{execution_id}"   # Unique per flow run
 flow_name = Path(args.flow).stem
 
@@ -218,17 +240,26 @@ def validate_flow_yaml(data):
             if dep not in all_task_names:
                 errors.append(f"Task '{name}' has OR dependency on non-existent task '{dep}'")
 
+    errors.extend(validate_resources(data))
+
     return errors
 
 # Validate flow before processing
 validation_errors = validate_flow_yaml(data)
 if validation_errors:
-    print("Flow validation errors found:")
+    safe_print("Flow validation errors found:")
     for error in validation_errors:
-        print(f"  - {error}")
-    print("Please fix these errors before running.")
+        safe_print(f"  - {error}")
+    safe_print("Please fix these errors before running.")
     sys.exit(1)
 
+# Host-wide admission control: only active when the flow declares resources
+admission = None
+if flow_uses_admission(data) and not args.no_admission:
+    admission = AdmissionController.from_flow(data, owner=flow_id, warn=safe_print)
+    safe_print(f"Admission control enabled: cpus={admission.max_cpus}, mem={admission.max_mem_gb:.0f}G, "
+          f"licenses={admission.license_limits or 'unlimited'} (store: {admission.store_path})")
+
 # Get run_ver variable from current directory (customize as needed)
 current_dir = os.getcwd()
 path_components = current_dir.strip(os.sep).split(os.sep)
@@ -236,6 +267,56 @@ run_ver_components = path_components[-4:]
 run_dir = path_components[-1]
 run_ver = os.sep.join(run_ver_components)
 
+# Live task log streaming: only when stdout is piped (casino_gui), never to a terminal
+def _publish_task_log(task_name, text):
+    safe_print(format_log_message(flow_id, task_name, text), flush=True)
+
+log_tailer = None
+if not args.no_log_stream and not sys.stdout.isatty():
+    log_tailer = LogTailer(_publish_task_log, warn=safe_print)
+
+def start_task_log_stream(task):
+    """Follow the task's tool log (if one can be determined) and publish new output"""
+    if log_tailer is None:
+        return
+    log_stem = guess_task_log(task, current_dir)
+    if log_stem:
+        log_tailer.watch(task['name'], log_stem)
+
+def stop_task_log_stream(task):
+    if log_tailer is not None:
+        log_tailer.unwatch(task['name'])
+
+# Execution registry: lets `task_monitor.py --all` discover every flow running on this host
+EXECUTION_REGISTRY_FILE = f"/tmp/casino_exec_{execution_key}.yaml"
+
+def register_execution():
+    """Record where this execution keeps its state files for the aggregate monitor"""
+    entry = {
+        'execution_id': execution_id,
+        'execution_key': execution_key,
+        'flow_id': flow_id,
+        'flow_name': flow_name,
+        'flow': os.path.abspath(args.flow),
+        'completed': os.path.abspath(COMPLETED_TASKS_FILE),
+        'runtime': os.path.abspath(RUNTIME_HISTORY_FILE),
+        'run_dir': current_dir,
+        'run_ver': run_ver,
+        'pid': os.getpid(),
+        'user': os.environ.get('USER', ''),
+        'start_time': datetime.now().strftime("%Y/%m/%d %H:%M:%S"),
+        'start': args.start,
+        'end': args.end,
+        'only': args.only,
+    }
+    try:
+        with open(EXECUTION_REGISTRY_FILE, 'w') as f:
+            yaml.safe_dump(entry, f, default_flow_style=False)
+    except OSError as e:
+        safe_print(f"Warning: could not write execution registry {EXECUTION_REGISTRY_FILE}: {e}")
+
+register_execution()
+
 # Replace $run_ver variable in commands
 for task in data['tasks']:
     if 'command' in task:
@@ -248,14 +329,14 @@ if os.path.exists(COMPLETED_TASKS_FILE):
         with open(COMPLETED_TASKS_FILE, 'r') as file:
             completed_tasks = yaml.safe_load(file) or []
     except (yaml.YAMLError, ValueError) as e:
-        print(f"Warning: {COMPLETED_TASKS_FILE} is empty or malformed. Starting with an empty list of completed tasks.")
+        safe_print(f"Warning: {COMPLETED_TASKS_FILE} is empty or malformed. Starting with an empty list of completed tasks.")
         completed_tasks = []
 else:
-    print(f"Warning: {COMPLETED_TASKS_FILE} does not exist. Starting with an empty list of completed tasks.")
+    safe_print(f"Warning: {COMPLETED_TASKS_FILE} does not exist. Starting with an empty list of completed tasks.")
 
 # If force flag is set, clear all completed tasks to start fresh
 if args.force:
-    print("Force flag set - clearing completed tasks for fresh execution")
+    safe_print("Force flag set - clearing completed tasks for fresh execution")
     completed_tasks = []
     # Clear the completed tasks file
     with open(COMPLETED_TASKS_FILE, 'w') as f:
@@ -266,15 +347,15 @@ completed_tasks = [task for task in completed_tasks if task['status'] == "Succes
 
 def display_completed_tasks(tasks):
     if not tasks:
-        print("No completed tasks found.")
+        safe_print("No completed tasks found.")
         return
 
-    print("\nCompleted Tasks:")
-    print(f"{'No.':<3} {'Task Name':<20} {'Start Time':<22} {'End Time':<22} {'Runtime':<20} {'Status':<10}")
-    print("-" * 120)
+    safe_print("\nCompleted Tasks:")
+    safe_print(f"{'No.':<3} {'Task Name':<20} {'Start Time':<22} {'End Time':<22} {'Runtime':<20} {'Status':<10}")
+    safe_print("-" * 120)
     for idx, task in enumerate(tasks):
-        print(f"{idx + 1:<3} {task['name']:<20} {task['start_time']:<22} {task['end_time']:<22} {task['runtime']:<20} {task.get('status', 'Unknown'):<10}")
-    print("-" * 120)
+        safe_print(f"{idx + 1:<3} {task['name']:<20} {task['start_time']:<22} {task['end_time']:<22} {task['runtime']:<20} {task.get('status', 'Unknown'):<10}")
+    safe_print("-" * 120)
 
 def display_previous_runs_summary():
     """Display the most recent previous run's task details and return completion status"""
@@ -282,7 +363,7 @@ def display_previous_runs_summary():
     previous_files = glob.glob(pattern)
 
     if not previous_files:
-        print("No previous runs found for this task range.")
+        safe_print("No previous runs found for this task range.")
         return False  # No previous run = proceed
 
     most_recent_file = max(previous_files, key=os.path.getmtime)
@@ -294,44 +375,44 @@ def display_previous_runs_summary():
         with open(most_recent_file, 'r') as f:
             content = f.read().strip()
             if not content:
-                print("Most recent run file is empty.")
+                safe_print("Most recent run file is empty.")
                 return False
 
         tasks_data = yaml.safe_load(content) or []
         if not isinstance(tasks_data, list):
-            print("Invalid format in most recent run file.")
+            safe_print("Invalid format in most recent run file.")
             return False
 
         file_time = datetime.fromtimestamp(os.path.getmtime(most_recent_file))
-        print(f"\nMost Recent Run (Execution ID: {exec_id}):")
-        print(f"Run Time: {file_time.strftime('%Y/%m/%d %H:%M:%S')}")
-        print(f"{'No.':<3} {'Task Name':<20} {'Start Time':<22} {'End Time':<22} {'Runtime':<20} {'Status':<12}")
-        print("-" * 120)
+        safe_print(f"\nMost Recent Run (Execution ID: {exec_id}):")
+        safe_print(f"Run Time: {file_time.strftime('%Y/%m/%d %H:%M:%S')}")
+        safe_print(f"{'No.':<3} {'Task Name':<20} {'Start Time':<22} {'End Time':<22} {'Runtime':<20} {'Status':<12}")
+        safe_print("-" * 120)
 
         for idx, task in enumerate(tasks_data):
             if task.get('name'):
-                print(f"{idx + 1:<3} {task.get('name', ''):<20} {task.get('start_time', 'N/A'):<22} {task.get('end_time', 'N/A'):<22} {task.get('runtime', 'N/A'):<20} {task.get('status', 'Unknown'):<12}")
+                safe_print(f"{idx + 1:<3} {task.get('name', ''):<20} {task.get('start_time', 'N/A'):<22} {task.get('end_time', 'N/A'):<22} {task.get('runtime', 'N/A'):<20} {task.get('status', 'Unknown'):<12}")
 
-        print("-" * 120)
+        safe_print("-" * 120)
 
         total_tasks = len([t for t in tasks_data if t.get('name')])
         success_count = len([t for t in tasks_data if t.get('status') == 'Success'])
         failed_count = len([t for t in tasks_data if t.get('status') in ['Failed', 'Interrupted', 'Timeout']])
         not_executed = len([t for t in tasks_data if t.get('status') == 'Not Executed'])
 
-        print(f"Summary: {total_tasks} total, {success_count} success, {failed_count} failed/interrupted, {not_executed} not executed")
+        safe_print(f"Summary: {total_tasks} total, {success_count} success, {failed_count} failed/interrupted, {not_executed} not executed")
 
         previous_run_completed = (success_count == total_tasks and failed_count == 0 and not_executed == 0)
 
         if previous_run_completed:
-            print(f"? Previous run completed successfully - all {total_tasks} tasks finished with Success status")
+            safe_print(f"? Previous run completed successfully - all {total_tasks} tasks finished with Success status")
         else:
-            print(f"? Previous run incomplete - {failed_count} failed/interrupted, {not_executed} not executed")
+            safe_print(f"? Previous run incomplete - {failed_count} failed/interrupted, {not_executed} not executed")
 
         return previous_run_completed
 
     except Exception as e:
-        print(f"Error reading most recent run: {e}")
+        safe_print(f"Error reading most recent run: {e}")
         return False
 
 display_completed_tasks(completed_tasks)
@@ -383,20 +464,20 @@ def cleanup_temp_files():
         try:
             files = glob.glob(pattern)
             for file in files:
-                # Only clean files from this execution
-                if execution_id in file:
+                # Only clean files from this execution (not another flow started in the same second)
+                if f"_{execution_key}_" in file:
                     os.remove(file)
         except Exception as e:
-            print(f"Cleanup warning: {e}")
+            safe_print(f"Cleanup warning: {e}")
 
 def handle_interruption(signum, frame):
     global interrupted, current_process, monitor_process, active_task_processes
     interrupted = True
-    print(f"\nReceived signal {signum}. Stopping all tasks...")
+    safe_print(f"\nReceived signal {signum}. Stopping all tasks...")
 
     # Emit INTERRUPTED markers BEFORE cleanup so the GUI updates task rows
     for _term_proc, _pid_file, task_name in list(active_task_processes):
-        print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}", flush=True)
+        safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}", flush=True)
 
     # Kill every tracked task: terminal process + pid-file process (gnome-terminal-server children)
     for term_proc, pid_file, task_name in list(active_task_processes):
@@ -513,7 +594,7 @@ exec {' '.join(command_args)}
                 return cmd
 
             except Exception as e:
-                print(f"Error creating color script: {e}")
+                safe_print(f"Error creating color script: {e}")
                 # Fallback to normal command without colors
                 if group_name:
                     cmd.extend(['--', 'sg', group_name, '-c', ' '.join(command_args)])
@@ -541,23 +622,23 @@ def launch_task_monitor():
         monitor_script = os.path.join(script_dir, 'task_monitor.py')
 
         if not os.path.exists(monitor_script):
-            print(f"Error: task_monitor.py not found at {monitor_script}")
+            safe_print(f"Error: task_monitor.py not found at {monitor_script}")
             return None
 
         # Verify that required files exist
-        print(f"Verifying monitor file paths:")
-        print(f"  Flow file: {args.flow} - {'Exists' if os.path.exists(args.flow) else 'Missing'}")
-        print(f"  Completed tasks file: {COMPLETED_TASKS_FILE} - {'Exists' if os.path.exists(COMPLETED_TASKS_FILE) else 'Missing'}")
-        print(f"  Runtime history file: {RUNTIME_HISTORY_FILE} - {'Exists' if os.path.exists(RUNTIME_HISTORY_FILE) else 'Missing'}")
+        safe_print(f"Verifying monitor file paths:")
+        safe_print(f"  Flow file: {args.flow} - {'Exists' if os.path.exists(args.flow) else 'Missing'}")
+        safe_print(f"  Completed tasks file: {COMPLETED_TASKS_FILE} - {'Exists' if os.path.exists(COMPLETED_TASKS_FILE) else 'Missing'}")
+        safe_print(f"  Runtime history file: {RUNTIME_HISTORY_FILE} - {'Exists' if os.path.exists(RUNTIME_HISTORY_FILE) else 'Missing'}")
 
         # Create empty files if they don't exist
         if not os.path.exists(COMPLETED_TASKS_FILE):
-            print(f"Creating empty completed tasks file: {COMPLETED_TASKS_FILE}")
+            safe_print(f"Creating empty completed tasks file: {COMPLETED_TASKS_FILE}")
             with open(COMPLETED_TASKS_FILE, 'w') as f:
                 f.write("[]")
 
         if not os.path.exists(RUNTIME_HISTORY_FILE):
-            print(f"Creating empty runtime history file: {RUNTIME_HISTORY_FILE}")
+            safe_print(f"Creating empty runtime history file: {RUNTIME_HISTORY_FILE}")
             with open(RUNTIME_HISTORY_FILE, 'w') as f:
                 f.write("")
 
@@ -607,8 +688,8 @@ def launch_task_monitor():
             working_directory=current_dir
         )
 
-        print(f"Launching task monitor in {selected_terminal.value} window...")
-        print(f"Execution ID: {execution_id}")
+        safe_print(f"Launching task monitor in {selected_terminal.value} window...")
+        safe_print(f"Execution ID: {execution_id}")
 
         monitor_process = subprocess.Popen(
             terminal_cmd,
@@ -617,25 +698,25 @@ def launch_task_monitor():
             env=os.environ.copy()
         )
 
-        print(f"Task monitor launched with PID: {monitor_process.pid}")
+        safe_print(f"Task monitor launched with PID: {monitor_process.pid}")
 
         # Wait a moment to see if it starts successfully
         time.sleep(2)
 
         if monitor_process.poll() is not None:
             stdout, stderr = monitor_process.communicate()
-            print(f"Monitor process exited immediately")
-            print(f"Return code: {monitor_process.returncode}")
+            safe_print(f"Monitor process exited immediately")
+            safe_print(f"Return code: {monitor_process.returncode}")
             if stdout:
-                print(f"stdout: {stdout.decode()}")
+                safe_print(f"stdout: {stdout.decode()}")
             if stderr:
-                print(f"stderr: {stderr.decode()}")
+                safe_print(f"stderr: {stderr.decode()}")
             return None
 
         return monitor_process
 
     except Exception as e:
-        print(f"Error launching task monitor: {e}")
+        safe_print(f"Error launching task monitor: {e}")
         return None
 
 def save_completed_task_immediately(task_runtime_info):
@@ -662,7 +743,7 @@ def save_completed_task_immediately(task_runtime_info):
             # Check if not already in list (avoid duplicates)
             if not any(t['name'] == task_runtime_info['name'] and t['status'] == 'Success' for t in completed_tasks):
                 completed_tasks.append(task_runtime_info)
-                print(f"[DEBUG] Added '{task_runtime_info['name']}' to in-memory completed_tasks list")
+                safe_print(f"[DEBUG] Added '{task_runtime_info['name']}' to in-memory completed_tasks list")
 
         # Save immediately
         formatted_tasks = []
@@ -682,7 +763,7 @@ def save_completed_task_immediately(task_runtime_info):
         os.sync()
 
     except Exception as e:
-        print(f"Warning: Could not save task completion immediately: {e}")
+        safe_print(f"Warning: Could not save task completion immediately: {e}")
 
 def monitor_process_and_status(self, process, status_file, pid_file, task_name, max_wait_time=864000):
     """
@@ -692,12 +773,12 @@ def monitor_process_and_status(self, process, status_file, pid_file, task_name,
     last_status = None
     task_completed = False
 
-    print(f"Monitoring task completion for {task_name} - checking both process and status...")
+    safe_print(f"Monitoring task completion for {task_name} - checking both process and status...")
 
     while not interrupted and not task_completed:
         # Check timeout
         if time.time() - wait_start > max_wait_time:
-            print(f"Task {task_name} exceeded maximum wait time, terminating...")
+            safe_print(f"Task {task_name} exceeded maximum wait time, terminating...")
             self.cleanup_task_processes(process, pid_file, task_name)
             return "Timeout"
 
@@ -709,20 +790,20 @@ def monitor_process_and_status(self, process, status_file, pid_file, task_name,
 
                     if status_content != last_status:
                         if status_content == "RUNNING":
-                            print(f"Task {task_name} is running...")
+                            safe_print(f"Task {task_name} is running...")
                         elif status_content.startswith('SUCCESS'):
-                            print(f"Task {task_name} completed successfully")
+                            safe_print(f"Task {task_name} completed successfully")
                             return "Success"
                         elif status_content.startswith('FAILED'):
-                            print(f"Task {task_name} failed")
+                            safe_print(f"Task {task_name} failed")
                             return "Failed"
                         elif status_content == "INTERRUPTED":
-                            print(f"Task {task_name} was interrupted")
+                            safe_print(f"Task {task_name} was interrupted")
                             return "Interrupted"
                         last_status = status_content
 
             except Exception as e:
-                print(f"Warning: Could not read status file {status_file}: {e}")
+                safe_print(f"Warning: Could not read status file {status_file}: {e}")
 
         # SECONDARY: Check if terminal process died unexpectedly
         terminal_dead = False
@@ -738,15 +819,15 @@ def monitor_process_and_status(self, process, status_file, pid_file, task_name,
             # Terminal died AND no command processes running
             if not os.path.exists(status_file) or last_status == "RUNNING":
                 # No completion status written = accidental closure
-                print(f"DETECTED: Terminal for {task_name} closed without proper completion status")
-                print(f"This appears to be an accidental terminal closure - marking as INTERRUPTED")
+                safe_print(f"DETECTED: Terminal for {task_name} closed without proper completion status")
+                safe_print(f"This appears to be an accidental terminal closure - marking as INTERRUPTED")
                 return "Interrupted"
             # else: Normal completion, status file shows final state
 
         elif terminal_dead and command_processes_running:
             # Terminal died but command still running = definite zombie situation
-            print(f"DETECTED: Terminal for {task_name} closed but command processes still running")
-            print(f"Cleaning up zombie processes for task: {task_name}")
+            safe_print(f"DETECTED: Terminal for {task_name} closed but command processes still running")
+            safe_print(f"Cleaning up zombie processes for task: {task_name}")
             self.cleanup_task_processes(process, pid_file, task_name)
             return "Interrupted"
 
@@ -786,7 +867,7 @@ def check_command_processes_running(self, pid_file, task_name):
                                 continue
 
                         if running_processes:
-                            print(f"Found {len(running_processes)} processes still running for task {task_name}")
+                            safe_print(f"Found {len(running_processes)} processes still running for task {task_name}")
                             return True
 
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -794,7 +875,7 @@ def check_command_processes_running(self, pid_file, task_name):
                     pass
 
     except Exception as e:
-        print(f"Error checking command processes for {task_name}: {e}")
+        safe_print(f"Error checking command processes for {task_name}: {e}")
 
     return False
 
@@ -802,7 +883,7 @@ def cleanup_task_processes(self, terminal_process, pid_file, task_name):
     """
     Clean up both terminal and command processes
     """
-    print(f"Cleaning up processes for task: {task_name}")
+    safe_print(f"Cleaning up processes for task: {task_name}")
 
     # 1. Terminate terminal process if still running
     if terminal_process and terminal_process.poll() is None:
@@ -811,9 +892,9 @@ def cleanup_task_processes(self, terminal_process, pid_file, task_name):
             time.sleep(2)
             if terminal_process.poll() is None:
                 terminal_process.kill()
-                print(f"Force killed terminal process for {task_name}")
+                safe_print(f"Force killed terminal process for {task_name}")
         except Exception as e:
-            print(f"Error terminating terminal process: {e}")
+            safe_print(f"Error terminating terminal process: {e}")
 
     # 2. Clean up command processes using PID file
     try:
@@ -831,7 +912,7 @@ def cleanup_task_processes(self, terminal_process, pid_file, task_name):
                     # Terminate children first
                     for child in children:
                         try:
-                            print(f"Terminating child process {child.pid} for task {task_name}")
+                            safe_print(f"Terminating child process {child.pid} for task {task_name}")
                             child.terminate()
                         except (psutil.NoSuchProcess, psutil.AccessDenied):
                             pass
@@ -842,25 +923,25 @@ def cleanup_task_processes(self, terminal_process, pid_file, task_name):
                     # Force kill any remaining children
                     for child in alive:
                         try:
-                            print(f"Force killing child process {child.pid} for task {task_name}")
+                            safe_print(f"Force killing child process {child.pid} for task {task_name}")
                             child.kill()
                         except (psutil.NoSuchProcess, psutil.AccessDenied):
                             pass
 
                     # Finally terminate the main process
-                    print(f"Terminating main process {pid} for task {task_name}")
+                    safe_print(f"Terminating main process {pid} for task {task_name}")
                     proc.terminate()
                     try:
                         proc.wait(timeout=5)
                     except psutil.TimeoutExpired:
-                        print(f"Force killing main process {pid} for task {task_name}")
+                        safe_print(f"Force killing main process {pid} for task {task_name}")
                         proc.kill()
 
                 except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    print(f"Process {pid} already gone or access denied: {e}")
+                    safe_print(f"Process {pid} already gone or access denied: {e}")
 
     except Exception as e:
-        print(f"Error during process cleanup for {task_name}: {e}")
+        safe_print(f"Error during process cleanup for {task_name}: {e}")
 
 ########
 # Modified execute_task function
@@ -873,19 +954,19 @@ def execute_task(task):
 
     # Check for interruption before starting
     if interrupted:
-        print(f"Task '{task['name']}' skipped due to interruption.")
+        safe_print(f"Task '{task['name']}' skipped due to interruption.")
         return start_time_str, start_time_str, "00:00:00:00", "Interrupted"
 
     if 'command' not in task or not task['command']:
-        print(f"Skipping task '{task['name']}' as it has no command.")
+        safe_print(f"Skipping task '{task['name']}' as it has no command.")
         return start_time_str, start_time_str, "00:00:00:00", "Skipped"
 
     # Create unique task identifier
-    task_id = f"{task['name']}_{execution_id}_{int(start_time)}"
+    task_id = f"{task['name']}_{execution_key}_{int(start_time)}"
     status_file = f"/tmp/task_status_{task_id}.txt"
     pid_file = f"/tmp/task_pid_{task_id}.txt"
 
-    print(f"Executing {task['name']} at {start_time_str} with command: {task['command']}")
+    safe_print(f"Executing {task['name']} at {start_time_str} with command: {task['command']}")
     status = "Success"
     table = PrettyTable()
     table.field_names = ["Output/Error Type", "Message"]
@@ -893,7 +974,7 @@ def execute_task(task):
     try:
         # Check for interruption before creating script
         if interrupted:
-            print(f"Task '{task['name']}' interrupted before script creation.")
+            safe_print(f"Task '{task['name']}' interrupted before script creation.")
             return start_time_str, get_current_time(), "00:00:00:01", "Interrupted"
 
         # Create enhanced C shell script with status tracking
@@ -978,7 +1059,7 @@ exit $exit_code
 
         # Check for interruption before launching
         if interrupted:
-            print(f"Task '{task['name']}' interrupted before launch.")
+            safe_print(f"Task '{task['name']}' interrupted before launch.")
             os.remove(script_path)
             return start_time_str, get_current_time(), "00:00:00:01", "Interrupted"
 
@@ -1027,8 +1108,9 @@ exit $exit_code
             working_directory=current_dir
         )
 
-        print(f"CASINO_TASK_START: {flow_id}|{task['name']}|{task_id}|{get_current_time()}", flush=True)
+        safe_print(f"CASINO_TASK_START: {flow_id}|{task['name']}|{task_id}|{get_current_time()}", flush=True)
         process = subprocess.Popen(terminal_cmd, env=os.environ.copy())
+        start_task_log_stream(task)
         global current_process
         current_process = process
         active_task_processes.append((process, pid_file, task['name']))
@@ -1044,21 +1126,21 @@ exit $exit_code
 
         # Handle specific status cases
         if status == "Success":
-            print(f"CONFIRMED: Task {task['name']} completed successfully - proceeding to next task")
+            safe_print(f"CONFIRMED: Task {task['name']} completed successfully - proceeding to next task")
         elif status == "Failed":
-            print(f"CONFIRMED: Task {task['name']} failed - execution will stop")
+            safe_print(f"CONFIRMED: Task {task['name']} failed - execution will stop")
         elif status == "Interrupted":
-            print(f"CONFIRMED: Task {task['name']} was interrupted - execution will stop")
+            safe_print(f"CONFIRMED: Task {task['name']} was interrupted - execution will stop")
             if not interrupted:
                 # Terminal closed externally (not via Kill button).
                 # Signal handler hasn't emitted CASINO_TASK_STATUS yet — emit now so GUI updates.
-                print(f"CASINO_TASK_STATUS: {flow_id}|{task['name']}|INTERRUPTED|{get_current_time()}", flush=True)
+                safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task['name']}|INTERRUPTED|{get_current_time()}", flush=True)
             interrupted = True
         elif status == "Timeout":
-            print(f"CONFIRMED: Task {task['name']} timed out - execution will stop")
+            safe_print(f"CONFIRMED: Task {task['name']} timed out - execution will stop")
             table.add_row(["Timeout", f"Task exceeded maximum execution time"])
         else:
-            print(f"UNCERTAIN: Task {task['name']} status unclear: {status}")
+            safe_print(f"UNCERTAIN: Task {task['name']} status unclear: {status}")
             status = "Failed"
 
         # Cleanup temp files
@@ -1070,7 +1152,7 @@ exit $exit_code
                 pass
 
     except KeyboardInterrupt:
-        print(f"KeyboardInterrupt caught during task '{task['name']}' execution")
+        safe_print(f"KeyboardInterrupt caught during task '{task['name']}' execution")
         interrupted = True
         status = "Interrupted"
         # Clean up temp files
@@ -1086,14 +1168,14 @@ exit $exit_code
         status = "Failed"
 
     if table._rows:
-        print(table)
+        safe_print(table)
 
     end_time = time.time()
     end_time_str = get_current_time()
     elapsed_time = end_time - start_time
     runtime = format_runtime(elapsed_time)
 
-    print(f"Task {task['name']} completed at {end_time_str} in {runtime}. Status: {status}")
+    safe_print(f"Task {task['name']} completed at {end_time_str} in {runtime}. Status: {status}")
 
     # Save task completion immediately for real-time monitoring
     task_runtime_info = {
@@ -1134,14 +1216,14 @@ def monitor_with_process_tree_csh(process, status_file, pid_file, task_name, max
     status_file_grace_period = 600  # 10 minutes without status update
     last_status_update = time.time()
 
-    print(f"Monitoring task completion for {task_name} - checking status file + terminal + process health...")
+    safe_print(f"Monitoring task completion for {task_name} - checking status file + terminal + process health...")
 
     while not interrupted:
         current_time = time.time()
 
         # Check timeout
         if current_time - wait_start > max_wait_time:
-            print(f"Task {task_name} exceeded maximum wait time, terminating...")
+            safe_print(f"Task {task_name} exceeded maximum wait time, terminating...")
             cleanup_orphaned_processes(pid_file, task_name)
             return "Timeout"
 
@@ -1159,23 +1241,23 @@ def monitor_with_process_tree_csh(process, status_file, pid_file, task_name, max
 
                     if status_content != last_status:
                         if status_content == "RUNNING":
-                            print(f"Task {task_name} is running...")
+                            safe_print(f"Task {task_name} is running...")
                         elif status_content.startswith('SUCCESS'):
-                            print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|SUCCESS|{get_current_time()}", flush=True)
-                            print(f"Task {task_name} completed successfully")
+                            safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|SUCCESS|{get_current_time()}", flush=True)
+                            safe_print(f"Task {task_name} completed successfully")
                             return "Success"
                         elif status_content.startswith('FAILED'):
-                            print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|FAILED|{get_current_time()}", flush=True)
-                            print(f"Task {task_name} failed")
+                            safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|FAILED|{get_current_time()}", flush=True)
+                            safe_print(f"Task {task_name} failed")
                             return "Failed"
                         elif status_content == "INTERRUPTED":
-                            print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}", flush=True)
-                            print(f"Task {task_name} was interrupted")
+                            safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}", flush=True)
+                            safe_print(f"Task {task_name} was interrupted")
                             return "Interrupted"
                         last_status = status_content
 
             except Exception as e:
-                print(f"Warning: Could not read status file {status_file}: {e}")
+                safe_print(f"Warning: Could not read status file {status_file}: {e}")
 
         # NEW: FAST terminal process death detection (every 10 seconds)
         # This catches accidental "X" clicks on terminal window QUICKLY
@@ -1183,10 +1265,10 @@ def monitor_with_process_tree_csh(process, status_file, pid_file, task_name, max
             if detect_terminal_closed_fast(process, task_name):
                 # Terminal window was closed — always treat as interruption.
                 if check_task_process_alive(pid_file, task_name):
-                    print(f"WARNING: Terminal window for {task_name} was closed (task still running) - killing and marking as INTERRUPTED")
+                    safe_print(f"WARNING: Terminal window for {task_name} was closed (task still running) - killing and marking as INTERRUPTED")
                 else:
-                    print(f"WARNING: Terminal window for {task_name} was closed and task process is dead - marking as INTERRUPTED")
-                print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}", flush=True)
+                    safe_print(f"WARNING: Terminal window for {task_name} was closed and task process is dead - marking as INTERRUPTED")
+                safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}", flush=True)
                 cleanup_orphaned_processes(pid_file, task_name)
                 return "Interrupted"
 
@@ -1197,9 +1279,9 @@ def monitor_with_process_tree_csh(process, status_file, pid_file, task_name, max
         if seen_running and current_time - last_pid_check > pid_check_interval:
             if not check_task_process_alive(pid_file, task_name):
                 # csh PID is dead but status still shows RUNNING → terminal was closed with "X"
-                print(f"WARNING: Task process for {task_name} has died while status is RUNNING "
+                safe_print(f"WARNING: Task process for {task_name} has died while status is RUNNING "
                       f"- terminal likely closed accidentally, marking as INTERRUPTED")
-                print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}",
+                safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task_name}|INTERRUPTED|{get_current_time()}",
                       flush=True)
                 cleanup_orphaned_processes(pid_file, task_name)
                 return "Interrupted"
@@ -1209,9 +1291,9 @@ def monitor_with_process_tree_csh(process, status_file, pid_file, task_name, max
         if current_time - last_process_check > process_check_interval:
             # Only perform aggressive checks if status file is stale
             if current_time - last_status_update > status_file_grace_period:
-                print(f"Status file hasn't been updated for {int(current_time - last_status_update)}s - checking process health...")
+                safe_print(f"Status file hasn't been updated for {int(current_time - last_status_update)}s - checking process health...")
                 if detect_accidental_closure_csh_relaxed(pid_file, task_name):
-                    print(f"DETECTED: Accidental terminal closure for {task_name}")
+                    safe_print(f"DETECTED: Accidental terminal closure for {task_name}")
                     cleanup_orphaned_processes(pid_file, task_name)
                     return "Interrupted"
             last_process_check = current_time
@@ -1225,16 +1307,16 @@ def monitor_with_process_tree_csh(process, status_file, pid_file, task_name, max
             with open(status_file, 'r') as f:
                 final_status = f.read().strip()
                 if final_status.startswith('SUCCESS'):
-                    print(f"Task {task_name} completed successfully (detected on final check)")
+                    safe_print(f"Task {task_name} completed successfully (detected on final check)")
                     return "Success"
                 elif final_status.startswith('FAILED'):
-                    print(f"Task {task_name} failed (detected on final check)")
+                    safe_print(f"Task {task_name} failed (detected on final check)")
                     return "Failed"
                 elif final_status == "INTERRUPTED":
-                    print(f"Task {task_name} was interrupted (detected on final check)")
+                    safe_print(f"Task {task_name} was interrupted (detected on final check)")
                     return "Interrupted"
         except Exception as e:
-            print(f"Warning: Could not read status file on final check: {e}")
+            safe_print(f"Warning: Could not read status file on final check: {e}")
 
     return "Interrupted" if interrupted else "Unknown"
 
@@ -1251,7 +1333,7 @@ def detect_terminal_closed_fast(terminal_process, task_name):
             return True
         return False
     except Exception as e:
-        print(f"Error checking terminal for {task_name}: {e}")
+        safe_print(f"Error checking terminal for {task_name}: {e}")
         return False
 
 def check_task_process_alive(pid_file, task_name):
@@ -1280,7 +1362,7 @@ def check_task_process_alive(pid_file, task_name):
             return False
 
     except Exception as e:
-        print(f"Error checking task process for {task_name}: {e}")
+        safe_print(f"Error checking task process for {task_name}: {e}")
         return False
 
 def detect_accidental_closure_csh_relaxed(pid_file, task_name):
@@ -1290,49 +1372,49 @@ def detect_accidental_closure_csh_relaxed(pid_file, task_name):
     """
     try:
         if not os.path.exists(pid_file):
-            print(f"PID file missing for {task_name} - likely accidental closure")
+            safe_print(f"PID file missing for {task_name} - likely accidental closure")
             return True
 
         with open(pid_file, 'r') as f:
             csh_pid = int(f.read().strip())
 
         if not psutil.pid_exists(csh_pid):
-            print(f"Csh process {csh_pid} no longer exists for {task_name} - accidental closure detected")
+            safe_print(f"Csh process {csh_pid} no longer exists for {task_name} - accidental closure detected")
             return True
 
         proc = psutil.Process(csh_pid)
 
         # CRITICAL FIX: Only check for zombie status - remove terminal and parent checks
         if proc.status() == psutil.STATUS_ZOMBIE:
-            print(f"Csh process {csh_pid} is zombie for {task_name} - accidental closure detected")
+            safe_print(f"Csh process {csh_pid} is zombie for {task_name} - accidental closure detected")
             return True
 
         # REMOVED: Terminal association check (causes false positives with EDA tools)
         # REMOVED: Parent PID check (processes can legitimately be reparented)
 
     except (ValueError, FileNotFoundError, PermissionError) as e:
-        print(f"Error checking csh process for {task_name}: {e} - assuming accidental closure")
+        safe_print(f"Error checking csh process for {task_name}: {e} - assuming accidental closure")
         return True
     except Exception as e:
-        print(f"Unexpected error checking csh process for {task_name}: {e}")
+        safe_print(f"Unexpected error checking csh process for {task_name}: {e}")
         return False  # Don't assume closure for unexpected errors
 
     return False  # Process looks healthy
 
 def cleanup_orphaned_processes(pid_file, task_name):
     """Clean up orphaned processes after accidental terminal closure"""
-    print(f"Cleaning up orphaned processes for task: {task_name}")
+    safe_print(f"Cleaning up orphaned processes for task: {task_name}")
 
     try:
         if not os.path.exists(pid_file):
-            print(f"No PID file found for {task_name}, cannot clean up processes")
+            safe_print(f"No PID file found for {task_name}, cannot clean up processes")
             return
 
         with open(pid_file, 'r') as f:
             csh_pid = int(f.read().strip())
 
         if not psutil.pid_exists(csh_pid):
-            print(f"Main csh process {csh_pid} already gone for {task_name}")
+            safe_print(f"Main csh process {csh_pid} already gone for {task_name}")
             return
 
         proc = psutil.Process(csh_pid)
@@ -1340,12 +1422,12 @@ def cleanup_orphaned_processes(pid_file, task_name):
         # Get all child processes first
         try:
             children = proc.children(recursive=True)
-            print(f"Found {len(children)} child processes for {task_name}")
+            safe_print(f"Found {len(children)} child processes for {task_name}")
 
             # Terminate children first
             for child in children:
                 try:
-                    print(f"Terminating child process {child.pid} ({child.name()}) for task {task_name}")
+                    safe_print(f"Terminating child process {child.pid} ({child.name()}) for task {task_name}")
                     child.terminate()
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
                     pass
@@ -1353,36 +1435,36 @@ def cleanup_orphaned_processes(pid_file, task_name):
             # Wait for children to exit
             if children:
                 gone, alive = psutil.wait_procs(children, timeout=5)
-                print(f"Terminated {len(gone)} child processes, {len(alive)} still alive")
+                safe_print(f"Terminated {len(gone)} child processes, {len(alive)} still alive")
 
                 # Force kill any remaining children
                 for child in alive:
                     try:
-                        print(f"Force killing child process {child.pid} for task {task_name}")
+                        safe_print(f"Force killing child process {child.pid} for task {task_name}")
                         child.kill()
                     except (psutil.NoSuchProcess, psutil.AccessDenied):
                         pass
 
         except (psutil.NoSuchProcess, psutil.AccessDenied):
-            print(f"Could not get children for process {csh_pid}")
+            safe_print(f"Could not get children for process {csh_pid}")
 
         # Finally terminate the main csh process
         try:
-            print(f"Terminating main csh process {csh_pid} for task {task_name}")
+            safe_print(f"Terminating main csh process {csh_pid} for task {task_name}")
             proc.terminate()
             try:
                 proc.wait(timeout=5)
-                print(f"Main csh process {csh_pid} terminated gracefully")
+                safe_print(f"Main csh process {csh_pid} terminated gracefully")
             except psutil.TimeoutExpired:
-                print(f"Force killing main csh process {csh_pid} for task {task_name}")
+                safe_print(f"Force killing main csh process {csh_pid} for task {task_name}")
                 proc.kill()
         except (psutil.NoSuchProcess, psutil.AccessDenied):
-            print(f"Main csh process {csh_pid} already gone")
+            safe_print(f"Main csh process {csh_pid} already gone")
 
     except Exception as e:
-        print(f"Error during process cleanup for {task_name}: {e}")
+        safe_print(f"Error during process cleanup for {task_name}: {e}")
 
-    print(f"Process cleanup completed for task: {task_name}")
+    safe_print(f"Process cleanup completed for task: {task_name}")
 
 def display_previous_runs_summary():
     """Display the most recent previous run's task details with improved empty run detection"""
@@ -1390,7 +1472,7 @@ def display_previous_runs_summary():
     previous_files = glob.glob(pattern)
 
     if not previous_files:
-        print("No previous runs found for this task range.")
+        safe_print("No previous runs found for this task range.")
         return False  # No previous run = proceed
 
     most_recent_file = max(previous_files, key=os.path.getmtime)
@@ -1403,48 +1485,48 @@ def display_previous_runs_summary():
             content = f.read().strip()
 
         if not content:
-            print("Most recent run file exists but is empty - no tasks were executed.")
+            safe_print("Most recent run file exists but is empty - no tasks were executed.")
             return False  # Empty file = not successful
 
         tasks_data = yaml.safe_load(content) or []
         if not isinstance(tasks_data, list) or len(tasks_data) == 0:
-            print("Most recent run file exists but contains no task data.")
+            safe_print("Most recent run file exists but contains no task data.")
             return False  # No tasks = not successful
 
         file_time = datetime.fromtimestamp(os.path.getmtime(most_recent_file))
-        print(f"\nMost Recent Run (Execution ID: {exec_id}):")
-        print(f"Run Time: {file_time.strftime('%Y/%m/%d %H:%M:%S')}")
-        print(f"{'No.':<3} {'Task Name':<20} {'Start Time':<22} {'End Time':<22} {'Runtime':<20} {'Status':<12}")
-        print("-" * 120)
+        safe_print(f"\nMost Recent Run (Execution ID: {exec_id}):")
+        safe_print(f"Run Time: {file_time.strftime('%Y/%m/%d %H:%M:%S')}")
+        safe_print(f"{'No.':<3} {'Task Name':<20} {'Start Time':<22} {'End Time':<22} {'Runtime':<20} {'Status':<12}")
+        safe_print("-" * 120)
 
         for idx, task in enumerate(tasks_data):
             if task.get('name'):
-                print(f"{idx + 1:<3} {task.get('name', ''):<20} {task.get('start_time', 'N/A'):<22} {task.get('end_time', 'N/A'):<22} {task.get('runtime', 'N/A'):<20} {task.get('status', 'Unknown'):<12}")
+                safe_print(f"{idx + 1:<3} {task.get('name', ''):<20} {task.get('start_time', 'N/A'):<22} {task.get('end_time', 'N/A'):<22} {task.get('runtime', 'N/A'):<20} {task.get('status', 'Unknown'):<12}")
 
-        print("-" * 120)
+        safe_print("-" * 120)
 
         total_tasks = len([t for t in tasks_data if t.get('name')])
         success_count = len([t for t in tasks_data if t.get('status') == 'Success'])
         failed_count = len([t for t in tasks_data if t.get('status') in ['Failed', 'Interrupted', 'Timeout']])
         not_executed = len([t for t in tasks_data if t.get('status') == 'Not Executed'])
 
-        print(f"Summary: {total_tasks} total, {success_count} success, {failed_count} failed/interrupted, {not_executed} not executed")
+        safe_print(f"Summary: {total_tasks} total, {success_count} success, {failed_count} failed/interrupted, {not_executed} not executed")
 
         # Fixed logic: only successful if we have tasks AND all succeeded
         previous_run_completed = (total_tasks > 0 and success_count == total_tasks and failed_count == 0 and not_executed == 0)
 
         if previous_run_completed:
-            print(f"? Previous run completed successfully - all {total_tasks} tasks finished with Success status")
+            safe_print(f"? Previous run completed successfully - all {total_tasks} tasks finished with Success status")
         else:
             if total_tasks == 0:
-                print("? Previous run had no tasks executed")
+                safe_print("? Previous run had no tasks executed")
             else:
-                print(f"? Previous run incomplete - {failed_count} failed/interrupted, {not_executed} not executed")
+                safe_print(f"? Previous run incomplete - {failed_count} failed/interrupted, {not_executed} not executed")
 
         return previous_run_completed
 
     except Exception as e:
-        print(f"Error reading most recent run: {e}")
+        safe_print(f"Error reading most recent run: {e}")
         return False
 
 ########
@@ -1459,12 +1541,12 @@ def monitor_process_and_status(process, status_file, pid_file, task_name, max_wa
     last_status = None
     task_completed = False
 
-    print(f"Monitoring task completion for {task_name} - checking both process and status...")
+    safe_print(f"Monitoring task completion for {task_name} - checking both process and status...")
 
     while not interrupted and not task_completed:
         # Check timeout
         if time.time() - wait_start > max_wait_time:
-            print(f"Task {task_name} exceeded maximum wait time, terminating...")
+            safe_print(f"Task {task_name} exceeded maximum wait time, terminating...")
             cleanup_task_processes(process, pid_file, task_name)
             return "Timeout"
 
@@ -1476,20 +1558,20 @@ def monitor_process_and_status(process, status_file, pid_file, task_name, max_wa
 
                     if status_content != last_status:
                         if status_content == "RUNNING":
-                            print(f"Task {task_name} is running...")
+                            safe_print(f"Task {task_name} is running...")
                         elif status_content.startswith('SUCCESS'):
-                            print(f"Task {task_name} completed successfully")
+                            safe_print(f"Task {task_name} completed successfully")
                             return "Success"
                         elif status_content.startswith('FAILED'):
-                            print(f"Task {task_name} failed")
+                            safe_print(f"Task {task_name} failed")
                             return "Failed"
                         elif status_content == "INTERRUPTED":
-                            print(f"Task {task_name} was interrupted")
+                            safe_print(f"Task {task_name} was interrupted")
                             return "Interrupted"
                         last_status = status_content
 
             except Exception as e:
-                print(f"Warning: Could not read status file {status_file}: {e}")
+                safe_print(f"Warning: Could not read status file {status_file}: {e}")
 
         # SECONDARY: Check if terminal process died unexpectedly
         terminal_dead = False
@@ -1505,15 +1587,15 @@ def monitor_process_and_status(process, status_file, pid_file, task_name, max_wa
             # Terminal died AND no command processes running
             if not os.path.exists(status_file) or last_status == "RUNNING":
                 # No completion status written = accidental closure
-                print(f"DETECTED: Terminal for {task_name} closed without proper completion status")
-                print(f"This appears to be an accidental terminal closure - marking as INTERRUPTED")
+                safe_print(f"DETECTED: Terminal for {task_name} closed without proper completion status")
+                safe_print(f"This appears to be an accidental terminal closure - marking as INTERRUPTED")
                 return "Interrupted"
             # else: Normal completion, status file shows final state
 
         elif terminal_dead and command_processes_running:
             # Terminal died but command still running = definite zombie situation
-            print(f"DETECTED: Terminal for {task_name} closed but command processes still running")
-            print(f"Cleaning up zombie processes for task: {task_name}")
+            safe_print(f"DETECTED: Terminal for {task_name} closed but command processes still running")
+            safe_print(f"Cleaning up zombie processes for task: {task_name}")
             cleanup_task_processes(process, pid_file, task_name)
             return "Interrupted"
 
@@ -1553,12 +1635,12 @@ def check_command_processes_running(pid_file, task_name):
                                 continue
 
                         if running_processes:
-                            print(f"Found {len(running_processes)} processes still running for task {task_name}")
+                            safe_print(f"Found {len(running_processes)} processes still running for task {task_name}")
                             for rp in running_processes:
                                 try:
-                                    print(f"  - PID {rp.pid}: {' '.join(rp.cmdline()[:3])}")
+                                    safe_print(f"  - PID {rp.pid}: {' '.join(rp.cmdline()[:3])}")
                                 except:
-                                    print(f"  - PID {rp.pid}: <cannot read cmdline>")
+                                    safe_print(f"  - PID {rp.pid}: <cannot read cmdline>")
                             return True
 
                 except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -1566,7 +1648,7 @@ def check_command_processes_running(pid_file, task_name):
                     pass
 
     except Exception as e:
-        print(f"Error checking command processes for {task_name}: {e}")
+        safe_print(f"Error checking command processes for {task_name}: {e}")
 
     return False
 
@@ -1574,19 +1656,19 @@ def cleanup_task_processes(terminal_process, pid_file, task_name):
     """
     Clean up both terminal and command processes
     """
-    print(f"Cleaning up processes for task: {task_name}")
+    safe_print(f"Cleaning up processes for task: {task_name}")
 
     # 1. Terminate terminal process if still running
     if terminal_process and terminal_process.poll() is None:
         try:
-            print(f"Terminating terminal process for {task_name}")
+            safe_print(f"Terminating terminal process for {task_name}")
             terminal_process.terminate()
             time.sleep(2)
             if terminal_process.poll() is None:
                 terminal_process.kill()
-                print(f"Force killed terminal process for {task_name}")
+                safe_print(f"Force killed terminal process for {task_name}")
         except Exception as e:
-            print(f"Error terminating terminal process: {e}")
+            safe_print(f"Error terminating terminal process: {e}")
 
     # 2. Clean up command processes using PID file
     try:
@@ -1604,7 +1686,7 @@ def cleanup_task_processes(terminal_process, pid_file, task_name):
                     # Terminate children first
                     for child in children:
                         try:
-                            print(f"Terminating child process {child.pid} for task {task_name}")
+                            safe_print(f"Terminating child process {child.pid} for task {task_name}")
                             child.terminate()
                         except (psutil.NoSuchProcess, psutil.AccessDenied):
                             pass
@@ -1616,27 +1698,27 @@ def cleanup_task_processes(terminal_process, pid_file, task_name):
                         # Force kill any remaining children
                         for child in alive:
                             try:
-                                print(f"Force killing child process {child.pid} for task {task_name}")
+                                safe_print(f"Force killing child process {child.pid} for task {task_name}")
                                 child.kill()
                             except (psutil.NoSuchProcess, psutil.AccessDenied):
                                 pass
 
                     # Finally terminate the main process
-                    print(f"Terminating main process {pid} for task {task_name}")
+                    safe_print(f"Terminating main process {pid} for task {task_name}")
                     proc.terminate()
                     try:
                         proc.wait(timeout=5)
                     except psutil.TimeoutExpired:
-                        print(f"Force killing main process {pid} for task {task_name}")
+                        safe_print(f"Force killing main process {pid} for task {task_name}")
                         proc.kill()
 
                 except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                    print(f"Process {pid} already gone or access denied: {e}")
+                    safe_print(f"Process {pid} already gone or access denied: {e}")
 
     except Exception as e:
-        print(f"Error during process cleanup for {task_name}: {e}")
+        safe_print(f"Error during process cleanup for {task_name}: {e}")
 
-    print(f"Process cleanup completed for task: {task_name}")
+    safe_print(f"Process cleanup completed for task: {task_name}")
 
 def execute_task_single_terminal(task):
     """Execute a task in single terminal mode (sequential execution)"""
@@ -1646,25 +1728,25 @@ def execute_task_single_terminal(task):
 
     # Check for interruption before starting
     if interrupted:
-        print(f"Task '{task['name']}' skipped due to interruption.")
+        safe_print(f"Task '{task['name']}' skipped due to interruption.")
         return start_time_str, start_time_str, "00:00:00:00", "Interrupted"
 
     if 'command' not in task or not task['command']:
-        print(f"Skipping task '{task['name']}' as it has no command.")
+        safe_print(f"Skipping task '{task['name']}' as it has no command.")
         return start_time_str, start_time_str, "00:00:00:00", "Skipped"
 
     # Create unique task identifier
-    task_id = f"{task['name']}_{execution_id}_{int(start_time)}"
+    task_id = f"{task['name']}_{execution_key}_{int(start_time)}"
     status_file = f"/tmp/task_status_{task_id}.txt"
     pid_file = f"/tmp/task_pid_{task_id}.txt"
 
-    print(f"Executing {task['name']} at {start_time_str} with command: {task['command']}")
+    safe_print(f"Executing {task['name']} at {start_time_str} with command: {task['command']}")
     status = "Success"
 
     try:
         # Check for interruption before creating script
         if interrupted:
-            print(f"Task '{task['name']}' interrupted before script creation.")
+            safe_print(f"Task '{task['name']}' interrupted before script creation.")
             return start_time_str, get_current_time(), "00:00:00:01", "Interrupted"
 
         # Create enhanced C shell script with status tracking for single terminal
@@ -1711,11 +1793,12 @@ exit $exit_code
 
         # Check for interruption before launching
         if interrupted:
-            print(f"Task '{task['name']}' interrupted before launch.")
+            safe_print(f"Task '{task['name']}' interrupted before launch.")
             os.remove(script_path)
             return start_time_str, get_current_time(), "00:00:00:01", "Interrupted"
 
-        print(f"CASINO_TASK_START: {flow_id}|{task['name']}|{task_id}|{get_current_time()}", flush=True)
+        safe_print(f"CASINO_TASK_START: {flow_id}|{task['name']}|{task_id}|{get_current_time()}", flush=True)
+        start_task_log_stream(task)
         # Execute directly with csh (no xterm wrapper for single terminal mode)
         if args.interactive:
             # Interactive mode: inherit stdin/stdout/stderr for real-time interaction
@@ -1742,7 +1825,7 @@ exit $exit_code
 
         if args.interactive:
             # Interactive mode: simply wait for process completion
-            print(f"Interactive mode: Task '{task['name']}' is running. You can interact with it directly.")
+            safe_print(f"Interactive mode: Task '{task['name']}' is running. You can interact with it directly.")
 
             # Check if the command might launch an interactive tool
             command_lower = task['command'].lower()
@@ -1753,36 +1836,36 @@ exit $exit_code
                     detected_tool = tool
                     break
 
-            print("=" * 60)
+            safe_print("=" * 60)
             if detected_tool:
-                print(f"DETECTED INTERACTIVE TOOL: {detected_tool.upper()}")
+                safe_print(f"DETECTED INTERACTIVE TOOL: {detected_tool.upper()}")
                 if detected_tool in ['vim', 'nano', 'emacs']:
-                    print("- Text editor detected - Use standard editor commands to exit")
+                    safe_print("- Text editor detected - Use standard editor commands to exit")
                     if detected_tool == 'vim':
-                        print("  Vim: Press Esc, then type :q (or :wq to save)")
+                        safe_print("  Vim: Press Esc, then type :q (or :wq to save)")
                     elif detected_tool == 'nano':
-                        print("  Nano: Press Ctrl+X to exit")
+                        safe_print("  Nano: Press Ctrl+X to exit")
                     elif detected_tool == 'emacs':
-                        print("  Emacs: Press Ctrl+X, then Ctrl+C to exit")
+                        safe_print("  Emacs: Press Ctrl+X, then Ctrl+C to exit")
                 elif detected_tool in ['htop', 'top']:
-                    print("- System monitor detected - Press 'q' to quit")
+                    safe_print("- System monitor detected - Press 'q' to quit")
                 elif detected_tool in ['less', 'more', 'man']:
-                    print("- Pager detected - Press 'q' to quit")
+                    safe_print("- Pager detected - Press 'q' to quit")
                 elif detected_tool in ['bash', 'sh', 'csh', 'tcsh']:
-                    print("- Shell detected - Type 'exit' or press Ctrl+D to quit")
+                    safe_print("- Shell detected - Type 'exit' or press Ctrl+D to quit")
             else:
-                print("IMPORTANT: If the task opens a tool shell or interactive interface:")
-                print("- For text editors (vim, nano): Use :q or Ctrl+X to exit")
-                print("- For system tools (htop, top): Press 'q' to quit")
-                print("- For interactive GUIs: Close the window or use the exit option")
-                print("- For command shells: Type 'exit' or press Ctrl+D")
-                print("- For any tool: Press Ctrl+C to force exit if needed")
-            print("=" * 60)
-            print("Press Ctrl+C in this terminal to interrupt the entire task if needed.")
+                safe_print("IMPORTANT: If the task opens a tool shell or interactive interface:")
+                safe_print("- For text editors (vim, nano): Use :q or Ctrl+X to exit")
+                safe_print("- For system tools (htop, top): Press 'q' to quit")
+                safe_print("- For interactive GUIs: Close the window or use the exit option")
+                safe_print("- For command shells: Type 'exit' or press Ctrl+D")
+                safe_print("- For any tool: Press Ctrl+C to force exit if needed")
+            safe_print("=" * 60)
+            safe_print("Press Ctrl+C in this terminal to interrupt the entire task if needed.")
             try:
                 process.wait()
             except KeyboardInterrupt:
-                print(f"\nInterrupting task '{task['name']}'...")
+                safe_print(f"\nInterrupting task '{task['name']}'...")
                 process.terminate()
                 try:
                     process.wait(timeout=5)
@@ -1795,7 +1878,7 @@ exit $exit_code
             while process.poll() is None and not interrupted:
                 # Check if we've been waiting too long
                 if time.time() - wait_start > max_wait_time:
-                    print(f"Task '{task['name']}' timed out after {max_wait_time} seconds.")
+                    safe_print(f"Task '{task['name']}' timed out after {max_wait_time} seconds.")
                     process.terminate()
                     try:
                         process.wait(timeout=5)
@@ -1862,26 +1945,43 @@ exit $exit_code
             try:
                 stdout_output = process.stdout.read()
                 if stdout_output:
-                    print("=== TASK OUTPUT ===")
-                    print(stdout_output)
-                    print("=== END OUTPUT ===")
+                    safe_print("=== TASK OUTPUT ===")
+                    safe_print(stdout_output)
+                    safe_print("=== END OUTPUT ===")
             except Exception:
                 pass
 
-        print(f"Task '{task['name']}' completed with status: {final_status}")
-        print(f"CASINO_TASK_STATUS: {flow_id}|{task['name']}|{final_status}|{get_current_time()}", flush=True)
-        print(f"Runtime: {runtime_str}")
+        safe_print(f"Task '{task['name']}' completed with status: {final_status}")
+        safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task['name']}|{final_status}|{get_current_time()}", flush=True)
+        safe_print(f"Runtime: {runtime_str}")
 
         return start_time_str, end_time_str, runtime_str, final_status
 
     except Exception as e:
-        print(f"Error executing task '{task['name']}': {e}")
+        safe_print(f"Error executing task '{task['name']}': {e}")
         end_time = time.time()
         end_time_str = get_current_time()
         runtime = end_time - start_time
         runtime_str = format_runtime(runtime)
         return start_time_str, end_time_str, runtime_str, f"Error: {str(e)}"
 
+def admit_task(task):
+    """Wait until the host admission controller admits a task. Returns (admitted, token)."""
+    if admission is None or not task.get('command'):
+        return True, None
+
+    request = parse_task_resources(task)
+
+    def _on_wait(reason):
+        safe_print(f"CASINO_TASK_STATUS: {flow_id}|{task['name']}|QUEUED|{get_current_time()}", flush=True)
+        safe_print(f"Task {task['name']} queued for host resources ({request.describe()}): {reason}", flush=True)
+
+    token = admission.acquire(task['name'], request, should_abort=lambda: interrupted, on_wait=_on_wait)
+    if token is None:
+        return False, None
+    safe_print(f"Task {task['name']} admitted ({request.describe()})")
+    return True, token
+
 def execute_task_single_terminal_with_retries(task, max_retries=3):
     """Execute task in single terminal mode with retries, but stop immediately on interruption"""
     global interrupted
@@ -1890,11 +1990,24 @@ def execute_task_single_terminal_with_retries(task, max_retries=3):
     if interrupted:
         return get_current_time(), get_current_time(), "00:00:00:01", "Interrupted"
 
+    # Reserve host resources once for all attempts (blocks while queued)
+    admitted, token = admit_task(task)
+    if not admitted:
+        safe_print(f"Task '{task['name']}' left the admission queue due to interruption")
+        return get_current_time(), get_current_time(), "00:00:00:01", "Interrupted"
+    try:
+        return _execute_task_single_terminal_with_retries(task, max_retries)
+    finally:
+        stop_task_log_stream(task)
+        if admission:
+            admission.release(token)
+
+def _execute_task_single_terminal_with_retries(task, max_retries):
     retries = 0
     while retries < max_retries:
         # Check for interruption before each retry
         if interrupted:
-            print(f"Task '{task['name']}' execution stopped due to interruption")
+            safe_print(f"Task '{task['name']}' execution stopped due to interruption")
             return get_current_time(), get_current_time(), "00:00:00:01", "Interrupted"
 
         start_time, end_time, runtime, status = execute_task_single_terminal(task)
@@ -1905,14 +2018,14 @@ def execute_task_single_terminal_with_retries(task, max_retries=3):
         # Don't retry interrupted tasks, timeouts, unknown status, or when globally interrupted
         # CRITICAL FIX: Added "Unknown" to prevent retry loops on monitoring issues
         if status in ["Interrupted", "Timeout", "Unknown"] or interrupted:
-            print(f"Task '{task['name']}' was {status.lower()} - not retrying")
+            safe_print(f"Task '{task['name']}' was {status.lower()} - not retrying")
             return start_time, end_time, runtime, status
 
         retries += 1
         if retries < max_retries:
-            print(f"Retrying task '{task['name']}' ({retries}/{max_retries})...")
+            safe_print(f"Retrying task '{task['name']}' ({retries}/{max_retries})...")
 
-    print(f"Task '{task['name']}' failed after {max_retries} retries.")
+    safe_print(f"Task '{task['name']}' failed after {max_retries} retries.")
     return start_time, end_time, runtime, "Failed"
 
 def execute_task_with_retries(task, max_retries=3):
@@ -1923,11 +2036,24 @@ def execute_task_with_retries(task, max_retries=3):
     if interrupted:
         return get_current_time(), get_current_time(), "00:00:00:01", "Interrupted"
 
+    # Reserve host resources once for all attempts (blocks while queued)
+    admitted, token = admit_task(task)
+    if not admitted:
+        safe_print(f"Task '{task['name']}' left the admission queue due to interruption")
+        return get_current_time(), get_current_time(), "00:00:00:01", "Interrupted"
+    try:
+        return _execute_task_with_retries(task, max_retries)
+    finally:
+        stop_task_log_stream(task)
+        if admission:
+            admission.release(token)
+
+def _execute_task_with_retries(task, max_retries):
     retries = 0
     while retries < max_retries:
         # Check for interruption before each retry
         if interrupted:
-            print(f"Task '{task['name']}' execution stopped due to interruption")
+            safe_print(f"Task '{task['name']}' execution stopped due to interruption")
             return get_current_time(), get_current_time(), "00:00:00:01", "Interrupted"
 
         start_time, end_time, runtime, status = execute_task(task)
@@ -1938,14 +2064,14 @@ def execute_task_with_retries(task, max_retries=3):
         # Don't retry interrupted tasks, timeouts, unknown status, or when globally interrupted
         # CRITICAL FIX: Added "Unknown" to prevent retry loops on monitoring issues
         if status in ["Interrupted", "Timeout", "Unknown"] or interrupted:
-            print(f"Task '{task['name']}' was {status.lower()} - not retrying")
+            safe_print(f"Task '{task['name']}' was {status.lower()} - not retrying")
             return start_time, end_time, runtime, status
 
         retries += 1
         if retries < max_retries:
-            print(f"Retrying task '{task['name']}' ({retries}/{max_retries})...")
+            safe_print(f"Retrying task '{task['name']}' ({retries}/{max_retries})...")
 
-    print(f"Task '{task['name']}' failed after {max_retries} retries.")
+    safe_print(f"Task '{task['name']}' failed after {max_retries} retries.")
     return start_time, end_time, runtime, "Failed"
 
 def assign_task_numbers(execution_order):
@@ -1974,34 +2100,34 @@ def execute_tasks_single_terminal(task_graph, execution_order):
 
     # Check for interruption before starting
     if interrupted:
-        print("Execution was interrupted before starting tasks.")
+        safe_print("Execution was interrupted before starting tasks.")
         return runtimes
 
-    print(f"CASINO_FLOW_START: {flow_id}|{flow_name}|{get_current_time()}", flush=True)
-    print("=" * 70)
-    print("CASINO FLOW MANAGER - SINGLE TERMINAL MODE")
-    print("=" * 70)
-    print("All tasks will be executed sequentially in this terminal.")
-    print("Each task will run to completion before the next one starts.")
+    safe_print(f"CASINO_FLOW_START: {flow_id}|{flow_name}|{get_current_time()}", flush=True)
+    safe_print("=" * 70)
+    safe_print("CASINO FLOW MANAGER - SINGLE TERMINAL MODE")
+    safe_print("=" * 70)
+    safe_print("All tasks will be executed sequentially in this terminal.")
+    safe_print("Each task will run to completion before the next one starts.")
     if args.interactive:
-        print("INTERACTIVE MODE: Tasks will run with real-time output and user input.")
-        print("You can interact with each task as it runs, including tool shells and GUIs.")
-        print("Useful for tasks that open editors, system tools, or interactive interfaces.")
+        safe_print("INTERACTIVE MODE: Tasks will run with real-time output and user input.")
+        safe_print("You can interact with each task as it runs, including tool shells and GUIs.")
+        safe_print("Useful for tasks that open editors, system tools, or interactive interfaces.")
     else:
-        print("NON-INTERACTIVE MODE: Task output will be captured and displayed after completion.")
-    print("=" * 70)
+        safe_print("NON-INTERACTIVE MODE: Task output will be captured and displayed after completion.")
+    safe_print("=" * 70)
 
     # For single task execution (-only option)
     if args.only:
         task_name = execution_order[0]
         current_task = next(task for task in expanded_tasks if task['name'] == task_name)
         if task_name in completed_task_names and not args.force:
-            print(f"Skipping task '{task_name}' as it is already completed.")
+            safe_print(f"Skipping task '{task_name}' as it is already completed.")
             return runtimes
 
         # Check for interruption before executing
         if interrupted:
-            print("Execution was interrupted before starting task.")
+            safe_print("Execution was interrupted before starting task.")
             return runtimes
 
         # Execute the single task directly
@@ -2028,31 +2154,31 @@ def execute_tasks_single_terminal(task_graph, execution_order):
 
         # If task was interrupted, mark remaining tasks as not executed
         if status == "Interrupted" or interrupted:
-            print("Task execution was interrupted.")
+            safe_print("Task execution was interrupted.")
 
         _succeeded = sum(1 for r in runtimes if r.get('status') == 'Success')
         _failed = sum(1 for r in runtimes if r.get('status') in ('Failed', 'Timeout'))
-        print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
+        safe_print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
         return runtimes
 
     # Sequential execution for multiple tasks
     for task_name in execution_order:
         # Check for interruption before each task
         if interrupted:
-            print("Execution was interrupted.")
+            safe_print("Execution was interrupted.")
             break
 
         # Skip if already completed and not forcing
         if task_name in completed_task_names and not args.force:
-            print(f"Skipping task '{task_name}' as it is already completed.")
+            safe_print(f"Skipping task '{task_name}' as it is already completed.")
             continue
 
         # Find the task
         current_task = next(task for task in expanded_tasks if task['name'] == task_name)
 
-        print(f"\n{'='*50}")
-        print(f"Starting Task: {task_name}")
-        print(f"{'='*50}")
+        safe_print(f"\n{'='*50}")
+        safe_print(f"Starting Task: {task_name}")
+        safe_print(f"{'='*50}")
 
         # Execute the task
         start_time, end_time, task_runtime, status = execute_task_single_terminal_with_retries(
@@ -2076,22 +2202,22 @@ def execute_tasks_single_terminal(task_graph, execution_order):
         # Write completed tasks file for real-time monitoring
         write_completed_tasks_file()
 
-        print(f"Task '{task_name}' completed with status: {status}")
-        print(f"Runtime: {task_runtime}")
+        safe_print(f"Task '{task_name}' completed with status: {status}")
+        safe_print(f"Runtime: {task_runtime}")
 
         # If task failed and we're not forcing, we might want to stop
         if status not in ["Success", "Interrupted"] and not args.force:
-            print(f"Task '{task_name}' failed. Consider using -force to continue with remaining tasks.")
+            safe_print(f"Task '{task_name}' failed. Consider using -force to continue with remaining tasks.")
             # Continue with next task instead of stopping
 
         # If task was interrupted, stop execution
         if status == "Interrupted" or interrupted:
-            print("Task execution was interrupted. Stopping execution.")
+            safe_print("Task execution was interrupted. Stopping execution.")
             break
 
     _succeeded = sum(1 for r in runtimes if r.get('status') == 'Success')
     _failed = sum(1 for r in runtimes if r.get('status') in ('Failed', 'Timeout'))
-    print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
+    safe_print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
     return runtimes
 
 def execute_tasks_with_constraints(task_graph, execution_order):
@@ -2101,22 +2227,22 @@ def execute_tasks_with_constraints(task_graph, execution_order):
 
     # Check for interruption before starting
     if interrupted:
-        print("Execution was interrupted before starting tasks.")
+        safe_print("Execution was interrupted before starting tasks.")
         return runtimes
 
-    print(f"CASINO_FLOW_START: {flow_id}|{flow_name}|{get_current_time()}", flush=True)
+    safe_print(f"CASINO_FLOW_START: {flow_id}|{flow_name}|{get_current_time()}", flush=True)
 
     # For single task execution (-only option)
     if args.only:
         task_name = execution_order[0]
         current_task = next(task for task in expanded_tasks if task['name'] == task_name)
         if task_name in completed_task_names and not args.force:
-            print(f"Skipping task '{task_name}' as it is already completed.")
+            safe_print(f"Skipping task '{task_name}' as it is already completed.")
             return runtimes
 
         # Check for interruption before executing
         if interrupted:
-            print("Execution was interrupted before starting task.")
+            safe_print("Execution was interrupted before starting task.")
             return runtimes
 
         # Execute the single task directly
@@ -2136,11 +2262,11 @@ def execute_tasks_with_constraints(task_graph, execution_order):
 
         # If task was interrupted, mark remaining tasks as not executed
         if status == "Interrupted" or interrupted:
-            print("Task execution was interrupted.")
+            safe_print("Task execution was interrupted.")
 
         _succeeded = sum(1 for r in runtimes if r.get('status') == 'Success')
         _failed = sum(1 for r in runtimes if r.get('status') in ('Failed', 'Timeout'))
-        print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
+        safe_print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
         return runtimes
 
     # Sequential execution for dependency-based tasks (no parallel execution)
@@ -2152,7 +2278,7 @@ def execute_tasks_with_constraints(task_graph, execution_order):
         for task_name in execution_order:
             # Check for interruption before each task
             if interrupted:
-                print(f"Execution interrupted before starting task '{task_name}'")
+                safe_print(f"Execution interrupted before starting task '{task_name}'")
                 # Mark all remaining tasks as "Not Executed"
                 for remaining_task in execution_order:
                     if remaining_task not in [r['name'] for r in runtimes]:
@@ -2169,7 +2295,7 @@ def execute_tasks_with_constraints(task_graph, execution_order):
             current_task = next(task for task in expanded_tasks if task['name'] == task_name)
 
             if task_name in completed_task_names and not args.force:
-                print(f"Skipping task '{task_name}' as it is already completed.")
+                safe_print(f"Skipping task '{task_name}' as it is already completed.")
                 runtimes.append({
                     "name": task_name,
                     "start_time": "N/A",
@@ -2201,7 +2327,7 @@ def execute_tasks_with_constraints(task_graph, execution_order):
 
             # Check if task failed, was interrupted, or if global interruption occurred
             if status in ["Failed", "Interrupted", "Timeout"] or interrupted:
-                print(f"Execution stopped due to {status.lower() if not interrupted else 'interruption'} in task: {task_name}")
+                safe_print(f"Execution stopped due to {status.lower() if not interrupted else 'interruption'} in task: {task_name}")
 
                 # Add remaining tasks as "Not Executed"
                 for remaining_task in execution_order:
@@ -2217,7 +2343,7 @@ def execute_tasks_with_constraints(task_graph, execution_order):
                 break
 
     except KeyboardInterrupt:
-        print("KeyboardInterrupt caught in execution loop")
+        safe_print("KeyboardInterrupt caught in execution loop")
         interrupted = True
         # Mark any remaining tasks as not executed
         for remaining_task in execution_order:
@@ -2232,13 +2358,13 @@ def execute_tasks_with_constraints(task_graph, execution_order):
                 summary_table.add_row([remaining_task, "N/A", "N/A", "N/A", "Not Executed"])
 
     except Exception as e:
-        print(f"Execution interrupted. Error: {e}")
+        safe_print(f"Execution interrupted. Error: {e}")
 
-    print("\nExecution Summary:")
-    print(summary_table)
+    safe_print("\nExecution Summary:")
+    safe_print(summary_table)
     _succeeded = sum(1 for r in runtimes if r.get('status') == 'Success')
     _failed = sum(1 for r in runtimes if r.get('status') in ('Failed', 'Timeout'))
-    print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
+    safe_print(f"CASINO_FLOW_DONE: {flow_id}|{len(runtimes)}|{_succeeded}|{_failed}|{get_current_time()}", flush=True)
     return runtimes
 
 def build_graph_and_in_degree(tasks):
@@ -2402,7 +2528,7 @@ if args.only:
     collect_subtasks(selected_task)
 
 if not execution_order:
-    print("No tasks to execute.")
+    safe_print("No tasks to execute.")
     exit(0)
 
 execution_table = PrettyTable()
@@ -2426,62 +2552,62 @@ for idx, task in enumerate(execution_order):
     previous_task_info = current_task_info
     execution_table.add_row([current_no, task, dependencies, dependencies_or, priority])
 
-print("\nExecution Order:")
-print(execution_table)
+safe_print("\nExecution Order:")
+safe_print(execution_table)
 
 # Launch task monitor if requested
 if args.monitor:
     monitor_process = launch_task_monitor()
     if monitor_process:
-        print(f"Task monitor is running in {selected_terminal.value}. You can monitor progress in the separate terminal window.")
-        print("The monitor will automatically update every 2 seconds.")
-        print("The monitor will stay open until you manually close it.")
-        print()
+        safe_print(f"Task monitor is running in {selected_terminal.value}. You can monitor progress in the separate terminal window.")
+        safe_print("The monitor will automatically update every 2 seconds.")
+        safe_print("The monitor will stay open until you manually close it.")
+        safe_print()
 
 # Main execution flow with intelligent go/no-go decision based on previous run
 if not args.y:  # Only use intelligent decision if -y flag is not set
     # Decision logic based on previous run status
     if previous_run_successful:
-        print(f"\n{'='*70}")
-        print("INTELLIGENT DECISION: Previous run completed successfully.")
-        print("All tasks in the previous execution finished with Success status.")
-        print("RECOMMENDATION: Skip execution to avoid redundant work.")
-        print(f"{'='*70}")
-        print("\nOptions:")
-        print("  'y' - Force proceed all tasks (like -force option)")
-        print("  'n' - Exit (follow recommendation)")
-        print("  Any other key - Abort")
-        print("\nChoice (y/n/other): ", end="", flush=True)
+        safe_print(f"\n{'='*70}")
+        safe_print("INTELLIGENT DECISION: Previous run completed successfully.")
+        safe_print("All tasks in the previous execution finished with Success status.")
+        safe_print("RECOMMENDATION: Skip execution to avoid redundant work.")
+        safe_print(f"{'='*70}")
+        safe_print("\nOptions:")
+        safe_print("  'y' - Force proceed all tasks (like -force option)")
+        safe_print("  'n' - Exit (follow recommendation)")
+        safe_print("  Any other key - Abort")
+        safe_print("\nChoice (y/n/other): ", end="", flush=True)
     else:
-        print(f"\n{'='*70}")
-        print("INTELLIGENT DECISION: Previous run was incomplete or failed.")
-        print("Some tasks failed, were interrupted, or were not executed.")
-        print("RECOMMENDATION: Proceed to complete missing work.")
-        print(f"{'='*70}")
-        print("\nOptions:")
-        print("  'y' - Proceed all tasks (like -force option)")
-        print("  'n' - Exit")
-        print("  's' - Smart proceed from failed task only")
-        print("  Any other key - Abort")
-        print("\nChoice (y/n/s/other): ", end="", flush=True)
+        safe_print(f"\n{'='*70}")
+        safe_print("INTELLIGENT DECISION: Previous run was incomplete or failed.")
+        safe_print("Some tasks failed, were interrupted, or were not executed.")
+        safe_print("RECOMMENDATION: Proceed to complete missing work.")
+        safe_print(f"{'='*70}")
+        safe_print("\nOptions:")
+        safe_print("  'y' - Proceed all tasks (like -force option)")
+        safe_print("  'n' - Exit")
+        safe_print("  's' - Smart proceed from failed task only")
+        safe_print("  Any other key - Abort")
+        safe_print("\nChoice (y/n/s/other): ", end="", flush=True)
 
     try:
         user_input = input().strip().lower()
-        #print("-" * 70)
+        #safe_print("-" * 70)
 
         if user_input == 'y':
             # Force proceed with all tasks
-            print("Force proceeding with all tasks (ignoring previous completions).")
+            safe_print("Force proceeding with all tasks (ignoring previous completions).")
             args.force = True  # Set force flag dynamically
         elif user_input == 'n':
-            print("Execution skipped.")
+            safe_print("Execution skipped.")
             if monitor_process:
-                print("Task monitor will continue running. You can close it manually when done.")
-                print("Monitor PID:", monitor_process.pid)
+                safe_print("Task monitor will continue running. You can close it manually when done.")
+                safe_print("Monitor PID:", monitor_process.pid)
             exit(0)
         elif user_input == 's' and not previous_run_successful:
             # Smart proceed - load successful tasks from previous run
-            print("Smart proceeding from failed task (loading previous successes).")
+            safe_print("Smart proceeding from failed task (loading previous successes).")
             try:
                 # Load previous successful tasks into current completed_tasks
                 pattern = os.path.join(RUNS_HISTORY_DIR, f'completed_tasks___{filename_suffix}_*.yaml')
@@ -2495,49 +2621,49 @@ if not args.y:  # Only use intelligent decision if -y flag is not set
                             # Only load successfully completed tasks
                             successful_tasks = [t for t in previous_tasks if t.get('status') == 'Success']
                             completed_tasks.extend(successful_tasks)
-                            print(f"Loaded {len(successful_tasks)} successful tasks from previous run.")
+                            safe_print(f"Loaded {len(successful_tasks)} successful tasks from previous run.")
             except Exception as e:
-                print(f"Warning: Could not load previous successful tasks: {e}")
+                safe_print(f"Warning: Could not load previous successful tasks: {e}")
         else:
-            print("Execution aborted by user.")
+            safe_print("Execution aborted by user.")
             if monitor_process:
-                print("Task monitor will continue running. You can close it manually when done.")
-                print("Monitor PID:", monitor_process.pid)
+                safe_print("Task monitor will continue running. You can close it manually when done.")
+                safe_print("Monitor PID:", monitor_process.pid)
             exit(0)
 
     except KeyboardInterrupt:
-        print("\nExecution aborted by user (Ctrl+C).")
+        safe_print("\nExecution aborted by user (Ctrl+C).")
         interrupted = True
         if monitor_process:
-            print("Task monitor will continue running. You can close it manually when done.")
-            print("Monitor PID:", monitor_process.pid)
+            safe_print("Task monitor will continue running. You can close it manually when done.")
+            safe_print("Monitor PID:", monitor_process.pid)
         exit(0)
 else:
-    print("Auto-proceeding with execution (-y flag set)")
-    print("-" * 70)
+    safe_print("Auto-proceeding with execution (-y flag set)")
+    safe_print("-" * 70)
 
 # Check for interruption before starting task execution
 if interrupted:
-    print("Execution was interrupted before starting.")
+    safe_print("Execution was interrupted before starting.")
     if monitor_process:
-        print("Task monitor will continue running. You can close it manually when done.")
-        print("Monitor PID:", monitor_process.pid)
+        safe_print("Task monitor will continue running. You can close it manually when done.")
+        safe_print("Monitor PID:", monitor_process.pid)
     exit(0)
 
-print("Starting task execution...")
+safe_print("Starting task execution...")
 if args.singleTerm:
-    print("Using single terminal mode - tasks will run sequentially in this terminal.")
+    safe_print("Using single terminal mode - tasks will run sequentially in this terminal.")
     runtimes = execute_tasks_single_terminal(task_graph, execution_order)
 else:
-    print("Using multi-terminal mode - each task will run in its own terminal window.")
+    safe_print("Using multi-terminal mode - each task will run in its own terminal window.")
     runtimes = execute_tasks_with_constraints(task_graph, execution_order)
 
 # Check if execution was interrupted
 if interrupted:
-    print("\nExecution was interrupted.")
-    print("Some tasks may not have completed.")
+    safe_print("\nExecution was interrupted.")
+    safe_print("Some tasks may not have completed.")
 else:
-    print("\nTask execution completed normally.")
+    safe_print("\nTask execution completed normally.")
 
 completed_tasks = [task for task in completed_tasks if task['name'] not in [r['name'] for r in runtimes]]
 completed_tasks.extend(runtimes)
@@ -2577,21 +2703,21 @@ if runtimes:
         "status": ""
     })
 
-    print("\nTask Start/End Times and Runtimes:")
-    print(f"{'Task Name':<20} {'Start (YY/MM/DD HH:MM:SS)':<30} {'End (YY/MM/DD HH:MM:SS)':<30} {'Runtime (DD:HH:MM:SS)':<20} {'Status':<10}")
-    print("-" * 120)
+    safe_print("\nTask Start/End Times and Runtimes:")
+    safe_print(f"{'Task Name':<20} {'Start (YY/MM/DD HH:MM:SS)':<30} {'End (YY/MM/DD HH:MM:SS)':<30} {'Runtime (DD:HH:MM:SS)':<20} {'Status':<10}")
+    safe_print("-" * 120)
     for runtime in runtimes:
-        print(f"{runtime['name']:<20} {runtime['start_time']:<30} {runtime['end_time']:<30} {runtime['runtime']:<20} {runtime['status']:<10}")
-    print("-" * 120)
+        safe_print(f"{runtime['name']:<20} {runtime['start_time']:<30} {runtime['end_time']:<30} {runtime['runtime']:<20} {runtime['status']:<10}")
+    safe_print("-" * 120)
     append_to_runtime_history(runtimes, RUNTIME_HISTORY_FILE)
 else:
-    print("No tasks were executed.")
+    safe_print("No tasks were executed.")
 
 # Cleanup monitor process if it was launched
 if monitor_process:
-    print("\nTask execution completed.")
-    print(f"Task monitor will continue running in {selected_terminal.value}. You can close it manually when done.")
-    print("Monitor PID:", monitor_process.pid)
-    print("To close the monitor: Press Ctrl+C in the monitor window or close the terminal window.")
+    safe_print("\nTask execution completed.")
+    safe_print(f"Task monitor will continue running in {selected_terminal.value}. You can close it manually when done.")
+    safe_print("Monitor PID:", monitor_process.pid)
+    safe_print("To close the monitor: Press Ctrl+C in the monitor window or close the terminal window.")
 
 
@@ -0,0 +1,243 @@
+#!/usr/local/bin/python3.12
+"""
+Live tailing of fm_casino task log files.
+
+fm_casino launches each task in its own terminal, so the tool log
+(e.g. `innovus -log logs/place`) is normally only visible there. The
+LogTailer follows every running task's log with seek-based polling: each
+file is only ever read forward from the last offset, so dozens of
+concurrent multi-GB logs cost one stat() per poll plus the new bytes.
+The last N KB per task are kept in a RingBuffer, and new data is handed
+to a publish callback (fm_casino prints it as CASINO_TASK_LOG lines on
+the same stdout channel the GUI already parses for CASINO_TASK_STATUS).
+
+Log file resolution: a task may set `log: <path>` in flow_casino.yaml;
+otherwise the path is derived from the command's `cd <dir>` prefix and
+`-log <file>` argument (Innovus appends .log, or .logN when the file
+already exists, so the newest match is followed).
+"""
+from collections import deque
+from typing import Callable, Dict, Optional
+import glob
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+DEFAULT_RING_KB = 64          # last N KB kept per task
+DEFAULT_POLL_INTERVAL = 0.5   # seconds between stat() sweeps
+MAX_PUBLISH_BYTES = 16384     # per task per sweep; older excess is skipped
+
+_CD_RE = re.compile(r'^\s*cd\s+(\S+)\s*$')
+_LOG_ARG_RE = re.compile(r'(?:^|\s)-log\s+(\S+)')
+
+
+class RingBuffer:
+    """Byte-bounded buffer of recent text chunks (oldest chunks are dropped)."""
+
+    def __init__(self, capacity: int = DEFAULT_RING_KB * 1024):
+        self.capacity = capacity
+        self._chunks = deque()
+        self._size = 0
+
+    def append(self, text: str):
+        if not text:
+            return
+        if len(text) >= self.capacity:
+            text = text[-self.capacity:]
+            self._chunks.clear()
+            self._size = 0
+        self._chunks.append(text)
+        self._size += len(text)
+        while self._size > self.capacity:
+            dropped = self._chunks.popleft()
+            self._size -= len(dropped)
+
+    def clear(self):
+        self._chunks.clear()
+        self._size = 0
+
+    def getvalue(self) -> str:
+        return ''.join(self._chunks)
+
+    def __len__(self):
+        return self._size
+
+
+def _print_warning(message: str):
+    print(message, file=sys.stderr)
+
+
+def guess_task_log(task: dict, base_dir: str) -> Optional[str]:
+    """
+    Return the log path (or Innovus -log stem) for a flow task, or None.
+
+    The explicit `log:` key wins. Otherwise the command is split on ';' / '&&',
+    `cd` segments before the one carrying `-log` set the working directory.
+    """
+    explicit = task.get('log')
+    if explicit:
+        return os.path.normpath(os.path.join(base_dir, os.path.expandvars(explicit)))
+
+    command = task.get('command') or ''
+    cwd = base_dir
+    for segment in re.split(r';|&&', command):
+        cd_match = _CD_RE.match(segment)
+        if cd_match:
+            cwd = os.path.normpath(os.path.join(cwd, os.path.expandvars(cd_match.group(1))))
+            continue
+        log_match = _LOG_ARG_RE.search(segment)
+        if log_match:
+            return os.path.normpath(os.path.join(cwd, os.path.expandvars(log_match.group(1))))
+    return None
+
+
+def _resolve_log_file(stem: str, not_before: float) -> Optional[str]:
+    """Pick the newest file for a log stem that was written after the task started."""
+    if os.path.splitext(stem)[1] == '.log' or os.path.isfile(stem):
+        candidates = [stem]
+    else:
+        candidates = glob.glob(stem + '.log') + glob.glob(stem + '.log[0-9]*')
+    best, best_mtime = None, not_before
+    for path in candidates:
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            continue
+        if mtime >= best_mtime:
+            best, best_mtime = path, mtime
+    return best
+
+
+class _TailState:
+    __slots__ = ('stem', 'path', 'inode', 'offset', 'ring', 'started', 'last_error')
+
+    def __init__(self, stem: str, ring_bytes: int):
+        self.stem = stem
+        self.path = None
+        self.inode = None
+        self.offset = 0
+        self.ring = RingBuffer(ring_bytes)
+        self.started = time.time()
+        self.last_error = None  # Warned once per distinct error, until a poll succeeds
+
+
+class LogTailer:
+    """Background thread following the log files of all running tasks.
+
+    Warnings go to `warn` (fm_casino passes safe_print: its stderr is not read).
+    """
+
+    def __init__(self, publish: Callable[[str, str], None],
+                 ring_kb: int = DEFAULT_RING_KB,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL,
+                 warn: Callable[[str], None] = _print_warning):
+        self._publish = publish
+        self._warn = warn
+        self._ring_bytes = ring_kb * 1024
+        self._poll_interval = poll_interval
+        self._states: Dict[str, _TailState] = {}
+        self._lock = threading.Lock()        # guards _states
+        self._poll_lock = threading.Lock()   # one reader per state at a time
+        self._stop = threading.Event()
+        self._thread = None
+
+    def watch(self, task_name: str, stem: str):
+        """Start following a task's log (the file may not exist yet)."""
+        with self._lock:
+            self._states[task_name] = _TailState(stem, self._ring_bytes)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='casino-logtail', daemon=True)
+            self._thread.start()
+
+    def unwatch(self, task_name: str):
+        """Publish whatever is left in the task's log, then stop following it."""
+        with self._lock:
+            state = self._states.pop(task_name, None)
+        if state is not None:
+            with self._poll_lock:
+                self._poll_one(task_name, state)
+
+    def tail(self, task_name: str) -> str:
+        """Return the buffered last N KB of a watched task's log."""
+        with self._lock:
+            state = self._states.get(task_name)
+        return state.ring.getvalue() if state else ""
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        while not self._stop.wait(self._poll_interval):
+            with self._lock:
+                items = list(self._states.items())
+            with self._poll_lock:
+                for task_name, state in items:
+                    self._poll_one(task_name, state)
+
+    def _poll_one(self, task_name: str, state: _TailState):
+        try:
+            if state.path is None:
+                state.path = _resolve_log_file(state.stem, state.started - 5)
+                if state.path is None:
+                    return
+            try:
+                st = os.stat(state.path)
+            except FileNotFoundError:
+                state.path, state.inode, state.offset = None, None, 0
+                return
+
+            if state.inode is None:
+                # First sight: start at the tail instead of replaying the whole file
+                state.inode = st.st_ino
+                state.offset = max(0, st.st_size - self._ring_bytes)
+            elif st.st_ino != state.inode or st.st_size < state.offset:
+                # Rotated or truncated - follow the new content from the start
+                state.inode = st.st_ino
+                state.offset = 0
+
+            if st.st_size == state.offset:
+                return
+
+            skipped = 0
+            if st.st_size - state.offset > MAX_PUBLISH_BYTES:
+                skipped = st.st_size - MAX_PUBLISH_BYTES - state.offset
+                state.offset = st.st_size - MAX_PUBLISH_BYTES
+
+            with open(state.path, 'rb') as f:
+                f.seek(state.offset)
+                data = f.read(st.st_size - state.offset)
+            state.offset += len(data)
+
+            text = data.decode('utf-8', errors='replace')
+            if skipped:
+                text = f"[... {skipped} bytes skipped ...]\n" + text
+            state.ring.append(text)
+            self._publish(task_name, text)
+            state.last_error = None
+        except Exception as e:
+            # Polled every sweep: report each failure once, not on every poll
+            error = f"{type(e).__name__}: {e}"
+            if error != state.last_error:
+                state.last_error = error
+                self._warn(f"Warning: log tail for {task_name} failed: {error}")
+
+
+def format_log_message(flow_id: str, task_name: str, text: str) -> str:
+    """Encode a log chunk as a single CASINO_TASK_LOG control line."""
+    return f"CASINO_TASK_LOG: {flow_id}|{task_name}|{json.dumps(text)}"
+
+
+def parse_log_message(payload: str):
+    """Inverse of format_log_message (payload excludes the prefix). Returns (flow_id, task, text)."""
+    parts = payload.split("|", 2)
+    if len(parts) < 3:
+        return None
+    try:
+        return parts[0], parts[1], json.loads(parts[2])
+    except ValueError:
+        return None
@@ -10,6 +10,7 @@ A comprehensive issue tracking system with advanced features including:
 - Filter presets
 - Dark mode theme
 - Keyboard shortcuts
+- Optional shared server with live updates (python -m ftrack_casino.server)
 """
 
 __version__ = "2.0.0"
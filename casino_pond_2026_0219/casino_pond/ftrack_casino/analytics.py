@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 from collections import Counter
 
+from .database import RESOLVED_STATUSES
+
 
 class IssueDashboard:
     """Analytics and visualizations"""
@@ -45,49 +47,81 @@ class IssueDashboard:
         """
         Get issue status trend over time
 
-        Returns dict with status names as keys and list of (date, count) tuples
+        Returns dict with status names as keys and list of (date, count) tuples,
+        count being the issues in that status at the end of the day
         """
+        self.db.ensure_status_snapshots()
         cursor = self.db.conn.cursor()
 
-        # Generate date range
-        end_date = datetime.now().date()
-        start_date = end_date - timedelta(days=days)
-
-        # Get daily counts
+        start_date = datetime.now().date() - timedelta(days=days)
         cursor.execute("""
-            SELECT
-                DATE(created_at) as date,
-                status,
-                COUNT(*) as count
-            FROM issues
-            WHERE DATE(created_at) >= ?
-            GROUP BY DATE(created_at), status
-            ORDER BY date
+            SELECT day, status, count
+            FROM status_snapshots
+            WHERE day >= ?
+            ORDER BY day
         """, (start_date.isoformat(),))
 
         # Organize by status
         trends = {}
         for row in cursor.fetchall():
-            status = row['status']
-            if status not in trends:
-                trends[status] = []
-            trends[status].append((row['date'], row['count']))
+            trends.setdefault(row['status'], []).append((row['day'], row['count']))
 
         return trends
 
+    def get_open_trend(self, days: int = 30) -> List[Tuple[str, int]]:
+        """Unresolved issues at the end of each day (burn-down)"""
+        self.db.ensure_status_snapshots()
+        cursor = self.db.conn.cursor()
+
+        start_date = (datetime.now().date() - timedelta(days=days)).isoformat()
+        cursor.execute(f"""
+            SELECT day, SUM(count) as count
+            FROM status_snapshots
+            WHERE day >= ? AND status NOT IN ({', '.join('?' * len(RESOLVED_STATUSES))})
+            GROUP BY day
+            ORDER BY day
+        """, (start_date, *RESOLVED_STATUSES))
+
+        return [(row['day'], row['count']) for row in cursor.fetchall()]
+
+    def get_status_flow(self, days: int = 30) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Get daily movement between statuses
+
+        Returns dict with status names as keys and list of
+        (date, issues entered, issues exited) tuples
+        """
+        self.db.ensure_status_snapshots()
+        cursor = self.db.conn.cursor()
+
+        start_date = (datetime.now().date() - timedelta(days=days)).isoformat()
+        cursor.execute("""
+            SELECT day, status, entered, exited
+            FROM status_snapshots
+            WHERE day >= ?
+            ORDER BY day
+        """, (start_date,))
+
+        flow = {}
+        for row in cursor.fetchall():
+            flow.setdefault(row['status'], []).append((row['day'], row['entered'], row['exited']))
+
+        return flow
+
     def get_resolution_metrics(self) -> Dict[str, any]:
         """Get resolution time metrics"""
+        self.db.ensure_status_snapshots()
         cursor = self.db.conn.cursor()
 
         # Average resolution time by severity
         cursor.execute("""
             SELECT
-                severity,
-                AVG(julianday(updated_at) - julianday(created_at)) as avg_days,
+                issues.severity,
+                AVG(resolution_times.days) as avg_days,
                 COUNT(*) as count
-            FROM issues
-            WHERE status IN ('Resolved', 'Closed')
-            GROUP BY severity
+            FROM resolution_times
+            JOIN issues ON issues.id = resolution_times.issue_id
+            GROUP BY issues.severity
         """)
 
         by_severity = {}
@@ -100,11 +134,10 @@ class IssueDashboard:
         # Overall stats
         cursor.execute("""
             SELECT
-                AVG(julianday(updated_at) - julianday(created_at)) as avg_days,
-                MIN(julianday(updated_at) - julianday(created_at)) as min_days,
-                MAX(julianday(updated_at) - julianday(created_at)) as max_days
-            FROM issues
-            WHERE status IN ('Resolved', 'Closed')
+                AVG(days) as avg_days,
+                MIN(days) as min_days,
+                MAX(days) as max_days
+            FROM resolution_times
         """)
 
         overall = cursor.fetchone()
@@ -118,6 +151,30 @@ class IssueDashboard:
             }
         }
 
+    def get_resolution_distribution(self, bucket_days: Tuple[int, ...] = (1, 3, 7, 14, 30, 90)) -> Dict[str, int]:
+        """
+        Get resolved issue counts by time to resolution
+
+        Returns dict with bucket labels ('<1d', '1-3d', ..., '>=90d') as keys
+        """
+        self.db.ensure_status_snapshots()
+        cursor = self.db.conn.cursor()
+
+        labels = []
+        sums = []
+        lower = 0
+        for upper in map(int, bucket_days):
+            labels.append(f"<{upper}d" if not lower else f"{lower}-{upper}d")
+            sums.append(f"SUM(days >= {lower} AND days < {upper})")
+            lower = upper
+        labels.append(f">={lower}d")
+        sums.append(f"SUM(days >= {lower})")
+
+        cursor.execute(f"SELECT {', '.join(sums)} FROM resolution_times")
+        row = cursor.fetchone()
+
+        return {label: row[i] or 0 for i, label in enumerate(labels)}
+
     def get_overdue_summary(self) -> Dict[str, any]:
         """Get summary of overdue issues"""
         overdue = self.db.get_overdue_issues()
@@ -145,7 +202,7 @@ class IssueDashboard:
                 DATE(created_at) as date,
                 COUNT(*) as count
             FROM issues
-            WHERE DATE(created_at) >= ?
+            WHERE created_at >= ?  -- Range on idx_created_at
             GROUP BY DATE(created_at)
             ORDER BY date
         """, (start_date,))
@@ -188,7 +245,7 @@ class IssueDashboard:
                 CAST(strftime('%w', created_at) AS INTEGER) as dow,
                 COUNT(*) as count
             FROM issues
-            WHERE DATE(created_at) >= ?
+            WHERE created_at >= ?  -- Range on idx_created_at
             GROUP BY dow
         """, (start_date,))
 
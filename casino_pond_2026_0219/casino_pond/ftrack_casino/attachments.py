@@ -3,21 +3,186 @@ Enhanced attachment management for FastTrack
 
 Features:
 - File deduplication using SHA256 hashing
-- Thumbnail generation for images
+- Single-pass hash and copy with large buffers (reflink/hardlink when possible)
+- Concurrent ingestion of several files with progress reporting
+- Background thumbnail generation for images, cached by hash
 - Reference counting
-- Automatic cleanup of orphaned files
+- Automatic cleanup of orphaned files, using sizes tracked in the database
 """
 
 import os
+import errno
 import hashlib
 import shutil
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from PIL import Image
 
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; no reflinks there
+    fcntl = None
+
+BUFFER_SIZE = 8 * 1024 * 1024  # Read size for hashing and copying
+INGEST_WORKERS = 4  # Files hashed/copied concurrently (hashlib releases the GIL)
+THUMBNAIL_WORKERS = 2
+PROGRESS_INTERVAL = 0.1  # Seconds between progress callbacks
+
+FICLONE = 0x40049409  # Linux ioctl: share the source's extents (btrfs, XFS)
+
+# errnos meaning "this filesystem cannot clone/link": fall back to copying
+_UNSUPPORTED = {errno.EXDEV, errno.EINVAL, errno.ENOTTY, errno.EOPNOTSUPP,
+                errno.EPERM, errno.ENOSYS, errno.EBADF}
+
+# progress(bytes_done, bytes_total, files_done, files_total)
+ProgressCallback = Callable[[int, int, int, int], None]
+
+
+def render_thumbnail(image_path: Path, thumbnail_path: Path, size: Tuple[int, int]) -> Optional[Path]:
+    """
+    Write a PNG thumbnail of an image
+
+    Returns:
+        thumbnail_path, or None if the image could not be read
+    """
+    try:
+        # Open and resize image
+        with Image.open(image_path) as img:
+            # Convert to RGB if necessary (for transparency)
+            if img.mode in ('RGBA', 'LA', 'P'):
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                if img.mode == 'P':
+                    img = img.convert('RGBA')
+                background.paste(img, mask=img.split()[-1] if 'A' in img.mode else None)
+                img = background
+
+            # Resize maintaining aspect ratio
+            img.thumbnail(size, Image.Resampling.LANCZOS)
+
+            # Save under a temporary name so readers never see a partial file
+            partial = thumbnail_path.with_name(f".{thumbnail_path.name}.{threading.get_ident()}")
+            img.save(partial, 'PNG', optimize=True)
+            os.replace(partial, thumbnail_path)
+
+        return thumbnail_path
+
+    except Exception as e:
+        print(f"Failed to generate thumbnail: {e}")
+        return None
+
+
+class ThumbnailCache:
+    """Thumbnails generated on background threads, cached by file hash
+
+    Lookups are answered from memory after the first hit, so listing
+    attachments does not stat the thumbnails directory for every image.
+    """
+
+    def __init__(self, thumbnails_dir: Path, size: Tuple[int, int] = (200, 200),
+                 max_workers: int = THUMBNAIL_WORKERS):
+        self.thumbnails_dir = thumbnails_dir
+        self.size = size
+        self.max_workers = max_workers
+        self._paths: Dict[str, Optional[Path]] = {}  # None: generation failed
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def path_for(self, file_hash: str) -> Path:
+        return self.thumbnails_dir / f"{file_hash}_thumb.png"
+
+    def get(self, file_hash: str) -> Optional[Path]:
+        """Thumbnail path if one has been generated, else None (does not generate)"""
+        with self._lock:
+            if file_hash in self._paths:
+                return self._paths[file_hash]
+        thumbnail_path = self.path_for(file_hash)
+        if not thumbnail_path.exists():
+            return None  # Misses are not cached: it may be generated later
+        with self._lock:
+            self._paths[file_hash] = thumbnail_path
+        return thumbnail_path
+
+    def request(self, image_path: Path, file_hash: str,
+                callback: Optional[Callable[[str, Optional[Path]], None]] = None) -> Future:
+        """
+        Generate a thumbnail in the background unless it is cached
+
+        Args:
+            image_path: Path to source image
+            file_hash: File hash
+            callback: Optional callback(file_hash, thumbnail_path or None); runs
+                      on a worker thread, or immediately if already cached
+
+        Returns:
+            Future resolving to the thumbnail path or None
+        """
+        cached = self.get(file_hash)
+        with self._lock:
+            future = self._pending.get(file_hash)
+            if future is None:
+                if cached is not None or file_hash in self._paths:
+                    future = Future()
+                    future.set_result(self._paths.get(file_hash, cached))
+                else:
+                    if self._pool is None:
+                        self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='ftrack-thumbnail')
+                    future = self._pool.submit(self._generate, Path(image_path), file_hash)
+                    self._pending[file_hash] = future
+        if callback:
+            future.add_done_callback(lambda done: callback(file_hash, done.result()))
+        return future
+
+    def _generate(self, image_path: Path, file_hash: str) -> Optional[Path]:
+        thumbnail_path = self.path_for(file_hash)
+        if not thumbnail_path.exists():
+            thumbnail_path = render_thumbnail(image_path, thumbnail_path, self.size)
+        with self._lock:
+            self._paths[file_hash] = thumbnail_path
+            self._pending.pop(file_hash, None)
+        return thumbnail_path
+
+    def discard(self, file_hash: str) -> int:
+        """Delete a thumbnail; returns the bytes freed"""
+        with self._lock:
+            self._paths.pop(file_hash, None)
+        thumbnail_path = self.path_for(file_hash)
+        try:
+            size = thumbnail_path.stat().st_size
+            thumbnail_path.unlink()
+        except FileNotFoundError:
+            return 0
+        except OSError as e:
+            print(f"Failed to delete thumbnail: {e}")
+            return 0
+        print(f"Deleted thumbnail: {thumbnail_path}")
+        return size
+
+    def wait(self):
+        """Block until queued thumbnails are written"""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.result()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
 
 class AttachmentManager:
-    """Centralized attachment handling with deduplication"""
+    """Centralized attachment handling with deduplication
+
+    Every file in the store has a row in attachment_blobs (hash, path, size,
+    kind), so deduplication, cleanup and statistics are database queries
+    rather than scans of the files directory.
+    """
 
     # Supported file types
     IMAGE_EXTS = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff', '.webp'}
@@ -40,6 +205,10 @@ class AttachmentManager:
         self.files_dir.mkdir(parents=True, exist_ok=True)
         self.thumbnails_dir.mkdir(parents=True, exist_ok=True)
 
+        self.thumbnails = ThumbnailCache(self.thumbnails_dir)
+        self._store_dev = self.files_dir.stat().st_dev
+        self._register_existing_blobs()
+
     def add_attachment(self, file_path: str, issue_id: str) -> Dict[str, any]:
         """
         Add attachment with deduplication
@@ -49,32 +218,96 @@ class AttachmentManager:
             issue_id: Issue ID
 
         Returns:
-            Dictionary with attachment info
+            Dictionary with attachment info; 'thumbnail' is None until the
+            background thumbnail for a new image is ready
         """
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        file_name = os.path.basename(file_path)
-        file_size = os.path.getsize(file_path)
-        file_hash = self.calculate_hash(file_path)
+        result = self._add_many([file_path], issue_id)[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-        # Check if file already exists (deduplication)
-        existing_path = self.db.find_duplicate_attachment(file_hash)
+    def add_attachments(self, file_paths: List[str], issue_id: str,
+                        progress: Optional[ProgressCallback] = None) -> List[Dict[str, any]]:
+        """
+        Add several attachments (e.g. a drop) concurrently, with deduplication
 
-        if existing_path and os.path.exists(existing_path):
-            # File already exists, create reference
-            stored_path = existing_path
+        Args:
+            file_paths: Source file paths
+            issue_id: Issue ID
+            progress: Optional callback(bytes_done, bytes_total, files_done,
+                      files_total), called on this thread while files are processed
+
+        Returns:
+            Attachment info dictionaries in file_paths order; a file that could
+            not be added has only 'name' and 'error'
+        """
+        return [{'name': os.path.basename(path), 'error': str(result)}
+                if isinstance(result, Exception) else result
+                for path, result in zip(file_paths, self._add_many(file_paths, issue_id, progress))]
+
+    def _add_many(self, file_paths: List[str], issue_id: str,
+                  progress: Optional[ProgressCallback] = None) -> List:
+        """Ingest files on a worker pool; database work stays on this thread"""
+        results: List = [None] * len(file_paths)
+        sizes: Dict[int, int] = {}
+        for index, file_path in enumerate(file_paths):
+            try:
+                sizes[index] = os.path.getsize(file_path)
+            except OSError as e:
+                results[index] = e
+
+        bytes_total = sum(sizes.values())
+        batch_sizes = Counter(sizes.values())
+        bytes_done = [0]
+        lock = threading.Lock()
+
+        def advance(nbytes: int):
+            with lock:
+                bytes_done[0] += nbytes
+
+        with ThreadPoolExecutor(max_workers=min(INGEST_WORKERS, max(len(sizes), 1)),
+                                thread_name_prefix='ftrack-attach') as pool:
+            futures = {
+                # Files of the same size (stored, or in this batch) are the only possible duplicates
+                pool.submit(self._ingest, file_paths[index], self._stored_with_size(size),
+                            batch_sizes[size] > 1, advance): index
+                for index, size in sizes.items()
+            }
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, timeout=PROGRESS_INTERVAL)
+                for future in finished:
+                    index = futures[future]
+                    try:
+                        file_hash, stored_path, how = future.result()
+                    except OSError as e:
+                        results[index] = e
+                        continue
+                    results[index] = self._record(file_paths[index], sizes[index], issue_id,
+                                                  file_hash, stored_path, how)
+                if progress:
+                    files_done = sum(result is not None for result in results)
+                    progress(bytes_done[0], bytes_total, files_done, len(file_paths))
+
+        return results
+
+    def _record(self, file_path: str, file_size: int, issue_id: str,
+                file_hash: str, stored_path: Path, how: str) -> Dict[str, any]:
+        """Register an ingested file and queue its thumbnail"""
+        file_name = os.path.basename(file_path)
+        if how == 'deduplicated':
             print(f"Deduplicated: {file_name} (existing file found)")
-        else:
-            # Store new file
-            stored_path = self.store_file(file_path, file_hash)
 
-        # Generate thumbnail for images
-        thumbnail_path = None
-        if self.is_image(file_path):
-            thumbnail_path = self.generate_thumbnail(stored_path, file_hash)
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            INSERT OR IGNORE INTO attachment_blobs (file_hash, stored_path, file_size, kind)
+            VALUES (?, ?, ?, ?)
+        """, (file_hash, str(stored_path), file_size, self._kind(file_path)))
 
-        # Add to database
+        # Add to database (commits the blob row too)
         self.db.add_attachment(
             issue_id=issue_id,
             file_path=str(stored_path),
@@ -83,6 +316,12 @@ class AttachmentManager:
             file_hash=file_hash
         )
 
+        thumbnail_path = None
+        if self.is_image(file_path):
+            thumbnail_path = self.thumbnails.get(file_hash)
+            if thumbnail_path is None:
+                self.thumbnails.request(stored_path, file_hash)
+
         return {
             'path': str(stored_path),
             'name': file_name,
@@ -93,12 +332,138 @@ class AttachmentManager:
             'is_text': self.is_text(file_path)
         }
 
-    def calculate_hash(self, file_path: str) -> str:
+    def _stored_with_size(self, file_size: int) -> Dict[str, str]:
+        """hash -> stored path of stored files with exactly this size"""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT file_hash, stored_path FROM attachment_blobs WHERE file_size = ?",
+                       (file_size,))
+        return {row['file_hash']: row['stored_path'] for row in cursor.fetchall()}
+
+    def _ingest(self, source_path: str, candidates: Dict[str, str], hash_first: bool,
+                advance: Callable[[int], None]) -> Tuple[str, Path, str]:
+        """
+        Hash a file and put it in the store unless an identical file is there
+
+        Runs on a worker thread, so it must not touch the database.
+
+        Args:
+            source_path: Source file path
+            candidates: hash -> stored path of stored files with the same size
+            hash_first: Hash before copying even without candidates (another
+                        file of the same size is being added)
+            advance: Called with the number of source bytes read
+
+        Returns:
+            (file_hash, stored_path, how), how being 'deduplicated', 'reflinked',
+            'hardlinked' or 'copied'
+        """
+        ext = Path(source_path).suffix.lower()
+
+        if candidates or hash_first:
+            # A file of this size exists: hash first so duplicates are never copied
+            file_hash = self.calculate_hash(source_path, advance)
+            existing = candidates.get(file_hash)
+            if existing and os.path.exists(existing):
+                return file_hash, Path(existing), 'deduplicated'
+            stored_path, how = self._place(source_path, file_hash, ext)
+            return file_hash, stored_path, how
+
+        if self._can_hardlink(source_path):
+            file_hash = self.calculate_hash(source_path, advance)
+            stored_path, how = self._place(source_path, file_hash, ext)
+            return file_hash, stored_path, how
+
+        # Nothing stored of this size: copy and hash in one pass into a temp file
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.files_dir), prefix='.incoming_')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(source_path, 'rb') as src:
+                if self._reflink(src, dst):
+                    how = 'reflinked'
+                    file_hash = self.calculate_hash(source_path, advance)
+                else:
+                    how = 'copied'
+                    sha256 = hashlib.sha256()
+                    for chunk in iter(lambda: src.read(BUFFER_SIZE), b''):
+                        sha256.update(chunk)
+                        dst.write(chunk)
+                        advance(len(chunk))
+                    file_hash = sha256.hexdigest()
+            shutil.copystat(source_path, tmp_path)
+
+            stored_path = self.files_dir / f"{file_hash}{ext}"
+            if stored_path.exists():
+                os.unlink(tmp_path)  # Stored earlier under another size row or by a parallel drop
+                return file_hash, stored_path, 'deduplicated'
+            os.replace(tmp_path, stored_path)
+            return file_hash, stored_path, how
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _can_hardlink(self, source_path: str) -> bool:
+        """Hardlink only read-only files on the store's filesystem
+
+        A writable source could be edited in place later, which would silently
+        change the stored copy.
+        """
+        st = os.stat(source_path)
+        return st.st_dev == self._store_dev and not st.st_mode & 0o222
+
+    @staticmethod
+    def _reflink(src, dst) -> bool:
+        """Clone src into dst (open files); False if the filesystem cannot"""
+        if fcntl is None:
+            return False
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            if e.errno in _UNSUPPORTED:
+                return False
+            raise
+
+    def _place(self, source_path: str, file_hash: str, ext: str) -> Tuple[Path, str]:
+        """Put an already-hashed file in the store: hardlink, reflink or copy"""
+        stored_path = self.files_dir / f"{file_hash}{ext}"
+        if stored_path.exists():
+            return stored_path, 'deduplicated'
+
+        if self._can_hardlink(source_path):
+            try:
+                os.link(source_path, stored_path)
+                return stored_path, 'hardlinked'
+            except FileExistsError:
+                return stored_path, 'deduplicated'
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED and e.errno != errno.EMLINK:
+                    raise
+
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.files_dir), prefix='.incoming_')
+        try:
+            with os.fdopen(fd, 'wb') as dst, open(source_path, 'rb') as src:
+                how = 'reflinked' if self._reflink(src, dst) else 'copied'
+                if how == 'copied':
+                    shutil.copyfileobj(src, dst, BUFFER_SIZE)
+            shutil.copystat(source_path, tmp_path)
+            os.replace(tmp_path, stored_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return stored_path, how
+
+    def calculate_hash(self, file_path: str, advance: Optional[Callable[[int], None]] = None) -> str:
         """
         Calculate SHA256 hash of file
 
         Args:
             file_path: Path to file
+            advance: Optional callback with the number of bytes read
 
         Returns:
             Hex string of SHA256 hash
@@ -106,9 +471,11 @@ class AttachmentManager:
         sha256 = hashlib.sha256()
 
         with open(file_path, 'rb') as f:
-            # Read in chunks to handle large files
-            for chunk in iter(lambda: f.read(8192), b''):
+            # Large reads: fewer syscalls, and hashlib releases the GIL per chunk
+            for chunk in iter(lambda: f.read(BUFFER_SIZE), b''):
                 sha256.update(chunk)
+                if advance:
+                    advance(len(chunk))
 
         return sha256.hexdigest()
 
@@ -123,17 +490,12 @@ class AttachmentManager:
         Returns:
             Path to stored file
         """
-        ext = Path(source_path).suffix.lower()
-        stored_path = self.files_dir / f"{file_hash}{ext}"
-
-        # Copy file
-        shutil.copy2(source_path, stored_path)
-
+        stored_path, _ = self._place(source_path, file_hash, Path(source_path).suffix.lower())
         return stored_path
 
     def generate_thumbnail(self, image_path: Path, file_hash: str, size: Tuple[int, int] = (200, 200)) -> Optional[Path]:
         """
-        Generate thumbnail for image
+        Generate thumbnail for image (synchronously; see request_thumbnail)
 
         Args:
             image_path: Path to source image
@@ -143,34 +505,15 @@ class AttachmentManager:
         Returns:
             Path to thumbnail or None if failed
         """
-        try:
-            thumbnail_path = self.thumbnails_dir / f"{file_hash}_thumb.png"
-
-            # Skip if thumbnail already exists
-            if thumbnail_path.exists():
-                return thumbnail_path
-
-            # Open and resize image
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary (for transparency)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if 'A' in img.mode else None)
-                    img = background
-
-                # Resize maintaining aspect ratio
-                img.thumbnail(size, Image.Resampling.LANCZOS)
-
-                # Save thumbnail
-                img.save(thumbnail_path, 'PNG', optimize=True)
-
+        thumbnail_path = self.thumbnails.get(file_hash)
+        if thumbnail_path is not None:
             return thumbnail_path
+        return render_thumbnail(image_path, self.thumbnails.path_for(file_hash), size)
 
-        except Exception as e:
-            print(f"Failed to generate thumbnail: {e}")
-            return None
+    def request_thumbnail(self, image_path: Path, file_hash: str,
+                          callback: Optional[Callable[[str, Optional[Path]], None]] = None) -> Future:
+        """Generate a thumbnail in the background; see ThumbnailCache.request"""
+        return self.thumbnails.request(image_path, file_hash, callback)
 
     def is_image(self, file_path: str) -> bool:
         """Check if file is an image"""
@@ -182,6 +525,32 @@ class AttachmentManager:
         ext = Path(file_path).suffix.lower()
         return ext in self.TEXT_EXTS
 
+    def _kind(self, file_path: str) -> str:
+        if self.is_image(file_path):
+            return 'image'
+        if self.is_text(file_path):
+            return 'text'
+        return 'other'
+
+    def _register_existing_blobs(self):
+        """Seed attachment_blobs from attachment rows stored before it existed"""
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT 1 FROM attachment_blobs LIMIT 1")
+        if cursor.fetchone():
+            return
+        cursor.execute("""
+            SELECT file_hash, file_path, MAX(file_size) as file_size FROM attachments
+            WHERE file_hash IS NOT NULL GROUP BY file_hash
+        """)
+        rows = [(row['file_hash'], row['file_path'], row['file_size'] or 0, self._kind(row['file_path']))
+                for row in cursor.fetchall()]
+        if rows:
+            with self.db.conn:
+                cursor.executemany("""
+                    INSERT OR IGNORE INTO attachment_blobs (file_hash, stored_path, file_size, kind)
+                    VALUES (?, ?, ?, ?)
+                """, rows)
+
     def get_attachments(self, issue_id: str) -> List[Dict[str, any]]:
         """
         Get all attachments for an issue with metadata
@@ -202,8 +571,8 @@ class AttachmentManager:
             # Check for thumbnail
             thumbnail_path = None
             if file_hash and self.is_image(file_path):
-                thumb_path = self.thumbnails_dir / f"{file_hash}_thumb.png"
-                if thumb_path.exists():
+                thumb_path = self.thumbnails.get(file_hash)
+                if thumb_path is not None:
                     thumbnail_path = str(thumb_path)
 
             enriched.append({
@@ -251,70 +620,65 @@ class AttachmentManager:
         if ref_count == 0:
             self._delete_file(file_hash)
 
-    def _delete_file(self, file_hash: str):
+    def _delete_file(self, file_hash: str) -> int:
         """
         Delete file and thumbnail from storage
 
         Args:
             file_hash: File hash
+
+        Returns:
+            Bytes freed (the tracked file size plus the thumbnail)
         """
-        # Find and delete file
-        for file_path in self.files_dir.glob(f"{file_hash}.*"):
-            try:
-                file_path.unlink()
-                print(f"Deleted orphaned file: {file_path}")
-            except Exception as e:
-                print(f"Failed to delete {file_path}: {e}")
+        cursor = self.db.conn.cursor()
+        cursor.execute("SELECT stored_path, file_size FROM attachment_blobs WHERE file_hash = ?",
+                       (file_hash,))
+        row = cursor.fetchone()
+        if not row:
+            return 0
+
+        space_freed = 0
+        file_path = Path(row['stored_path'])
+        try:
+            file_path.unlink()
+            space_freed += row['file_size']
+            print(f"Deleted orphaned file: {file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Failed to delete {file_path}: {e}")
+            return 0  # Keep the row so a later cleanup retries
+
+        with self.db.conn:
+            cursor.execute("DELETE FROM attachment_blobs WHERE file_hash = ?", (file_hash,))
 
         # Delete thumbnail
-        thumbnail_path = self.thumbnails_dir / f"{file_hash}_thumb.png"
-        if thumbnail_path.exists():
-            try:
-                thumbnail_path.unlink()
-                print(f"Deleted thumbnail: {thumbnail_path}")
-            except Exception as e:
-                print(f"Failed to delete thumbnail: {e}")
+        return space_freed + self.thumbnails.discard(file_hash)
 
     def cleanup_orphaned_files(self) -> Tuple[int, int]:
         """
         Remove files that are no longer referenced by any issue
 
+        Orphans are found and sized from the database, without scanning the
+        store; files copied into it by hand are not tracked and are left alone.
+
         Returns:
             Tuple of (files_deleted, space_freed_bytes)
         """
-        # Get all file hashes in database
         cursor = self.db.conn.cursor()
-        cursor.execute("SELECT DISTINCT file_hash FROM attachments WHERE file_hash IS NOT NULL")
-        referenced_hashes = {row['file_hash'] for row in cursor.fetchall()}
+        cursor.execute("""
+            SELECT file_hash FROM attachment_blobs b
+            WHERE NOT EXISTS (SELECT 1 FROM attachments a WHERE a.file_hash = b.file_hash)
+        """)
+        orphaned = [row['file_hash'] for row in cursor.fetchall()]
 
         files_deleted = 0
         space_freed = 0
-
-        # Check files directory
-        for file_path in self.files_dir.iterdir():
-            if file_path.is_file():
-                # Extract hash from filename
-                file_hash = file_path.stem
-
-                if file_hash not in referenced_hashes:
-                    # Orphaned file
-                    size = file_path.stat().st_size
-                    space_freed += size
-                    file_path.unlink()
-                    files_deleted += 1
-                    print(f"Deleted orphaned file: {file_path.name}")
-
-        # Check thumbnails directory
-        for thumb_path in self.thumbnails_dir.iterdir():
-            if thumb_path.is_file():
-                # Extract hash from thumbnail filename
-                file_hash = thumb_path.stem.replace('_thumb', '')
-
-                if file_hash not in referenced_hashes:
-                    size = thumb_path.stat().st_size
-                    space_freed += size
-                    thumb_path.unlink()
-                    print(f"Deleted orphaned thumbnail: {thumb_path.name}")
+        for file_hash in orphaned:
+            freed = self._delete_file(file_hash)
+            if freed:
+                files_deleted += 1
+                space_freed += freed
 
         return files_deleted, space_freed
 
@@ -325,26 +689,16 @@ class AttachmentManager:
         Returns:
             Dictionary with storage stats
         """
-        total_files = 0
-        total_size = 0
-        image_count = 0
-        text_count = 0
-        other_count = 0
-
-        for file_path in self.files_dir.iterdir():
-            if file_path.is_file():
-                total_files += 1
-                total_size += file_path.stat().st_size
-
-                if self.is_image(str(file_path)):
-                    image_count += 1
-                elif self.is_text(str(file_path)):
-                    text_count += 1
-                else:
-                    other_count += 1
+        cursor = self.db.conn.cursor()
+        cursor.execute("""
+            SELECT kind, COUNT(*) as files, COALESCE(SUM(file_size), 0) as size
+            FROM attachment_blobs GROUP BY kind
+        """)
+        by_kind = {row['kind']: (row['files'], row['size']) for row in cursor.fetchall()}
+        total_files = sum(files for files, _ in by_kind.values())
+        total_size = sum(size for _, size in by_kind.values())
 
         # Get unique file count (deduplication)
-        cursor = self.db.conn.cursor()
         cursor.execute("SELECT COUNT(DISTINCT file_hash) as unique_files FROM attachments")
         unique_files = cursor.fetchone()['unique_files']
 
@@ -357,9 +711,9 @@ class AttachmentManager:
             'total_files': total_files,
             'total_size_bytes': total_size,
             'total_size_mb': total_size / (1024 * 1024),
-            'image_count': image_count,
-            'text_count': text_count,
-            'other_count': other_count,
+            'image_count': by_kind.get('image', (0, 0))[0],
+            'text_count': by_kind.get('text', (0, 0))[0],
+            'other_count': by_kind.get('other', (0, 0))[0],
             'unique_files': unique_files,
             'total_references': total_references,
             'deduplication_ratio': dedup_ratio
@@ -9,10 +9,78 @@ import sqlite3
 import json
 import yaml
 import os
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 
+# libyaml's C parser when PyYAML was built with it, several times faster
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# Issue files read concurrently by a sync; on NFS the wait is per-file latency, not parsing
+SYNC_WORKERS = 8
+
+# Issues per query when streaming (exports)
+EXPORT_BATCH_SIZE = 500
+
+ISSUE_COLUMNS = ("id", "title", "description", "status", "severity", "stage",
+                 "assignee", "assigner", "created_at", "due_date", "run_id",
+                 "modules", "yaml_path", "updated_at",
+                 "attachment_count", "file_mtime_ns", "file_size")
+
+# (attachment path, size in bytes)
+AttachmentStat = Tuple[str, int]
+
+RESOLVED_STATUSES = ('Resolved', 'Closed')
+
+# Positions in an issue row (see IssueDatabase._issue_row)
+_YAML_PATH = ISSUE_COLUMNS.index('yaml_path')
+_MTIME_NS = ISSUE_COLUMNS.index('file_mtime_ns')
+_SIZE = ISSUE_COLUMNS.index('file_size')
+
+# activity_log entries that move an issue between statuses
+STATUS_ACTIVITY_TYPES = ('created', 'status_change', 'deleted')
+
+# (issue_id, activity_type, user, timestamp, old status, new status); None status: not an issue
+StatusEvent = Tuple[str, str, str, str, Optional[str], Optional[str]]
+
+
+def _timestamp(value) -> Optional[str]:
+    """'YYYY-MM-DD HH:MM:SS' for a stored date/time, None if it is not one"""
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value).strip())
+        except ValueError:
+            return None
+    return value.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _stat_attachments(paths) -> List[AttachmentStat]:
+    """Size of each attachment that exists; missing ones are not indexed."""
+    stats = []
+    for attach_path in paths:
+        try:
+            stats.append((attach_path, os.stat(attach_path).st_size))
+        except (OSError, TypeError, ValueError):
+            continue
+    return stats
+
+
+def _read_issue_file(yaml_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[List[AttachmentStat]]]:
+    """Parse one issue file and stat its attachments (runs on a sync worker thread).
+
+    Returns (None, None) for a file that is not an issue, and attachments None
+    when the issue has no attachments key. Raises on unreadable/invalid YAML.
+    """
+    with open(yaml_path, 'r') as f:
+        data = yaml.load(f, Loader=YamlLoader)
+    if not isinstance(data, dict) or 'id' not in data:
+        return None, None
+    if 'attachments' not in data:
+        return data, None
+    return data, _stat_attachments(data['attachments'] or [])
+
 
 class IssueDatabase:
     """SQLite backend for faster querying and indexing"""
@@ -22,6 +90,9 @@ class IssueDatabase:
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
         self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        self._distinct_values: Dict[str, List[Any]] = {}  # Column -> values, dropped on every write
+        self._distinct_version: Optional[int] = None  # PRAGMA data_version the cache was filled at
+        self.last_sync_changes: Tuple[List[str], List[str]] = ([], [])  # (updated ids, removed YAML paths)
         self.create_schema()
 
     def create_schema(self):
@@ -44,10 +115,22 @@ class IssueDatabase:
                 run_id TEXT,
                 modules TEXT,  -- JSON array
                 yaml_path TEXT NOT NULL,
-                updated_at TIMESTAMP
+                updated_at TIMESTAMP,
+                attachment_count INTEGER DEFAULT 0,
+                file_mtime_ns INTEGER,  -- YAML file stat at last sync
+                file_size INTEGER
             )
         """)
 
+        # Columns added after the first schema; CREATE TABLE IF NOT EXISTS leaves older tables alone
+        cursor.execute("PRAGMA table_info(issues)")
+        columns = {row['name'] for row in cursor.fetchall()}
+        for column, decl in (("attachment_count", "INTEGER DEFAULT 0"),
+                             ("file_mtime_ns", "INTEGER"),
+                             ("file_size", "INTEGER")):
+            if column not in columns:
+                cursor.execute(f"ALTER TABLE issues ADD COLUMN {column} {decl}")
+
         # Attachments table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS attachments (
@@ -63,6 +146,17 @@ class IssueDatabase:
             )
         """)
 
+        # Files in the AttachmentManager store, one per content hash
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS attachment_blobs (
+                file_hash TEXT PRIMARY KEY,
+                stored_path TEXT NOT NULL,
+                file_size INTEGER NOT NULL,
+                kind TEXT NOT NULL,  -- 'image', 'text' or 'other'
+                added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
         # Activity log table for tracking changes and comments
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS activity_log (
@@ -89,11 +183,40 @@ class IssueDatabase:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_due_date ON issues(due_date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_issue_activity ON activity_log(issue_id, timestamp)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_attachment_hash ON attachments(file_hash)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_blob_size ON attachment_blobs(file_size)")
+
+        # Daily status snapshots, maintained from status events in activity_log
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS status_snapshots (
+                day TEXT NOT NULL,  -- YYYY-MM-DD
+                status TEXT NOT NULL,
+                count INTEGER NOT NULL,  -- Issues in this status at the end of the day
+                entered INTEGER NOT NULL DEFAULT 0,  -- Issues that moved into it that day
+                exited INTEGER NOT NULL DEFAULT 0,  -- Issues that moved out of it that day
+                PRIMARY KEY (day, status)
+            ) WITHOUT ROWID
+        """)
+
+        # Time to resolution of each currently resolved/closed issue
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resolution_times (
+                issue_id TEXT PRIMARY KEY,
+                resolved_at TIMESTAMP NOT NULL,
+                days REAL NOT NULL
+            )
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_resolved_at ON resolution_times(resolved_at)")
 
-        # Full-text search virtual table
+        # Full-text search virtual table. External content: FTS5 reads column
+        # values from issues by name, and the triggers below keep it in sync.
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'issues_fts'")
+        row = cursor.fetchone()
+        rebuild_fts = row is None or 'issue_id' in row['sql']
+        if row is not None and rebuild_fts:
+            # The first schema had an issue_id column, which issues does not have
+            cursor.execute("DROP TABLE issues_fts")
         cursor.execute("""
             CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5(
-                issue_id UNINDEXED,
                 title,
                 description,
                 modules,
@@ -101,77 +224,137 @@ class IssueDatabase:
                 content_rowid=rowid
             )
         """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS issues_fts_insert AFTER INSERT ON issues BEGIN
+                INSERT INTO issues_fts (rowid, title, description, modules)
+                VALUES (new.rowid, new.title, new.description, new.modules);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS issues_fts_delete AFTER DELETE ON issues BEGIN
+                INSERT INTO issues_fts (issues_fts, rowid, title, description, modules)
+                VALUES ('delete', old.rowid, old.title, old.description, old.modules);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS issues_fts_update AFTER UPDATE ON issues BEGIN
+                INSERT INTO issues_fts (issues_fts, rowid, title, description, modules)
+                VALUES ('delete', old.rowid, old.title, old.description, old.modules);
+                INSERT INTO issues_fts (rowid, title, description, modules)
+                VALUES (new.rowid, new.title, new.description, new.modules);
+            END
+        """)
+        if rebuild_fts:
+            cursor.execute("INSERT INTO issues_fts (issues_fts) VALUES ('rebuild')")
 
         self.conn.commit()
 
     def sync_from_yaml(self, yaml_dir: str, force: bool = False):
-        """Sync database from YAML files"""
+        """Sync database from YAML files
+
+        Files are stat'ed first and only those whose mtime or size differs from
+        the last sync are parsed, so syncing an unchanged directory costs one
+        listing and no YAML parsing. Changed files are read on SYNC_WORKERS
+        threads and written in a single transaction. Returns the number of
+        issues updated; their ids and the YAML paths of removed issues are left
+        in last_sync_changes.
+        """
         cursor = self.conn.cursor()
 
-        # Get all YAML files
-        yaml_files = []
-        for fn in os.listdir(yaml_dir):
-            if fn.endswith(('.yaml', '.yml')) and not fn.startswith('deleted_'):
-                yaml_files.append(os.path.join(yaml_dir, fn))
-
-        # Track existing issues in DB
-        cursor.execute("SELECT id, yaml_path, updated_at FROM issues")
-        existing_issues = {row['id']: (row['yaml_path'], row['updated_at']) for row in cursor.fetchall()}
-
-        synced_count = 0
-        for yaml_path in yaml_files:
-            try:
-                with open(yaml_path, 'r') as f:
-                    data = yaml.safe_load(f)
-
-                if not data or 'id' not in data:
+        # Stat all YAML files
+        yaml_files = {}
+        with os.scandir(yaml_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(('.yaml', '.yml')) or entry.name.startswith('deleted_'):
                     continue
-
-                issue_id = data['id']
-
-                # Check if we need to update
-                file_mtime = os.path.getmtime(yaml_path)
-                file_mtime_dt = datetime.fromtimestamp(file_mtime)
-
-                if issue_id in existing_issues and not force:
-                    db_path, db_updated = existing_issues[issue_id]
-                    if db_updated and file_mtime_dt <= datetime.fromisoformat(db_updated):
-                        continue  # Skip, DB is up to date
-
-                # Insert or update
-                self.upsert_issue(data, yaml_path, file_mtime_dt)
-                synced_count += 1
-
-            except Exception as e:
-                print(f"Error syncing {yaml_path}: {e}")
-
-        # Remove issues that no longer have YAML files
-        yaml_ids = {os.path.basename(f).replace('.yaml', '').replace('.yml', '').split('_')[0]
-                    for f in yaml_files}
-        for issue_id in existing_issues:
-            if issue_id not in yaml_ids:
-                cursor.execute("DELETE FROM issues WHERE id = ?", (issue_id,))
-
-        self.conn.commit()
-        return synced_count
-
-    def upsert_issue(self, data: Dict[str, Any], yaml_path: str, updated_at: datetime = None):
-        """Insert or update an issue"""
-        cursor = self.conn.cursor()
-
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                yaml_files[entry.path] = (st.st_mtime_ns, st.st_size)
+
+        # Stat of each file as of its last sync
+        cursor.execute("SELECT id, status, yaml_path, file_mtime_ns, file_size FROM issues")
+        synced = cursor.fetchall()
+        synced_stats = {row['yaml_path']: (row['file_mtime_ns'], row['file_size']) for row in synced}
+
+        changed = [(yaml_path, file_stat) for yaml_path, file_stat in yaml_files.items()
+                   if force or synced_stats.get(yaml_path) != file_stat]
+        removed = [(yaml_path,) for yaml_path in synced_stats if yaml_path not in yaml_files]
+
+        # Parse only the changed files, several at a time
+        issues = []
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(SYNC_WORKERS, len(changed))) as pool:
+                futures = [pool.submit(_read_issue_file, yaml_path) for yaml_path, _ in changed]
+                for (yaml_path, file_stat), future in zip(changed, futures):
+                    try:
+                        data, attachments = future.result()
+                    except Exception as e:
+                        print(f"Error syncing {yaml_path}: {e}")
+                        continue
+                    if data is None:
+                        continue
+                    updated_at = datetime.fromtimestamp(file_stat[0] / 1e9)
+                    issues.append((self._issue_row(data, yaml_path, updated_at, file_stat), attachments))
+
+        if not issues and not removed:
+            self.last_sync_changes = ([], [])
+            return 0
+
+        # Apply everything in one transaction. Another GUI may have synced the
+        # same files since they were listed, so what is indexed is read again
+        # under the write lock and files it already has are dropped.
+        with self.conn:
+            self._begin_write()
+            cursor.execute("SELECT yaml_path, file_mtime_ns, file_size FROM issues")
+            synced_stats = {row['yaml_path']: (row['file_mtime_ns'], row['file_size']) for row in cursor.fetchall()}
+            issues = [(row, attachments) for row, attachments in issues
+                      if force or synced_stats.get(row[_YAML_PATH]) != (row[_MTIME_NS], row[_SIZE])]
+            removed = [(yaml_path,) for yaml_path, in removed if yaml_path in synced_stats]
+            self.last_sync_changes = ([row[0] for row, _ in issues], [yaml_path for yaml_path, in removed])
+
+            self._write_issues(cursor, issues)
+            # Remove issues that no longer have YAML files
+            removed_paths = {yaml_path for yaml_path, in removed}
+            now = _timestamp(datetime.now())
+            self._log_status_events(cursor, [(row['id'], 'deleted', '', now, row['status'], None)
+                                             for row in synced if row['yaml_path'] in removed_paths])
+            cursor.executemany("DELETE FROM attachments WHERE issue_id IN "
+                               "(SELECT id FROM issues WHERE yaml_path = ?)", removed)
+            cursor.executemany("DELETE FROM issues WHERE yaml_path = ?", removed)
+            self._distinct_values.clear()
+        return len(issues)
+
+    def _begin_write(self):
+        """Open a write transaction now, taking SQLite's write lock before any read
+
+        Python's sqlite3 only begins a transaction at the first INSERT/UPDATE,
+        so rows read before it (such as an issue's old status) could be stale
+        when another GUI writes the shared issues.db at the same moment.
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+
+    def upsert_issue(self, data: Dict[str, Any], yaml_path: str, updated_at: datetime = None,
+                     file_stat: Optional[Tuple[int, int]] = None):
+        """Insert or update an issue
+
+        file_stat is the (mtime_ns, size) of yaml_path the data was read from,
+        used by sync_from_yaml to skip unchanged files.
+        """
         if updated_at is None:
             updated_at = datetime.now()
-
-        # Convert modules list to JSON
-        modules_json = json.dumps(data.get('modules', []))
-
-        cursor.execute("""
-            INSERT OR REPLACE INTO issues (
-                id, title, description, status, severity, stage,
-                assignee, assigner, created_at, due_date, run_id,
-                modules, yaml_path, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        attachments = _stat_attachments(data['attachments'] or []) if 'attachments' in data else None
+        with self.conn:
+            self._begin_write()
+            self._write_issues(self.conn.cursor(),
+                               [(self._issue_row(data, yaml_path, updated_at, file_stat), attachments)])
+
+    @staticmethod
+    def _issue_row(data: Dict[str, Any], yaml_path: str, updated_at: datetime,
+                   file_stat: Optional[Tuple[int, int]]) -> tuple:
+        """Values for ISSUE_COLUMNS from parsed issue YAML"""
+        return (
             data['id'],
             data.get('title', ''),
             data.get('description', ''),
@@ -183,53 +366,342 @@ class IssueDatabase:
             data.get('created_at', datetime.now().isoformat()),
             data.get('due_date'),
             data.get('run_id', ''),
-            modules_json,
+            json.dumps(data.get('modules', [])),  # Modules list as JSON
             yaml_path,
-            updated_at.isoformat()
-        ))
-
-        # Update FTS index
-        cursor.execute("""
-            INSERT OR REPLACE INTO issues_fts (rowid, issue_id, title, description, modules)
-            SELECT rowid, id, title, description, modules FROM issues WHERE id = ?
-        """, (data['id'],))
+            updated_at.isoformat(),
+            len(data.get('attachments') or []),
+            file_stat[0] if file_stat else None,
+            file_stat[1] if file_stat else None
+        )
+
+    def _write_issues(self, cursor, issues: List[Tuple[tuple, Optional[List[AttachmentStat]]]]):
+        """Upsert (issue row, attachments) pairs; the caller owns the transaction.
+
+        attachments None leaves the issue's attachment records untouched.
+        New issues and status changes are logged as status events.
+        """
+        # Status of the issues before this write
+        issue_ids = [row[0] for row, _ in issues]
+        old_status = {}
+        for start in range(0, len(issue_ids), 500):
+            chunk = issue_ids[start:start + 500]
+            cursor.execute(f"SELECT id, status FROM issues WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            old_status.update((row['id'], row['status']) for row in cursor.fetchall())
+
+        # ON CONFLICT DO UPDATE keeps the rowid (and so the FTS entry) of an existing issue
+        cursor.executemany(f"""
+            INSERT INTO issues ({', '.join(ISSUE_COLUMNS)})
+            VALUES ({', '.join('?' * len(ISSUE_COLUMNS))})
+            ON CONFLICT(id) DO UPDATE SET
+                {', '.join(f'{column} = excluded.{column}' for column in ISSUE_COLUMNS[1:])}
+        """, [row for row, _ in issues])
+        self._distinct_values.clear()
 
         # Sync attachments
-        if 'attachments' in data:
-            cursor.execute("DELETE FROM attachments WHERE issue_id = ?", (data['id'],))
-            for attach_path in data['attachments']:
-                if os.path.exists(attach_path):
-                    self.add_attachment(
-                        data['id'],
-                        attach_path,
-                        os.path.basename(attach_path),
-                        os.path.getsize(attach_path)
-                    )
-
-        self.conn.commit()
+        synced = [(row[0], attachments) for row, attachments in issues if attachments is not None]
+        cursor.executemany("DELETE FROM attachments WHERE issue_id = ?",
+                           [(issue_id,) for issue_id, _ in synced])
+        cursor.executemany("""
+            INSERT INTO attachments (issue_id, file_path, file_name, file_size)
+            VALUES (?, ?, ?, ?)
+        """, [(issue_id, attach_path, os.path.basename(attach_path), size)
+              for issue_id, attachments in synced for attach_path, size in attachments])
+
+        # The user behind a change found in a YAML file is unknown (''). An issue
+        # first seen in another status is taken as opened at created_at and
+        # moved at its last update, as rebuild_status_snapshots() assumes.
+        events = []
+        for row, _ in issues:
+            issue = dict(zip(ISSUE_COLUMNS, row))
+            if issue['id'] not in old_status:
+                updated_at = _timestamp(issue['updated_at'])
+                created_at = _timestamp(issue['created_at']) or updated_at
+                events.append((issue['id'], 'created', issue['assigner'] or '', created_at, None, 'Open'))
+                if issue['status'] != 'Open':
+                    events.append((issue['id'], 'status_change', '', max(updated_at, created_at),
+                                   'Open', issue['status']))
+            elif old_status[issue['id']] != issue['status']:
+                events.append((issue['id'], 'status_change', '', _timestamp(issue['updated_at']),
+                               old_status[issue['id']], issue['status']))
+        self._log_status_events(cursor, events)
+
+    def _log_status_events(self, cursor, events: List[StatusEvent]):
+        """Record status events in activity_log and fold them into the snapshots"""
+        cursor.executemany("""
+            INSERT INTO activity_log (
+                issue_id, activity_type, user, timestamp, field_name, old_value, new_value
+            ) VALUES (?, ?, ?, ?, 'status', ?, ?)
+        """, events)
+        self._apply_status_events(cursor, events)
+
+    def _apply_status_events(self, cursor, events: List[StatusEvent]):
+        """Fold status events into status_snapshots and resolution_times
+
+        A no-op until the snapshots are materialized (ensure_status_snapshots()).
+        An event on day D moves one issue between the counts of days >= D,
+        normally just today's rows. Events before the first snapshot day only
+        shift counts.
+        """
+        cursor.execute("SELECT MIN(day), MAX(day) FROM status_snapshots")
+        first_day, last_day = cursor.fetchone()
+        if last_day is None or not events:
+            return
+        cursor.execute("SELECT status FROM status_snapshots WHERE day = ?", (last_day,))
+        known = {row[0] for row in cursor.fetchall()}
+
+        for issue_id, activity_type, _, timestamp, old, new in events:
+            day = timestamp[:10]
+            if day > last_day:
+                self._extend_snapshots(cursor, last_day, day)
+                last_day = day
+            for status, delta, column in ((old, -1, 'exited'), (new, 1, 'entered')):
+                if status is None:
+                    continue
+                if status not in known:
+                    # First issue ever in this status: zero rows for the materialized days
+                    cursor.execute("""
+                        INSERT OR IGNORE INTO status_snapshots (day, status, count)
+                        SELECT DISTINCT day, ?, 0 FROM status_snapshots
+                    """, (status,))
+                    known.add(status)
+                cursor.execute("UPDATE status_snapshots SET count = count + ? WHERE day >= ? AND status = ?",
+                               (delta, max(day, first_day), status))
+                if day >= first_day:
+                    cursor.execute(f"UPDATE status_snapshots SET {column} = {column} + 1 "
+                                   "WHERE day = ? AND status = ?", (day, status))
+
+            if old is None:
+                continue  # Resolution time is only known from a status change
+            if new in RESOLVED_STATUSES and old not in RESOLVED_STATUSES:
+                cursor.execute("SELECT created_at FROM issues WHERE id = ?", (issue_id,))
+                row = cursor.fetchone()
+                created_at = _timestamp(row[0]) if row else None
+                if created_at:
+                    cursor.execute("""
+                        INSERT OR REPLACE INTO resolution_times (issue_id, resolved_at, days)
+                        VALUES (?, ?, MAX(0, julianday(?) - julianday(?)))
+                    """, (issue_id, timestamp, timestamp, created_at))
+            elif old in RESOLVED_STATUSES and new not in RESOLVED_STATUSES:
+                cursor.execute("DELETE FROM resolution_times WHERE issue_id = ?", (issue_id,))
+
+    @staticmethod
+    def _extend_snapshots(cursor, last_day: str, day: str):
+        """Carry the counts of last_day forward through day"""
+        current = date.fromisoformat(last_day)
+        end = date.fromisoformat(day)
+        while current < end:
+            following = current + timedelta(days=1)
+            cursor.execute("""
+                INSERT OR IGNORE INTO status_snapshots (day, status, count)
+                SELECT ?, status, count FROM status_snapshots WHERE day = ?
+            """, (following.isoformat(), current.isoformat()))
+            current = following
+
+    def ensure_status_snapshots(self):
+        """Materialize the snapshots through today, backfilling them on first use"""
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT MAX(day) FROM status_snapshots")
+        last_day = cursor.fetchone()[0]
+        if last_day is None:
+            self.rebuild_status_snapshots()
+            return
+        today = date.today().isoformat()
+        if last_day < today:
+            with self.conn:
+                self._extend_snapshots(cursor, last_day, today)
+
+    def rebuild_status_snapshots(self):
+        """Backfill status_snapshots and resolution_times from existing records
+
+        Replays the status events in activity_log per issue. Issues indexed
+        before events were logged are assumed created Open at created_at and
+        moved to their current status at their last update (the YAML mtime).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT id, status, created_at, updated_at FROM issues")
+        issues = {row['id']: row for row in cursor.fetchall()}
+        cursor.execute(f"""
+            SELECT issue_id, activity_type, timestamp, old_value, new_value
+            FROM activity_log
+            WHERE activity_type IN ({', '.join('?' * len(STATUS_ACTIVITY_TYPES))})
+            ORDER BY timestamp, id
+        """, STATUS_ACTIVITY_TYPES)
+        history = defaultdict(list)
+        for row in cursor.fetchall():
+            timestamp = _timestamp(row['timestamp'])
+            if timestamp:
+                history[row['issue_id']].append((timestamp, row['activity_type'], row['old_value'], row['new_value']))
+
+        deltas = defaultdict(Counter)  # Day -> status -> net change in count
+        entered = Counter()  # (day, status) -> issues that moved in
+        exited = Counter()
+        resolutions = {}
+        for issue_id in issues.keys() | history.keys():
+            issue = issues.get(issue_id)
+            events = history.get(issue_id, [])
+            if issue is not None and not any(kind == 'created' for _, kind, _, _ in events):
+                created_at = _timestamp(issue['created_at']) or _timestamp(issue['updated_at'])
+                if created_at is None:
+                    continue
+                if events:
+                    events = [(created_at, 'created', None, events[0][2])] + events
+                elif issue['status'] == 'Open':
+                    events = [(created_at, 'created', None, 'Open')]
+                else:
+                    updated_at = max(_timestamp(issue['updated_at']) or created_at, created_at)
+                    events = [(created_at, 'created', None, 'Open'),
+                              (updated_at, 'status_change', 'Open', issue['status'])]
+                events.sort(key=lambda event: event[0])
+
+            status = None
+            created_at = None
+            for timestamp, kind, _, new in events:
+                if kind == 'created':
+                    created_at = created_at or timestamp
+                    # Tracker 'created' entries carry no status; a repeated one changes nothing
+                    new = status or new or 'Open'
+                elif kind == 'deleted':
+                    new = None
+                if new == status:
+                    continue
+                day = timestamp[:10]
+                if status is not None:
+                    deltas[day][status] -= 1
+                    exited[day, status] += 1
+                if new is not None:
+                    deltas[day][new] += 1
+                    entered[day, new] += 1
+                if new in RESOLVED_STATUSES and status is not None and status not in RESOLVED_STATUSES:
+                    days = (datetime.fromisoformat(timestamp) - datetime.fromisoformat(created_at)).total_seconds() / 86400
+                    resolutions[issue_id] = (timestamp, max(0.0, days))
+                elif status in RESOLVED_STATUSES and new not in RESOLVED_STATUSES:
+                    resolutions.pop(issue_id, None)
+                status = new
+
+        # One row per day and status, from the first event through today
+        rows = []
+        if deltas:
+            statuses = {status for changes in deltas.values() for status in changes}
+            running = Counter()
+            day = date.fromisoformat(min(deltas))
+            end = max(date.fromisoformat(max(deltas)), date.today())
+            while day <= end:
+                key = day.isoformat()
+                running.update(deltas.get(key, {}))
+                rows.extend((key, status, running[status], entered[key, status], exited[key, status])
+                            for status in statuses)
+                day += timedelta(days=1)
+
+        with self.conn:
+            cursor.execute("DELETE FROM status_snapshots")
+            cursor.execute("DELETE FROM resolution_times")
+            cursor.executemany("""
+                INSERT INTO status_snapshots (day, status, count, entered, exited)
+                VALUES (?, ?, ?, ?, ?)
+            """, rows)
+            cursor.executemany("INSERT INTO resolution_times (issue_id, resolved_at, days) VALUES (?, ?, ?)",
+                               [(issue_id, timestamp, days) for issue_id, (timestamp, days) in resolutions.items()
+                                if issue_id in issues])
 
     def search_issues(self, query: str) -> List[Dict[str, Any]]:
         """Full-text search across title, description, and modules"""
-        cursor = self.conn.cursor()
-
-        # FTS5 full-text search
-        cursor.execute("""
-            SELECT issues.* FROM issues
-            JOIN issues_fts ON issues.id = issues_fts.issue_id
-            WHERE issues_fts MATCH ?
-            ORDER BY rank
-        """, (query,))
+        return self.select_issues(text_query=query)
+
+    def select_issues(self, conditions: List[str] = (), params: List[Any] = (),
+                      text_query: Optional[str] = None, order_by: Optional[str] = None,
+                      limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """Issues matching all conditions and an FTS5 query, as one statement
+
+        conditions are SQL fragments built by the caller (never user input) with
+        ? placeholders for params. Columns must be qualified as issues.<column>
+        because issues_fts shares some names. Ordered by FTS rank when there is a
+        text query, newest first otherwise.
+        """
+        sql, params = self._issue_query("issues.*", conditions, params, text_query)
+        if order_by is None:
+            order_by = "issues_fts.rank" if text_query else "issues.created_at DESC"
+        sql += f" ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
 
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
         return [dict(row) for row in cursor.fetchall()]
 
+    def iter_issue_batches(self, conditions: List[str] = (), params: List[Any] = (),
+                           text_query: Optional[str] = None,
+                           batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Issues matching as select_issues(), in id order, batch_size at a time
+
+        Keyset-paged on the primary key: every batch is its own short query, so
+        a long export never holds a read lock that would stall a sync.
+        """
+        last_id = None
+        while True:
+            batch_conditions, batch_params = list(conditions), list(params)
+            if last_id is not None:
+                batch_conditions.append("issues.id > ?")
+                batch_params.append(last_id)
+            batch = self.select_issues(batch_conditions, batch_params, text_query,
+                                       order_by="issues.id", limit=batch_size)
+            if batch:
+                yield batch
+            if len(batch) < batch_size:
+                return
+            last_id = batch[-1]['id']
+
+    def count_issues(self, conditions: List[str] = (), params: List[Any] = (),
+                     text_query: Optional[str] = None) -> int:
+        """Number of issues select_issues() would return without paging"""
+        sql, params = self._issue_query("COUNT(*)", conditions, params, text_query)
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def _issue_query(select: str, conditions, params, text_query: Optional[str]):
+        sql = f"SELECT {select} FROM issues"
+        conditions, params = list(conditions), list(params)
+        if text_query:
+            sql += " JOIN issues_fts ON issues_fts.rowid = issues.rowid"
+            conditions.insert(0, "issues_fts MATCH ?")
+            params.insert(0, text_query)
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return sql, params
+
+    def distinct_values(self, column: str) -> List[Any]:
+        """Distinct values of an issues column, cached until the next write
+
+        Cheap for the indexed columns (status, severity, stage, assignee): the
+        index alone is scanned, and only when issues changed. Writes through
+        other connections (other GUIs, sync runs, the server) bump
+        PRAGMA data_version, which drops the cache as well.
+        """
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._distinct_version:
+            self._distinct_values.clear()
+            self._distinct_version = version
+        values = self._distinct_values.get(column)
+        if values is None:
+            cursor = self.conn.cursor()
+            cursor.execute(f"SELECT DISTINCT {column} FROM issues")
+            values = self._distinct_values[column] = [row[0] for row in cursor.fetchall()]
+        return values
+
     def filter_issues(self,
                       status: Optional[str] = None,
                       severity: Optional[str] = None,
                       assignee: Optional[str] = None,
                       stage: Optional[str] = None,
                       created_after: Optional[str] = None,
-                      due_before: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Filter issues by multiple criteria"""
+                      due_before: Optional[str] = None,
+                      order_by: str = "created_at DESC") -> List[Dict[str, Any]]:
+        """Filter issues by multiple criteria
+
+        order_by is an SQL ORDER BY clause supplied by the caller (never user input).
+        """
         cursor = self.conn.cursor()
 
         conditions = []
@@ -264,7 +736,7 @@ class IssueDatabase:
         cursor.execute(f"""
             SELECT * FROM issues
             WHERE {where_clause}
-            ORDER BY created_at DESC
+            ORDER BY {order_by}
         """, params)
 
         return [dict(row) for row in cursor.fetchall()]
@@ -338,15 +810,27 @@ class IssueDatabase:
         """Log an activity event"""
         cursor = self.conn.cursor()
         mentions_json = json.dumps(mentions) if mentions else None
-
-        cursor.execute("""
-            INSERT INTO activity_log (
-                issue_id, activity_type, user, field_name,
-                old_value, new_value, comment_text, mentions
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (issue_id, activity_type, user, field_name,
-              old_value, new_value, comment_text, mentions_json))
-        self.conn.commit()
+        # Local time, as the sync's status events; the column DEFAULT (CURRENT_TIMESTAMP) is UTC
+        now = _timestamp(datetime.now())
+
+        with self.conn:
+            self._begin_write()  # The status check below must see other writers' changes
+            cursor.execute("""
+                INSERT INTO activity_log (
+                    issue_id, activity_type, user, timestamp, field_name,
+                    old_value, new_value, comment_text, mentions
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (issue_id, activity_type, user, now, field_name,
+                  old_value, new_value, comment_text, mentions_json))
+
+            if activity_type == 'status_change' and field_name == 'status':
+                # Keep the indexed status in step, so the next YAML sync does not log the change again
+                cursor.execute("UPDATE issues SET status = ? WHERE id = ? AND status = ?",
+                               (new_value, issue_id, old_value))
+                if cursor.rowcount:
+                    self._distinct_values.clear()
+                    self._apply_status_events(cursor, [(issue_id, activity_type, user, now,
+                                                        old_value, new_value)])
 
     def get_activity(self, issue_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """Get activity log for an issue"""
@@ -367,6 +851,24 @@ class IssueDatabase:
 
         return activities
 
+    def get_activity_range(self, first_id: str, last_id: str) -> List[Dict[str, Any]]:
+        """Activity of issues first_id..last_id (inclusive), by issue then time"""
+        cursor = self.conn.cursor()
+        cursor.execute("""
+            SELECT * FROM activity_log
+            WHERE issue_id BETWEEN ? AND ?
+            ORDER BY issue_id, timestamp
+        """, (first_id, last_id))
+
+        activities = []
+        for row in cursor.fetchall():
+            activity = dict(row)
+            if activity['mentions']:
+                activity['mentions'] = json.loads(activity['mentions'])
+            activities.append(activity)
+
+        return activities
+
     def get_overdue_issues(self) -> List[Dict[str, Any]]:
         """Get all overdue issues"""
         cursor = self.conn.cursor()
@@ -381,3 +883,76 @@ class IssueDatabase:
     def close(self):
         """Close database connection"""
         self.conn.close()
+
+
+if __name__ == "__main__":
+    # Benchmark: python ftrack_casino/database.py [--issues N] [--workers N] [--dir FASTTRACK_DIR]
+    import argparse
+    import random
+    import shutil
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="IssueDatabase.sync_from_yaml cold/warm sync benchmark")
+    parser.add_argument("--issues", type=int, default=10000, help="Synthetic issues to generate")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS, help="Sync reader threads")
+    parser.add_argument("--dir", help="Sync an existing FastTrack directory instead (e.g. on NFS)")
+    args = parser.parse_args()
+    SYNC_WORKERS = args.workers
+
+    work_dir = tempfile.mkdtemp(prefix="ftrack_bench_")
+    try:
+        yaml_dir = args.dir
+        if yaml_dir is None:
+            yaml_dir = os.path.join(work_dir, "FastTrack")
+            os.makedirs(yaml_dir)
+            rng = random.Random(1)
+            dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+            attachment = os.path.join(work_dir, "log.txt")
+            with open(attachment, 'w') as f:
+                f.write("x" * 1000)
+            for n in range(1, args.issues + 1):
+                issue_id = f"{n:04d}_20250101_{n % 1000000:06d}"
+                data = {
+                    'id': issue_id,
+                    'title': f"Timing violation in block {n}",
+                    'description': "Setup violation on the clock path after route.\n" * rng.randint(1, 40),
+                    'severity': rng.choice(["Critical", "Major", "Minor"]),
+                    'stage': rng.choice(["syn", "place", "route", "sta"]),
+                    'modules': rng.sample(["cpu", "gpu", "ddr", "pcie", "usb"], 2),
+                    'assignee': f"user{rng.randint(1, 20)}",
+                    'assigner': f"user{rng.randint(1, 20)}",
+                    'status': rng.choice(["Open", "In Progress", "Resolved", "Closed"]),
+                    'created_at': f"2025-01-{n % 28 + 1:02d} 10:00:00",
+                    'due_date': "2025-03-01",
+                    'run_id': f"/proj/works/run{n}",
+                    'attachments': [attachment] if n % 5 == 0 else [],
+                }
+                with open(os.path.join(yaml_dir, f"{issue_id}.yaml"), 'w') as f:
+                    yaml.dump(data, f, Dumper=dumper)
+
+        db = IssueDatabase(os.path.join(work_dir, "issues.db"))
+        files = sorted(fn for fn in os.listdir(yaml_dir) if fn.endswith(('.yaml', '.yml')))
+        print(f"{len(files)} issue files, loader {YamlLoader.__name__}, {SYNC_WORKERS} workers")
+
+        def timed(label):
+            start = time.perf_counter()
+            count = db.sync_from_yaml(yaml_dir)
+            print(f"{label:<28} {(time.perf_counter() - start) * 1000:9.0f} ms  {count:6d} parsed")
+            return count
+
+        assert timed("cold sync") == len(db.filter_issues())
+        assert timed("warm sync (unchanged)") == 0
+        if args.dir is None:
+            # Touch 1% of the issues
+            for fn in files[::100]:
+                path = os.path.join(yaml_dir, fn)
+                st = os.stat(path)
+                os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+            assert timed("warm sync (1% changed)") == len(files[::100])
+            os.remove(os.path.join(yaml_dir, files[0]))
+            timed("warm sync (1 removed)")
+            assert len(db.filter_issues()) == len(files) - 1
+        db.close()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
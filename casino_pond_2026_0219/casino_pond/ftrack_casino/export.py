@@ -2,13 +2,65 @@
 Multi-format export for FastTrack issues
 
 Supports: Excel, CSV, JIRA CSV, HTML
+
+export_query() streams issues from the database in batches and writes each
+format incrementally (Excel in openpyxl's write-only mode), so memory stays
+flat however many issues are exported. It reports progress, can be
+cancelled, and is safe to run on a worker thread with its own IssueDatabase.
 """
 
+import os
 import csv
 import json
+import html
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Format by file extension for export_query()
+EXTENSION_FORMATS = {'.csv': 'csv', '.xlsx': 'xlsx', '.html': 'html', '.htm': 'html'}
+
+EXCEL_CELL_LIMIT = 32767  # Characters Excel accepts in one cell
+
+SEVERITY_COLORS = {
+    'Critical': 'FFDC3545',
+    'Major': 'FFFD7E14',
+    'Minor': 'FFFFC107',
+    'Enhancement': 'FF28A745',
+    'Info': 'FFE9ECEF'
+}
+
+CSV_COLUMNS = ['ID', 'Title', 'Status', 'Severity', 'Stage', 'Assignee',
+               'Assigner', 'Created', 'Due Date', 'Blocks', 'Run Directory', 'Description']
+EXCEL_COLUMNS = ['ID', 'Title', 'Status', 'Severity', 'Stage', 'Assignee',
+                 'Assigner', 'Created', 'Due Date', 'Blocks', 'Run Directory']
+# Write-only sheets need widths before the first row, so streamed exports use these
+EXCEL_WIDTHS = [22, 50, 12, 12, 10, 14, 14, 20, 12, 25, 50, 80]
+
+# progress(issues_done, issues_total)
+ProgressCallback = Callable[[int, int], None]
+
+
+class ExportCancelled(Exception):
+    """Raised by export_query() when is_cancelled() returned True"""
+
+
+def _modules_list(issue: Dict[str, Any]) -> List[str]:
+    modules = issue.get('modules') or '[]'
+    return json.loads(modules) if isinstance(modules, str) else list(modules)
+
+
+def _format_activity(activity: List[Dict[str, Any]]) -> str:
+    """One line per activity entry, oldest first"""
+    lines = []
+    for entry in activity:
+        line = f"{entry.get('timestamp', '')} {entry.get('user') or '-'} {entry.get('activity_type', '')}"
+        if entry.get('field_name'):
+            line += f" {entry['field_name']}: {entry.get('old_value') or ''} -> {entry.get('new_value') or ''}"
+        if entry.get('comment_text'):
+            line += f": {entry['comment_text']}"
+        lines.append(line)
+    return '\n'.join(lines)
 
 
 class IssueExporter:
@@ -17,24 +69,104 @@ class IssueExporter:
     def __init__(self, database):
         self.db = database
 
+    def export_query(self, filename: str, fmt: Optional[str] = None,
+                     conditions: List[str] = (), params: List[Any] = (),
+                     text_query: Optional[str] = None, include_activity: bool = False,
+                     project_name: str = "", progress: Optional[ProgressCallback] = None,
+                     is_cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Export issues straight from the database, streaming
+
+        The file is written under a temporary name and renamed when complete,
+        so a cancelled or failed export leaves nothing behind.
+
+        Args:
+            filename: Output file
+            fmt: 'csv', 'jira', 'xlsx' or 'html' (default: from the extension)
+            conditions, params, text_query: Issue selection, as IssueDatabase.select_issues
+            include_activity: Add each issue's activity log (CSV, Excel, HTML)
+            project_name: Shown in the HTML title
+            progress: Optional callback(issues_done, issues_total), once per batch
+            is_cancelled: Polled once per batch; True aborts with ExportCancelled
+
+        Returns:
+            Number of issues exported
+
+        Raises:
+            ExportCancelled, OSError, sqlite3.Error
+        """
+        fmt = fmt or EXTENSION_FORMATS.get(Path(filename).suffix.lower(), 'csv')
+        if fmt == 'xlsx' and not self._have_openpyxl():
+            print("openpyxl not installed. Falling back to CSV export.")
+            fmt, filename = 'csv', filename.replace('.xlsx', '.csv')
+
+        total = self.db.count_issues(conditions, params, text_query)
+        done = [0]
+
+        def issues() -> Iterator[Dict[str, Any]]:
+            for batch in self.db.iter_issue_batches(conditions, params, text_query):
+                if is_cancelled and is_cancelled():
+                    raise ExportCancelled()
+                if include_activity:
+                    self._attach_activity(batch)
+                yield from batch
+                done[0] += len(batch)
+                if progress:
+                    progress(done[0], total)
+
+        partial = f"{filename}.part"
+        try:
+            if fmt == 'xlsx':
+                self._write_excel(issues(), partial, include_activity=include_activity)
+            elif fmt == 'html':
+                self._write_html(issues(), partial, total, project_name, include_activity)
+            elif fmt == 'jira':
+                self._write_jira_csv(issues(), partial)
+            else:
+                self._write_csv(issues(), partial, include_activity)
+            os.replace(partial, filename)
+        except BaseException:
+            try:
+                os.unlink(partial)
+            except OSError:
+                pass
+            raise
+        return done[0]
+
+    def _attach_activity(self, batch: List[Dict[str, Any]]):
+        """Set issue['activity'] for a batch (sorted by id) with one range query"""
+        by_issue: Dict[str, List[Dict[str, Any]]] = {issue['id']: [] for issue in batch}
+        for entry in self.db.get_activity_range(batch[0]['id'], batch[-1]['id']):
+            entries = by_issue.get(entry['issue_id'])
+            if entries is not None:
+                entries.append(entry)
+        for issue in batch:
+            issue['activity'] = by_issue[issue['id']]
+
+    @staticmethod
+    def _have_openpyxl() -> bool:
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
     def export_to_csv(self, issues: List[Dict[str, Any]], filename: str):
         """Export issues to CSV"""
         if not issues:
             return
+        self._write_csv(issues, filename)
 
+    def _write_csv(self, issues: Iterable[Dict[str, Any]], filename: str, include_activity: bool = False):
         # Define columns
-        columns = ['ID', 'Title', 'Status', 'Severity', 'Stage', 'Assignee',
-                   'Assigner', 'Created', 'Due Date', 'Blocks', 'Run Directory', 'Description']
+        columns = CSV_COLUMNS + (['Activity'] if include_activity else [])
 
         with open(filename, 'w', newline='', encoding='utf-8') as f:
             writer = csv.DictWriter(f, fieldnames=columns)
             writer.writeheader()
 
             for issue in issues:
-                # Parse modules from JSON
-                modules_str = ', '.join(json.loads(issue.get('modules', '[]')))
-
-                writer.writerow({
+                row = {
                     'ID': issue.get('id', ''),
                     'Title': issue.get('title', ''),
                     'Status': issue.get('status', ''),
@@ -44,84 +176,96 @@ class IssueExporter:
                     'Assigner': issue.get('assigner', ''),
                     'Created': issue.get('created_at', ''),
                     'Due Date': issue.get('due_date', ''),
-                    'Blocks': modules_str,
+                    'Blocks': ', '.join(_modules_list(issue)),
                     'Run Directory': issue.get('run_id', ''),
                     'Description': issue.get('description', '')
-                })
+                }
+                if include_activity:
+                    row['Activity'] = _format_activity(issue.get('activity', []))
+                writer.writerow(row)
 
     def export_to_excel(self, issues: List[Dict[str, Any]], filename: str):
         """Export to Excel with formatting"""
-        try:
-            import openpyxl
-            from openpyxl.styles import PatternFill, Font
-        except ImportError:
+        if not self._have_openpyxl():
             print("openpyxl not installed. Falling back to CSV export.")
             self.export_to_csv(issues, filename.replace('.xlsx', '.csv'))
             return
 
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Issues"
+        # Auto-size columns (the list is in memory anyway)
+        rows = [self._excel_row(issue) for issue in issues]
+        widths = []
+        for index, header in enumerate(EXCEL_COLUMNS):
+            max_length = max([len(header)] + [len(str(row[index])) for row in rows if row[index]])
+            widths.append(min(max_length + 2, 50))
+
+        self._write_excel(issues, filename, widths=widths)
+
+    @staticmethod
+    def _excel_row(issue: Dict[str, Any]) -> List[Any]:
+        return [
+            issue.get('id', ''),
+            issue.get('title', ''),
+            issue.get('status', ''),
+            issue.get('severity', ''),
+            issue.get('stage', ''),
+            issue.get('assignee', ''),
+            issue.get('assigner', ''),
+            issue.get('created_at', ''),
+            issue.get('due_date', ''),
+            ', '.join(_modules_list(issue)),
+            issue.get('run_id', '')
+        ]
+
+    def _write_excel(self, issues: Iterable[Dict[str, Any]], filename: str,
+                     widths: Optional[List[int]] = None, include_activity: bool = False):
+        """Write-only workbook: rows are serialized as appended, not kept in memory"""
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+        from openpyxl.styles import PatternFill, Font
+        from openpyxl.utils import get_column_letter
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Issues")
 
         # Headers
-        headers = ['ID', 'Title', 'Status', 'Severity', 'Stage', 'Assignee',
-                   'Assigner', 'Created', 'Due Date', 'Blocks', 'Run Directory']
-        ws.append(headers)
-
-        # Style header row
-        for cell in ws[1]:
-            cell.fill = PatternFill(start_color='E6E6FA', end_color='E6E6FA', fill_type='solid')
-            cell.font = Font(bold=True)
+        headers = EXCEL_COLUMNS + (['Activity'] if include_activity else [])
+        for index, width in enumerate((widths or EXCEL_WIDTHS)[:len(headers)], start=1):
+            ws.column_dimensions[get_column_letter(index)].width = width
+
+        header_fill = PatternFill(start_color='E6E6FA', end_color='E6E6FA', fill_type='solid')
+        header_font = Font(bold=True)
+        # Color code by severity (one style object per color, shared by all rows)
+        severity_fills = {severity: PatternFill(start_color=color, end_color=color, fill_type='solid')
+                          for severity, color in SEVERITY_COLORS.items()}
+
+        def cell(value, fill=None, font=None):
+            if isinstance(value, str):
+                value = ILLEGAL_CHARACTERS_RE.sub('', value)[:EXCEL_CELL_LIMIT]
+            c = WriteOnlyCell(ws, value=value)
+            if fill is not None:
+                c.fill = fill
+            if font is not None:
+                c.font = font
+            return c
+
+        ws.append([cell(header, header_fill, header_font) for header in headers])
 
         # Data rows
         for issue in issues:
-            modules_str = ', '.join(json.loads(issue.get('modules', '[]')))
-
-            row = [
-                issue.get('id', ''),
-                issue.get('title', ''),
-                issue.get('status', ''),
-                issue.get('severity', ''),
-                issue.get('stage', ''),
-                issue.get('assignee', ''),
-                issue.get('assigner', ''),
-                issue.get('created_at', ''),
-                issue.get('due_date', ''),
-                modules_str,
-                issue.get('run_id', '')
-            ]
-            ws.append(row)
-
-            # Color code by severity
-            severity = issue.get('severity', '')
-            severity_colors = {
-                'Critical': 'FFDC3545',
-                'Major': 'FFFD7E14',
-                'Minor': 'FFFFC107',
-                'Enhancement': 'FF28A745',
-                'Info': 'FFE9ECEF'
-            }
-
-            if severity in severity_colors:
-                fill = PatternFill(start_color=severity_colors[severity],
-                                 end_color=severity_colors[severity],
-                                 fill_type='solid')
-                for cell in ws[ws.max_row]:
-                    cell.fill = fill
-
-        # Auto-size columns
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
+            values = self._excel_row(issue)
+            if include_activity:
+                values.append(_format_activity(issue.get('activity', [])))
+            fill = severity_fills.get(issue.get('severity', ''))
+            ws.append([cell(value, fill) for value in values])
 
         wb.save(filename)
 
     def export_to_jira_csv(self, issues: List[Dict[str, Any]], filename: str):
         """Export in JIRA-compatible CSV format"""
+        self._write_jira_csv(issues, filename)
+
+    def _write_jira_csv(self, issues: Iterable[Dict[str, Any]], filename: str):
         columns = ['Summary', 'Issue Type', 'Priority', 'Status', 'Assignee',
                    'Description', 'Labels', 'Created', 'Due Date']
 
@@ -138,7 +282,7 @@ class IssueExporter:
             writer.writeheader()
 
             for issue in issues:
-                modules_str = ','.join(json.loads(issue.get('modules', '[]')))
+                modules_str = ','.join(_modules_list(issue))
 
                 writer.writerow({
                     'Summary': issue.get('title', ''),
@@ -154,10 +298,19 @@ class IssueExporter:
 
     def export_to_html(self, issues: List[Dict[str, Any]], filename: str, project_name: str = ""):
         """Export to HTML with styling"""
-        html = f"""<!DOCTYPE html>
+        self._write_html(issues, filename, len(issues), project_name)
+
+    def _write_html(self, issues: Iterable[Dict[str, Any]], filename: str, total: int,
+                    project_name: str = "", include_activity: bool = False):
+        """Write the page row by row; total is printed before the rows arrive"""
+        esc = lambda value: html.escape(str(value or ''))
+        activity_header = "\n            <th>Activity</th>" if include_activity else ""
+
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(f"""<!DOCTYPE html>
 <html>
 <head>
-    <title>Issue Export - {project_name}</title>
+    <title>Issue Export - {esc(project_name)}</title>
     <style>
         body {{ font-family: Arial, sans-serif; margin: 20px; }}
         h1 {{ color: #2c3e50; }}
@@ -174,12 +327,13 @@ class IssueExporter:
         .severity-minor {{ background-color: #ffc107; }}
         .severity-enhancement {{ background-color: #28a745; color: white; }}
         .overdue {{ color: red; font-weight: bold; }}
+        .activity {{ white-space: pre-wrap; font-size: 11px; }}
     </style>
 </head>
 <body>
-    <h1>Issue Export - {project_name}</h1>
+    <h1>Issue Export - {esc(project_name)}</h1>
     <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-    <p>Total Issues: {len(issues)}</p>
+    <p>Total Issues: {total}</p>
 
     <table>
         <tr>
@@ -190,42 +344,44 @@ class IssueExporter:
             <th>Stage</th>
             <th>Assignee</th>
             <th>Created</th>
-            <th>Due Date</th>
+            <th>Due Date</th>{activity_header}
         </tr>
-"""
+""")
 
-        for issue in issues:
-            status = issue.get('status', '').lower().replace(' ', '-')
-            severity = issue.get('severity', '').lower()
-            due_date = issue.get('due_date', '')
-
-            # Check if overdue
-            overdue_class = ""
-            if due_date:
-                try:
-                    due_dt = datetime.fromisoformat(due_date.split()[0])
-                    if due_dt < datetime.now() and issue.get('status') not in ['Resolved', 'Closed']:
-                        overdue_class = "overdue"
-                except:
-                    pass
-
-            html += f"""
+            now = datetime.now()
+            for issue in issues:
+                status = (issue.get('status') or '').lower().replace(' ', '-')
+                severity = (issue.get('severity') or '').lower()
+                due_date = issue.get('due_date') or ''
+
+                # Check if overdue
+                overdue_class = ""
+                if due_date:
+                    try:
+                        due_dt = datetime.fromisoformat(due_date.split()[0])
+                        if due_dt < now and issue.get('status') not in ['Resolved', 'Closed']:
+                            overdue_class = "overdue"
+                    except ValueError:
+                        pass
+
+                activity_cell = ""
+                if include_activity:
+                    activity_cell = f"\n            <td class=\"activity\">{esc(_format_activity(issue.get('activity', [])))}</td>"
+
+                f.write(f"""
         <tr>
-            <td>{issue.get('id', '')}</td>
-            <td>{issue.get('title', '')}</td>
-            <td class="status-{status}">{issue.get('status', '')}</td>
-            <td class="severity-{severity}">{issue.get('severity', '')}</td>
-            <td>{issue.get('stage', '')}</td>
-            <td>{issue.get('assignee', '')}</td>
-            <td>{issue.get('created_at', '')}</td>
-            <td class="{overdue_class}">{due_date}</td>
+            <td>{esc(issue.get('id'))}</td>
+            <td>{esc(issue.get('title'))}</td>
+            <td class="status-{esc(status)}">{esc(issue.get('status'))}</td>
+            <td class="severity-{esc(severity)}">{esc(issue.get('severity'))}</td>
+            <td>{esc(issue.get('stage'))}</td>
+            <td>{esc(issue.get('assignee'))}</td>
+            <td>{esc(issue.get('created_at'))}</td>
+            <td class="{overdue_class}">{esc(due_date)}</td>{activity_cell}
         </tr>
-"""
+""")
 
-        html += """
+            f.write("""
     </table>
 </body>
-</html>"""
-
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(html)
+</html>""")
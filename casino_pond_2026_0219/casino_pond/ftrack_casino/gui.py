@@ -10,18 +10,27 @@ import subprocess
 import tempfile
 import logging
 import difflib
+import json
+import sqlite3
 from datetime import datetime
+from functools import lru_cache
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QDialog, QVBoxLayout, QHBoxLayout, QLabel,
     QListWidget, QAbstractItemView, QTextEdit, QComboBox, QPushButton,
     QFileDialog, QCheckBox, QMessageBox, QTableWidget, QTableWidgetItem,
     QHeaderView, QLineEdit, QGroupBox, QDateEdit, QFormLayout, QTimeEdit,
     QScrollArea, QShortcut, QTabWidget, QTextBrowser, QFrame, QSizePolicy,
-    QSplitter
+    QSplitter, QProgressDialog, QTableView, QStyledItemDelegate
 )
 from PyQt5.QtWidgets import QListWidgetItem
 from PyQt5.QtGui import QColor, QFont, QKeySequence
-from PyQt5.QtCore import Qt, QDate, QTime
+from PyQt5.QtCore import Qt, QDate, QTime, QThread, pyqtSignal, QAbstractTableModel, QModelIndex
+
+from .attachments import AttachmentManager
+from .database import IssueDatabase
+from .export import ExportCancelled, IssueExporter
+from .history import DescriptionHistory
+from .storage import IssueSequence, write_yaml_atomic
 
 # Set default application font
 DEFAULT_FONT = QFont("Terminus", 8)  # Updated to size 8
@@ -514,16 +523,436 @@ class RichTextDescriptionEditor(QDialog):
 MarkdownDescriptionEditor = RichTextDescriptionEditor
 
 
+class ExportWorker(QThread):
+    """Streams an issue export off the UI thread.
+
+    SQLite connections are bound to their thread, so the worker opens its own
+    connection to the index file.
+    """
+
+    progress_updated = pyqtSignal(int, int)  # issues done, issues total
+    export_completed = pyqtSignal(int, str)  # issues exported, error ('' on success)
+
+    def __init__(self, db_path, filename, project_name="", include_activity=True, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.filename = filename
+        self.project_name = project_name
+        self.include_activity = include_activity
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        db = None
+        try:
+            db = IssueDatabase(self.db_path)
+            count = IssueExporter(db).export_query(
+                self.filename, include_activity=self.include_activity,
+                project_name=self.project_name, progress=self.progress_updated.emit,
+                is_cancelled=lambda: self.cancelled)
+            self.export_completed.emit(count, '')
+        except ExportCancelled:
+            self.export_completed.emit(0, 'Export cancelled')
+        except Exception as e:
+            self.export_completed.emit(0, str(e))
+        finally:
+            if db is not None:
+                db.close()
+
+
+class AttachWorker(QThread):
+    """Ingests a new issue's attachments off the UI thread.
+
+    Files go through AttachmentManager (hashed, deduplicated, hard-linked or
+    reflinked when possible, thumbnails for images) into the store under
+    attachments/files. Each is then hard-linked into the issue's own
+    attachment directory under its original name, which is the path the
+    YAML keeps, so listing, opening and deleting issues work as before.
+    """
+
+    progress_updated = pyqtSignal(int, int)  # bytes done, bytes total
+    attach_completed = pyqtSignal(list, list)  # issue-directory paths, error messages
+
+    def __init__(self, db_path, storage_dir, issue_id, file_paths, parent=None):
+        super().__init__(parent)
+        self.db_path = db_path
+        self.storage_dir = storage_dir
+        self.issue_id = issue_id
+        self.file_paths = file_paths
+
+    def run(self):
+        db = manager = None
+        paths, errors = [], []
+        try:
+            db = IssueDatabase(self.db_path)
+            manager = AttachmentManager(db, self.storage_dir)
+            issue_dir = os.path.join(self.storage_dir, self.issue_id)
+            os.makedirs(issue_dir, exist_ok=True)
+            results = manager.add_attachments(
+                self.file_paths, self.issue_id,
+                progress=lambda done, total, *_: self.progress_updated.emit(done, total))
+            for result in results:
+                if 'error' in result:
+                    errors.append(f"{result['name']}: {result['error']}")
+                    continue
+                try:
+                    paths.append(self._link_into(issue_dir, result['path'], result['name']))
+                except OSError as e:
+                    errors.append(f"{result['name']}: {e}")
+            manager.thumbnails.wait()
+        except Exception as e:
+            errors.append(str(e))
+        finally:
+            if manager is not None:
+                manager.thumbnails.shutdown()
+            if db is not None:
+                db.close()
+        self.attach_completed.emit(paths, errors)
+
+    @staticmethod
+    def _link_into(issue_dir, stored_path, filename):
+        """Give a stored file its original name in the issue directory; returns the new path"""
+        dst_path = os.path.join(issue_dir, filename)
+        if os.path.exists(dst_path):
+            # Add timestamp to filename to make it unique
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base, ext = os.path.splitext(filename)
+            dst_path = os.path.join(issue_dir, f"{base}_{timestamp}{ext}")
+        try:
+            os.link(stored_path, dst_path)
+        except OSError:
+            shutil.copy2(stored_path, dst_path)  # e.g. the link count limit
+        return dst_path
+
+
+@lru_cache(maxsize=4096)
+def _parse_due_date(due_date_str):
+    """Due date ('YYYY-MM-DD' or 'YYYY-MM-DD HH:MM') as a datetime, None if unset or malformed"""
+    if not due_date_str:
+        return None
+    try:
+        if len(due_date_str) > 10:  # Contains time
+            return datetime.strptime(due_date_str, "%Y-%m-%d %H:%M")
+        return datetime.strptime(due_date_str, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+class IssueTableModel(QAbstractTableModel):
+    """Rows of the Issue Status Viewer, over an issue index query
+
+    Issues are held as plain arrays and the view only asks for the cells it
+    paints, so thousands of issues cost one query and no widgets per row.
+    Sorting and filtering reorder `order` (indexes into `issues`) and never
+    rebuild anything. Rows being modified keep their new values in `edits`
+    until they are saved.
+    """
+
+    COLUMNS = ["ID", "Title", "Assigner", "Assignee", "Status", "Created", "Due Date",
+               "Severity", "Stage", "Blocks", "Run Dir"]
+    FIELDS = ['id', 'title', 'assigner', 'assignee', 'status', 'created_at', 'due_date',
+              'severity', 'stage', 'modules', 'run_id']
+    TITLE, ASSIGNEE, STATUS, DUE_DATE, SEVERITY, STAGE, BLOCKS = 1, 3, 4, 6, 7, 8, 9
+    EDITABLE = (ASSIGNEE, STATUS, DUE_DATE, SEVERITY, STAGE, BLOCKS)
+
+    def __init__(self, status_colors, severity_colors, parent=None):
+        super().__init__(parent)
+        self.status_colors = status_colors
+        self.severity_colors = severity_colors
+        self.issues = []  # Issue data as FastTrackGUI._query_issues() returns it
+        self.texts = []  # Per issue, the displayed text of every column
+        self.overdue = []  # Per issue, whether the due date has passed
+        self.order = []  # Issue indexes of the visible rows, in display order
+        self.index_of_path = {}  # YAML path -> issue index
+        self.edits = {}  # Issue index -> {field: new value} while rows are modified
+        self._rows = None  # Issue index -> row, rebuilt on demand after reordering
+        self._sort_column = -1  # -1: query order
+        self._sort_order = Qt.AscendingOrder
+        self._patterns = {}  # Column -> compiled filter regex
+        self._desc_pattern = None
+        self._overdue_font = QFont()
+        self._overdue_font.setBold(True)
+
+    # Qt model interface
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        i = self.order[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            return self.texts[i][column]
+        if role == Qt.EditRole:
+            field = self.FIELDS[column]
+            return self.edits.get(i, {}).get(field, self.issues[i].get(field))
+        if role == Qt.BackgroundRole:
+            if column == self.SEVERITY:
+                return self.severity_colors.get(self.issues[i].get('severity'))
+            return self.status_colors.get(self.issues[i].get('status'))
+        if role == Qt.ToolTipRole and column == self.TITLE:
+            return self.issues[i].get('description', '')
+        if column == self.DUE_DATE and self.overdue[i]:
+            if role == Qt.ForegroundRole:
+                return QColor("#FF0000")
+            if role == Qt.FontRole:
+                return self._overdue_font
+        if role == Qt.TextAlignmentRole and column == self.BLOCKS:
+            return int(Qt.AlignLeft | Qt.AlignTop)
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and index.column() in self.EDITABLE and self.order[index.row()] in self.edits:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        i = self.order[index.row()] if index.isValid() else None
+        if role != Qt.EditRole or i not in self.edits:
+            return False
+        self.edits[i][self.FIELDS[index.column()]] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column, self._sort_order = column, order
+        self._reorder()
+
+    # Loading and updating
+
+    def load(self, issues):
+        """Show these issues (any pending edits are dropped)"""
+        self.beginResetModel()
+        now = datetime.now()
+        self.issues = list(issues)
+        cells = [self._cells(issue, now) for issue in self.issues]
+        self.texts = [texts for texts, _ in cells]
+        self.overdue = [overdue for _, overdue in cells]
+        self.index_of_path = {issue['yaml_path']: i for i, issue in enumerate(self.issues)}
+        self.edits.clear()
+        self.order = self._arranged()
+        self._rows = None
+        self.endResetModel()
+
+    def update_issues(self, issues):
+        """Replace listed issues by newer data, re-sorting and re-filtering"""
+        now = datetime.now()
+        changed = []
+        for issue in issues:
+            i = self.index_of_path[issue['yaml_path']]
+            self.issues[i] = issue
+            self.texts[i], self.overdue[i] = self._cells(issue, now)
+            changed.append(i)
+        self._reorder()  # A change may move or hide rows
+        rows = self._row_map()
+        for i in changed:
+            if i in rows:
+                self.dataChanged.emit(self.index(rows[i], 0), self.index(rows[i], len(self.COLUMNS) - 1))
+
+    def set_filters(self, patterns, desc_pattern=None):
+        """Show only issues whose column texts match every pattern in
+        {column: regex} and whose description matches desc_pattern"""
+        self._patterns, self._desc_pattern = patterns, desc_pattern
+        self._reorder()
+
+    def issue(self, row):
+        return self.issues[self.order[row]]
+
+    # Modify mode
+
+    def begin_edit(self, rows):
+        for row in rows:
+            self.edits.setdefault(self.order[row], {})
+
+    def editing_rows(self):
+        rows = self._row_map()
+        return sorted(rows[i] for i in self.edits if i in rows)
+
+    def pending_edits(self):
+        """{yaml_path: {field: new value}} of the rows being modified"""
+        return {self.issues[i]['yaml_path']: dict(fields) for i, fields in self.edits.items()}
+
+    def end_edit(self):
+        self.edits.clear()
+        if self._patterns or self._desc_pattern is not None:
+            self._reorder()  # Rows kept visible for editing may be filtered out now
+
+    # Helpers
+
+    def _cells(self, issue, now):
+        """(column texts, overdue) of one issue"""
+        texts = [issue.get(field) or '' for field in self.FIELDS]
+        if issue.get('attachment_count'):
+            texts[self.TITLE] = f"{texts[self.TITLE]} ({issue['attachment_count']})"
+        texts[self.BLOCKS] = '\n'.join(issue.get('modules') or [])
+
+        overdue = False
+        due_date = _parse_due_date(texts[self.DUE_DATE])
+        if due_date is not None:
+            texts[self.DUE_DATE] = due_date.strftime("%Y-%m-%d %H:%M")
+            overdue = due_date < now
+        return tuple(str(text) for text in texts), overdue
+
+    @staticmethod
+    def _sort_key(text):
+        try:
+            return (0, float(text))  # Numbers sort before text
+        except ValueError:
+            return (1, text.lower())  # Text sorting (case-insensitive)
+
+    def _arranged(self):
+        """Issue indexes passing the filters, in the current sort order
+
+        Rows being modified always pass: hiding one would make the view drop
+        its open editors along with the values not yet saved.
+        """
+        patterns, desc_pattern, edits = self._patterns, self._desc_pattern, self.edits
+        order = [i for i, texts in enumerate(self.texts)
+                 if i in edits
+                 or all(pattern.search(texts[c]) for c, pattern in patterns.items())
+                 and (desc_pattern is None or desc_pattern.search(self.issues[i].get('description') or ''))]
+        if self._sort_column >= 0:
+            column = self._sort_column
+            order.sort(key=lambda i: self._sort_key(self.texts[i][column]),
+                       reverse=self._sort_order == Qt.DescendingOrder)
+        return order
+
+    def _reorder(self):
+        """Apply the current filters and sort, keeping selection and open editors on their issues"""
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        targets = [(self.order[index.row()], index.column()) for index in persistent]
+        self.order = self._arranged()
+        self._rows = None
+        rows = self._row_map()
+        self.changePersistentIndexList(
+            persistent, [self.index(rows[i], column) if i in rows else QModelIndex() for i, column in targets])
+        self.layoutChanged.emit()
+
+    def _row_map(self):
+        if self._rows is None:
+            self._rows = {i: row for row, i in enumerate(self.order)}
+        return self._rows
+
+
+class IssueEditDelegate(QStyledItemDelegate):
+    """Editors for the columns of issues being modified in the Issue Status Viewer"""
+
+    SEVERITIES = ["Critical", "Major", "Minor", "Enhancement", "Info"]
+    STAGES = ["casino", "design", "dk", "syn", "dft", "lec", "sta", "ldrc", "vclp", "sim",
+              "floorplan", "place", "cts", "route", "pex", "pv", "psi", "bump", "signoff"]
+
+    def __init__(self, status_options, assignees, blocks, parent=None):
+        super().__init__(parent)
+        self.choices = {
+            IssueTableModel.ASSIGNEE: assignees,
+            IssueTableModel.STATUS: status_options,
+            IssueTableModel.SEVERITY: self.SEVERITIES,
+            IssueTableModel.STAGE: self.STAGES,
+        }
+        self.blocks = blocks
+
+    def createEditor(self, parent, option, index):
+        column = index.column()
+        if column in self.choices:
+            editor = QComboBox(parent)
+            editor.addItems(self.choices[column])
+            editor.setEditable(column == IssueTableModel.STAGE)
+            return editor
+        if column == IssueTableModel.DUE_DATE:
+            editor = QWidget(parent)
+            editor.setAutoFillBackground(True)
+            layout = QVBoxLayout(editor)
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.setSpacing(2)  # Reduce spacing between date and time
+            editor.date_edit = QDateEdit()
+            editor.date_edit.setCalendarPopup(True)
+            editor.date_edit.setDisplayFormat("yyyy-MM-dd")
+            editor.time_edit = QTimeEdit()
+            editor.time_edit.setDisplayFormat("HH:mm")
+            layout.addWidget(editor.date_edit)
+            layout.addWidget(editor.time_edit)
+            return editor
+        if column == IssueTableModel.BLOCKS:
+            editor = QListWidget(parent)
+            editor.setSelectionMode(QAbstractItemView.MultiSelection)
+            editor.addItems(self.blocks)
+            return editor
+        return super().createEditor(parent, option, index)
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole)
+        column = index.column()
+        if column in self.choices:
+            editor.setCurrentText(value or '')
+        elif column == IssueTableModel.DUE_DATE:
+            date, time = QDate.currentDate(), QTime.currentTime()
+            if value:
+                if len(value) > 10:  # Contains time
+                    date_str, _, time_str = value.partition(" ")
+                    date, time = QDate.fromString(date_str, "yyyy-MM-dd"), QTime.fromString(time_str, "HH:mm")
+                else:
+                    date, time = QDate.fromString(value, "yyyy-MM-dd"), QTime(0, 0)
+                if not date.isValid() or not time.isValid():
+                    date, time = QDate.currentDate(), QTime.currentTime()
+            editor.date_edit.setDate(date)
+            editor.time_edit.setTime(time)
+        elif column == IssueTableModel.BLOCKS:
+            current = set(value or [])
+            for row in range(editor.count()):
+                item = editor.item(row)
+                item.setSelected(item.text() in current)
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        column = index.column()
+        if column in self.choices:
+            model.setData(index, editor.currentText())
+        elif column == IssueTableModel.DUE_DATE:
+            model.setData(index, f"{editor.date_edit.date().toString('yyyy-MM-dd')} "
+                                 f"{editor.time_edit.time().toString('HH:mm')}")
+        elif column == IssueTableModel.BLOCKS:
+            blocks = [editor.item(row).text() for row in range(editor.count()) if editor.item(row).isSelected()]
+            if blocks:  # Only update if blocks were selected
+                model.setData(index, blocks)
+        else:
+            super().setModelData(editor, model, index)
+
+
 class DescriptionHistoryDialog(QDialog):
     """Enhanced history dialog with visual diffs, timeline view, and version restoration"""
 
-    def __init__(self, issue_data, yaml_path, parent=None):
+    def __init__(self, issue_data, yaml_path, parent=None, save_issue=write_yaml_atomic):
         super().__init__(parent)
         self.issue_data = issue_data
         self.yaml_path = yaml_path
+        self.save_issue = save_issue  # save_issue(yaml_path, issue_data), e.g. through the server
         self.current_description = issue_data.get('description', '')
         self.current_description_html = issue_data.get('description_html', '')
-        self.history = issue_data.get('description_history', [])
+
+        # Versions are read from the side store only now, and rebuilt lazily
+        self.history_store = DescriptionHistory.for_issue(yaml_path, issue_data.get('id', ''))
+        try:
+            if self.history_store.import_inline(issue_data):
+                self.save_issue(yaml_path, issue_data)  # Drop the legacy inline copies
+        except Exception as e:
+            logging.error(f"Failed to migrate description history of {issue_data.get('id', '')}: {e}")
+        self.history = self.history_store.entries()
+        self._diff_cache = {}  # (version_number, 'current') -> diff HTML
 
         self.setWindowTitle(f"Description History - {issue_data.get('id', '')}")
         self.setMinimumSize(950, 700)
@@ -738,8 +1167,6 @@ class DescriptionHistoryDialog(QDialog):
                 'is_current': False,
                 'version_number': version_number,
                 'entry': entry,
-                'description': entry.get('old_description', ''),
-                'description_html': entry.get('old_description_html', ''),
                 'timestamp': timestamp,
                 'user': user,
                 'restored_from': restored_from
@@ -801,20 +1228,30 @@ class DescriptionHistoryDialog(QDialog):
         # Store current selection data for actions
         self.selected_version_data = data
 
+    def version_text(self, data):
+        """(description, description_html) of a version list item"""
+        if data['is_current']:
+            return self.current_description, self.current_description_html
+        return self.history_store.text(data['version_number'])
+
     def show_version_diff(self, data):
         """Show diff for selected version"""
-        old_desc = data['description']
-        diff_html = self.generate_diff_html(old_desc, self.current_description, data['timestamp'])
+        key = (data['version_number'], 'current')
+        diff_html = self._diff_cache.get(key)
+        if diff_html is None:
+            old_desc = self.version_text(data)[0]
+            diff_html = self.generate_diff_html(old_desc, self.current_description, data['timestamp'])
+            self._diff_cache[key] = diff_html
         self.content_display.setHtml(diff_html)
 
     def show_version_full_text(self, data):
         """Show full text for selected version"""
         # Display HTML if available, otherwise plain text
-        html = data.get('description_html', '')
+        description, html = self.version_text(data)
         if html:
             self.content_display.setHtml(html)
         else:
-            self.content_display.setPlainText(data['description'])
+            self.content_display.setPlainText(description)
 
     def on_toggle_diff(self):
         """Toggle between diff view and full text view"""
@@ -929,7 +1366,7 @@ class DescriptionHistoryDialog(QDialog):
 
     def restore_version(self, entry, version_number):
         """Restore a previous version with user confirmation"""
-        old_description = entry.get('old_description', '')
+        old_description, old_description_html = self.history_store.text(version_number)
 
         # Confirmation dialog
         reply = QMessageBox.question(
@@ -944,22 +1381,18 @@ class DescriptionHistoryDialog(QDialog):
         )
 
         if reply == QMessageBox.Yes:
-            # Create new history entry for restoration
-            history_entry = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'user': getpass.getuser(),
-                'old_description': self.current_description,
-                'restored_from': f"Version #{version_number} ({entry.get('timestamp')})"
-            }
-
             # Update issue data
             self.issue_data['description'] = old_description
-            self.issue_data['description_history'].append(history_entry)
+            self.issue_data['description_html'] = old_description_html
 
-            # Save to YAML file
+            # Save the issue, then record the superseded description as a new version
             try:
-                with open(self.yaml_path, 'w') as f:
-                    yaml.safe_dump(self.issue_data, f)
+                self.save_issue(self.yaml_path, self.issue_data)
+                self.history_store.append(
+                    self.current_description, self.current_description_html,
+                    user=getpass.getuser(),
+                    timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                    restored_from=f"Version #{version_number} ({entry.get('timestamp')})")
 
                 QMessageBox.information(
                     self,
@@ -969,7 +1402,13 @@ class DescriptionHistoryDialog(QDialog):
 
                 # Refresh the dialog to show new state
                 self.current_description = old_description
-                self.history = self.issue_data['description_history']
+                self.current_description_html = old_description_html
+                if old_description_html:
+                    self.current_display.setHtml(old_description_html)
+                else:
+                    self.current_display.setPlainText(old_description)
+                self.history = self.history_store.entries()
+                self._diff_cache.clear()
                 self.populate_version_list()
 
             except Exception as e:
@@ -995,7 +1434,7 @@ class DescriptionHistoryDialog(QDialog):
                 # Search in timestamp, user, and description
                 timestamp = data.get('timestamp', '').lower()
                 user = data.get('user', '').lower()
-                description = data.get('description', '').lower()
+                description = self.version_text(data)[0].lower()
 
                 # Current version is always visible or check match
                 if data['is_current']:
@@ -1094,7 +1533,7 @@ class DescriptionHistoryDialog(QDialog):
 
                 html_content += f"""
                     </div>
-                    <pre>{self.escape_html(entry.get('old_description', ''))}</pre>
+                    <pre>{self.escape_html(self.history_store.text(version_num)[0])}</pre>
                 </div>
                 """
 
@@ -1145,6 +1584,9 @@ class FastTrackGUI(QWidget):
         "Info": QColor("#E0E0E0")           # Medium Gray
     }
 
+    # Server change notification ({'updated': [rows], 'removed': [paths]}), on the GUI thread
+    issues_changed = pyqtSignal(object)
+
     class DragDropListWidget(QListWidget):
         """Custom QListWidget with drag and drop support for files"""
         def __init__(self, parent=None):
@@ -1186,7 +1628,7 @@ class FastTrackGUI(QWidget):
             else:
                 super().keyPressEvent(event)
 
-    def __init__(self, prj_base=None):
+    def __init__(self, prj_base=None, use_server=False):
         super().__init__()
         self.setFont(DEFAULT_FONT)  # Set font for this widget and all children
         self.prj_base = prj_base or os.getenv('casino_prj_base', '')
@@ -1194,6 +1636,8 @@ class FastTrackGUI(QWidget):
         self.proj_dir = (os.path.join(self.prj_base, self.prj_name)
                          if self.prj_base and self.prj_name else self.prj_base)
         self.assigner = getpass.getuser()
+        self.issue_db = None  # Opened on first use, see _issue_database()
+        self.server = None  # ServerClient when the project's FastTrack server is running
 
         # Initialize directory structure
         if self.proj_dir:
@@ -1207,6 +1651,16 @@ class FastTrackGUI(QWidget):
             os.makedirs(self.deleted_dir, exist_ok=True)
             os.makedirs(self.deleted_attach_dir, exist_ok=True)
 
+            if use_server:
+                # Imported here so `python -m ftrack_casino.server` runs a single copy of the module
+                from .server import ServerClient
+                self.server = ServerClient.connect(self.fast_dir)
+                if self.server is not None:
+                    logging.info(f"Connected to FastTrack server {self.server.info.get('host')}:{self.server.info.get('port')}")
+                    # Emitted from the client's reader thread, delivered on the GUI thread
+                    self.server.on_change = self.issues_changed.emit
+                    self.issues_changed.connect(lambda _: self._update_summary_table())
+
         self.blks = self._load_blocks()
         self.assignees = self._load_assignees()
         self.setWindowTitle("FastTrack Issue Manager")
@@ -1832,7 +2286,8 @@ class FastTrackGUI(QWidget):
                 'attachments': []
             }
 
-            # Handle attachments
+            # Handle attachments: symlinks are made here, copies go to a worker thread
+            to_copy = []
             for i in range(self.attach_list.count()):
                 item = self.attach_list.item(i)
                 if not item:
@@ -1842,6 +2297,10 @@ class FastTrackGUI(QWidget):
                 if not src_path or not os.path.exists(src_path):
                     continue
 
+                if not self.link_check.isChecked():
+                    to_copy.append(src_path)
+                    continue
+
                 try:
                     filename = os.path.basename(src_path)
                     dst_path = os.path.join(issue_attach_dir, filename)
@@ -1853,31 +2312,61 @@ class FastTrackGUI(QWidget):
                         filename = f"{base}_{timestamp}{ext}"
                         dst_path = os.path.join(issue_attach_dir, filename)
 
-                    if self.link_check.isChecked():
-                        if os.path.exists(dst_path):
-                            os.remove(dst_path)
-                        os.symlink(src_path, dst_path)
-                    else:
-                        shutil.copy2(src_path, dst_path)
+                    if os.path.exists(dst_path):
+                        os.remove(dst_path)
+                    os.symlink(src_path, dst_path)
                     issue_data['attachments'].append(dst_path)
                 except Exception as e:
                     QMessageBox.warning(self, "Warning",
-                                      f"Failed to copy attachment {filename}: {str(e)}")
+                                      f"Failed to link attachment {filename}: {str(e)}")
 
-            # Save issue file
             issue_path = os.path.join(self.fast_dir, issue_filename)
-            try:
-                with open(issue_path, 'w') as f:
-                    yaml.safe_dump(issue_data, f)
-                QMessageBox.information(self, "Success",
-                                      f"Issue {issue_id} created successfully")
-                self._clear_form()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save issue: {str(e)}")
+            if to_copy:
+                self._copy_attachments_and_save(issue_path, issue_data, to_copy)
+            else:
+                self._save_new_issue(issue_path, issue_data)
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to create issue: {str(e)}")
 
+    def _copy_attachments_and_save(self, issue_path, issue_data, file_paths):
+        """Copy a new issue's attachments on an AttachWorker, then save the issue"""
+        db_path = self._local_issue_database().db_path
+        progress = QProgressDialog("Copying attachments...", None, 0, 0, self)
+        progress.setWindowTitle("Submit Issue")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)  # Shown at once, so the form cannot be submitted twice
+
+        worker = AttachWorker(db_path, self.attach_dir, issue_data['id'], file_paths, parent=self)
+
+        def on_progress(done, total):
+            # QProgressDialog takes ints; keep large totals in range
+            progress.setMaximum(max(total >> 10, 1))
+            progress.setValue(done >> 10)
+
+        def on_completed(paths, errors):
+            progress.close()
+            issue_data['attachments'].extend(paths)
+            if errors:
+                QMessageBox.warning(self, "Warning",
+                                    "Failed to copy attachments:\n" + "\n".join(errors))
+            self._save_new_issue(issue_path, issue_data)
+
+        worker.progress_updated.connect(on_progress)
+        worker.attach_completed.connect(on_completed)
+        worker.finished.connect(worker.deleteLater)
+        worker.start()
+
+    def _save_new_issue(self, issue_path, issue_data):
+        """Write a submitted issue's YAML and clear the form"""
+        try:
+            self._save_issue_file(issue_path, issue_data)
+            QMessageBox.information(self, "Success",
+                                  f"Issue {issue_data['id']} created successfully")
+            self._clear_form()
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save issue: {str(e)}")
+
     def _load_issue(self):
         fast_dir = os.path.join(self.proj_dir, "FastTrack")
         if not os.path.isdir(fast_dir):
@@ -1927,20 +2416,8 @@ class FastTrackGUI(QWidget):
         btn_layout.addWidget(close_btn)
         layout.addLayout(btn_layout)
 
-        # Populate table with issues
-        issues = []
-        for fn in os.listdir(fast_dir):
-            if not fn.endswith(('.yaml','.yml')):
-                continue
-            path = os.path.join(fast_dir, fn)
-            try:
-                data = yaml.safe_load(open(path))
-                issues.append((data, path))
-            except Exception:
-                pass
-
-        # Sort issues by creation date (newest first)
-        issues.sort(key=lambda x: x[0].get('created_at', ''), reverse=True)
+        # Populate table with issues, newest first
+        issues = [(data, data['yaml_path']) for data in self._query_issues()]
 
         # Function to populate table with filtered issues
         def populate_table(filter_text=""):
@@ -2085,99 +2562,49 @@ class FastTrackGUI(QWidget):
         desc_search = QLineEdit()
         desc_search.setPlaceholderText("Search Description...")
         layout.addWidget(desc_search)
-        cols = ["ID","Title","Assigner","Assignee","Status","Created","Due Date","Severity","Stage","Blocks","Run Dir"]
-        tbl = QTableWidget()
-        tbl.setColumnCount(len(cols))
-        tbl.setHorizontalHeaderLabels(cols)
-
-        # Make headers clickable for sorting
-        tbl.horizontalHeader().setSectionsClickable(True)
-        tbl.horizontalHeader().setSortIndicatorShown(True)
-
-        for idx in range(tbl.columnCount()):
-            mode = QHeaderView.ResizeToContents if idx < 9 else QHeaderView.Interactive
-            tbl.horizontalHeader().setSectionResizeMode(idx, mode)
-
-        # Filter row
-        tbl.insertRow(0)
+        cols = IssueTableModel.COLUMNS
+        model = IssueTableModel(self.STATUS_COLORS, self.SEVERITY_COLORS, dlg)
+        delegate = IssueEditDelegate(self.STATUS_OPTIONS, self.assignees, self.blks, dlg)
+        tbl = QTableView()
+        tbl.setModel(model)
+        tbl.setItemDelegate(delegate)
+        tbl.setEditTriggers(QAbstractItemView.NoEditTriggers)  # Editors are opened by Modify Status
+        header = tbl.horizontalHeader()
+
+        # Header clicks sort the model's arrays; until then rows stay in query order
+        header.setSortIndicator(-1, Qt.AscendingOrder)
+        tbl.setSortingEnabled(True)
+
+        for idx in range(len(cols)):
+            header.setSectionResizeMode(idx, QHeaderView.Interactive)
+        header.setResizeContentsPrecision(100)  # Fit columns to a sample of rows, not all of them
+
+        # Filter boxes, kept above their columns as columns resize and scroll
+        filter_bar = QWidget()
         self.col_filters = []
         for c, col in enumerate(cols):
-            le = QLineEdit()
+            le = QLineEdit(filter_bar)
             le.setPlaceholderText(col)
-            tbl.setCellWidget(0, c, le)
             self.col_filters.append((c, le))
+        filter_bar.setFixedHeight(self.col_filters[0][1].sizeHint().height())
 
-        # Custom sorting state tracking
-        self._current_sort_column = -1
-        self._current_sort_order = Qt.AscendingOrder
-
-        # Custom sort function that excludes filter row
-        def manual_sort(logical_index):
-            """Sort table data while keeping filter row (row 0) fixed"""
-            # Toggle sort order if clicking same column
-            if self._current_sort_column == logical_index:
-                self._current_sort_order = Qt.DescendingOrder if self._current_sort_order == Qt.AscendingOrder else Qt.AscendingOrder
-            else:
-                self._current_sort_column = logical_index
-                self._current_sort_order = Qt.AscendingOrder
-
-            # Update header to show sort indicator
-            tbl.horizontalHeader().setSortIndicator(logical_index, self._current_sort_order)
-
-            # Collect all data rows (skip row 0 which is filter row)
-            rows_data = []
-            for r in range(1, tbl.rowCount()):
-                row_data = []
-                for c in range(tbl.columnCount()):
-                    # Get cell widget or item
-                    widget = tbl.cellWidget(r, c)
-                    if widget:
-                        # For widgets (like comboboxes), get current text
-                        if hasattr(widget, 'currentText'):
-                            row_data.append(widget.currentText())
-                        else:
-                            row_data.append('')
-                    else:
-                        item = tbl.item(r, c)
-                        row_data.append(item.text() if item else '')
-
-                # Store the issue path index for this row
-                rows_data.append((r-1, row_data))  # r-1 because _issue_paths is 0-indexed
-
-            # Sort the data based on the selected column
-            def sort_key(row_tuple):
-                _, row_data = row_tuple
-                value = row_data[logical_index]
-                # Try to convert to number for numeric sorting
-                try:
-                    return (0, float(value))  # Numbers sort before text
-                except (ValueError, TypeError):
-                    return (1, value.lower())  # Text sorting (case-insensitive)
-
-            rows_data.sort(key=sort_key, reverse=(self._current_sort_order == Qt.DescendingOrder))
-
-            # Now reorder the issue paths and descriptions to match sorted order
-            sorted_paths = []
-            sorted_descriptions = []
-            for issue_idx, _ in rows_data:
-                sorted_paths.append(self._issue_paths[issue_idx])
-                sorted_descriptions.append(self._descriptions[issue_idx])
-
-            self._issue_paths = sorted_paths
-            self._descriptions = sorted_descriptions
-
-            # Repopulate the table with sorted data (preserve the sorted order)
-            populate(preserve_order=True)
+        def place_filters(*_):
+            x0 = tbl.frameWidth() + tbl.verticalHeader().width()
+            for c, le in self.col_filters:
+                le.setGeometry(x0 + header.sectionViewportPosition(c), 0,
+                               header.sectionSize(c), filter_bar.height())
 
-        # Connect header click to custom sort function
-        tbl.horizontalHeader().sectionClicked.connect(manual_sort)
+        header.sectionResized.connect(place_filters)
+        header.geometriesChanged.connect(place_filters)
+        tbl.horizontalScrollBar().valueChanged.connect(place_filters)
 
         # Modify Status button
         btn_modify = QPushButton("Modify Status")
         style_button(btn_modify, "action")
         btn_modify.setEnabled(False)
         layout.addWidget(btn_modify)
-        # Table widget
+        # Table
+        layout.addWidget(filter_bar)
         layout.addWidget(tbl)
 
         # Enable context menu for table
@@ -2189,19 +2616,19 @@ class FastTrackGUI(QWidget):
         # Enable row hovering effect
         tbl.setMouseTracking(True)
         tbl.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 font-family: Terminus;
                 font-size: 8pt;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: #6BA3D0;
                 color: #FFFFFF;
             }
-            QTableWidget::item:selected:hover {
+            QTableView::item:selected:hover {
                 background-color: #4080C0;
                 color: #FFFFFF;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #5B9BD5;
                 color: #FFFFFF;
             }
@@ -2231,13 +2658,12 @@ class FastTrackGUI(QWidget):
         style_button(btn_refresh, "gray")
         btn_html = QPushButton("Export HTML")
         style_button(btn_html, "blue")
-        for b in (btn_modify, btn_det, btn_save, btn_delete, btn_restore, btn_auto_size, btn_refresh, btn_html, btn_close):
+        btn_export = QPushButton("Export...")
+        style_button(btn_export, "blue")
+        for b in (btn_modify, btn_det, btn_save, btn_delete, btn_restore, btn_auto_size, btn_refresh, btn_html, btn_export, btn_close):
             btns.addWidget(b)
         layout.addLayout(btns)
         user = self.assigner
-        self._issue_paths = []
-        self._descriptions = []
-        self._status_combos = []  # Store references to all status combos
 
         # Filter preset management
         presets_file = os.path.join(self.fast_dir, "filter_presets.json")
@@ -2422,139 +2848,33 @@ class FastTrackGUI(QWidget):
         # Load initial presets
         refresh_presets_combo()
 
-        def populate(preserve_order=False):
-            """Populate table with issue data
-
-            Args:
-                preserve_order: If True, use existing order in _issue_paths.
-                               If False, load from directory and sort by filename.
-            """
-            tbl.setRowCount(1)  # Keep filter row
-            self._status_combos.clear()
-
+        def populate():
+            """Load the issue index into the table (sorted and filtered by the model)"""
             if not os.path.isdir(fast_dir):
+                model.load([])
                 return
-
-            # If not preserving order, reload from directory
-            if not preserve_order:
-                self._issue_paths.clear()
-                self._descriptions.clear()
-
-                for fn in sorted(os.listdir(fast_dir)):
-                    if not fn.endswith(('.yaml','.yml')):
-                        continue
-
-                    path = os.path.join(fast_dir, fn)
-                    data = yaml.safe_load(open(path))
-                    desc = data.get('description', '')
-                    self._issue_paths.append(path)
-                    self._descriptions.append(desc)
-
-            # Now populate table using current order in _issue_paths
-            for idx, path in enumerate(self._issue_paths):
-                data = yaml.safe_load(open(path))
-                desc = self._descriptions[idx]
-
-                r = tbl.rowCount()
-                tbl.insertRow(r)
-
-                # Get status for background color
-                status = data.get('status', '')
-                status_color = self.STATUS_COLORS.get(status)
-
-                vals = [
-                    data.get('id', ''),
-                    data.get('title', ''),
-                    data.get('assigner', ''),
-                    data.get('assignee', ''),
-                    status,
-                    data.get('created_at', ''),
-                    data.get('due_date', ''),
-                    data.get('severity', ''),
-                    data.get('stage', ''),
-                    ', '.join(data.get('modules', [])),
-                    data.get('run_id', '')
-                ]
-
-                # Add number of attachments to title
-                attachments = data.get('attachments', [])
-                if attachments:
-                    num_attachments = len(attachments)
-                    vals[1] = f"{vals[1]} ({num_attachments})"
-
-                for c, val in enumerate(vals):
-                    if c == 4:  # Status column
-                        cb = QComboBox()
-                        cb.addItems(self.STATUS_OPTIONS)
-                        cb.setCurrentText(val)
-                        cb.setEnabled(False)
-                        tbl.setCellWidget(r, c, cb)
-                        if status_color:
-                            cb.setStyleSheet(f"QComboBox {{ background-color: {status_color.name()}; }}")
-                    else:
-                        item = QTableWidgetItem(val)
-                        if c == 1:  # Title column
-                            item.setToolTip(desc)
-                        tbl.setItem(r, c, item)
-
-                        # Apply status color to all cells except severity
-                        if status_color and c != 7:  # Skip severity column
-                            item.setBackground(status_color)
-
-                # Apply severity color to the severity column (index 7)
-                severity = data.get('severity', '')
-                severity_color = self.SEVERITY_COLORS.get(severity)
-                if severity_color:
-                    severity_cell = tbl.item(r, 7)
-                    if severity_cell:
-                        severity_cell.setBackground(severity_color)
-
-                # Format blocks with newlines and ensure status color is applied
-                blocks = data.get('modules', [])
-                blocks_text = '\n'.join(blocks) if blocks else ''
-                blocks_item = QTableWidgetItem(blocks_text)
-                blocks_item.setTextAlignment(Qt.AlignLeft | Qt.AlignTop)
-                if status_color:
-                    blocks_item.setBackground(status_color)
-                tbl.setItem(r, 9, blocks_item)
-
-                # Check if due date is overdue
-                due_date_str = data.get('due_date', '')
-                if due_date_str:
-                    try:
-                        if len(due_date_str) > 10:  # Contains time
-                            due_date = datetime.strptime(due_date_str, "%Y-%m-%d %H:%M")
-                            formatted_date = due_date.strftime("%Y-%m-%d %H:%M")
-                        else:
-                            due_date = datetime.strptime(due_date_str, "%Y-%m-%d")
-                            formatted_date = due_date.strftime("%Y-%m-%d 00:00")
-
-                        due_date_cell = tbl.item(r, 6)
-                        if due_date_cell:
-                            due_date_cell.setText(formatted_date)
-                            if due_date < datetime.now():
-                                font = due_date_cell.font()
-                                font.setBold(True)
-                                due_date_cell.setFont(font)
-                                due_date_cell.setForeground(QColor("#FF0000"))
-                    except Exception:
-                        pass
-
+            model.load(self._query_issues(order_by="yaml_path"))
             tbl.resizeColumnsToContents()
             btn_modify.setEnabled(False)
 
-        def on_row_selected(r, c):
-            if r <= 0:
+        def update_description(path, description):
+            """Show an edited description without reloading the table"""
+            if path in model.index_of_path:
+                issue = model.issues[model.index_of_path[path]]
+                model.update_issues([dict(issue, description=description)])
+
+        def on_row_selected(index):
+            if not index.isValid():
                 btn_modify.setEnabled(False)
                 return
-            ass = tbl.item(r, 2).text(); to = tbl.item(r, 3).text()
-            btn_modify.setEnabled(user in (ass, to))
+            issue = model.issue(index.row())
+            btn_modify.setEnabled(user in (issue.get('assigner', ''), issue.get('assignee', '')))
 
-        def on_cell_clicked(row, col):
+        def on_cell_clicked(index):
             # Title click shows description in popup window (non-modal, multiple allowed)
-            if row <= 0 or col != 1:
+            if not index.isValid() or index.column() != IssueTableModel.TITLE:
                 return
-            path = self._issue_paths[row-1]
+            path = model.issue(index.row())['yaml_path']
 
             with open(path, 'r') as f:
                 data = yaml.safe_load(f)
@@ -2621,34 +2941,21 @@ class FastTrackGUI(QWidget):
                         QMessageBox.warning(editor, "Error", "Description cannot be empty.")
                         return
 
-                    # Add to change history
-                    if 'description_history' not in data:
-                        data['description_history'] = []
-
-                    history_entry = {
-                        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        'user': getpass.getuser(),
-                        'old_description': old_description,
-                        'old_description_html': old_description_html
-                    }
-                    data['description_history'].append(history_entry)
-
                     # Update description (both formats)
                     data['description'] = new_description_text
                     data['description_html'] = new_description_html
 
-                    # Save to file
+                    # Save the issue, then record the old description in the history store
                     try:
-                        with open(path, 'w') as f:
-                            yaml.safe_dump(data, f)
-
-                        # Update the descriptions array
-                        self._descriptions[row-1] = new_description_text
+                        history = DescriptionHistory.for_issue(path, data.get('id', ''))
+                        history.import_inline(data)
+                        self._save_issue_file(path, data)
+                        history.append(old_description, old_description_html,
+                                       user=getpass.getuser(),
+                                       timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
-                        # Update tooltip in table
-                        title_item = tbl.item(row, col)
-                        if title_item:
-                            title_item.setToolTip(new_description_text)
+                        # Update the tooltip and description search in the table
+                        update_description(path, new_description_text)
 
                         # Update displayed description
                         te.setPlainText(new_description_text)
@@ -2683,7 +2990,7 @@ class FastTrackGUI(QWidget):
             def on_show_history():
                 """Show enhanced history dialog with visual diffs (non-modal)"""
                 # Create non-modal history dialog
-                history_dlg = DescriptionHistoryDialog(data, path, dlg2)
+                history_dlg = DescriptionHistoryDialog(data, path, dlg2, save_issue=self._save_issue_file)
                 history_dlg.setWindowFlags(Qt.Window | Qt.WindowCloseButtonHint | Qt.WindowMinMaxButtonsHint)
                 history_dlg.setWindowTitle(f"Description History - {data.get('id', '')}")
 
@@ -2698,13 +3005,8 @@ class FastTrackGUI(QWidget):
                         # Update displayed description if it changed
                         te.setPlainText(data.get('description', ''))
 
-                        # Update the descriptions array
-                        self._descriptions[row-1] = data.get('description', '')
-
-                        # Update tooltip in table
-                        title_item = tbl.item(row, col)
-                        if title_item:
-                            title_item.setToolTip(data.get('description', ''))
+                        # Update the tooltip and description search in the table
+                        update_description(path, data.get('description', ''))
 
                     except Exception as e:
                         print(f"Error reloading data after history dialog: {e}")
@@ -2739,226 +3041,60 @@ class FastTrackGUI(QWidget):
 
             dlg2.finished.connect(on_dialog_closed)
 
-        def on_modify():
-            selected_rows = tbl.selectedItems()
-            if not selected_rows:
-                return
+        def show_editors(rows, show=True):
+            for r in rows:
+                for c in IssueTableModel.EDITABLE:
+                    if show:
+                        tbl.openPersistentEditor(model.index(r, c))
+                    else:
+                        tbl.closePersistentEditor(model.index(r, c))
+                tbl.setRowHeight(r, max(tbl.rowHeight(r), 120) if show
+                                 else tbl.verticalHeader().defaultSectionSize())
 
-            # Get all unique selected rows (excluding row 0 which is the filter row)
-            rows_to_modify = set(item.row() for item in selected_rows if item.row() > 0)
-            if not rows_to_modify:
+        def on_modify():
+            # Selected rows get editors for every modifiable column
+            rows = [index.row() for index in tbl.selectionModel().selectedRows()]
+            if not rows:
                 return
+            model.begin_edit(rows)
+            show_editors(model.editing_rows())
 
-            # Store current values before modification
-            for r in rows_to_modify:
-                # Create status combo
-                cb = QComboBox()
-                cb.addItems(self.STATUS_OPTIONS)
-                current_status = tbl.item(r, 4).text() if tbl.item(r, 4) else ""
-                cb.setCurrentText(current_status)
-                tbl.setCellWidget(r, 4, cb)
-                self._status_combos.append((r, cb))
-
-                # Assignee
-                assignee_cb = QComboBox()
-                assignee_cb.addItems(self.assignees)
-                current_assignee = tbl.item(r, 3).text() if tbl.item(r, 3) else ""
-                assignee_cb.setCurrentText(current_assignee)
-                tbl.setCellWidget(r, 3, assignee_cb)
-
-                # Due Date
-                date_time_layout = QVBoxLayout()
-                date_time_layout.setSpacing(2)  # Reduce spacing between elements
-                date_time_layout.setContentsMargins(0, 0, 0, 0)
-
-                # Display current value as text
-                current_value = tbl.item(r, 6).text() if tbl.item(r, 6) else ""
-                current_value_label = QLabel("Original:")
-                current_value_label.setStyleSheet("color: #666666; font-size: 9px; padding: 2px;")
-                date_time_layout.addWidget(current_value_label)
-
-                # Create vertical layout for date and time inputs
-                input_layout = QVBoxLayout()
-                input_layout.setContentsMargins(0, 0, 0, 0)
-                input_layout.setSpacing(2)  # Reduce spacing between date and time
-
-                # Add date widget
-                date_edit = QDateEdit()
-                date_edit.setCalendarPopup(True)
-                date_edit.setDisplayFormat("yyyy-MM-dd")
-                input_layout.addWidget(date_edit)
-
-                # Add time widget
-                time_edit = QTimeEdit()
-                time_edit.setDisplayFormat("HH:mm")
-                input_layout.addWidget(time_edit)
-
-                # Set values for the edit widgets
-                if current_value:
-                    try:
-                        if len(current_value) > 10:  # Contains time
-                            date_str, time_str = current_value.split(" ")
-                            date = QDate.fromString(date_str, "yyyy-MM-dd")
-                            time = QTime.fromString(time_str, "HH:mm")
-                            date_edit.setDate(date)
-                            time_edit.setTime(time)
-                        else:
-                            date = QDate.fromString(current_value, "yyyy-MM-dd")
-                            date_edit.setDate(date)
-                            time_edit.setTime(QTime(0, 0))
-                    except:
-                        date_edit.setDate(QDate.currentDate())
-                        time_edit.setTime(QTime.currentTime())
-                else:
-                    date_edit.setDate(QDate.currentDate())
-                    time_edit.setTime(QTime.currentTime())
-
-                date_time_layout.addLayout(input_layout)
-
-                date_time_widget = QWidget()
-                date_time_widget.setLayout(date_time_layout)
-                tbl.setCellWidget(r, 6, date_time_widget)
-
-                # Severity
-                severity_cb = QComboBox()
-                severity_cb.addItems(["Critical", "Major", "Minor", "Enhancement", "Info"])
-                severity_cb.setCurrentText(tbl.item(r, 7).text() if tbl.item(r, 7) else "")
-                tbl.setCellWidget(r, 7, severity_cb)
-
-                # Stage
-                stage_cb = QComboBox()
-                stage_cb.setEditable(True)
-                stage_cb.addItems(["casino", "design", "dk", "syn", "dft", "lec", "sta", "ldrc", "vclp", "sim",
-                               "floorplan", "place", "cts", "route", "pex", "pv", "psi", "bump", "signoff"])
-                stage_cb.setCurrentText(tbl.item(r, 8).text() if tbl.item(r, 8) else "")
-                tbl.setCellWidget(r, 8, stage_cb)
-
-                # Blocks
-                list_widget = QListWidget()
-                list_widget.setSelectionMode(QAbstractItemView.MultiSelection)
-                for blk in self.blks:
-                    list_widget.addItem(blk)
-                current_blocks = tbl.item(r, 9).text().split(", ") if tbl.item(r, 9) and tbl.item(r, 9).text() else []
-                for i in range(list_widget.count()):
-                    item = list_widget.item(i)
-                    item.setSelected(item.text() in current_blocks)
-
-                list_widget.setMinimumHeight(100)
-                list_widget.setMaximumHeight(150)
-                tbl.setCellWidget(r, 9, list_widget)
-                tbl.setRowHeight(r, max(tbl.rowHeight(r), 120))
+        def end_modify():
+            """Close the editors and drop unsaved values"""
+            show_editors(model.editing_rows(), show=False)
+            model.end_edit()
 
         def on_cancel_modify():
             """Cancel modification and restore original values"""
-            # Get all modified rows
-            modified_rows = set(row for row, _ in self._status_combos)
-
-            # Restore original cells by repopulating from data
-            for r in modified_rows:
-                if r <= 0:  # Skip filter row
-                    continue
-
-                try:
-                    path = self._issue_paths[r-1]
-                    with open(path, 'r') as f:
-                        d = yaml.safe_load(f)
-
-                    # Clear all cell widgets first (important for Due Date and other complex widgets)
-                    for c in [3, 4, 6, 7, 8, 9]:  # Columns that may have widgets
-                        tbl.removeCellWidget(r, c)
-
-                    # Restore all fields to original values
-                    tbl.setItem(r, 3, QTableWidgetItem(d.get('assignee', '')))
-                    tbl.setItem(r, 4, QTableWidgetItem(d.get('status', '')))
-                    tbl.setItem(r, 6, QTableWidgetItem(d.get('due_date', '')))
-                    tbl.setItem(r, 7, QTableWidgetItem(d.get('severity', '')))
-                    tbl.setItem(r, 8, QTableWidgetItem(d.get('stage', '')))
-                    tbl.setItem(r, 9, QTableWidgetItem(", ".join(d.get('blocks', []))))
-
-                    # Apply status color
-                    status = d.get('status', '')
-                    status_color = self.STATUS_COLORS.get(status)
-                    if status_color:
-                        for c in range(tbl.columnCount()):
-                            if c != 7:  # Skip severity column
-                                item = tbl.item(r, c)
-                                if item:
-                                    item.setBackground(status_color)
-
-                    # Apply severity color
-                    severity = d.get('severity', '')
-                    severity_color = self.SEVERITY_COLORS.get(severity)
-                    if severity_color:
-                        severity_cell = tbl.item(r, 7)
-                        if severity_cell:
-                            severity_cell.setBackground(severity_color)
-
-                    # Reset row height
-                    tbl.setRowHeight(r, tbl.rowHeight(0))
-                except Exception as e:
-                    logging.error(f"Error canceling modification for row {r}: {e}")
-
-            # Clear status combo tracking
-            self._status_combos.clear()
+            end_modify()
             btn_modify.setEnabled(True)
 
         def on_save():
             changes_made = False
             save_errors = []
-            modified_rows = set(row for row, _ in self._status_combos)
 
             try:
-                # Save changes for all modified rows
-                for r in modified_rows:
-                    if r <= 0:  # Skip filter row
-                        continue
-
-                    path = self._issue_paths[r-1]
+                # Editors hand their values to the model, then every modified issue is saved
+                for r in model.editing_rows():
+                    for c in IssueTableModel.EDITABLE:
+                        index = model.index(r, c)
+                        editor = tbl.indexWidget(index)
+                        if editor is not None:
+                            delegate.setModelData(editor, model, index)
+                edits = model.pending_edits()
+                end_modify()
+
+                for path, fields in edits.items():
                     with open(path, 'r') as f:
                         d = yaml.safe_load(f)
 
                     original_data = d.copy()
-
-                    # Get all modified values
-                    status_widget = tbl.cellWidget(r, 4)
-                    if status_widget:
-                        d['status'] = status_widget.currentText()
-
-                    assignee_widget = tbl.cellWidget(r, 3)
-                    if assignee_widget:
-                        d['assignee'] = assignee_widget.currentText()
-
-                    date_time_widget = tbl.cellWidget(r, 6)
-                    if date_time_widget and date_time_widget.layout():
-                        input_layout = date_time_widget.layout().itemAt(1).layout()
-                        if input_layout:
-                            date_edit = input_layout.itemAt(0).widget()
-                            time_edit = input_layout.itemAt(1).widget()
-                            if date_edit and time_edit:
-                                d['due_date'] = f"{date_edit.date().toString('yyyy-MM-dd')} {time_edit.time().toString('HH:mm')}"
-
-                    severity_widget = tbl.cellWidget(r, 7)
-                    if severity_widget:
-                        d['severity'] = severity_widget.currentText()
-
-                    stage_widget = tbl.cellWidget(r, 8)
-                    if stage_widget:
-                        d['stage'] = stage_widget.currentText()
-
-                    blocks_widget = tbl.cellWidget(r, 9)
-                    if blocks_widget:
-                        new_blocks = []
-                        for i in range(blocks_widget.count()):
-                            if blocks_widget.item(i).isSelected():
-                                new_blocks.append(blocks_widget.item(i).text())
-                        if new_blocks:  # Only update if blocks were modified
-                            d['modules'] = new_blocks
+                    d.update(fields)
 
                     # Save if changes were made
                     if d != original_data:
                         try:
-                            with open(path, 'w') as f:
-                                yaml.safe_dump(d, f)
+                            self._save_issue_file(path, d)
                             changes_made = True
                         except Exception as e:
                             save_errors.append(f"Failed to save changes for issue {d.get('id', '')}: {str(e)}")
@@ -2979,17 +3115,14 @@ class FastTrackGUI(QWidget):
                 QMessageBox.critical(dlg, "Error", f"An error occurred while saving changes: {str(e)}")
 
         def on_delete():
-            selected_items = tbl.selectedItems()
-            if not selected_items:
+            selected_rows = tbl.selectionModel().selectedRows()
+            if not selected_rows:
                 QMessageBox.warning(dlg, "Warning", "Please select an issue to delete.")
                 return
 
-            row = selected_items[0].row()
-            if row <= 0:  # Skip if filter row is selected
-                return
-
-            issue_id = tbl.item(row, 0).text()
-            issue_path = self._issue_paths[row-1]
+            issue = model.issue(selected_rows[0].row())
+            issue_id = issue['id']
+            issue_path = issue['yaml_path']
 
             try:
                 # Load issue data
@@ -3042,15 +3175,13 @@ Description:
                         # Move issue file to deleted directory
                         deleted_filename = f"deleted_{os.path.basename(issue_path)}"
                         deleted_path = os.path.join(self.deleted_dir, deleted_filename)
-                        shutil.move(issue_path, deleted_path)
+                        moves = [(issue_path, deleted_path)]
 
                         # Move the issue-specific attachment directory to deleted attachments directory
                         issue_attach_dir = os.path.join(self.attach_dir, issue_id)
                         if os.path.exists(issue_attach_dir):
-                            deleted_attach_dir = os.path.join(self.deleted_attach_dir, issue_id)
-                            if os.path.exists(deleted_attach_dir):
-                                shutil.rmtree(deleted_attach_dir)
-                            shutil.move(issue_attach_dir, deleted_attach_dir)
+                            moves.append((issue_attach_dir, os.path.join(self.deleted_attach_dir, issue_id)))
+                        self._move_issue_files(moves)
 
                         # Update the table
                         populate()
@@ -3171,15 +3302,13 @@ Description:
                         try:
                             # Move issue file back to active directory
                             new_path = os.path.join(self.fast_dir, os.path.basename(issue_path).replace('deleted_', ''))
-                            shutil.move(issue_path, new_path)
+                            moves = [(issue_path, new_path)]
 
                             # Move the issue-specific attachment directory back to attachments
                             deleted_attach_dir = os.path.join(self.deleted_attach_dir, issue_id)
                             if os.path.exists(deleted_attach_dir):
-                                issue_attach_dir = os.path.join(self.attach_dir, issue_id)
-                                if os.path.exists(issue_attach_dir):
-                                    shutil.rmtree(issue_attach_dir)
-                                shutil.move(deleted_attach_dir, issue_attach_dir)
+                                moves.append((deleted_attach_dir, os.path.join(self.attach_dir, issue_id)))
+                            self._move_issue_files(moves)
 
                             QMessageBox.information(confirm_dlg, "Success", "Issue has been restored successfully.")
                             confirm_dlg.accept()
@@ -3223,91 +3352,30 @@ Description:
                     desc_pat = re.compile(txt_desc)
                 except re.error:
                     desc_pat = None
-            for r in range(1, tbl.rowCount()):
-                show = True
-                # filter columns
-                for c, pat in patterns.items():
-                    widget = tbl.cellWidget(r, c)
-                    val = widget.currentText() if widget else tbl.item(r, c).text()
-                    if not pat.search(val):
-                        show = False
-                        break
-                # filter description
-                if show and desc_pat and not desc_pat.search(self._descriptions[r-1]):
-                    show = False
-                tbl.setRowHidden(r, not show)
+            model.set_filters(patterns, desc_pat)
 
         def on_auto_size():
-            # Reset all column widths and row heights first
-            for col in range(tbl.columnCount()):
-                tbl.setColumnWidth(col, tbl.horizontalHeader().defaultSectionSize())
-            for row in range(tbl.rowCount()):
-                tbl.setRowHeight(row, tbl.verticalHeader().defaultSectionSize())
-
-            # Adjust column widths based on content
-            for col in range(tbl.columnCount()):
-                max_width = 0
-                # Get header width
-                header_width = tbl.horizontalHeader().sectionSize(col)
-                max_width = max(max_width, header_width)
-
-                # Check content width for each row
-                for row in range(tbl.rowCount()):
-                    item = tbl.item(row, col)
-                    if item:
-                        # Calculate text width (approximate)
-                        if col == 9:  # Blocks column
-                            # For blocks, consider the longest line
-                            lines = item.text().split('\n')
-                            text_width = max(len(line) for line in lines) * 8
-                        else:
-                            text_width = len(item.text()) * 8
-                        max_width = max(max_width, text_width)
-
-                # Set column width with some padding
-                tbl.setColumnWidth(col, max_width + 20)
-
-            # Adjust row heights based on content
-            for row in range(tbl.rowCount()):
-                max_height = 0
-                for col in range(tbl.columnCount()):
-                    item = tbl.item(row, col)
-                    if item:
-                        # For blocks column, count newlines
-                        if col == 9:  # Blocks column
-                            line_count = item.text().count('\n') + 1
-                            height = line_count * 20  # Approximate height per line
-                            max_height = max(max_height, height)
-                        else:
-                            # For other columns, use default height
-                            max_height = max(max_height, 25)
-
-                # Set row height with some padding, but cap it at a reasonable maximum
-                tbl.setRowHeight(row, min(max_height + 10, 200))  # Cap at 200 pixels
+            # Fit columns and rows to their content, capping row heights at 200 pixels
+            tbl.resizeColumnsToContents()
+            tbl.resizeRowsToContents()
+            for row in range(model.rowCount()):
+                if tbl.rowHeight(row) > 200:
+                    tbl.setRowHeight(row, 200)
 
         def on_refresh():
             # Reset all column widths and row heights to default
-            for col in range(tbl.columnCount()):
-                tbl.setColumnWidth(col, tbl.horizontalHeader().defaultSectionSize())
-            for row in range(tbl.rowCount()):
+            for col in range(model.columnCount()):
+                tbl.setColumnWidth(col, header.defaultSectionSize())
+            for row in range(model.rowCount()):
                 tbl.setRowHeight(row, tbl.verticalHeader().defaultSectionSize())
 
-            # Reset blocks column formatting
-            for row in range(1, tbl.rowCount()):  # Start from 1 to skip header row
-                item = tbl.item(row, 9)  # Blocks column
-                if item:
-                    blocks = item.text().split(', ')  # Split by comma and space
-                    blocks_text = '\n'.join(blocks)  # Join with newlines
-                    item.setText(blocks_text)
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignTop)
-
         def on_attach():
-            r = tbl.currentRow()
-            if r <= 0:  # Skip if no row or filter row is selected
+            r = tbl.currentIndex().row()
+            if r < 0:
                 QMessageBox.warning(dlg, "Warning", "Please select an issue first.")
                 return
 
-            path = self._issue_paths[r-1]
+            path = model.issue(r)['yaml_path']
             try:
                 with open(path, 'r') as f:
                     data = yaml.safe_load(f)
@@ -3505,20 +3573,9 @@ Description:
                 default_filename = f"issue_summary_{timestamp}.html"
                 file_path = os.path.join(summary_dir, default_filename)
 
-                # Collect all issues
-                issues = []
-                for fn in os.listdir(fast_dir):
-                    if not fn.endswith(('.yaml','.yml')):
-                        continue
-                    path = os.path.join(fast_dir, fn)
-                    try:
-                        data = yaml.safe_load(open(path))
-                        issues.append(data)
-                    except Exception:
-                        continue
-
-                # Sort issues by creation date (newest first)
-                issues.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+                # Collect all issues, newest first
+                issues = self._query_issues()
+                summary = self._issue_database().get_status_summary()
 
                 # Generate HTML content
                 html_content = f"""
@@ -3557,11 +3614,8 @@ Description:
 """
 
                 # Add status counts
-                status_counts = {"Open": 0, "In Progress": 0, "Resolved": 0, "Closed": 0}
-                for issue in issues:
-                    status = issue.get('status', '')
-                    if status in status_counts:
-                        status_counts[status] += 1
+                status_counts = {status: summary.get(status, 0)
+                                 for status in ("Open", "In Progress", "Resolved", "Closed")}
 
                 for status, count in status_counts.items():
                     html_content += f"""
@@ -3636,8 +3690,8 @@ Description:
                 QMessageBox.critical(dlg, "Error", f"Failed to generate HTML summary: {str(e)}")
 
         # Connect signals
-        tbl.cellClicked.connect(on_row_selected)
-        tbl.cellClicked.connect(on_cell_clicked)
+        tbl.clicked.connect(on_row_selected)
+        tbl.clicked.connect(on_cell_clicked)
         desc_search.textChanged.connect(apply_filters)
         for _, le in self.col_filters:
             le.textChanged.connect(apply_filters)
@@ -3650,6 +3704,7 @@ Description:
         btn_close.clicked.connect(dlg.close)
         btn_det.clicked.connect(on_attach)
         btn_html.clicked.connect(generate_html_summary)
+        btn_export.clicked.connect(lambda: self._export_issues(dlg))
 
         # ESC key to cancel modify mode
         esc_shortcut = QShortcut(QKeySequence("Escape"), dlg)
@@ -3658,13 +3713,8 @@ Description:
         # Context menu (right-click) handler
         def show_context_menu(position):
             """Show context menu on right-click"""
-            # Get the item at the clicked position
-            item = tbl.itemAt(position)
-            if not item:
-                return
-
-            row = item.row()
-            if row <= 0:  # Skip filter row
+            # Only over an issue row
+            if not tbl.indexAt(position).isValid():
                 return
 
             # Create context menu
@@ -3704,40 +3754,159 @@ Description:
         # Connect context menu to table
         tbl.customContextMenuRequested.connect(show_context_menu)
 
+        def on_issues_changed(change):
+            """Server notification: update only the issues that changed"""
+            if model.edits:
+                return  # Rows are being edited; saving reloads the table
+            updated = [self._shape_issue(row) for row in change.get('updated', [])]
+            if (any(path in model.index_of_path for path in change.get('removed', []))
+                    or any(data['yaml_path'] not in model.index_of_path for data in updated)):
+                populate()  # Issues were added or removed
+            else:
+                model.update_issues(updated)
+
         populate()
         dlg.resize(1200,600)
+        self.issues_changed.connect(on_issues_changed)
         dlg.exec_()
+        self.issues_changed.disconnect(on_issues_changed)
         # Update summary table after dialog is closed
         self._update_summary_table()
 
+    def _issue_database(self):
+        """SQLite index of the FastTrack YAML files, synced before returning
+
+        The YAML files stay the source of truth. The sync stats them and parses
+        only files changed since the last view, so views are SQL queries.
+        With a server connected, queries go to the server's index instead.
+        """
+        if self.server is not None and self.server.connected:
+            from .server import RemoteIssueDatabase
+            return RemoteIssueDatabase(self.server, self._local_issue_database)
+        return self._local_issue_database()
+
+    def _local_issue_database(self):
+        """This process's own IssueDatabase, see _issue_database()"""
+        if self.issue_db is None:
+            db_path = os.path.join(self.fast_dir, "issues.db")
+            try:
+                self.issue_db = IssueDatabase(db_path)
+            except sqlite3.Error as e:
+                # e.g. a read-only project area: index privately for this session
+                logging.warning(f"Cannot open issue index {db_path}: {e}")
+                self.issue_db = IssueDatabase(":memory:")
+        try:
+            self.issue_db.sync_from_yaml(self.fast_dir)
+        except (OSError, sqlite3.Error) as e:
+            logging.error(f"Failed to sync issue index: {e}")
+        return self.issue_db
+
+    def _export_issues(self, parent):
+        """Export every issue with its activity (format by extension) on a worker thread"""
+        db = self._issue_database()
+        if db.db_path == ":memory:":
+            QMessageBox.warning(parent, "Export", "The issue index could not be created on disk, so issues cannot be exported.")
+            return
+
+        default_name = os.path.join(self.proj_dir, f"issues_{datetime.now().strftime('%Y%m%d')}.xlsx")
+        filename, _ = QFileDialog.getSaveFileName(
+            parent, "Export Issues", default_name,
+            "Excel Files (*.xlsx);;CSV Files (*.csv);;HTML Files (*.html)")
+        if not filename:
+            return
+
+        progress = QProgressDialog("Exporting issues...", "Cancel", 0, 0, parent)
+        progress.setWindowTitle("Export Issues")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        worker = ExportWorker(db.db_path, filename, os.path.basename(self.proj_dir), parent=parent)
+
+        def on_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        def on_completed(count, error):
+            progress.close()
+            if error:
+                if not worker.cancelled:
+                    QMessageBox.critical(parent, "Export Failed", f"Failed to export issues: {error}")
+            else:
+                QMessageBox.information(parent, "Export", f"Exported {count} issues to:\n{filename}")
+
+        worker.progress_updated.connect(on_progress)
+        worker.export_completed.connect(on_completed)
+        worker.finished.connect(worker.deleteLater)
+        progress.canceled.connect(worker.cancel)
+        worker.start()
+
+    def _query_issues(self, **filters):
+        """Issues from the synced index, shaped like the YAML data
+
+        Takes IssueDatabase.filter_issues() arguments. Modules are decoded to a
+        list and NULL columns read as ''.
+        """
+        return [self._shape_issue(issue) for issue in self._issue_database().filter_issues(**filters)]
+
+    @staticmethod
+    def _shape_issue(issue):
+        """Index row -> issue data as in the YAML, see _query_issues()"""
+        for key, value in issue.items():
+            if value is None:
+                issue[key] = ''
+        issue['modules'] = json.loads(issue['modules'] or '[]')
+        return issue
+
+    def _save_issue_file(self, path, data):
+        """Write an issue YAML, through the server when connected. Raises OSError."""
+        if self.server is not None and self.server.connected:
+            from .server import ServerError
+            try:
+                self.server.save_issue(path, data)
+                return
+            except ConnectionError as e:
+                logging.warning(f"{e}; writing {path} directly")
+            except ServerError as e:
+                raise OSError(str(e)) from e
+        write_yaml_atomic(path, data)
+
+    def _move_issue_files(self, moves):
+        """Move (source, destination) pairs, replacing destination directories"""
+        if self.server is not None and self.server.connected:
+            from .server import ServerError
+            try:
+                self.server.move(moves)
+                return
+            except ConnectionError as e:
+                logging.warning(f"{e}; moving issue files directly")
+            except ServerError as e:
+                raise OSError(str(e)) from e
+        for source, destination in moves:
+            if os.path.isdir(destination):
+                shutil.rmtree(destination)
+            shutil.move(source, destination)
+
+    def _reserve_issue_number(self):
+        """Next issue number, from the server's sequence when connected"""
+        if self.server is not None and self.server.connected:
+            from .server import ServerError
+            try:
+                return self.server.reserve_number()
+            except (ConnectionError, ServerError) as e:
+                logging.warning(f"{e}; reserving the issue number directly")
+        return IssueSequence(self.fast_dir, self.deleted_dir).reserve()
+
     def _update_summary_table(self):
         """Update the summary table with current issue counts"""
         fast_dir = os.path.join(self.proj_dir, "FastTrack")
         if not os.path.isdir(fast_dir):
             return
 
-        # Initialize counts
-        counts = {
-            "Open": 0,
-            "In Progress": 0,
-            "Resolved": 0,
-            "Closed": 0,
-            "Total": 0
-        }
-
         # Count issues by status
-        for fn in os.listdir(fast_dir):
-            if not fn.endswith(('.yaml','.yml')):
-                continue
-            path = os.path.join(fast_dir, fn)
-            try:
-                data = yaml.safe_load(open(path))
-                status = data.get('status', '')
-                if status in counts:
-                    counts[status] += 1
-                counts["Total"] += 1
-            except Exception:
-                pass
+        summary = self._issue_database().get_status_summary()
+        counts = {status: summary.get(status, 0)
+                  for status in ("Open", "In Progress", "Resolved", "Closed")}
+        counts["Total"] = sum(summary.values())
 
         # Update table
         for status, row in self.status_rows.items():
@@ -3761,18 +3930,8 @@ Description:
             QMessageBox.warning(self, "Error", "No FastTrack directory found.")
             return
 
-        # Collect Open issues
-        open_issues = []
-        for fn in os.listdir(fast_dir):
-            if not fn.endswith(('.yaml','.yml')):
-                continue
-            path = os.path.join(fast_dir, fn)
-            try:
-                data = yaml.safe_load(open(path))
-                if data.get('status') == 'Open':
-                    open_issues.append(data)
-            except Exception:
-                pass
+        # Collect Open issues, newest first
+        open_issues = self._query_issues(status='Open')
 
         if not open_issues:
             QMessageBox.information(self, "Open Issues", "No Open issues found.")
@@ -3793,7 +3952,7 @@ Description:
         table.setHorizontalHeaderLabels(["ID", "Title", "Assigner", "Assignee", "Created", "Severity", "Stage"])
 
         # Populate table
-        for i, issue in enumerate(sorted(open_issues, key=lambda x: x.get('created_at', ''), reverse=True)):
+        for i, issue in enumerate(open_issues):
             table.setItem(i, 0, QTableWidgetItem(issue.get('id', '')))
             table.setItem(i, 1, QTableWidgetItem(issue.get('title', '')))
             table.setItem(i, 2, QTableWidgetItem(issue.get('assigner', '')))  # Added Assigner
@@ -3836,24 +3995,18 @@ Description:
                 QMessageBox.warning(dlg, "Warning", "Please select an issue to view.")
                 return
 
-            row = selected[0].row()
-            issue_id = table.item(row, 0).text()
+            # Rows are in open_issues order
+            data = open_issues[selected[0].row()]
 
-            # Find the issue file
-            for fn in os.listdir(fast_dir):
-                if fn.startswith(issue_id) and fn.endswith('.yaml'):
-                    path = os.path.join(fast_dir, fn)
-                    try:
-                        data = yaml.safe_load(open(path))
-                        # Show issue details
-                        detail_dlg = QDialog(dlg)
-                        detail_dlg.setWindowTitle(f"Issue: {data.get('id', '')}")
-                        detail_layout = QVBoxLayout(detail_dlg)
-
-                        # Add issue details
-                        details = QTextEdit()
-                        details.setReadOnly(True)
-                        details_text = f"""
+            # Show issue details
+            detail_dlg = QDialog(dlg)
+            detail_dlg.setWindowTitle(f"Issue: {data.get('id', '')}")
+            detail_layout = QVBoxLayout(detail_dlg)
+
+            # Add issue details
+            details = QTextEdit()
+            details.setReadOnly(True)
+            details_text = f"""
 ID: {data.get('id', '')}
 Title: {data.get('title', '')}
 Status: {data.get('status', '')}
@@ -3868,20 +4021,17 @@ Run Directory: {data.get('run_id', '')}
 Description:
 {data.get('description', '')}
 """
-                        details.setPlainText(details_text)
-                        detail_layout.addWidget(details)
+            details.setPlainText(details_text)
+            detail_layout.addWidget(details)
 
-                        # Add close button
-                        close_btn = QPushButton("Close")
-                        style_button(close_btn, "gray")
-                        close_btn.clicked.connect(detail_dlg.close)
-                        detail_layout.addWidget(close_btn)
+            # Add close button
+            close_btn = QPushButton("Close")
+            style_button(close_btn, "gray")
+            close_btn.clicked.connect(detail_dlg.close)
+            detail_layout.addWidget(close_btn)
 
-                        detail_dlg.resize(700, 500)
-                        detail_dlg.exec_()
-                        break
-                    except Exception as e:
-                        QMessageBox.critical(dlg, "Error", f"Failed to load issue: {e}")
+            detail_dlg.resize(700, 500)
+            detail_dlg.exec_()
 
         view_btn.clicked.connect(view_selected)
         close_btn.clicked.connect(dlg.close)
@@ -3895,61 +4045,23 @@ Description:
     def _generate_issue_id(self):
         """Generate a unique issue ID in format: 0019_20250419_141729"""
         try:
-            # Get all existing issue numbers
-            existing_nums = set()  # Using set to avoid duplicates
-
-            # Check active issues in FastTrack directory
-            if os.path.exists(self.fast_dir):
-                for fn in os.listdir(self.fast_dir):
-                    if fn.endswith('.yaml'):
-                        try:
-                            num_str = fn.split('_')[0]
-                            if num_str.isdigit() and len(num_str) == 4:
-                                existing_nums.add(int(num_str))
-                        except (IndexError, ValueError):
-                            continue
-
-            # Check deleted issues
-            if os.path.exists(self.deleted_dir):
-                for fn in os.listdir(self.deleted_dir):
-                    if fn.startswith('deleted_') and fn.endswith('.yaml'):
-                        try:
-                            parts = fn.split('_')
-                            if len(parts) > 1:
-                                num_str = parts[1]
-                                if num_str.isdigit() and len(num_str) == 4:
-                                    existing_nums.add(int(num_str))
-                        except (IndexError, ValueError):
-                            continue
-
-            # Generate next number
-            if existing_nums:
-                next_num = max(existing_nums) + 1
-            else:
-                next_num = 1
+            while True:
+                # Reserved under a lock, so concurrent submissions never share a number
+                num_str = f"{self._reserve_issue_number():04d}"
 
-            # Ensure the number is within valid range (1-9999)
-            if next_num < 1 or next_num > 9999:
-                logging.error(f"Issue number {next_num} out of range, resetting to 1")
-                next_num = 1
-
-            # Format as 4-digit number
-            num_str = f"{next_num:04d}"
-
-            # Add timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                # Add timestamp
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 
-            # Create issue ID
-            issue_id = f"{num_str}_{timestamp}"
+                # Create issue ID
+                issue_id = f"{num_str}_{timestamp}"
 
-            # Validate final format
-            if not re.match(r'^\d{4}_\d{8}_\d{6}$', issue_id):
-                raise ValueError(f"Generated ID has invalid format: {issue_id}")
+                # Validate final format
+                if not re.match(r'^\d{4}_\d{8}_\d{6}$', issue_id):
+                    raise ValueError(f"Generated ID has invalid format: {issue_id}")
 
-            # Check for duplicate (shouldn't happen, but just in case)
-            if os.path.exists(os.path.join(self.fast_dir, f"{issue_id}.yaml")):
-                time.sleep(1)  # Wait a second
-                return self._generate_issue_id()  # Try again
+                # Only possible after the counter wrapped past 9999
+                if not os.path.exists(os.path.join(self.fast_dir, f"{issue_id}.yaml")):
+                    break
 
             logging.info(f"Generated new issue ID: {issue_id}")
             return issue_id
@@ -4000,7 +4112,8 @@ Description:
                 f"Some fields could not be cleared properly:\n{str(e)}")
             logging.exception("Error in _clear_form")
 
-def launch_ftrack(prj_base=None):
+def launch_ftrack(prj_base=None, use_server=True):
+    """Run the GUI; with use_server, through the project's FastTrack server if one is running"""
     # Set up logging
     #logging.basicConfig(
         #level=logging.INFO,
@@ -4013,13 +4126,14 @@ def launch_ftrack(prj_base=None):
     #logging.info("Starting FastTrack application")
 
     app = QApplication(sys.argv)
-    window = FastTrackGUI(prj_base)
+    window = FastTrackGUI(prj_base, use_server=use_server)
     window.show()
 
     # Set up cleanup on application exit
     def cleanup():
         logging.info("Cleaning up FastTrack application")
-        # Add any additional cleanup code here if needed
+        if window.server is not None:
+            window.server.close()
 
     app.aboutToQuit.connect(cleanup)
     return app.exec_()
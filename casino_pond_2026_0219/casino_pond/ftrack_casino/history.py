@@ -0,0 +1,246 @@
+"""
+Description version history for FastTrack issues
+
+Versions are kept outside the issue YAML, in <FastTrack>/history/<id>.json,
+so loading or syncing an issue never parses its history. They are stored as
+reverse deltas: the newest version in full and every older one as a line
+delta against its successor, so an edit costs about the size of the change
+rather than another copy of a (possibly large rich-text) description.
+"""
+
+import os
+import json
+import difflib
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple, Union
+
+from .storage import write_json_atomic
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then unlocked
+    fcntl = None
+
+HISTORY_DIR = 'history'
+FIELDS = ('description', 'description_html')
+
+# [start, end] copies those lines of the successor; a string is inserted as is
+Delta = List[Union[List[int], str]]
+
+
+def make_delta(source: str, target: str) -> Delta:
+    """Delta that rebuilds `target` from `source`"""
+    source_lines = source.splitlines(keepends=True)
+    target_lines = target.splitlines(keepends=True)
+    delta: Delta = []
+    matcher = difflib.SequenceMatcher(None, source_lines, target_lines)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append(''.join(target_lines[j1:j2]))
+    return delta
+
+
+def apply_delta(source: str, delta: Delta) -> str:
+    """Inverse of make_delta: rebuild the target from `source`"""
+    source_lines = source.splitlines(keepends=True)
+    return ''.join(op if isinstance(op, str) else ''.join(source_lines[op[0]:op[1]])
+                   for op in delta)
+
+
+class DescriptionHistory:
+    """Previous descriptions of one issue, numbered from 1 (oldest)
+
+    The file is read on first access and versions are rebuilt on demand,
+    newest first, with every rebuilt version cached; reading all of them is
+    therefore one pass over the deltas.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._versions: Optional[List[dict]] = None
+        self._texts: Dict[int, Tuple[str, str]] = {}  # index -> (description, description_html)
+
+    @classmethod
+    def for_issue(cls, yaml_path: str, issue_id: str) -> 'DescriptionHistory':
+        """History of the issue stored at yaml_path"""
+        issue_id = issue_id or os.path.splitext(os.path.basename(yaml_path))[0]
+        return cls(os.path.join(os.path.dirname(yaml_path), HISTORY_DIR, f"{issue_id}.json"))
+
+    @property
+    def versions(self) -> List[dict]:
+        if self._versions is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._versions = json.load(f).get('versions', [])
+            except FileNotFoundError:
+                self._versions = []
+        return self._versions
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def entries(self) -> List[Dict[str, str]]:
+        """Timestamp, user and restored_from of every version, oldest first (no text)"""
+        return [{'timestamp': version.get('timestamp', ''),
+                 'user': version.get('user', ''),
+                 'restored_from': version.get('restored_from')}
+                for version in self.versions]
+
+    def text(self, number: int) -> Tuple[str, str]:
+        """(description, description_html) of version `number`"""
+        index = number - 1
+        if index in self._texts:
+            return self._texts[index]
+
+        versions = self.versions
+        if not 0 <= index < len(versions):
+            raise IndexError(f"No version #{number}")
+
+        # Nearest newer version already known; the newest one is stored in full
+        known = index
+        while known not in self._texts and known < len(versions) - 1:
+            known += 1
+        if known not in self._texts:
+            self._texts[known] = tuple(versions[known].get(field) or '' for field in FIELDS)
+
+        while known > index:
+            known -= 1
+            newer = self._texts[known + 1]
+            self._texts[known] = tuple(
+                value if isinstance(value, str) else apply_delta(newer_value, value or [])
+                for value, newer_value in zip((versions[known].get(field) for field in FIELDS), newer))
+        return self._texts[index]
+
+    def append(self, description: str, description_html: str, user: str, timestamp: str,
+               restored_from: Optional[str] = None):
+        """Record a superseded description and save. Raises OSError.
+
+        The store is read again under its lock, so versions another GUI
+        appended since this one loaded it are kept.
+        """
+        with self._locked():
+            self._add(description, description_html, user, timestamp, restored_from)
+            self.save()
+
+    def _add(self, description: str, description_html: str, user: str, timestamp: str,
+             restored_from: Optional[str] = None):
+        versions = self.versions
+        if versions:
+            # The previous newest version becomes a delta against this one
+            last = len(versions) - 1
+            for field, old, new in zip(FIELDS, self.text(last + 1), (description, description_html)):
+                versions[last][field] = make_delta(new, old)
+
+        entry = {'timestamp': timestamp, 'user': user,
+                 'description': description, 'description_html': description_html}
+        if restored_from:
+            entry['restored_from'] = restored_from
+        versions.append(entry)
+        self._texts[len(versions) - 1] = (description, description_html)
+
+    def import_inline(self, issue_data: dict) -> bool:
+        """
+        Move a legacy 'description_history' list out of the issue data into
+        this store (saving it)
+
+        Returns:
+            True if issue_data changed and should be written back
+        """
+        inline = issue_data.pop('description_history', None)
+        if inline is None:
+            return False
+        if inline:
+            with self._locked():
+                for entry in inline:
+                    self._add(entry.get('old_description') or '', entry.get('old_description_html') or '',
+                              entry.get('user', ''), entry.get('timestamp', ''), entry.get('restored_from'))
+                self.save()
+        return True
+
+    @contextmanager
+    def _locked(self):
+        """Hold <id>.json.lock (lockf, as IssueSequence does) and reload the store
+
+        write_json_atomic replaces the store by rename, so the lock is taken on
+        a separate file that is never replaced.
+        """
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.lock', 'a+') as f:
+            if fcntl is not None:
+                fcntl.lockf(f.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+            self._versions = None
+            self._texts.clear()
+            yield
+
+    def save(self):
+        """Write the store. Raises OSError."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        write_json_atomic(self.path, {'versions': self.versions})
+
+
+if __name__ == "__main__":
+    # Self-check / size comparison: python -m ftrack_casino.history [--edits N]
+    import argparse
+    import random
+    import tempfile
+    import time
+
+    import yaml
+
+    parser = argparse.ArgumentParser(description="Reverse-delta history vs. inline YAML copies")
+    parser.add_argument("--edits", type=int, default=200, help="Description edits to simulate")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    lines = [f"<p>Setup violation {i} on clk_core after route, slack -0.{i:03d}ns</p>\n" for i in range(300)]
+    texts = []
+    for _ in range(args.edits + 1):
+        for _ in range(rng.randint(1, 4)):
+            op = rng.random()
+            pos = rng.randrange(len(lines))
+            if op < 0.4:
+                lines.insert(pos, f"<p>Note {rng.random():.6f}</p>\n")
+            elif op < 0.7 and len(lines) > 10:
+                del lines[pos]
+            else:
+                lines[pos] = lines[pos].replace("after", "before")
+        texts.append(''.join(lines))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        inline = [{'timestamp': f"2025-01-01 00:00:{n % 60:02d}", 'user': 'user1',
+                   'old_description': text, 'old_description_html': text} for n, text in enumerate(texts[:-1])]
+        issue_data = {'id': '0001_20250101_000000', 'description': texts[-1], 'description_history': inline}
+        yaml_path = os.path.join(work_dir, "0001_20250101_000000.yaml")
+        with open(yaml_path, 'w') as f:
+            yaml.safe_dump(issue_data, f)
+        inline_size = os.path.getsize(yaml_path)
+
+        start = time.perf_counter()
+        history = DescriptionHistory.for_issue(yaml_path, issue_data['id'])
+        assert history.import_inline(issue_data) and 'description_history' not in issue_data
+        elapsed = time.perf_counter() - start
+        print(f"{args.edits} versions: inline YAML {inline_size / 1024:.0f} KB, "
+              f"delta store {os.path.getsize(history.path) / 1024:.0f} KB (import {elapsed * 1000:.0f} ms)")
+
+        reloaded = DescriptionHistory(history.path)
+        start = time.perf_counter()
+        for number in range(len(reloaded), 0, -1):
+            assert reloaded.text(number) == (texts[number - 1], texts[number - 1]), number
+        print(f"rebuild all versions: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        reloaded.append(texts[-1], '', 'user2', '2025-01-02 00:00:00', restored_from="Version #1")
+        again = DescriptionHistory(history.path)
+        assert len(again) == args.edits + 1 and again.text(1)[0] == texts[0]
+        assert again.text(len(again)) == (texts[-1], '') and again.entries()[-1]['restored_from']
+
+        # A store loaded before another writer appended keeps that writer's version
+        stale = DescriptionHistory(history.path)
+        len(stale)
+        again.append('second', '', 'user3', '2025-01-03 00:00:00')
+        stale.append('third', '', 'user4', '2025-01-04 00:00:00')
+        final = DescriptionHistory(history.path)
+        assert [entry['user'] for entry in final.entries()[-2:]] == ['user3', 'user4']
+        assert final.text(len(final) - 1)[0] == 'second' and final.text(len(final))[0] == 'third'
+    print("self-check ok")
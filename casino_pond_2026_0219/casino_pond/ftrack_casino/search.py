@@ -11,9 +11,29 @@ Supports:
 import re
 import json
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
 
+# Query field -> issues column
+FIELD_COLUMNS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'status': 'status',
+    'severity': 'severity',
+    'stage': 'stage',
+    'assignee': 'assignee',
+    'assigner': 'assigner',
+    'run_id': 'run_id',
+    'modules': 'modules',
+    'blocks': 'modules',
+    'created': 'created_at',
+    'due': 'due_date',
+}
+
+# Columns with an index (see IssueDatabase.create_schema)
+INDEXED_COLUMNS = {'status', 'severity', 'stage', 'assignee'}
+
 
 class AdvancedSearch:
     """Enhanced search with query builder and presets"""
@@ -105,21 +125,30 @@ class AdvancedSearch:
 
         return keyword
 
-    def search(self, query: str, current_user: str = None) -> List[Dict[str, Any]]:
+    def search(self, query: str, current_user: str = None,
+               limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
         """
-        Execute search query
+        Execute search query as a single SQL statement
 
         Args:
             query: Search query string
             current_user: Current username (for 'assignee:me')
+            limit: Page size (None for all matches)
+            offset: Number of matches to skip, for paging
 
         Returns:
-            List of matching issues
+            List of matching issues, ranked by relevance for text searches
+            and newest first otherwise
         """
-        if not query.strip():
-            # Return all issues if no query
-            return self.db.filter_issues()
+        conditions, params, text_query = self.compile_query(self._parse(query, current_user))
+        return self.db.select_issues(conditions, params, text_query, limit=limit, offset=offset)
+
+    def count(self, query: str, current_user: str = None) -> int:
+        """Total number of issues matching a query, for paging"""
+        conditions, params, text_query = self.compile_query(self._parse(query, current_user))
+        return self.db.count_issues(conditions, params, text_query)
 
+    def _parse(self, query: str, current_user: Optional[str]) -> Dict[str, Any]:
         parsed = self.parse_query(query)
 
         # Handle special 'me' keyword
@@ -128,64 +157,74 @@ class AdvancedSearch:
                 current_user if v == 'me' else v
                 for v in parsed['filters']['assignee']
             ]
+        return parsed
 
-        # Start with full-text search if present
-        if parsed['text_search']:
-            text_query = ' '.join(parsed['text_search'])
-            results = self.db.search_issues(text_query)
-        else:
-            results = self.db.filter_issues()
-
-        # Apply field filters
-        results = self._apply_filters(results, parsed)
-
-        return results
-
-    def _apply_filters(self, issues: List[Dict[str, Any]],
-                       parsed: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Apply parsed filters to issue list"""
-        filtered = []
-
-        for issue in issues:
-            match = True
-
-            # Check field filters
-            for field, values in parsed['filters'].items():
-                issue_value = issue.get(field, '')
-                if isinstance(issue_value, list):
-                    # For modules field (JSON array)
-                    issue_value = ' '.join(issue_value)
+    def compile_query(self, parsed: Dict[str, Any]) -> Tuple[List[str], List[Any], Optional[str]]:
+        """
+        Translate parse_query() output into IssueDatabase.select_issues() arguments
 
-                # Match any of the values (OR within field)
-                if not any(str(v).lower() in str(issue_value).lower() for v in values):
-                    match = False
-                    break
+        Field values match case-insensitively as substrings; several values for
+        one field are ORed and fields are ANDed. On indexed columns the values
+        are first matched against the column's distinct values so the filter
+        becomes an index lookup. Date comparisons are made on the stored
+        'YYYY-MM-DD ...' text, which the created_at/due_date indexes serve;
+        issues without the date are not filtered out.
 
-            # Check date filters
-            for field, comparisons in parsed['date_filters'].items():
-                issue_date_str = issue.get(field)
-                if not issue_date_str:
-                    continue
+        Returns:
+            (conditions, params, FTS5 query or None)
+        """
+        conditions = []
+        params = []
+        text_terms = list(parsed['text_search'])
+
+        for field, values in parsed['filters'].items():
+            field = field.lower()
+            if field == 'text':
+                text_terms.extend(values)
+                continue
+            column = FIELD_COLUMNS.get(field)
+            if column is None:
+                return ["0"], [], None  # Unknown field: no issue has it
+
+            needles = [str(v).lower() for v in values]
+            if column in INDEXED_COLUMNS:
+                matches = [value for value in self.db.distinct_values(column)
+                           if value is not None and any(n in str(value).lower() for n in needles)]
+                if not matches:
+                    return ["0"], [], None
+                conditions.append(f"issues.{column} IN ({', '.join('?' * len(matches))})")
+                params.extend(matches)
+            else:
+                conditions.append("(" + " OR ".join(f"instr(lower(issues.{column}), ?) > 0"
+                                                    for _ in needles) + ")")
+                params.extend(needles)
 
+        for field, comparisons in parsed['date_filters'].items():
+            column = FIELD_COLUMNS[field]
+            for operator, date_str in comparisons:
                 try:
-                    issue_date = datetime.fromisoformat(issue_date_str.split()[0])
-
-                    for operator, date_str in comparisons:
-                        compare_date = datetime.fromisoformat(date_str)
-
-                        if operator == '<' and issue_date >= compare_date:
-                            match = False
-                            break
-                        elif operator == '>' and issue_date <= compare_date:
-                            match = False
-                            break
-                except (ValueError, AttributeError):
-                    pass
-
-            if match:
-                filtered.append(issue)
-
-        return filtered
+                    date = datetime.fromisoformat(self._parse_date_keyword(date_str)).date()
+                except ValueError:
+                    continue  # Not a date: filters nothing
+                if operator == '<':
+                    condition, bound = f"issues.{column} < ?", date
+                else:
+                    condition, bound = f"issues.{column} >= ?", date + timedelta(days=1)
+                conditions.append(f"({condition} OR issues.{column} IS NULL OR issues.{column} = '')")
+                params.append(bound.isoformat())
+
+        return conditions, params, self._fts_query(text_terms)
+
+    @staticmethod
+    def _fts_query(texts: List[str]) -> Optional[str]:
+        """FTS5 query matching every word and "quoted phrase", FTS syntax taken literally"""
+        phrases = []
+        for text in texts:
+            for quoted, word in re.findall(r'"([^"]*)"|(\S+)', text):
+                phrase = quoted or word
+                if phrase:
+                    phrases.append('"' + phrase.replace('"', '""') + '"')
+        return ' '.join(phrases) or None
 
     def get_quick_filters(self, current_user: str = None) -> Dict[str, str]:
         """
@@ -0,0 +1,558 @@
+"""
+Shared-server mode for FastTrack
+
+One server process per project owns the FastTrack directory and its
+issues.db:
+
+    python -m ftrack_casino.server /proj/chip/FastTrack [--host HOST] [--port N]
+
+It is the only process that writes the index and the only one that syncs the
+directory. Writes from all clients that arrive within BATCH_WINDOW share one
+sync transaction, and every connected GUI is pushed the rows that changed so
+it can refresh only those. GUIs started through launch_ftrack() connect when
+a server is running and otherwise work on the files directly, as before.
+
+Protocol: newline-delimited JSON over TCP. The server publishes its address
+and a random token in <FastTrack>/.ftrack_server; a client must present the
+token, so only users who can read the project directory can connect.
+"""
+
+import os
+import json
+import queue
+import shutil
+import socket
+import logging
+import secrets
+import itertools
+import threading
+import socketserver
+import struct
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .database import IssueDatabase
+from .storage import IssueSequence, write_json_atomic, write_yaml_atomic
+
+SERVER_FILE = '.ftrack_server'
+BATCH_WINDOW = 0.05  # Seconds a write waits for others to share its transaction
+MAX_BATCH = 256
+RESYNC_INTERVAL = 30.0  # Seconds between syncs of edits made without the server
+CONNECT_TIMEOUT = 2.0
+REQUEST_TIMEOUT = 30.0
+SEND_TIMEOUT = 5.0  # A client that stops reading for this long is dropped
+
+# IssueDatabase methods clients may call; everything else is refused
+READ_METHODS = frozenset({
+    'filter_issues', 'get_issue', 'get_status_summary', 'get_assignee_workload',
+    'select_issues', 'count_issues', 'distinct_values', 'search_issues',
+    'get_attachments', 'get_activity', 'get_overdue_issues',
+})
+WRITE_OPS = frozenset({'save_issue', 'move', 'reserve_number'})
+
+_LOOPBACK = {'127.0.0.1', 'localhost', '::1'}
+
+
+class ServerError(Exception):
+    """The server refused or failed a request"""
+
+
+def _send(sock: socket.socket, lock: threading.Lock, message: Dict[str, Any]):
+    data = (json.dumps(message, ensure_ascii=False, separators=(',', ':'), default=str) + '\n').encode('utf-8')
+    with lock:
+        sock.sendall(data)
+
+
+class _Connection:
+    """A connected client as seen by the server
+
+    Sends happen on the database thread, so they are bounded by SEND_TIMEOUT
+    (SO_SNDTIMEO; reads stay blocking): a client that stops reading - a
+    suspended GUI, a full socket buffer - is disconnected instead of stalling
+    every other client's writes.
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.lock = threading.Lock()  # Replies and notifications share the socket
+        self.closed = False
+        seconds = int(SEND_TIMEOUT)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDTIMEO,
+                        struct.pack('ll', seconds, int((SEND_TIMEOUT - seconds) * 1e6)))
+
+    def send(self, message: Dict[str, Any]) -> bool:
+        if self.closed:
+            return False
+        try:
+            _send(self.sock, self.lock, message)
+            return True
+        except OSError:  # Timed out (possibly mid-message) or gone
+            self.close()
+            return False
+
+    def close(self):
+        """Disconnect; the connection's reader sees EOF and deregisters it"""
+        self.closed = True
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Reads one client's requests and queues them for the database thread"""
+
+    def handle(self):
+        server: 'IssueServer' = self.server.issue_server
+        conn = _Connection(self.request)
+        authenticated = False
+        try:
+            for line in self.rfile:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    break
+                if not authenticated:
+                    if (message.get('op') != 'hello'
+                            or not secrets.compare_digest(str(message.get('token', '')), server.token)):
+                        conn.send({'id': message.get('id'), 'error': 'Invalid token'})
+                        break
+                    authenticated = True
+                    server.add_client(conn)
+                    conn.send({'id': message.get('id'), 'result': {'seq': server.seq}})
+                    continue
+                server.submit(message, conn)
+        except OSError:
+            pass
+        finally:
+            server.remove_client(conn)
+
+
+class _TCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class IssueServer:
+    """Single writer for one FastTrack directory, serving GUI clients
+
+    Connection threads only parse requests; a single database thread owns
+    the IssueDatabase (SQLite connections are thread-bound) and works
+    through the request queue in batches.
+    """
+
+    def __init__(self, fast_dir: str, host: str = '127.0.0.1', port: int = 0):
+        self.fast_dir = os.path.realpath(fast_dir)
+        self.deleted_dir = os.path.join(self.fast_dir, 'deleted_issues')
+        self.db_path = os.path.join(self.fast_dir, 'issues.db')
+        self.info_path = os.path.join(self.fast_dir, SERVER_FILE)
+        self.token = secrets.token_hex(16)
+        self.seq = 0  # Change notifications sent
+        self.stats = {'writes': 0, 'transactions': 0}
+
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], _Connection]]]" = queue.Queue()
+        self._clients: List[_Connection] = []
+        self._clients_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._db_thread: Optional[threading.Thread] = None
+        self.db: Optional[IssueDatabase] = None
+
+        self._tcp = _TCPServer((host, port), _Handler, bind_and_activate=True)
+        self._tcp.issue_server = self
+        self.host, self.port = self._tcp.server_address[:2]
+        if host in ('', '0.0.0.0', '::'):
+            self.host = socket.getfqdn()
+
+    # Lifecycle
+
+    def start(self):
+        """Open the index, publish the address and serve on background threads"""
+        if ServerClient.connect(self.fast_dir) is not None:
+            raise RuntimeError(f"A FastTrack server is already running for {self.fast_dir}")
+        self._db_thread = threading.Thread(target=self._run_db, name='ftrack-server-db', daemon=True)
+        self._db_thread.start()
+        self._ready.wait()
+        write_json_atomic(self.info_path, {
+            'host': self.host, 'port': self.port, 'hostname': socket.gethostname(),
+            'token': self.token, 'pid': os.getpid(), 'db_path': self.db_path,
+        })
+        threading.Thread(target=self._tcp.serve_forever, name='ftrack-server', daemon=True).start()
+        logging.info(f"FastTrack server for {self.fast_dir} listening on {self.host}:{self.port}")
+
+    def serve_forever(self):
+        self.start()
+        try:
+            while self._db_thread.is_alive():
+                self._db_thread.join(1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        self._tcp.shutdown()
+        self._tcp.server_close()
+        self._queue.put(None)
+        if self._db_thread is not None:
+            self._db_thread.join()
+        with self._clients_lock:
+            clients, self._clients = self._clients, []
+        for conn in clients:  # Clients fall back to direct file access
+            conn.close()
+        try:
+            with open(self.info_path, 'r') as f:
+                if json.load(f).get('token') == self.token:
+                    os.unlink(self.info_path)
+        except (OSError, ValueError):
+            pass
+
+    # Connections (called on connection threads)
+
+    def add_client(self, conn: _Connection):
+        with self._clients_lock:
+            self._clients.append(conn)
+
+    def remove_client(self, conn: _Connection):
+        with self._clients_lock:
+            if conn in self._clients:
+                self._clients.remove(conn)
+
+    def submit(self, message: Dict[str, Any], conn: _Connection):
+        self._queue.put((message, conn))
+
+    def _broadcast(self, message: Dict[str, Any]):
+        with self._clients_lock:
+            clients = list(self._clients)
+        for conn in clients:
+            if not conn.send(message):
+                self.remove_client(conn)
+
+    # Database thread
+
+    def _run_db(self):
+        self.db = IssueDatabase(self.db_path)
+        self._sync_and_notify()
+        self._ready.set()
+        try:
+            while True:
+                try:
+                    first = self._queue.get(timeout=RESYNC_INTERVAL)
+                except queue.Empty:
+                    self._sync_and_notify()  # Edits by GUIs running without the server
+                    continue
+                if first is None:
+                    return
+                batch = [first]
+                # A write waits briefly so concurrent writes share its transaction
+                deadline = time.monotonic() + (BATCH_WINDOW if first[0].get('op') in WRITE_OPS else 0)
+                while len(batch) < MAX_BATCH:
+                    remaining = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self._queue.put(None)  # Stop after this batch
+                        break
+                    batch.append(item)
+                self._process(batch)
+        finally:
+            self.db.close()
+
+    def _process(self, batch: List[Tuple[Dict[str, Any], _Connection]]):
+        replies = []
+        wrote = False
+        for message, conn in batch:
+            op = message.get('op')
+            try:
+                if op in WRITE_OPS:
+                    result = self._apply_write(op, message)
+                    wrote = wrote or op != 'reserve_number'
+                elif op == 'call' and message.get('method') in READ_METHODS:
+                    continue  # Answered after the writes of this batch are indexed
+                else:
+                    raise ServerError(f"Unknown request: {op} {message.get('method', '')}".strip())
+                replies.append((conn, {'id': message.get('id'), 'result': result}))
+            except Exception as e:
+                replies.append((conn, {'id': message.get('id'), 'error': str(e)}))
+
+        if wrote:
+            self._sync_and_notify()  # One transaction for every write in the batch
+        for conn, reply in replies:
+            conn.send(reply)
+
+        for message, conn in batch:
+            if message.get('op') != 'call' or message.get('method') not in READ_METHODS:
+                continue
+            try:
+                method = getattr(self.db, message['method'])
+                reply = {'id': message.get('id'),
+                         'result': method(*message.get('args', []), **message.get('kwargs', {}))}
+            except Exception as e:
+                reply = {'id': message.get('id'), 'error': str(e)}
+            conn.send(reply)
+
+    def _apply_write(self, op: str, message: Dict[str, Any]) -> Any:
+        self.stats['writes'] += 1
+        if op == 'reserve_number':
+            return IssueSequence(self.fast_dir, self.deleted_dir).reserve()
+        if op == 'save_issue':
+            write_yaml_atomic(self._checked_path(message['path']), message['data'])
+            return None
+        # 'move': [[source, destination], ...], replacing destination directories
+        for source, destination in message['moves']:
+            source, destination = self._checked_path(source), self._checked_path(destination)
+            if os.path.isdir(destination):
+                shutil.rmtree(destination)
+            shutil.move(source, destination)
+        return None
+
+    def _checked_path(self, path: str) -> str:
+        """path, refused unless it is inside the FastTrack directory"""
+        real = os.path.realpath(path)
+        if not real.startswith(self.fast_dir + os.sep):
+            raise ServerError(f"Path outside the FastTrack directory: {path}")
+        return real
+
+    def _sync_and_notify(self):
+        try:
+            self.db.sync_from_yaml(self.fast_dir)
+        except Exception as e:
+            logging.error(f"Failed to sync issue index: {e}")
+            return
+        self.stats['transactions'] += 1
+        updated_ids, removed = self.db.last_sync_changes
+        if not updated_ids and not removed:
+            return
+        self.seq += 1
+        updated = [row for row in (self.db.get_issue(issue_id) for issue_id in updated_ids) if row]
+        self._broadcast({'event': 'changed', 'seq': self.seq, 'updated': updated, 'removed': removed})
+
+
+class ServerClient:
+    """A GUI's connection to the project's IssueServer
+
+    Requests may come from any thread. Change notifications are passed to
+    on_change(message) on the client's reader thread; message has 'seq',
+    'updated' (issue rows as in the index) and 'removed' (YAML paths).
+    """
+
+    def __init__(self, sock: socket.socket, info: Dict[str, Any]):
+        self.info = info
+        self.db_path = info.get('db_path')
+        self.connected = True
+        self.on_change: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._sock = sock
+        self._send_lock = threading.Lock()
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        threading.Thread(target=self._read_loop, name='ftrack-server-client', daemon=True).start()
+
+    @classmethod
+    def connect(cls, fast_dir: str, timeout: float = CONNECT_TIMEOUT) -> Optional['ServerClient']:
+        """Client for the server running on fast_dir, or None when there is none"""
+        try:
+            with open(os.path.join(fast_dir, SERVER_FILE), 'r') as f:
+                info = json.load(f)
+            host, port = info['host'], info['port']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if host in _LOOPBACK and info.get('hostname') != socket.gethostname():
+            return None  # Listening on another machine's loopback
+
+        try:
+            sock = socket.create_connection((host, port), timeout=timeout)
+            sock.settimeout(None)
+        except OSError:
+            return None  # Stale file: the server is gone
+        client = cls(sock, info)
+        try:
+            client.request('hello', timeout=timeout, token=info.get('token'))
+        except (ConnectionError, ServerError):
+            client.close()
+            return None
+        return client
+
+    def request(self, op: str, timeout: float = REQUEST_TIMEOUT, **payload) -> Any:
+        """Send a request and wait for its result. Raises ServerError or ConnectionError."""
+        if not self.connected:
+            raise ConnectionError("Not connected to the FastTrack server")
+        req_id = next(self._ids)
+        future = Future()
+        self._pending[req_id] = future
+        try:
+            _send(self._sock, self._send_lock, {'id': req_id, 'op': op, **payload})
+            return future.result(timeout)
+        except OSError as e:
+            self._disconnected()
+            raise ConnectionError(f"Lost connection to the FastTrack server: {e}") from e
+        except FutureTimeout:
+            raise ConnectionError("The FastTrack server did not answer") from None
+        finally:
+            self._pending.pop(req_id, None)
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """Run a read-only IssueDatabase method on the server's index"""
+        return self.request('call', method=method, args=args, kwargs=kwargs)
+
+    def save_issue(self, path: str, data: Dict[str, Any]):
+        """Write an issue YAML atomically; indexed before this returns"""
+        self.request('save_issue', path=path, data=data)
+
+    def move(self, moves: List[Tuple[str, str]]):
+        """Move files/directories inside FastTrack (issue delete/restore)"""
+        self.request('move', moves=[list(move) for move in moves])
+
+    def reserve_number(self) -> int:
+        return self.request('reserve_number')
+
+    def close(self):
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._disconnected()
+
+    def _read_loop(self):
+        try:
+            for line in self._sock.makefile('rb'):
+                message = json.loads(line)
+                if 'event' in message:
+                    if self.on_change is not None:
+                        try:
+                            self.on_change(message)
+                        except Exception as e:
+                            logging.error(f"Error handling FastTrack change notification: {e}")
+                    continue
+                future = self._pending.get(message.get('id'))
+                if future is None:
+                    continue
+                if 'error' in message:
+                    future.set_exception(ServerError(message['error']))
+                else:
+                    future.set_result(message.get('result'))
+        except (OSError, ValueError):
+            pass
+        self._disconnected()
+
+    def _disconnected(self):
+        self.connected = False
+        for future in list(self._pending.values()):
+            if not future.done():
+                future.set_exception(ConnectionError("Lost connection to the FastTrack server"))
+
+
+class RemoteIssueDatabase:
+    """The read side of IssueDatabase, answered by the server
+
+    Once the server is gone, calls go to fallback() - a direct IssueDatabase.
+    """
+
+    def __init__(self, client: ServerClient, fallback: Callable[[], IssueDatabase]):
+        self.client = client
+        self.fallback = fallback
+        self.db_path = client.db_path
+
+    def __getattr__(self, name: str):
+        if name not in READ_METHODS:
+            raise AttributeError(name)
+
+        def call(*args, **kwargs):
+            if self.client.connected:
+                try:
+                    return self.client.call(name, *args, **kwargs)
+                except ConnectionError as e:
+                    logging.warning(f"{e}; using the FastTrack files directly")
+            return getattr(self.fallback(), name)(*args, **kwargs)
+        return call
+
+
+def _selftest_client(fast_dir: str, client_no: int, issues: int) -> Dict[str, Any]:
+    """One simulated GUI: create issues, change their status, count notifications"""
+    client = ServerClient.connect(fast_dir)
+    if client is None:
+        return {'error': 'could not connect'}
+    notified = []
+    client.on_change = lambda message: notified.append(message['seq'])
+
+    numbers = []
+    start = time.perf_counter()
+    for n in range(issues):
+        number = client.reserve_number()
+        numbers.append(number)
+        issue_id = f"{number:04d}_20250101_{client_no:03d}{n:03d}"
+        data = {'id': issue_id, 'title': f"Client {client_no} issue {n}", 'description': 'x',
+                'severity': 'Major', 'stage': 'route', 'modules': ['cpu'], 'assignee': f'user{client_no}',
+                'assigner': 'lead', 'status': 'Open', 'created_at': '2025-01-01 10:00:00',
+                'due_date': '2025-03-01', 'run_id': '', 'attachments': []}
+        path = os.path.join(fast_dir, f"{issue_id}.yaml")
+        client.save_issue(path, data)
+        data['status'] = 'In Progress'
+        client.save_issue(path, data)
+        # Read-your-writes: the index already has the new status
+        assert client.call('get_issue', issue_id)['status'] == 'In Progress'
+    elapsed = time.perf_counter() - start
+    time.sleep(0.5)  # Let notifications for the last writes arrive
+    mine = client.call('filter_issues', assignee=f'user{client_no}')
+    client.close()
+    return {'numbers': numbers, 'indexed': len(mine), 'notifications': len(notified), 'seconds': elapsed}
+
+
+def run_selftest(clients: int = 6, issues: int = 25):
+    """Serve a temporary project and hammer it from several client processes"""
+    import multiprocessing
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        fast_dir = os.path.join(work_dir, 'FastTrack')
+        os.makedirs(os.path.join(fast_dir, 'deleted_issues'))
+        server = IssueServer(fast_dir)
+        server.start()
+        try:
+            with multiprocessing.get_context('spawn').Pool(clients) as pool:
+                results = pool.starmap(_selftest_client, [(fast_dir, n, issues) for n in range(clients)])
+            total = server.stats['writes']
+            transactions = server.stats['transactions']
+            db = IssueDatabase(server.db_path)
+            indexed = db.count_issues()
+            db.close()
+        finally:
+            server.shutdown()
+
+        for result in results:
+            assert 'error' not in result, result
+        numbers = [number for result in results for number in result['numbers']]
+        assert len(numbers) == len(set(numbers)) == clients * issues, "duplicate issue numbers"
+        assert indexed == clients * issues, indexed
+        assert all(result['indexed'] == issues for result in results)
+        assert all(result['notifications'] > 0 for result in results)
+        assert not os.path.exists(os.path.join(fast_dir, SERVER_FILE))
+        slowest = max(result['seconds'] for result in results)
+        print(f"{clients} clients x {issues} issues: {total} writes in {transactions} sync transactions, "
+              f"slowest client {slowest:.2f}s, "
+              f"notifications per client {min(r['notifications'] for r in results)}-"
+              f"{max(r['notifications'] for r in results)}")
+    print("self-check ok")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="FastTrack shared server")
+    parser.add_argument("fast_dir", nargs='?', help="Project FastTrack directory")
+    parser.add_argument("--host", default='127.0.0.1',
+                        help="Interface to listen on ('' for all, to serve GUIs on other hosts)")
+    parser.add_argument("--port", type=int, default=0, help="TCP port (default: any free port)")
+    parser.add_argument("--selftest", type=int, metavar="CLIENTS",
+                        help="Run concurrent simulated clients against a temporary project")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.selftest:
+        run_selftest(args.selftest)
+    elif args.fast_dir:
+        IssueServer(args.fast_dir, args.host, args.port).serve_forever()
+    else:
+        parser.error("fast_dir is required")
@@ -0,0 +1,134 @@
+"""
+Shared-directory storage helpers for FastTrack
+
+The FastTrack directory is shared by every engineer on a project (usually
+over NFS), so anything that allocates or rewrites files there must be safe
+against concurrent writers:
+- IssueSequence hands out issue numbers from a lock-protected counter file
+- write_yaml_atomic / write_json_atomic replace a file with a temp file + rename
+"""
+
+import os
+import json
+import logging
+import tempfile
+from typing import Any, Callable, Optional, TextIO
+
+import yaml
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; reservations are then unlocked
+    fcntl = None
+
+SEQUENCE_FILE = '.issue_sequence'
+MAX_ISSUE_NUMBER = 9999  # Issue IDs carry a 4-digit number
+
+# Mode for newly created files, as open() would give them
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+_NEW_FILE_MODE = 0o666 & ~_UMASK
+
+
+def _issue_number(file_name: str) -> Optional[int]:
+    """4-digit number of an issue file name ('0019_...yaml' or 'deleted_0019_...yaml')"""
+    if not file_name.endswith('.yaml'):
+        return None
+    parts = file_name.split('_')
+    num_str = parts[1] if parts[0] == 'deleted' and len(parts) > 1 else parts[0]
+    if num_str.isdigit() and len(num_str) == 4:
+        return int(num_str)
+    return None
+
+
+class IssueSequence:
+    """Next-issue-number counter stored in <fast_dir>/.issue_sequence
+
+    reserve() reads, increments and rewrites the counter under a POSIX
+    record lock (lockf, which NFS honours across clients), so simultaneous
+    submissions get distinct numbers without listing any directory. The
+    counter is seeded once from the highest number among existing and
+    deleted issue files.
+    """
+
+    def __init__(self, fast_dir: str, deleted_dir: Optional[str] = None):
+        self.fast_dir = fast_dir
+        self.deleted_dir = deleted_dir
+        self.path = os.path.join(fast_dir, SEQUENCE_FILE)
+
+    def reserve(self) -> int:
+        """Reserve and return the next issue number (1-9999). Raises OSError."""
+        os.makedirs(self.fast_dir, exist_ok=True)
+        with open(self.path, 'a+') as f:
+            if fcntl is not None:
+                fcntl.lockf(f.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+            f.seek(0)
+            content = f.read().strip()
+            last = int(content) if content.isdigit() else self._highest_existing()
+
+            next_num = last + 1
+            if next_num > MAX_ISSUE_NUMBER:
+                logging.error(f"Issue number {next_num} out of range, resetting to 1")
+                next_num = 1
+
+            f.seek(0)
+            f.truncate()
+            f.write(f"{next_num}\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return next_num
+
+    def _highest_existing(self) -> int:
+        """Highest issue number on disk (the one-time seed), 0 if none"""
+        highest = 0
+        for directory in (self.fast_dir, self.deleted_dir):
+            if not directory or not os.path.isdir(directory):
+                continue
+            for fn in os.listdir(directory):
+                number = _issue_number(fn)
+                if number is not None:
+                    highest = max(highest, number)
+        logging.info(f"Seeded issue sequence from existing files: {highest}")
+        return highest
+
+
+def write_yaml_atomic(path: str, data: Any):
+    """
+    Write data as YAML so readers see either the old or the new file
+
+    Raises OSError or yaml.YAMLError.
+    """
+    _write_atomic(path, lambda f: yaml.safe_dump(data, f))
+
+
+def write_json_atomic(path: str, data: Any):
+    """Write data as compact JSON, atomically as write_yaml_atomic. Raises OSError."""
+    _write_atomic(path, lambda f: json.dump(data, f, ensure_ascii=False, separators=(',', ':')))
+
+
+def _write_atomic(path: str, write: Callable[[TextIO], None]):
+    """
+    Replace path with whatever write() puts in a temp file
+
+    The temp file lives in the same directory (so the rename is atomic) and is
+    hidden, so directory scans for '*.yaml' never pick it up.
+    """
+    directory, name = os.path.split(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory or '.', prefix=f'.{name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = _NEW_FILE_MODE  # mkstemp creates 0600; other users must read issues
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
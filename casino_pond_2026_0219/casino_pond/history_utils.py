@@ -13,7 +13,11 @@ from typing import Optional, Tuple
 import json
 import getpass
 import os
-import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then unlocked
+    fcntl = None
 
 
 def add_history_entry(
@@ -26,8 +30,10 @@ def add_history_entry(
     """
     Add a history entry to the user's directory history file.
 
-    This function updates the .directory_history_{user}.json file that
-    the Tree Manager uses to display recent operations in the GUI.
+    This function appends one record to the .directory_history_{user}.jsonl
+    journal that the Tree Manager uses to display recent operations in the
+    GUI. The append is made under a file lock, so it is safe while the Tree
+    Manager is running; the Tree Manager compacts the journal itself.
 
     Args:
         operation: Type of operation. Supported values:
@@ -56,7 +62,7 @@ def add_history_entry(
         ...     details="Created run directory: v1.0"
         ... )
         >>> print(msg)
-        History updated: /project/.directory_history_user.json
+        History updated: /project/.directory_history_user.jsonl
     """
     try:
         current_user = getpass.getuser()
@@ -74,25 +80,9 @@ def add_history_entry(
         if project_name is None:
             project_name = os.getenv('casino_prj_name', 'unknown')
 
-        # Determine history file location
-        # Format: .directory_history_{username}.json
-        history_file = project_base / f".directory_history_{current_user}.json"
-
-        # Load existing history or create new
-        if history_file.exists():
-            try:
-                with open(history_file, 'r', encoding='utf-8') as f:
-                    history_data = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                # Corrupted file - backup and start fresh
-                backup_file = history_file.with_suffix('.json.bak')
-                if history_file.exists():
-                    import shutil
-                    shutil.copy2(history_file, backup_file)
-                    print(f"Warning: Corrupted history file backed up to {backup_file}")
-                history_data = _create_new_history_data(current_user, project_base, project_name)
-        else:
-            history_data = _create_new_history_data(current_user, project_base, project_name)
+        # Determine history journal location
+        # Format: .directory_history_{username}.jsonl
+        history_file = project_base / f".directory_history_{current_user}.jsonl"
 
         # Create new history entry
         new_entry = {
@@ -103,20 +93,21 @@ def add_history_entry(
             'user': current_user
         }
 
-        # Add to history list
-        history_data['history'].append(new_entry)
-        history_data['current_index'] = len(history_data['history']) - 1
-        history_data['saved_at'] = datetime.now().isoformat()
-
-        # Trim history if too long (keep last 50 entries)
-        max_history = 50
-        if len(history_data['history']) > max_history:
-            removed = len(history_data['history']) - max_history
-            history_data['history'] = history_data['history'][removed:]
-            history_data['current_index'] -= removed
+        # A new journal is seeded with the pre-journal .json history, if any
+        def initial_records():
+            legacy_file = history_file.with_suffix('.json')
+            if not legacy_file.exists():
+                return []
+            try:
+                with open(legacy_file, 'r', encoding='utf-8') as f:
+                    history_data = json.load(f)
+            except (json.JSONDecodeError, IOError):
+                print(f"Warning: Corrupted history file {legacy_file} not imported")
+                return []
+            return [dict(history_data, op='snapshot')]
 
-        # Save updated history (atomic write to prevent corruption)
-        _save_history_atomic(history_file, history_data)
+        # Appended entries go to the end of the history (the Tree Manager trims it to 50)
+        _append_history_records(history_file, [{'op': 'add', 'entry': new_entry}], initial_records)
 
         return True, f"History updated: {history_file}"
 
@@ -126,50 +117,50 @@ def add_history_entry(
         return False, f"Failed to update history: {e}"
 
 
-def _create_new_history_data(user: str, project_base: Path, project_name: str) -> dict:
-    """
-    Create a new history data structure.
-
-    Args:
-        user: Username
-        project_base: Project base directory path
-        project_name: Project name
-
-    Returns:
-        Dictionary with initialized history structure
-    """
-    return {
-        'user': user,
-        'project_base': str(project_base),
-        'project_name': project_name,
-        'history': [],
-        'current_index': -1,
-        'version': '2.0'
-    }
-
-
-def _save_history_atomic(history_file: Path, history_data: dict):
+def _append_history_records(history_file: Path, records: list, initial_records=None):
     """
-    Save history file to trigger file watchers properly.
+    Append JSON-line records to the history journal under an exclusive lock.
 
-    Direct write (not atomic) to ensure QFileSystemWatcher detects the change.
+    Uses the same locking as the Tree Manager's journal: a POSIX lock on the
+    journal itself (honoured across NFS clients), re-acquired if the Tree
+    Manager compacted (replaced) the file while we were waiting.
 
     Args:
-        history_file: Path to the history file
-        history_data: History data dictionary to save
+        history_file: Path to the history journal
+        records: Records to append
+        initial_records: Optional callable returning records that seed an empty journal
 
     Raises:
-        IOError: If file cannot be written
+        IOError: If the journal cannot be written
     """
     # Ensure parent directory exists
     history_file.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        # Direct write to ensure file watcher triggers
-        with open(history_file, 'w', encoding='utf-8') as f:
-            json.dump(history_data, f, indent=2, ensure_ascii=False)
-            f.flush()
-            os.fsync(f.fileno())  # Force write to disk
+        while True:
+            f = open(history_file, 'ab+')
+            try:
+                if fcntl is not None:
+                    fcntl.lockf(f.fileno(), fcntl.LOCK_EX)
+                    st = os.fstat(f.fileno())
+                    try:
+                        current = os.stat(history_file)
+                    except FileNotFoundError:
+                        current = None
+                    if current is None or (current.st_dev, current.st_ino) != (st.st_dev, st.st_ino):
+                        continue  # Replaced by a compaction; lock the new file
+
+                lines = list(records)
+                if initial_records is not None and os.fstat(f.fileno()).st_size == 0:
+                    lines = list(initial_records()) + lines
+                f.seek(0, os.SEEK_END)
+                f.write(''.join(json.dumps(r, ensure_ascii=False, separators=(',', ':')) + '\n'
+                                for r in lines).encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())  # Force write to disk
+                return
+            finally:
+                f.close()
 
     except Exception as e:
         raise IOError(f"Failed to save history file: {e}")
@@ -263,7 +254,7 @@ if __name__ == "__main__":
     print("\nTest 3: History file location...")
     current_user = getpass.getuser()
     prj_base = Path(os.getenv('casino_prj_base', Path.home()))
-    history_file = prj_base / f".directory_history_{current_user}.json"
+    history_file = prj_base / f".directory_history_{current_user}.jsonl"
 
     print(f"  History file: {history_file}")
     print(f"  Exists: {history_file.exists()}")
@@ -271,12 +262,13 @@ if __name__ == "__main__":
     if history_file.exists():
         print(f"  Size: {history_file.stat().st_size} bytes")
 
-        # Show last 3 entries
-        with open(history_file, 'r') as f:
-            data = json.load(f)
-            print(f"  Total entries: {len(data['history'])}")
+        # Show last 3 appended entries
+        with open(history_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+            entries = [r['entry'] for r in records if r.get('op') == 'add']
+            print(f"  Journal records: {len(records)}")
             print("\n  Last 3 entries:")
-            for entry in data['history'][-3:]:
+            for entry in entries[-3:]:
                 print(f"    - {entry['operation']}: {entry.get('details', entry['path'])}")
 
     print("\n" + "=" * 70)
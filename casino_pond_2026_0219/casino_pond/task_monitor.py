@@ -6,6 +6,7 @@ import argparse
 import time
 import psutil
 import glob
+import re
 import shutil
 import sys
 from io import StringIO
@@ -137,6 +138,156 @@ class DisplayBuffer:
         sys.stdout.flush()
         self.lines = []
 
+class ScreenRenderer:
+    """Cursor-addressed renderer that only rewrites lines changed since the last frame"""
+    def __init__(self):
+        self.previous = []
+        self.size = None
+
+    def render(self, content: str):
+        """Diff the new frame against the previous one and emit minimal updates"""
+        size = shutil.get_terminal_size()
+        lines = content.split('\n')[:size.lines]
+        out = []
+
+        if size != self.size:
+            # Resized (or first frame): everything must be redrawn
+            out.append('\033[2J')
+            self.previous = []
+            self.size = size
+
+        for row, line in enumerate(lines):
+            if row >= len(self.previous) or self.previous[row] != line:
+                # Move to row, write, clear the rest of the old line
+                out.append(f'\033[{row + 1};1H{line}\033[K')
+
+        for row in range(len(lines), len(self.previous)):
+            out.append(f'\033[{row + 1};1H\033[K')
+
+        self.previous = lines
+        if out:
+            sys.stdout.write(''.join(out))
+            sys.stdout.flush()
+
+    def invalidate(self):
+        """Force a full redraw on the next frame"""
+        self.size = None
+
+def disable_line_wrap():
+    """Disable auto-wrap so long lines cannot shift the rows below them"""
+    sys.stdout.write('\033[?7l')
+    sys.stdout.flush()
+
+def enable_line_wrap():
+    sys.stdout.write('\033[?7h')
+    sys.stdout.flush()
+
+SPARK_CHARS_UTF8 = '▁▂▃▄▅▆▇█'
+SPARK_CHARS_ASCII = '_.-~=+*#'
+
+def sparkline(values, width: int = 20) -> str:
+    """Render the last `width` values as a compact sparkline"""
+    values = list(values)[-width:]
+    if not values:
+        return ''
+    encoding = (getattr(sys.__stdout__, 'encoding', '') or '').lower()
+    chars = SPARK_CHARS_UTF8 if 'utf' in encoding else SPARK_CHARS_ASCII
+    top = max(values) or 1
+    return ''.join(chars[min(int(v / top * (len(chars) - 1)), len(chars) - 1)] for v in values)
+
+def format_bytes(num: float) -> str:
+    """Format a byte count as e.g. 512M / 12.3G"""
+    for unit in ('B', 'K', 'M', 'G'):
+        if num < 1024:
+            return f"{num:.0f}{unit}" if unit in ('B', 'K', 'M') else f"{num:.1f}{unit}"
+        num /= 1024
+    return f"{num:.1f}T"
+
+class TaskResourceSampler:
+    """
+    Low-overhead per-task resource sampler.
+
+    One process-table scan per interval builds the parent->children map for
+    all tasks at once; each task's tree is then walked from its csh PID and
+    capped at MAX_PROCS_PER_TASK processes. psutil.Process objects are cached
+    across samples (cpu_percent() needs the previous sample of the same object).
+    """
+    MAX_PROCS_PER_TASK = 64
+    HISTORY_LEN = 30
+
+    def __init__(self):
+        self._procs = {}      # pid -> psutil.Process (cached)
+        self._stats = {}      # task_name -> latest sample dict
+        self._peak_rss = {}   # task_name -> peak RSS bytes
+        self._history = {}    # task_name -> deque of RSS samples
+
+    def _children_map(self):
+        children = {}
+        for proc in psutil.process_iter(['pid', 'ppid']):
+            info = proc.info
+            children.setdefault(info['ppid'], []).append(info['pid'])
+        return children
+
+    def _get_proc(self, pid: int):
+        proc = self._procs.get(pid)
+        if proc is None:
+            proc = psutil.Process(pid)
+            proc.cpu_percent(None)   # prime: first call always returns 0.0
+            self._procs[pid] = proc
+        return proc
+
+    def sample(self, running_tasks: Dict[str, Dict]):
+        """Sample every running task's process tree (call once per refresh)"""
+        from collections import deque
+
+        children = self._children_map() if running_tasks else {}
+        live_pids = set()
+
+        for task_name, info in running_tasks.items():
+            tree, queue = [], [info['pid']]
+            while queue and len(tree) < self.MAX_PROCS_PER_TASK:
+                pid = queue.pop(0)
+                tree.append(pid)
+                queue.extend(children.get(pid, ()))
+
+            cpu = rss = threads = 0
+            for pid in tree:
+                try:
+                    proc = self._get_proc(pid)
+                    with proc.oneshot():
+                        cpu += proc.cpu_percent(None)
+                        rss += proc.memory_info().rss
+                        threads += proc.num_threads()
+                    live_pids.add(pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                    continue
+
+            self._peak_rss[task_name] = max(self._peak_rss.get(task_name, 0), rss)
+            self._history.setdefault(task_name, deque(maxlen=self.HISTORY_LEN)).append(rss)
+            self._stats[task_name] = {
+                'cpu': cpu, 'rss': rss, 'threads': threads,
+                'procs': len(tree), 'truncated': bool(queue),
+            }
+
+        # Drop cached Process objects for exited PIDs and finished tasks
+        for pid in list(self._procs):
+            if pid not in live_pids:
+                del self._procs[pid]
+        for task_name in list(self._stats):
+            if task_name not in running_tasks:
+                del self._stats[task_name]
+
+    def describe(self, task_name: str, colors: Dict[str, str]) -> str:
+        """One-line resource summary for a running task"""
+        stats = self._stats.get(task_name)
+        if not stats:
+            return ''
+        procs = f"{stats['procs']}{'+' if stats['truncated'] else ''}"
+        return (f"CPU {stats['cpu']:5.0f}% | RSS {format_bytes(stats['rss']):>6} | "
+                f"Thr {stats['threads']:>3} | Procs {procs:>3} | "
+                f"Peak {format_bytes(self._peak_rss.get(task_name, 0)):>6} "
+                f"{colors['cyan']}{sparkline(self._history.get(task_name, ()))}{colors['reset']}")
+
 def format_runtime(seconds: float) -> str:
     """Format runtime in DD:HH:MM:SS format"""
     if seconds is None or seconds == 0:
@@ -420,11 +571,438 @@ def print_header(colors: Dict[str, str], terminal_type: Optional[TerminalType],
     print(f"{colors['dim']}Press Ctrl+C to exit{colors['reset']}")
     print()
 
+# ---------------------------------------------------------------------------
+# Aggregate mode (--all): every active fm_casino execution in one monitor
+# ---------------------------------------------------------------------------
+
+EXEC_REGISTRY_GLOB = "casino_exec_*.yaml"
+PID_FILE_RE = re.compile(r'^task_pid_(.+)_(\d+_\d+)_(\d+)\.txt$')  # task, execution_key, start
+HISTORY_LINE_RE = re.compile(r'^(\S+)\s+(\d{4}/\d\d/\d\d \d\d:\d\d:\d\d)\s+(\d{4}/\d\d/\d\d \d\d:\d\d:\d\d)\s+(\d+:\d\d:\d\d:\d\d)\s+(\S+)')
+HISTORY_SAMPLES = 5
+AGGREGATE_SORT_KEYS = ['elapsed', 'flow', 'run', 'progress', 'eta', 'failed']
+STALE_REGISTRY_AGE = 7 * 86400  # registry files of dead executions are removed after this
+
+def parse_dhms(text: str) -> float:
+    """Inverse of fm_casino's DD:HH:MM:SS runtime format"""
+    days, hours, minutes, secs = (int(p) for p in text.split(':'))
+    return days * 86400 + hours * 3600 + minutes * 60 + secs
+
+def classify_status(status: str) -> str:
+    """Map a completed-file status onto success/failed/not_executed/skipped (same rules as main view)"""
+    status = (status or 'unknown').lower()
+    if status in ('failed', 'error', 'interrupted', 'timeout') or 'interrupt' in status:
+        return 'failed'
+    if status == 'not executed':
+        return 'not_executed'
+    if status == 'skipped':
+        return 'skipped'
+    return 'success'
+
+class _MtimeCachedFile:
+    """Re-parse a file only when its (mtime, size) changes"""
+    def __init__(self, path: str, parse, default):
+        self.path = path
+        self._parse = parse
+        self._default = default
+        self._key = None
+        self.value = default
+
+    def get(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._key, self.value = None, self._default
+            return self.value
+        key = (st.st_mtime_ns, st.st_size)
+        if key != self._key:
+            try:
+                with open(self.path, 'r') as f:
+                    self.value = self._parse(f.read())
+            except Exception:
+                self.value = self._default
+            self._key = key
+        return self.value
+
+def _parse_flow_tasks(text: str) -> List[Dict]:
+    return (yaml.safe_load(text) or {}).get('tasks', [])
+
+def _parse_completed(text: str) -> Dict[str, Dict]:
+    loaded = yaml.safe_load(text) if text.strip() else []
+    if isinstance(loaded, dict):
+        loaded = [loaded]
+    return {task['name']: task for task in (loaded or []) if isinstance(task, dict) and task.get('name')}
+
+def _parse_runtime_history(text: str) -> Dict[str, float]:
+    """Median of the last HISTORY_SAMPLES successful runtimes per task"""
+    samples = {}
+    for line in text.splitlines():
+        match = HISTORY_LINE_RE.match(line)
+        if match and match.group(5) == 'Success' and match.group(1) != 'Total':
+            samples.setdefault(match.group(1), []).append(parse_dhms(match.group(4)))
+    estimates = {}
+    for name, values in samples.items():
+        recent = sorted(values[-HISTORY_SAMPLES:])
+        estimates[name] = recent[len(recent) // 2]
+    return estimates
+
+class FlowExecution:
+    """State of one fm_casino execution, built from its registry entry"""
+    def __init__(self, registry_path: str, entry: Dict[str, Any]):
+        self.registry_path = registry_path
+        self.entry = entry
+        self.execution_id = str(entry.get('execution_id', ''))
+        # execution_id + fm_casino PID: flows started in the same second share the execution_id
+        self.key = str(entry.get('execution_key') or f"{self.execution_id}_{entry.get('pid')}")
+        self.flow_name = entry.get('flow_name') or Path(entry.get('flow', '?')).stem
+        self.run_dir = entry.get('run_dir', '')
+        self.pid = entry.get('pid')
+        self._flow = _MtimeCachedFile(entry.get('flow', ''), _parse_flow_tasks, [])
+        self._completed = _MtimeCachedFile(entry.get('completed', ''), _parse_completed, {})
+        self._history = _MtimeCachedFile(entry.get('runtime', ''), _parse_runtime_history, {})
+        try:
+            self.started = datetime.strptime(entry['start_time'], "%Y/%m/%d %H:%M:%S").timestamp()
+        except Exception:
+            self.started = os.path.getmtime(registry_path)
+        self.alive = None
+        self.finished_at = None
+        self.running = {}
+        self.reset_counts()
+
+    def reset_counts(self):
+        self.tasks = []
+        self.completed = {}
+        self.counts = {'success': 0, 'failed': 0, 'not_executed': 0, 'skipped': 0}
+        self.eta = None
+        self.eta_partial = False
+
+    def refresh(self, running: Dict[str, Dict], now: float):
+        self.running = running
+        was_alive = self.alive
+        self.alive = bool(self.pid) and psutil.pid_exists(self.pid)
+        if was_alive and not self.alive:
+            self.finished_at = now
+
+        self.reset_counts()
+        self.tasks = filter_tasks_by_range(self._flow.get(), self.entry.get('start'),
+                                           self.entry.get('end'), self.entry.get('only'))
+        completed = self._completed.get()
+        history = self._history.get()
+
+        eta, partial = 0.0, False
+        for task in self.tasks:
+            name = task['name']
+            if name in running:
+                estimate = history.get(name)
+                if estimate is None:
+                    partial = True
+                else:
+                    eta += max(estimate - calculate_runtime(running[name]['start_time']), 0)
+            elif name in completed:
+                self.completed[name] = completed[name]
+                self.counts[classify_status(completed[name].get('status'))] += 1
+            else:
+                estimate = history.get(name)
+                if estimate is None:
+                    partial = True
+                else:
+                    eta += estimate
+        self.eta = eta if self.alive else None
+        self.eta_partial = partial
+
+    @property
+    def total(self) -> int:
+        return len(self.tasks)
+
+    @property
+    def done(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def progress(self) -> float:
+        return self.done / self.total * 100 if self.total else 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.started
+
+    @property
+    def state(self) -> str:
+        if self.alive:
+            return 'running' if self.running else 'waiting'
+        if self.counts['failed'] or self.done < self.total:
+            return 'failed'
+        return 'completed'
+
+    def sort_key(self, key: str):
+        return {
+            'flow': self.flow_name,
+            'run': self.run_dir,
+            'progress': self.progress,
+            'eta': self.eta if self.eta is not None else float('inf'),
+            'failed': self.counts['failed'],
+        }.get(key, self.elapsed)
+
+class AggregateMonitor:
+    """
+    Tracks all registered executions with one shared refresh.
+
+    Per interval: one glob of the registry directory, one glob of the task PID
+    files (bucketed by execution key), one pid_exists() per PID file and per
+    fm_casino process. Flow/completed/runtime files are re-parsed only when
+    their mtime changes.
+    """
+    def __init__(self, registry_dir: str = '/tmp', keep_finished: float = 1800):
+        self.registry_dir = registry_dir
+        self.keep_finished = keep_finished
+        self.executions: Dict[str, FlowExecution] = {}
+        self._bad_registry = set()
+
+    def _discover(self):
+        paths = set(glob.glob(os.path.join(self.registry_dir, EXEC_REGISTRY_GLOB)))
+        for path in list(self.executions):
+            if path not in paths:
+                del self.executions[path]
+        for path in paths - set(self.executions) - self._bad_registry:
+            try:
+                with open(path, 'r') as f:
+                    entry = yaml.safe_load(f) or {}
+                self.executions[path] = FlowExecution(path, entry)
+            except Exception:
+                self._bad_registry.add(path)
+
+    def _scan_running(self) -> Dict[str, Dict[str, Dict]]:
+        """Single pass over /tmp/task_pid_*.txt for every execution at once"""
+        running = {}
+        for pid_file in glob.glob(os.path.join(self.registry_dir, 'task_pid_*.txt')):
+            match = PID_FILE_RE.match(os.path.basename(pid_file))
+            if not match:
+                continue
+            task_name, key = match.group(1), match.group(2)
+            try:
+                with open(pid_file, 'r') as f:
+                    pid_str = f.read().strip()
+                if not pid_str.isdigit() or not psutil.pid_exists(int(pid_str)):
+                    continue
+                started = datetime.fromtimestamp(os.path.getmtime(pid_file))
+            except OSError:
+                continue
+            running.setdefault(key, {})[task_name] = {
+                'pid': int(pid_str),
+                'start_time': started.strftime("%Y/%m/%d %H:%M:%S"),
+                'status': 'running',
+            }
+        return running
+
+    def refresh(self) -> List[FlowExecution]:
+        self._discover()
+        running = self._scan_running()
+        now = time.time()
+        visible = []
+        for execution in self.executions.values():
+            execution.refresh(running.get(execution.key, {}), now)
+            if not execution.alive:
+                if execution.finished_at is None:
+                    # Ended before this monitor started: last completed-file write is the end time
+                    try:
+                        execution.finished_at = os.path.getmtime(execution.entry.get('completed', ''))
+                    except OSError:
+                        execution.finished_at = execution.started
+                if now - execution.finished_at > STALE_REGISTRY_AGE:
+                    try:
+                        os.remove(execution.registry_path)
+                    except OSError:
+                        pass
+                if now - execution.finished_at > self.keep_finished:
+                    continue
+            visible.append(execution)
+        return visible
+
+class KeyReader:
+    """Non-blocking single-key reader for the aggregate view (no-op when stdin is not a TTY)"""
+    def __init__(self):
+        self.fd = sys.stdin.fileno() if sys.stdin.isatty() else None
+        self._saved = None
+
+    def __enter__(self):
+        if self.fd is not None:
+            import termios
+            import tty
+            self._saved = termios.tcgetattr(self.fd)
+            tty.setcbreak(self.fd)
+        return self
+
+    def __exit__(self, *exc):
+        if self._saved is not None:
+            import termios
+            termios.tcsetattr(self.fd, termios.TCSADRAIN, self._saved)
+
+    def wait(self, timeout: float) -> Optional[str]:
+        """Sleep up to `timeout` seconds, returning early with a key if one is pressed"""
+        if self.fd is None:
+            time.sleep(timeout)
+            return None
+        import select
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return None
+        key = os.read(self.fd, 16).decode(errors='ignore')
+        return {'\x1b[A': 'up', '\x1b[B': 'down', '\n': 'enter', '\r': 'enter', '\x1b': 'back'}.get(key, key)
+
+def format_eta(execution: FlowExecution) -> str:
+    if execution.eta is None:
+        return '-'
+    if execution.eta == 0 and execution.eta_partial:
+        return '?'
+    return format_runtime(execution.eta) + ('+' if execution.eta_partial else '')
+
+def print_aggregate_table(executions: List[FlowExecution], selected: int, sort_key: str,
+                          reverse: bool, colors: Dict[str, str]):
+    """Summary view: one row per execution"""
+    print(f"{colors['bold']}{colors['cyan']}{'=' * 80}{colors['reset']}")
+    print(f"{colors['bold']}{colors['white']}CASINO FLOW MANAGER - AGGREGATE MONITOR{colors['reset']}")
+    print(f"{colors['dim']}Last Updated: {get_current_time()} | Sort: {sort_key}{' (desc)' if reverse else ''}{colors['reset']}")
+    print(f"{colors['bold']}{colors['cyan']}{'=' * 80}{colors['reset']}")
+    print(f"{colors['dim']}Up/Down or j/k select | Enter drill down | s sort | r reverse | q quit{colors['reset']}")
+    print()
+
+    states = [e.state for e in executions]
+    print(f"Flows: {colors['cyan']}{states.count('running') + states.count('waiting')} active{colors['reset']} | "
+          f"{colors['green']}{states.count('completed')} completed{colors['reset']} | "
+          f"{colors['red']}{states.count('failed')} failed{colors['reset']}")
+    print()
+
+    table = PrettyTable()
+    table.field_names = [" ", "Flow", "Run", "State", "Current Task", "Progress", "Elapsed", "ETA", "Failed"]
+    table.align = "l"
+    for index, execution in enumerate(executions):
+        current = ', '.join(execution.running) or '-'
+        failed = execution.counts['failed']
+        table.add_row([
+            f"{colors['bold']}>{colors['reset']}" if index == selected else " ",
+            f"{colors['bold']}{execution.flow_name}{colors['reset']}" if index == selected else execution.flow_name,
+            Path(execution.run_dir).name or '-',
+            create_status_display(execution.state, colors),
+            current if len(current) <= 30 else current[:27] + '...',
+            f"{execution.done}/{execution.total} ({execution.progress:.0f}%)",
+            format_runtime(execution.elapsed),
+            format_eta(execution),
+            f"{colors['red']}{failed}{colors['reset']}" if failed else "0",
+        ])
+    if executions:
+        print(table)
+    else:
+        print(f"{colors['dim']}No active fm_casino executions found ({EXEC_REGISTRY_GLOB}){colors['reset']}")
+
+def print_execution_detail(execution: FlowExecution, sampler: Optional[TaskResourceSampler],
+                           colors: Dict[str, str]):
+    """Drill-down view: the per-task table of a single execution"""
+    print(f"{colors['bold']}{colors['cyan']}{'=' * 80}{colors['reset']}")
+    print(f"{colors['bold']}{colors['white']}{execution.flow_name}{colors['reset']}  "
+          f"{colors['bold']}{colors['green']}Execution ID: {execution.execution_id}{colors['reset']}")
+    print(f"{colors['dim']}Full Path: {execution.run_dir}{colors['reset']}")
+    print(f"{colors['dim']}Last Updated: {get_current_time()} | Elapsed: {format_runtime(execution.elapsed)} | "
+          f"ETA: {format_eta(execution)}{colors['reset']}")
+    print(f"{colors['bold']}{colors['cyan']}{'=' * 80}{colors['reset']}")
+    print(f"{colors['dim']}b/Esc back to all flows | q quit{colors['reset']}")
+    print()
+    print(f"Progress: {create_progress_bar(execution.counts['success'], execution.counts['failed'], len(execution.running), execution.total, colors)}")
+    print()
+
+    table = PrettyTable()
+    table.field_names = ["Task Name", "Status", "Start Time", "End Time", "Runtime"]
+    table.align = "l"
+    for task in execution.tasks:
+        name = task['name']
+        if name in execution.running:
+            info = execution.running[name]
+            table.add_row([f"{colors['bold']}{name}{colors['reset']}", create_status_display('running', colors),
+                           info['start_time'], '-', format_runtime(calculate_runtime(info['start_time']))])
+        elif name in execution.completed:
+            info = execution.completed[name]
+            table.add_row([name, create_status_display(info.get('status', 'completed'), colors),
+                           info.get('start_time', 'N/A'), info.get('end_time', 'N/A'),
+                           format_runtime(calculate_runtime(info.get('start_time', 'N/A'), info.get('end_time')))])
+        else:
+            table.add_row([f"{colors['dim']}{name}{colors['reset']}", create_status_display('waiting', colors), '-', '-', '-'])
+    print(table)
+
+    if execution.running and sampler is not None:
+        print()
+        print(f"{colors['bold']}{colors['cyan']}Currently Running:{colors['reset']}")
+        for name, info in execution.running.items():
+            print(f"  {colors['cyan']}{name}{colors['reset']} (PID: {colors['dim']}{info['pid']}{colors['reset']})")
+            resources = sampler.describe(name, colors)
+            if resources:
+                print(f"    {resources}")
+
+def run_aggregate_monitor(args, colors: Dict[str, str]) -> int:
+    """Main loop for --all: summary table of every execution with drill-down"""
+    monitor = AggregateMonitor(args.registry_dir, args.keep_finished * 60)
+    renderer = ScreenRenderer()
+    sampler = None if args.no_resources else TaskResourceSampler()
+    sort_index = AGGREGATE_SORT_KEYS.index(args.sort)
+    reverse = False
+    selected = 0
+    detail = None  # Execution key shown in drill-down, None for the summary
+
+    enter_alternate_screen()
+    hide_cursor()
+    disable_line_wrap()
+    try:
+        with KeyReader() as keys:
+            while True:
+                executions = monitor.refresh()
+                sort_key = AGGREGATE_SORT_KEYS[sort_index]
+                executions.sort(key=lambda e: e.sort_key(sort_key), reverse=reverse)
+                selected = min(selected, max(len(executions) - 1, 0))
+                current = next((e for e in executions if e.key == detail), None)
+
+                output_buffer = StringIO()
+                old_stdout = sys.stdout
+                try:
+                    sys.stdout = output_buffer
+                    if current is not None:
+                        if sampler is not None:
+                            # Only the drilled-down flow is sampled, so cost does not scale with flow count
+                            sampler.sample(current.running)
+                        print_execution_detail(current, sampler, colors)
+                    else:
+                        print_aggregate_table(executions, selected, sort_key, reverse, colors)
+                finally:
+                    sys.stdout = old_stdout
+                renderer.render(output_buffer.getvalue())
+
+                key = keys.wait(args.refresh_rate if current is None else 2.0)
+                if key in ('q', 'Q'):
+                    break
+                elif key in ('up', 'k'):
+                    selected = max(selected - 1, 0)
+                elif key in ('down', 'j'):
+                    selected = min(selected + 1, max(len(executions) - 1, 0))
+                elif key == 'enter' and current is None and executions:
+                    detail = executions[selected].key
+                    renderer.invalidate()
+                elif key in ('back', 'b') and current is not None:
+                    detail = None
+                    renderer.invalidate()
+                elif key == 's':
+                    sort_index = (sort_index + 1) % len(AGGREGATE_SORT_KEYS)
+                elif key == 'r':
+                    reverse = not reverse
+    except KeyboardInterrupt:
+        pass
+    finally:
+        enable_line_wrap()
+        show_cursor()
+        leave_alternate_screen()
+    print("Aggregate monitor stopped.")
+    return 0
+
 def main():
     parser = argparse.ArgumentParser(description="Enhanced Real-time Task Monitor")
-    parser.add_argument('--flow', required=True, help="Flow YAML file")
-    parser.add_argument('--completed', required=True, help="Completed tasks file")
-    parser.add_argument('--runtime', required=True, help="Runtime history file")
+    parser.add_argument('--flow', help="Flow YAML file")
+    parser.add_argument('--completed', help="Completed tasks file")
+    parser.add_argument('--runtime', help="Runtime history file")
     parser.add_argument('--start', help="Start task")
     parser.add_argument('--end', help="End task")
     parser.add_argument('--only', help="Only task")
@@ -434,9 +1012,19 @@ def main():
     parser.add_argument('--clear-on-start', action='store_true', help="Clear completed tasks memory on start for fresh monitoring")
     parser.add_argument('--singleTerm', action='store_true', help="Single terminal mode flag (informational only)")
     parser.add_argument('--interactive', action='store_true', help="Interactive mode flag (informational only)")
+    parser.add_argument('--no-resources', action='store_true', help="Disable per-task CPU/memory sampling")
+    parser.add_argument('--all', action='store_true', help="Aggregate mode: monitor every registered fm_casino execution")
+    parser.add_argument('--registry-dir', default='/tmp', help="Directory holding casino_exec_*.yaml and task PID files (--all)")
+    parser.add_argument('--keep-finished', type=float, default=30, help="Minutes to keep finished flows listed (--all)")
+    parser.add_argument('--sort', choices=AGGREGATE_SORT_KEYS, default='elapsed', help="Initial sort column (--all)")
 
     args = parser.parse_args()
 
+    if args.all:
+        return run_aggregate_monitor(args, setup_terminal_colors(detect_current_terminal()))
+    if not (args.flow and args.completed and args.runtime):
+        parser.error("--flow, --completed and --runtime are required unless --all is given")
+
     # Detect current terminal type
     current_terminal = detect_current_terminal()
     colors = setup_terminal_colors(current_terminal)
@@ -490,11 +1078,15 @@ def main():
     monitor_start_time = time.time()
     update_count = 0
 
+    renderer = ScreenRenderer()
+    sampler = None if args.no_resources else TaskResourceSampler()
+
     time.sleep(1)
 
     # Enter alternate screen so refresh frames don't accumulate in scrollback (like htop/vim)
     enter_alternate_screen()
     hide_cursor()
+    disable_line_wrap()
 
     try:
         while True:
@@ -517,6 +1109,12 @@ def main():
                 except Exception as e:
                     running_tasks = {}
 
+                if sampler is not None:
+                    try:
+                        sampler.sample(running_tasks)
+                    except Exception:
+                        pass
+
                 # Update our memory: track tasks that start running
                 current_time = get_current_time()
                 newly_started_tasks = []
@@ -706,6 +1304,10 @@ def main():
                             print(f"  {colors['cyan']}{task_name}{colors['reset']} "
                                   f"(PID: {colors['dim']}{running_info['pid']}{colors['reset']}) - "
                                   f"{colors['cyan']}{format_runtime(runtime_seconds)}{colors['reset']}")
+                            if sampler is not None:
+                                resources = sampler.describe(task_name, colors)
+                                if resources:
+                                    print(f"    {resources}")
                     print()
 
                 # Summary statistics
@@ -757,15 +1359,12 @@ def main():
                     print()
 
             finally:
-                # Restore stdout and write buffered content all at once
+                # Restore stdout and write only the lines that changed since the last frame
                 sys.stdout = old_stdout
                 buffered_content = output_buffer.getvalue()
                 output_buffer.close()
 
-                # Clear screen and write all content in one operation
-                sys.stdout.write('\033[H\033[2J')  # Home + clear
-                sys.stdout.write(buffered_content)
-                sys.stdout.flush()
+                renderer.render(buffered_content)
 
                 # Update interval with resource-conservative refresh rates
                 refresh_interval = args.refresh_rate
@@ -781,6 +1380,7 @@ def main():
                 time.sleep(refresh_interval)
 
     except KeyboardInterrupt:
+        enable_line_wrap()
         show_cursor()
         leave_alternate_screen()
         clear_screen()
@@ -793,6 +1393,7 @@ def main():
             print(f"Final status: {final_completion:.1f}% completion, {success_count} successful, {failed_count} failed")
 
     except Exception as e:
+        enable_line_wrap()
         show_cursor()
         leave_alternate_screen()
         clear_screen()
@@ -800,6 +1401,7 @@ def main():
         print("Monitor terminated unexpectedly.")
 
     finally:
+        enable_line_wrap()
         show_cursor()
         leave_alternate_screen()  # Always restore original screen on exit
 
@@ -18,6 +18,8 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QStandardItemModel, QStandardItem
 from PyQt5.QtCore import Qt
 
+from treem_casino.utils.copy_engine import copy_tree
+
 
 prj_base = os.getenv('casino_prj_base')
 print(f"Going to {prj_base} : $prj_base\n")
@@ -328,8 +330,10 @@ def copy_files_to_runs(ws_path):
             shutil.rmtree(common_dest_path)
             logger.debug(f"Removed existing directory: {common_dest_path}")
 
-        # Copy the entire source directory to the destination
-        shutil.copytree(src_common_dir, common_dest_path)
+        # Copy the entire source directory to the destination (parallel, follows symlinks like copytree)
+        stats = copy_tree(src_common_dir, common_dest_path, symlinks=False)
+        if stats.errors:
+            raise OSError(f"{len(stats.errors)} entries not copied, first: {stats.errors[0]}")
         logger.info(f"Successfully replaced '{common_dest_path}' with '{src_common_dir}'")
     except PermissionError as pe:
         logger.error(f"Permission denied while copying from '{src_common_dir}' to '{common_dest_path}': {pe}")
@@ -373,8 +377,10 @@ def copy_files_to_runs_local(ws_path, run_ver):
         os.makedirs(parent_dir, exist_ok=True)
         logger.debug(f"Ensured parent directories exist: {parent_dir}")
 
-        # Copy the entire source directory to the destination
-        shutil.copytree(src_common_dir, common_dest_path)
+        # Copy the entire source directory to the destination (parallel, follows symlinks like copytree)
+        stats = copy_tree(src_common_dir, common_dest_path, symlinks=False)
+        if stats.errors:
+            raise OSError(f"{len(stats.errors)} entries not copied, first: {stats.errors[0]}")
         logger.info(f"Successfully replaced '{common_dest_path}' with '{src_common_dir}'")
     except PermissionError as pe:
         logger.error(f"Permission denied while copying from '{src_common_dir}' to '{common_dest_path}': {pe}")
@@ -57,7 +57,7 @@ __all__ = [
 # treem_casino/utils/__init__.py
 """Utility modules."""
 
-from .tree_model import DirectoryTreeModel, TreeItem
+from .tree_model import DirectoryTreeModel
 from .logger import setup_logging, get_logger
 
-__all__ = ['DirectoryTreeModel', 'TreeItem', 'setup_logging', 'get_logger']
+__all__ = ['DirectoryTreeModel', 'setup_logging', 'get_logger']
@@ -76,7 +76,11 @@ class PathConfig:
 
         # Shared directory for memos
         self.shared_dir = self.project_base / "shared" if self.project_base else Path.home()
-        self.memo_file = self.shared_dir / "directory_memos.yaml"
+        self.memo_file = self.shared_dir / "directory_memos.yaml"  # Legacy store, imported into the journal once
+        self.memo_journal = self.shared_dir / "directory_memos.jsonl"
+
+        # Per-user cache of scanned directory trees (one snapshot per base directory)
+        self.snapshot_dir = Path(os.getenv('casino_treem_cache', str(Path.home() / ".treem_casino_cache")))
 
 
 @dataclass
@@ -92,7 +96,7 @@ class UIConfig:
     # Tree view settings
     tree_minimum_height: int = 400
     max_directory_depth: int = 6
-    initial_scan_depth: int = 3  # Only scan 3 levels initially for speed; background scan fills depth 4-6
+    initial_scan_depth: int = 3  # Levels scanned up front; deeper directories are listed when expanded
 
     # Terminal settings
     terminal_geometry: str = "120x40"
@@ -111,6 +115,12 @@ class UIConfig:
     fast_scan_mode: bool = True  # Skip expensive metadata checks during refresh
     lazy_load_metadata: bool = True  # Load metadata only when needed
     skip_empty_checks: bool = True  # Don't check if directories are empty
+    scan_workers: int = 8  # Parallel directory listings per scan (1 = sequential walk)
+    fs_watch_depth: int = 3  # Watch directories down to this depth for auto-refresh
+    fs_watch_budget: int = 2000  # Max watched directories (each costs one inotify watch)
+    disk_usage_workers: int = 8  # Parallel directory listings for disk-usage computation
+    copy_workers: int = 8  # Parallel file copies when cloning
+    journal_compact_after: int = 500  # Memo/history journal records before folding into a snapshot
 
 @dataclass
 class AppConfig:
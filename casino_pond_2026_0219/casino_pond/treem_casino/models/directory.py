@@ -3,14 +3,36 @@ Data models for directory and file system operations.
 Provides type-safe representations of directory hierarchies and metadata.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, InitVar
 from pathlib import Path
 from typing import Dict, List, Optional, Union, Any
 from datetime import datetime
+from functools import lru_cache
 import os
 import stat
 
 
+def format_size(num_bytes: Optional[int]) -> str:
+    """Human-readable byte count (binary units, like du -h)."""
+    if num_bytes is None:
+        return ""
+    size = float(num_bytes)
+    for unit in ("B", "K", "M", "G", "T"):
+        if size < 1024 or unit == "T":
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}P"
+
+
+@lru_cache(maxsize=None)
+def owner_name(uid: int) -> str:
+    """Resolve a uid to a user name (cached: NSS/LDAP lookups are slow)."""
+    try:
+        import pwd
+        return pwd.getpwuid(uid).pw_name
+    except (ImportError, KeyError):
+        return str(uid)
+
 
 @dataclass
 class DirectoryInfo:
@@ -18,18 +40,24 @@ class DirectoryInfo:
 
     path: Path
     name: str = field(init=False)
-    size: Optional[int] = None
+    size: Optional[int] = None  # Recursive allocated bytes, set by DiskUsageService
     modified_time: Optional[datetime] = None
     permissions: Optional[str] = None
     owner: Optional[str] = None
     is_symlink: bool = False
     is_empty: bool = False
     _metadata_loaded: bool = field(default=False, init=False)
+    _mtime_ns: Optional[int] = field(default=None, init=False, repr=False)  # Set by the parallel scanner
+    _link_target: Optional[str] = field(default=None, init=False, repr=False)  # Resolved target of a symlink
+    symlink_hint: InitVar[Optional[bool]] = None  # Known from os.scandir DirEntry - skips the lstat()
 
-    def __post_init__(self):
+    def __post_init__(self, symlink_hint: Optional[bool] = None):
         """Initialize computed fields."""
         self.name = self.path.name
-        # ALWAYS check if symlink (fast operation, no I/O needed)
+        if symlink_hint is not None:
+            self.is_symlink = symlink_hint
+            return
+        # ALWAYS check if symlink (one lstat, cheap on local disk)
         try:
             self.is_symlink = self.path.is_symlink()
         except (OSError, PermissionError):
@@ -44,29 +72,29 @@ class DirectoryInfo:
             check_empty: If True, check if directory is empty (expensive operation)
         """
         try:
-            if self.path.exists():
-                stat_info = self.path.stat()
-                self.modified_time = datetime.fromtimestamp(stat_info.st_mtime)
-                self.permissions = stat.filemode(stat_info.st_mode)
-                self.is_symlink = self.path.is_symlink()
-
-                # Resolve owner name
-                try:
-                    import pwd
-                    self.owner = pwd.getpwuid(stat_info.st_uid).pw_name
-                except (ImportError, KeyError):
-                    self.owner = str(stat_info.st_uid)
-
-                # Only check if directory is empty when explicitly requested
-                if check_empty and self.path.is_dir():
-                    try:
-                        self.is_empty = not any(self.path.iterdir())
-                    except PermissionError:
-                        self.is_empty = False
-
-                self._metadata_loaded = True
+            # One lstat (plus a stat only for symlinks) instead of exists/stat/is_symlink
+            lstat_info = os.lstat(self.path)
+            is_symlink = stat.S_ISLNK(lstat_info.st_mode)
+            stat_info = os.stat(self.path) if is_symlink else lstat_info
         except (OSError, PermissionError):
-            pass  # Keep defaults if we can't access the directory
+            return  # Keep defaults if we can't access the directory
+
+        self.apply_stat(stat_info, is_symlink)
+
+        # Only check if directory is empty when explicitly requested
+        if check_empty:
+            try:
+                self.is_empty = not any(self.path.iterdir())
+            except (OSError, PermissionError):
+                self.is_empty = False
+
+    def apply_stat(self, stat_info: os.stat_result, is_symlink: bool):
+        """Fill metadata from a stat result (taken here or by a background loader)."""
+        self.modified_time = datetime.fromtimestamp(stat_info.st_mtime)
+        self.permissions = stat.filemode(stat_info.st_mode)
+        self.is_symlink = is_symlink
+        self.owner = owner_name(stat_info.st_uid)
+        self._metadata_loaded = True
 
     def ensure_metadata_loaded(self, check_empty: bool = False):
         """Ensure metadata is loaded, load if not already loaded."""
@@ -87,6 +115,11 @@ class DirectoryInfo:
 
         return name
 
+    @property
+    def formatted_size(self) -> str:
+        """Get recursive size for display ('' until computed)."""
+        return format_size(self.size)
+
     def get_real_path(self) -> Optional[Path]:
         """Get the real path if this is a symlink, otherwise return None."""
         if self.is_symlink:
@@ -194,16 +227,39 @@ class DirectoryHierarchy:
         return paths
 
     def find_directory(self, target_path: Path) -> Optional['DirectoryHierarchy']:
-        """Find a specific directory in the hierarchy."""
-        if self.root.path == target_path:
-            return self
+        """Find a specific directory in the hierarchy (walks path components, no full traversal)."""
+        try:
+            parts = target_path.relative_to(self.root.path).parts
+        except ValueError:
+            return None
+
+        node = self
+        for part in parts:
+            node = node.children.get(node.root.path / part)
+            if node is None:
+                return None
+        return node
 
+    def collect_shallow_leaves(self) -> List[Path]:
+        """Get paths of nodes where the scan stopped at the depth limit (children may exist)."""
+        if self.is_shallow:
+            return [self.root.path]
+
+        paths = []
         for child in self.children.values():
-            result = child.find_directory(target_path)
-            if result:
-                return result
+            paths.extend(child.collect_shallow_leaves())
+        return paths
 
-        return None
+    def snapshot(self) -> 'DirectoryHierarchy':
+        """Copy the tree structure (sharing DirectoryInfo objects) so it can be handed to another thread."""
+        copy = DirectoryHierarchy(
+            root=self.root,
+            depth=self.depth,
+            max_depth=self.max_depth,
+            is_shallow=self.is_shallow
+        )
+        copy.children = {path: child.snapshot() for path, child in self.children.items()}
+        return copy
 
     def calculate_max_depth(self) -> int:
         """Calculate the maximum depth of this hierarchy."""
@@ -241,7 +297,7 @@ class DirectoryFilter:
     show_only_user_workspace: bool = False
     user_name: Optional[str] = None
     allowed_directories: List[str] = field(default_factory=list)
-    sort_by: str = "mtime"  # "mtime" or "name"
+    sort_by: str = "mtime"  # "mtime", "name" or "size"
     pattern_highlight: Optional[str] = None
     environment_pattern: Optional[str] = None
 
@@ -262,18 +318,34 @@ class DirectoryFilter:
 
         return directory_info.name in self.allowed_directories
 
+    def includes_top_level(self, name: str) -> bool:
+        """Whether a directory directly under the base passes the "Me only" filter.
+
+        Only other users' works_* directories are hidden; allowed and
+        non-workspace directories always show. Deeper levels are never filtered.
+        """
+        if not self.show_only_user_workspace or name in self.allowed_directories:
+            return True
+        if name.startswith("works_"):
+            return bool(self.user_name) and name == f"works_{self.user_name}"
+        return True
+
     def get_sort_key(self, directory_info: DirectoryInfo) -> Any:
         """Get sort key for a directory."""
-        is_works = directory_info.name.startswith("works_")
+        mtime = directory_info.modified_time
+        return self.get_sort_key_for(directory_info.name, mtime.timestamp() if mtime else None,
+                                     directory_info.size)
+
+    def get_sort_key_for(self, name: str, mtime: Optional[float], size: Optional[int]) -> Any:
+        """Get sort key from raw fields (mtime as a timestamp) - used by the flat tree model."""
+        is_works = name.startswith("works_")
 
         if self.sort_by == "mtime":
-            mtime = directory_info.modified_time
-            if mtime:
-                key_val = -mtime.timestamp()  # Negative for reverse order
-            else:
-                key_val = 0
+            key_val = -mtime if mtime else 0  # Negative for reverse order
+        elif self.sort_by == "size":
+            key_val = -(size or 0)  # Largest first, not yet computed last
         else:  # sort by name
-            key_val = directory_info.name.lower()
+            key_val = name.lower()
 
         # Works directories first, then by sort criteria
         return (0 if is_works else 1, key_val)
@@ -285,7 +357,7 @@ class SearchResult:
 
     path: Path
     name: str
-    match_type: str  # "name", "pattern", "memo"
+    match_type: str  # "name", "fuzzy", "pattern", "memo"
     relevance_score: float = 0.0
     context: Optional[str] = None
 
@@ -0,0 +1,394 @@
+"""
+Compact array-backed directory tree for the tree view.
+Nodes are numbered breadth-first and stored in parallel arrays (parent,
+first child, child count, interned name id, mtime, size, flags), so a
+directory costs a few dozen bytes instead of a DirectoryHierarchy, a
+DirectoryInfo, a Path and a TreeItem. Paths are built on demand.
+"""
+
+from array import array
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+import os
+
+from .directory import DirectoryHierarchy, DirectoryInfo
+
+NO_NODE = -1
+UNKNOWN = -1  # mtime_ns / size not known yet
+
+FLAG_SYMLINK = 1
+FLAG_SHALLOW = 2  # Scan stopped here - children may exist on disk
+FLAG_METADATA = 4  # mtime/symlink come from a metadata load, not only the scan
+FLAG_EMPTY = 8
+FLAG_SCANNED = 16  # mtime_ns is the one the scan listed the children at (snapshot-safe)
+
+
+class FlatDirectoryTree:
+    """Directory tree as parallel arrays indexed by node id (root is 0).
+
+    Children of a node are the contiguous ids first_child[n] ..
+    first_child[n] + child_count[n] - 1, so the next sibling of a child is
+    simply the next id. replace_children() appends a new block and orphans
+    the old one; orphaned ids are never reached from the root again and are
+    dropped by compact() once they make up more than half of the arrays.
+    """
+
+    def __init__(self, base: Path):
+        self.base = Path(base)
+        self.parent = array('i')
+        self.first_child = array('i')
+        self.child_count = array('i')
+        self.name_id = array('i')
+        self.mtime_ns = array('q')
+        self.size = array('q')
+        self.flags = array('B')
+        self.names: List[str] = []  # Interned names: run directories repeat a handful of names
+        self._name_ids: Dict[str, int] = {}
+        self.link_targets: Dict[int, str] = {}  # Resolved target of scanned symlinks (few per tree)
+        self.orphaned = 0  # Ids left unreachable by replace_children()
+
+    def __len__(self) -> int:
+        """Allocated node ids (including orphaned ones)."""
+        return len(self.parent)
+
+    def _intern(self, name: str) -> int:
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            name_id = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return name_id
+
+    def _add(self, parent: int, name: str, mtime_ns: int, size: int, flags: int) -> int:
+        node = len(self.parent)
+        self.parent.append(parent)
+        self.first_child.append(0)
+        self.child_count.append(0)
+        self.name_id.append(self._intern(name))
+        self.mtime_ns.append(mtime_ns)
+        self.size.append(size)
+        self.flags.append(flags)
+        return node
+
+    def _add_info(self, parent: int, hierarchy: DirectoryHierarchy, name: Optional[str] = None) -> int:
+        info = hierarchy.root
+        flags = FLAG_SYMLINK if info.is_symlink else 0
+        if info._mtime_ns is not None:
+            mtime_ns = info._mtime_ns
+            flags |= FLAG_SCANNED
+        elif info.modified_time is not None:
+            mtime_ns = int(info.modified_time.timestamp() * 1e9)
+        else:
+            mtime_ns = UNKNOWN
+        if hierarchy.is_shallow:
+            flags |= FLAG_SHALLOW
+        if info._metadata_loaded:
+            flags |= FLAG_METADATA
+            if info.is_empty:
+                flags |= FLAG_EMPTY
+        node = self._add(parent, name or info.name, mtime_ns, info.size if info.size is not None else UNKNOWN, flags)
+        if info._link_target is not None:
+            self.link_targets[node] = info._link_target
+        return node
+
+    def _add_levels(self, queue: deque):
+        """Append the descendants of (node, hierarchy) pairs breadth-first."""
+        while queue:
+            node, hierarchy = queue.popleft()
+            self.first_child[node] = len(self.parent)
+            self.child_count[node] = len(hierarchy.children)
+            for child in hierarchy.children.values():
+                queue.append((self._add_info(node, child), child))
+
+    @classmethod
+    def from_hierarchy(cls, hierarchy: DirectoryHierarchy) -> 'FlatDirectoryTree':
+        """Flatten a scanned (or filtered) hierarchy."""
+        tree = cls(hierarchy.root.path)
+        root = tree._add_info(NO_NODE, hierarchy, name=str(hierarchy.root.path))  # Root "name" is its full path
+        tree._add_levels(deque([(root, hierarchy)]))
+        return tree
+
+    @classmethod
+    def from_snapshot(cls, snapshot, max_depth: int) -> Optional['FlatDirectoryTree']:
+        """Build straight from a DirectorySnapshot, without any DirectoryHierarchy objects.
+
+        Mirrors DirectorySnapshot.build_hierarchy(): children missing from the
+        snapshot become leaves, and listed children past max_depth mark the
+        node shallow.
+        """
+        base = str(snapshot.base)
+        record = snapshot.get(base)
+        if record is None:
+            return None
+        tree = cls(snapshot.base)
+        root = tree._add(NO_NODE, base, record.mtime_ns, UNKNOWN,
+                         FLAG_SCANNED | (FLAG_SYMLINK if record.link_target is not None else 0)
+                         | (FLAG_SHALLOW if record.shallow else 0))
+        if record.link_target is not None:
+            tree.link_targets[root] = record.link_target
+        queue = deque([(root, base, record, 0)])
+        while queue:
+            node, path, record, depth = queue.popleft()
+            if depth >= max_depth:
+                if record.children:
+                    tree.flags[node] |= FLAG_SHALLOW
+                continue
+            tree.first_child[node] = len(tree.parent)
+            tree.child_count[node] = len(record.children)
+            for name in record.children:
+                child_path = os.path.join(path, name)
+                child = snapshot.get(child_path)
+                if child is None:
+                    # Not descended into when scanned (symlink to an already-visited target)
+                    tree._add(node, name, UNKNOWN, UNKNOWN, 0)
+                    continue
+                flags = (FLAG_SCANNED | (FLAG_SYMLINK if child.link_target is not None else 0)
+                         | (FLAG_SHALLOW if child.shallow else 0))
+                child_node = tree._add(node, name, child.mtime_ns, UNKNOWN, flags)
+                if child.link_target is not None:
+                    tree.link_targets[child_node] = child.link_target
+                queue.append((child_node, child_path, child, depth + 1))
+        return tree
+
+    def detach_children(self, node: int):
+        """Orphan the children of `node` (with their subtrees)."""
+        self.orphaned += self.subtree_size(node) - 1
+        self.child_count[node] = 0
+
+    def replace_children(self, node: int, hierarchy: DirectoryHierarchy):
+        """Swap in the children of a fresh subtree scan of `node`."""
+        self.detach_children(node)
+        self._add_levels(deque([(node, hierarchy)]))
+        self.flags[node] &= ~FLAG_SHALLOW  # Now fully scanned
+
+    def needs_compaction(self) -> bool:
+        return self.orphaned > len(self.parent) // 2
+
+    def compact(self) -> array:
+        """Drop orphaned ids by renumbering the reachable nodes breadth-first.
+
+        Returns the old id -> new id map (NO_NODE for dropped ids); callers
+        holding node ids must translate them through it.
+        """
+        order = array('i', [0])
+        i = 0
+        while i < len(order):
+            first = self.first_child[order[i]]
+            order.extend(range(first, first + self.child_count[order[i]]))
+            i += 1
+        remap = array('i', [NO_NODE]) * len(self.parent)
+        for new, old in enumerate(order):
+            remap[old] = new
+
+        parent, first_child = array('i', [NO_NODE]), array('i')
+        for old in order:
+            count = self.child_count[old]
+            first_child.append(remap[self.first_child[old]] if count else 0)
+            for _ in range(count):
+                parent.append(remap[old])
+        self.parent = parent
+        self.first_child = first_child
+        self.child_count = array('i', (self.child_count[old] for old in order))
+        self.name_id = array('i', (self.name_id[old] for old in order))
+        self.mtime_ns = array('q', (self.mtime_ns[old] for old in order))
+        self.size = array('q', (self.size[old] for old in order))
+        self.flags = array('B', (self.flags[old] for old in order))
+        self.link_targets = {remap[node]: target for node, target in self.link_targets.items()
+                             if remap[node] != NO_NODE}
+        self.orphaned = 0
+        return remap
+
+    def subtree_size(self, node: int) -> int:
+        """Number of reachable nodes under `node`, itself included."""
+        count, stack = 0, [node]
+        while stack:
+            current = stack.pop()
+            count += 1
+            first = self.first_child[current]
+            stack.extend(range(first, first + self.child_count[current]))
+        return count
+
+    def children(self, node: int) -> range:
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node])
+
+    def name(self, node: int) -> str:
+        return self.names[self.name_id[node]]
+
+    def display_name(self, node: int) -> str:
+        """Name with symlink/empty indicator, as DirectoryInfo.display_name."""
+        name = self.names[self.name_id[node]]
+        flags = self.flags[node]
+        if flags & FLAG_SYMLINK:
+            return f"{name} (ln)"
+        if flags & FLAG_EMPTY:
+            return f"{name} (Empty)"
+        return name
+
+    def path_str(self, node: int) -> str:
+        parts = []
+        while node > 0:
+            parts.append(self.names[self.name_id[node]])
+            node = self.parent[node]
+        parts.append(self.names[self.name_id[0]])
+        return os.path.join(*reversed(parts))
+
+    def path(self, node: int) -> Path:
+        return Path(self.path_str(node))
+
+    def depth(self, node: int) -> int:
+        depth = 0
+        while node > 0:
+            node = self.parent[node]
+            depth += 1
+        return depth
+
+    def find(self, path) -> int:
+        """Node id of an absolute path, or NO_NODE if it is not in the tree."""
+        node, missing = self.deepest(path)
+        return node if not missing else NO_NODE
+
+    def deepest(self, path) -> Tuple[int, Tuple[str, ...]]:
+        """Deepest loaded node on the way to `path` and the path components below it.
+
+        Returns (NO_NODE, ()) for a path outside the tree.
+        """
+        try:
+            parts = Path(path).relative_to(self.base).parts
+        except ValueError:
+            return NO_NODE, ()
+        node = 0
+        for depth, part in enumerate(parts):
+            name_id = self._name_ids.get(part)
+            for child in (self.children(node) if name_id is not None else ()):
+                if self.name_id[child] == name_id:
+                    node = child
+                    break
+            else:
+                return node, parts[depth:]
+        return node, ()
+
+    def walk(self, node: int = 0) -> Iterator[Tuple[int, str]]:
+        """(node, path string) of every reachable node under `node` (itself included), breadth-first."""
+        queue = deque([(node, self.path_str(node))])
+        while queue:
+            node, path = queue.popleft()
+            yield node, path
+            for child in self.children(node):
+                queue.append((child, os.path.join(path, self.names[self.name_id[child]])))
+
+    def modified_time(self, node: int) -> Optional[datetime]:
+        mtime_ns = self.mtime_ns[node]
+        return datetime.fromtimestamp(mtime_ns / 1e9) if mtime_ns != UNKNOWN else None
+
+    def set_stat(self, node: int, stat_info: Optional[os.stat_result], is_symlink: bool):
+        """Record a metadata load (stat_info None: unreadable, keep what the scan gave)."""
+        if stat_info is not None:
+            if stat_info.st_mtime_ns != self.mtime_ns[node]:
+                self.flags[node] &= ~FLAG_SCANNED  # Changed since listed: keep it out of the snapshot
+            self.mtime_ns[node] = stat_info.st_mtime_ns
+            if is_symlink:
+                self.flags[node] |= FLAG_SYMLINK
+            else:
+                self.flags[node] &= ~FLAG_SYMLINK
+        self.flags[node] |= FLAG_METADATA
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the arrays (names excluded)."""
+        return sum(a.itemsize * len(a) for a in (self.parent, self.first_child, self.child_count,
+                                                 self.name_id, self.mtime_ns, self.size, self.flags))
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m treem_casino.models.flat_tree [--dirs N]
+    import argparse
+    import gc
+    import random
+    import time
+    import tracemalloc
+
+    from .snapshot import DirectorySnapshot, DirRecord
+
+    parser = argparse.ArgumentParser(description="Flat tree vs. DirectoryHierarchy memory/build benchmark")
+    parser.add_argument("--dirs", type=int, default=200000, help="Approximate number of directories")
+    args = parser.parse_args()
+
+    # Synthetic snapshot shaped like a project: works_<user>/<block>/runs/<run>/<stage>/...
+    rng = random.Random(1)
+    stages = ["syn", "place", "cts", "route", "postroute", "signoff", "sta", "drc", "lvs", "ir"]
+    base = "/proj/chip"
+    snapshot = DirectorySnapshot(base=Path(base))
+    frontier = deque([(base, 0)])
+    total = 1
+    pending = {}
+    while frontier:
+        path, depth = frontier.popleft()
+        children = []
+        if depth < 6 and total < args.dirs:
+            for i in range(rng.randint(3, 12)):
+                name = f"works_user{i}" if depth == 0 else f"{rng.choice(stages)}_{rng.choice(['v1', 'v2', 'eco'])}_{i}"
+                children.append(name)
+                frontier.append((os.path.join(path, name), depth + 1))
+                total += 1
+        pending[path] = children
+    snapshot.records = {path: DirRecord(1700000000000000000 + i, None, children, False)
+                        for i, (path, children) in enumerate(pending.items())}
+    max_depth = 7
+
+    def measure(label, build):
+        gc.collect()
+        start = time.perf_counter()
+        result = build()
+        elapsed = time.perf_counter() - start
+        del result
+        gc.collect()
+        tracemalloc.start()
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label:<44} {elapsed * 1000:8.0f} ms {current / 2**20:8.1f} MB")
+        return result
+
+    print(f"{len(snapshot)} directories")
+    hierarchy = measure("snapshot -> DirectoryHierarchy", lambda: snapshot.build_hierarchy(max_depth))
+    tree = measure("snapshot -> FlatDirectoryTree", lambda: FlatDirectoryTree.from_snapshot(snapshot, max_depth))
+    flat = measure("DirectoryHierarchy -> FlatDirectoryTree", lambda: FlatDirectoryTree.from_hierarchy(hierarchy))
+    print(f"flat arrays: {tree.nbytes() / 2**20:.1f} MB, {len(tree.names)} distinct names")
+
+    # Both constructions agree, and lookups/paths round-trip
+    assert len(tree) == len(flat) == len(snapshot)
+    assert list(tree.walk()) == list(flat.walk())
+    sample = rng.sample(list(snapshot.records), 2000)
+    start = time.perf_counter()
+    for path in sample:
+        node = tree.find(path)
+        assert node != NO_NODE and tree.path_str(node) == path, path
+    print(f"find + path_str: {(time.perf_counter() - start) / len(sample) * 1e6:.1f} us/path")
+    assert tree.find(base + "/nope") == NO_NODE and tree.find("/elsewhere") == NO_NODE
+    assert DirectorySnapshot.from_tree(tree).records == snapshot.records
+
+    node = tree.find(sample[0])
+    sub = DirectoryHierarchy(root=DirectoryInfo(Path(sample[0]), symlink_hint=False))
+    sub.children[Path(sample[0]) / "new"] = DirectoryHierarchy(
+        root=DirectoryInfo(Path(sample[0]) / "new", symlink_hint=False))
+    tree.replace_children(node, sub)
+    assert tree.find(os.path.join(sample[0], "new")) != NO_NODE
+
+    # Refreshing the same subtree over and over (fs-watch auto-refresh) must not grow the arrays
+    path = tree.path_str(next(iter(tree.children(0))))
+    sub = snapshot.build_hierarchy(max_depth).find_directory(Path(path))
+    tree.replace_children(tree.find(path), sub)
+    reachable = sum(1 for _ in tree.walk())
+    compactions = 0
+    for _ in range(50):
+        tree.replace_children(tree.find(path), sub)
+        if tree.needs_compaction():
+            tree.compact()
+            compactions += 1
+        assert len(tree) <= 2 * reachable, len(tree)
+    assert compactions and sum(1 for _ in tree.walk()) == reachable == len(tree) - tree.orphaned
+    for path in sample[1:200]:
+        node = tree.find(path)
+        assert node != NO_NODE and tree.path_str(node) == path, path
+    print("self-check ok")
@@ -0,0 +1,273 @@
+"""
+Incremental name index for fast directory search.
+Maps lowercased directory names to paths, with a trigram index over the
+distinct names for substring and fuzzy matching.
+"""
+
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import heapq
+import os
+
+from .directory import DirectoryHierarchy
+from .flat_tree import FlatDirectoryTree
+
+FUZZY_MIN_SIMILARITY = 0.3  # Minimum trigram overlap (of the query's trigrams) for a fuzzy match
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of a lowercased name."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def relevance(query: str, name: str) -> float:
+    """Score a lowercased name against a lowercased query (exact > prefix > substring)."""
+    if name == query:
+        return 1.0
+    if name.startswith(query):
+        return 0.8
+    if query in name:
+        return 0.6
+    return 0.0
+
+
+class DirectorySearchIndex:
+    """Name -> paths index kept in step with scans and subtree updates.
+
+    Trigrams are indexed per distinct name rather than per path: run
+    directories repeat the same few names thousands of times, so the
+    posting lists stay small and a query touches each name only once.
+    """
+
+    def __init__(self):
+        self._paths_by_name: Dict[str, Set[str]] = {}  # Lowercased name -> absolute paths
+        self._names_by_trigram: Dict[str, Set[str]] = {}  # Trigram -> lowercased names
+        self._name_of: Dict[str, str] = {}  # Absolute path -> lowercased name
+        self._children: Dict[str, List[str]] = {}  # Absolute path -> child paths (for subtree removal)
+
+    def __len__(self) -> int:
+        return len(self._name_of)
+
+    def __contains__(self, path) -> bool:
+        return str(path) in self._name_of
+
+    def clear(self):
+        self._paths_by_name.clear()
+        self._names_by_trigram.clear()
+        self._name_of.clear()
+        self._children.clear()
+
+    def rebuild(self, hierarchy: DirectoryHierarchy):
+        """Index a whole hierarchy from scratch."""
+        self.clear()
+        self._add(hierarchy)
+
+    def rebuild_tree(self, tree: FlatDirectoryTree):
+        """Index every reachable node of a flat tree from scratch."""
+        self.clear()
+        for node, path in tree.walk():
+            self._index(path, os.path.basename(path).lower())
+            if tree.child_count[node]:
+                self._children[path] = [os.path.join(path, tree.name(child)) for child in tree.children(node)]
+
+    def update_subtree(self, path: Path, hierarchy: DirectoryHierarchy):
+        """Replace the indexed descendants of `path` with the children of a fresh subtree scan."""
+        key = str(path)
+        if key not in self._name_of:
+            return  # Not part of the indexed tree (e.g. a scan of a base that was since replaced)
+        for child in self._children.pop(key, ()):
+            self._remove(child)
+        self._children[key] = [str(child.root.path) for child in hierarchy.children.values()]
+        for child in hierarchy.children.values():
+            self._add(child)
+
+    def _add(self, hierarchy: DirectoryHierarchy):
+        stack = [hierarchy]
+        while stack:
+            node = stack.pop()
+            path = str(node.root.path)
+            if path in self._name_of:
+                self._remove(path)
+            self._index(path, node.root.name.lower())
+            if node.children:
+                self._children[path] = [str(child.root.path) for child in node.children.values()]
+                stack.extend(node.children.values())
+
+    def _index(self, path: str, name: str):
+        self._name_of[path] = name
+        paths = self._paths_by_name.get(name)
+        if paths is None:
+            self._paths_by_name[name] = {path}
+            for gram in trigrams(name):
+                self._names_by_trigram.setdefault(gram, set()).add(name)
+        else:
+            paths.add(path)
+
+    def _remove(self, path: str):
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            name = self._name_of.pop(current, None)
+            if name is None:
+                continue
+            paths = self._paths_by_name.get(name)
+            if paths is not None:
+                paths.discard(current)
+                if not paths:
+                    del self._paths_by_name[name]
+                    for gram in trigrams(name):
+                        names = self._names_by_trigram.get(gram)
+                        if names is not None:
+                            names.discard(name)
+                            if not names:
+                                del self._names_by_trigram[gram]
+            stack.extend(self._children.pop(current, ()))
+
+    def _substring_names(self, query: str) -> Iterable[str]:
+        """Distinct indexed names containing the lowercased query."""
+        if len(query) < 3:
+            return [name for name in self._paths_by_name if query in name]
+
+        postings = []
+        for gram in trigrams(query):
+            names = self._names_by_trigram.get(gram)
+            if not names:
+                return []
+            postings.append(names)
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return [name for name in candidates if query in name]
+
+    def _fuzzy_names(self, query: str, exclude: Set[str]) -> List[Tuple[float, str]]:
+        """Names sharing enough trigrams with the query, scored below any substring match."""
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self._names_by_trigram.get(gram, ()))
+        scored = []
+        for name, count in shared.items():
+            if name in exclude:
+                continue
+            if count / len(query_grams) >= FUZZY_MIN_SIMILARITY:
+                # Dice coefficient, so long names that merely contain the trigrams rank lower
+                dice = 2 * count / (len(query_grams) + len(trigrams(name)))
+                scored.append((0.5 * dice, name))
+        return scored
+
+    def search(self, query: str, limit: Optional[int] = 50,
+               fuzzy: bool = True) -> List[Tuple[float, str]]:
+        """Ranked (score, path) matches for a query, best first.
+
+        Substring matches score 1.0/0.8/0.6 (exact/prefix/contains); fuzzy
+        trigram matches fill in below 0.5 when there are fewer than `limit`
+        substring matches. Only the top `limit` results are selected, the
+        full match set is never sorted. Ties prefer shallower, shorter paths.
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        substring = self._substring_names(query)
+        scored = [(relevance(query, name), name) for name in substring]
+        if fuzzy and (limit is None or sum(len(self._paths_by_name[n]) for n in substring) < limit):
+            scored.extend(self._fuzzy_names(query, set(substring)))
+
+        # Scores are per name, so walk the (few) distinct scores best first and
+        # only rank paths inside the tiers that can still reach the top `limit`
+        tiers: Dict[float, List[str]] = {}
+        for score, name in scored:
+            tiers.setdefault(score, []).append(name)
+
+        def key(path: str):
+            return (path.count(os.sep), len(path), path)
+
+        results = []
+        for score in sorted(tiers, reverse=True):
+            paths = (path for name in tiers[score] for path in self._paths_by_name[name])
+            if limit is None:
+                ranked = sorted(paths, key=key)
+            else:
+                ranked = heapq.nsmallest(limit - len(results), paths, key=key)
+            results.extend((score, path) for path in ranked)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def find_paths(self, pattern: str) -> List[str]:
+        """All paths whose name contains `pattern` (case-insensitive, unranked)."""
+        paths = []
+        for name in self._substring_names(pattern.lower()):
+            paths.extend(self._paths_by_name[name])
+        return paths
+
+
+if __name__ == "__main__":
+    # Benchmark: python -m treem_casino.models.search_index [--dirs N]
+    import argparse
+    import random
+    import time
+
+    from .directory import DirectoryInfo
+
+    parser = argparse.ArgumentParser(description="Search index vs. recursive search benchmark")
+    parser.add_argument("--dirs", type=int, default=100000, help="Approximate number of directories")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    stages = ["syn", "place", "cts", "route", "postroute", "signoff", "sta", "drc", "lvs", "ir"]
+    base = Path("/proj/chip")
+    root = DirectoryHierarchy(root=DirectoryInfo(base), depth=0, max_depth=6)
+    total = 1
+    frontier = [root]
+    while total < args.dirs and frontier:
+        node = frontier.pop(0)
+        for i in range(rng.randint(3, 12)):
+            name = f"{rng.choice(stages)}_{rng.choice(['v1', 'v2', 'eco'])}_{i}" if node.depth else f"works_user{i}"
+            path = node.root.path / name
+            child = DirectoryHierarchy(root=DirectoryInfo(path), depth=node.depth + 1, max_depth=6)
+            node.children[path] = child
+            frontier.append(child)
+            total += 1
+
+    def recursive_search(query, hierarchy):
+        results = []
+        if query in hierarchy.root.name.lower():
+            results.append((relevance(query, hierarchy.root.name.lower()), str(hierarchy.root.path)))
+        for child in hierarchy.children.values():
+            results.extend(recursive_search(query, child))
+        results.sort(reverse=True)
+        return results
+
+    queries = [rng.choice(stages)[:rng.randint(2, 5)] + rng.choice(["", "_v", "_e"]) for _ in range(args.queries)]
+    queries += ["rout_v1", "postrote", "signof_eco"]  # Fuzzy
+
+    start = time.perf_counter()
+    index = DirectorySearchIndex()
+    index.rebuild(root)
+    build = time.perf_counter() - start
+    print(f"{len(index)} directories, {len(index._paths_by_name)} distinct names, index built in {build * 1000:.0f} ms")
+
+    start = time.perf_counter()
+    for q in queries:
+        index.search(q, limit=50)
+    indexed = (time.perf_counter() - start) / len(queries)
+
+    sample = queries[:20]
+    start = time.perf_counter()
+    for q in sample:
+        recursive_search(q, root)
+    recursive = (time.perf_counter() - start) / len(sample)
+
+    for q in sample[:5]:
+        expected = {p for _, p in recursive_search(q, root)}
+        got = {p for s, p in index.search(q, limit=None, fuzzy=False)}
+        assert got == expected, q
+    from_tree = DirectorySearchIndex()
+    from_tree.rebuild_tree(FlatDirectoryTree.from_hierarchy(root))
+    assert from_tree._name_of == index._name_of and from_tree._children == index._children
+    print(f"recursive search: {recursive * 1000:.1f} ms/query, indexed top-50: {indexed * 1000:.2f} ms/query")
+    print("fuzzy 'postrote':", [p for _, p in index.search("postrote", limit=3)])
@@ -0,0 +1,161 @@
+"""
+Persistent directory snapshot for instant startup and incremental rescans.
+Stores per directory: mtime, symlink target, subdirectory names, shallow flag.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional
+from datetime import datetime
+import gzip
+import json
+import os
+import tempfile
+
+from .directory import DirectoryHierarchy, DirectoryInfo
+from .flat_tree import FLAG_SCANNED, FLAG_SHALLOW, FlatDirectoryTree
+
+SNAPSHOT_VERSION = 1
+
+
+class DirRecord(NamedTuple):
+    """Cached state of one directory."""
+
+    mtime_ns: int
+    link_target: Optional[str]  # Resolved real path when the directory is a symlink
+    children: List[str]  # Subdirectory names (empty when shallow)
+    shallow: bool  # Children were not listed (depth limit)
+
+
+@dataclass
+class DirectorySnapshot:
+    """Flat path -> DirRecord map of a scanned hierarchy."""
+
+    base: Path
+    records: Dict[str, DirRecord] = field(default_factory=dict)  # Keyed by absolute path string
+    saved_at: Optional[datetime] = None
+
+    def get(self, path: str) -> Optional[DirRecord]:
+        """Get the cached record for an absolute path."""
+        return self.records.get(path)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @classmethod
+    def from_hierarchy(cls, hierarchy: DirectoryHierarchy) -> 'DirectorySnapshot':
+        """Capture a hierarchy; nodes without a scanned mtime (and their subtrees) are skipped."""
+        snapshot = cls(base=hierarchy.root.path, saved_at=datetime.now())
+        stack = [hierarchy]
+        while stack:
+            node = stack.pop()
+            info = node.root
+            if info._mtime_ns is None:
+                continue
+            snapshot.records[str(info.path)] = DirRecord(
+                mtime_ns=info._mtime_ns,
+                link_target=info._link_target,
+                children=[child.root.name for child in node.children.values()],
+                shallow=node.is_shallow
+            )
+            stack.extend(node.children.values())
+        return snapshot
+
+    @classmethod
+    def from_tree(cls, tree: FlatDirectoryTree) -> 'DirectorySnapshot':
+        """Capture a FlatDirectoryTree; as from_hierarchy, nodes without a scanned mtime are skipped."""
+        snapshot = cls(base=tree.base, saved_at=datetime.now())
+        names, name_id, flags = tree.names, tree.name_id, tree.flags
+        stack = [(0, tree.path_str(0))]
+        while stack:
+            node, path = stack.pop()
+            if not flags[node] & FLAG_SCANNED:
+                continue
+            children = tree.children(node)
+            snapshot.records[path] = DirRecord(
+                mtime_ns=tree.mtime_ns[node],
+                link_target=tree.link_targets.get(node),
+                children=[names[name_id[child]] for child in children],
+                shallow=bool(flags[node] & FLAG_SHALLOW)
+            )
+            stack.extend((child, os.path.join(path, names[name_id[child]])) for child in children)
+        return snapshot
+
+    def build_hierarchy(self, max_depth: int) -> Optional[DirectoryHierarchy]:
+        """Rebuild a DirectoryHierarchy from the cached records without touching the filesystem."""
+        base = str(self.base)
+        if base not in self.records:
+            return None
+
+        def build(path: str, depth: int) -> DirectoryHierarchy:
+            record = self.records[path]
+            info = DirectoryInfo(Path(path), symlink_hint=record.link_target is not None)
+            info._mtime_ns = record.mtime_ns
+            info._link_target = record.link_target
+            info.modified_time = datetime.fromtimestamp(record.mtime_ns / 1e9)
+            node = DirectoryHierarchy(root=info, depth=depth, max_depth=max_depth,
+                                      is_shallow=record.shallow)
+            if depth < max_depth:
+                for name in record.children:
+                    child_path = os.path.join(path, name)
+                    if child_path in self.records:
+                        node.children[Path(child_path)] = build(child_path, depth + 1)
+                    else:
+                        # Not descended into when scanned (symlink to an already-visited target)
+                        node.children[Path(child_path)] = DirectoryHierarchy(
+                            root=DirectoryInfo(Path(child_path)), depth=depth + 1, max_depth=max_depth)
+            elif record.children:
+                node.is_shallow = True
+            return node
+
+        return build(base, 0)
+
+    def save(self, file_path: Path):
+        """Write the snapshot as gzipped JSON with paths relative to the base (atomic replace)."""
+        base = str(self.base)
+        prefix = len(base.rstrip(os.sep)) + 1
+        data = {
+            'version': SNAPSHOT_VERSION,
+            'base': base,
+            'saved_at': (self.saved_at or datetime.now()).isoformat(),
+            'dirs': {
+                ('' if path == base else path[prefix:]): [r.mtime_ns, r.link_target, r.children, int(r.shallow)]
+                for path, r in self.records.items()
+            }
+        }
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(file_path.parent), prefix='.snapshot_')
+        try:
+            with os.fdopen(fd, 'wb') as raw, gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=5) as f:
+                f.write(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @classmethod
+    def load(cls, file_path: Path, base: Path) -> Optional['DirectorySnapshot']:
+        """Load a snapshot for `base`; returns None if missing, unreadable or for another base."""
+        try:
+            with gzip.open(str(file_path), 'rb') as f:
+                data = json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError, EOFError):
+            return None
+
+        if data.get('version') != SNAPSHOT_VERSION or data.get('base') != str(base):
+            return None
+
+        base_str = str(base)
+        records = {}
+        for rel, (mtime_ns, link_target, children, shallow) in data.get('dirs', {}).items():
+            path = os.path.join(base_str, rel) if rel else base_str
+            records[path] = DirRecord(mtime_ns, link_target, children, bool(shallow))
+
+        try:
+            saved_at = datetime.fromisoformat(data.get('saved_at', ''))
+        except ValueError:
+            saved_at = None
+        return cls(base=base, records=records, saved_at=saved_at)
@@ -17,8 +17,8 @@ class DirectoryChange:
     """Represents a change in a directory."""
     path: Path
     old_mtime: Optional[datetime]
-    new_mtime: datetime
-    change_type: str  # "new", "modified", "unchanged"
+    new_mtime: Optional[datetime]
+    change_type: str  # "new", "modified", "removed", "unchanged"
 
     @property
     def is_updated(self) -> bool:
@@ -52,8 +52,19 @@ class ChangeDetectionService(QObject):
         for child in hierarchy.children.values():
             self._capture_recursive(child, state)
 
-    def detect_changes(self, new_hierarchy: DirectoryHierarchy) -> List[DirectoryChange]:
-        """Detect changes between previous and new state."""
+    def detect_changes(self, new_hierarchy: DirectoryHierarchy,
+                       diff: Optional[List[DirectoryChange]] = None) -> List[DirectoryChange]:
+        """Detect changes between previous and new state.
+
+        When the scanner already diffed against a snapshot (`diff`), use that
+        directly instead of walking both trees.
+        """
+        if diff is not None:
+            self.current_changes = list(diff)
+            if self.current_changes:
+                self.changes_detected.emit(self.current_changes)
+            return self.current_changes
+
         new_state = self.capture_state(new_hierarchy)
         changes = []
 
@@ -3,18 +3,26 @@ Fixed directory service with proper "Me only" filtering.
 """
 
 import os
+import queue
 import shutil
 import subprocess
 import platform
 import grp
+import hashlib
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Union, Callable
 from datetime import datetime  # ADD THIS LINE
 from PyQt5.QtCore import QObject, pyqtSignal, QThread, QTimer
 
 from ..models.directory import DirectoryHierarchy, DirectoryFilter, DirectoryInfo, SearchResult
+from ..models.flat_tree import FlatDirectoryTree
+from ..models.snapshot import DirectorySnapshot
+from ..models.search_index import DirectorySearchIndex, relevance
 from ..config.settings import AppConfig
+from .change_detection_service import DirectoryChange
 
 logger = logging.getLogger(__name__)
 
@@ -26,16 +34,26 @@ class DirectoryScanner(QThread):
     progress_updated = pyqtSignal(str, int)  # message, progress_percent
     scan_completed = pyqtSignal(DirectoryHierarchy)
     scan_error = pyqtSignal(str)
+    level_completed = pyqtSignal(DirectoryHierarchy)  # Snapshot once all dirs down to a depth are listed
 
-    def __init__(self, base_path: Path, max_depth: int = 6, fast_mode: bool = True):
+    def __init__(self, base_path: Path, max_depth: int = 6, fast_mode: bool = True,
+                 workers: int = 1, stream_levels: bool = False,
+                 previous: Optional[DirectorySnapshot] = None, lazy_depth: Optional[int] = None):
         super().__init__()
         self.base_path = base_path
         self.max_depth = max_depth
         self.fast_mode = fast_mode  # Skip expensive metadata checks
+        self.workers = workers  # > 1: list sibling directories concurrently on a thread pool
+        self.stream_levels = stream_levels  # Emit level_completed snapshots (parallel scan only)
         self._cancelled = False
         self.total_dirs_estimated = 0
         self.dirs_processed = 0
         self._visited_real_paths = set()  # Track visited real paths to prevent circular references
+        self._visited_lock = threading.Lock()  # Guards _visited_real_paths for pool workers
+        self.previous = previous  # Snapshot to revalidate against: unchanged dirs are not re-listed
+        self.changes: Optional[List[DirectoryChange]] = None  # Diff against `previous` (parallel scan only)
+        # Below lazy_depth only directories that `previous` has listed are descended into (parallel scan only)
+        self.lazy_depth = lazy_depth
 
     def cancel(self):
         """Cancel the scanning operation."""
@@ -104,13 +122,7 @@ class DirectoryScanner(QThread):
         self._visited_real_paths.add(real_path)
 
         # Update progress every 10 directories to reduce signal overhead
-        self.dirs_processed += 1
-        if self.dirs_processed % 10 == 0 or self.dirs_processed == 1:
-            progress_percent = min(95, int((self.dirs_processed / max(self.total_dirs_estimated, 1)) * 100))
-            dir_name = path.name if path.name else str(path)
-            depth_info = f"depth {current_depth}/{max_depth}"
-            message = f"Scanning {dir_name} ({depth_info}) - {self.dirs_processed}/{self.total_dirs_estimated} dirs"
-            self.progress_updated.emit(message, progress_percent)
+        self._report_progress(str(path), current_depth)
 
         # Create directory info
         root_info = DirectoryInfo(path)
@@ -209,6 +221,206 @@ class DirectoryScanner(QThread):
             logger.error(f"Cannot read directory {path}: {type(e).__name__}: {e}")
             pass  # Can't read directory
 
+    def _report_progress(self, path: str, current_depth: int):
+        """Emit a progress update every 10 directories to reduce signal overhead."""
+        self.dirs_processed += 1
+        if self.dirs_processed % 10 == 0 or self.dirs_processed == 1:
+            progress_percent = min(95, int((self.dirs_processed / max(self.total_dirs_estimated, 1)) * 100))
+            dir_name = os.path.basename(path) or path
+            depth_info = f"depth {current_depth}/{self.max_depth}"
+            message = f"Scanning {dir_name} ({depth_info}) - {self.dirs_processed}/{self.total_dirs_estimated} dirs"
+            self.progress_updated.emit(message, progress_percent)
+
+    def _list_subdirs(self, path: str, real_path: str) -> List[tuple]:
+        """Pool worker: list one directory's subdirectories as (path, is_symlink, real_path).
+
+        Uses DirEntry's cached type info, so a plain subdirectory costs no extra
+        syscall; only symlinks are stat'ed and resolved.
+        """
+        candidates = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if self._cancelled:
+                        return []
+                    try:
+                        # Include symlinks by checking is_dir with follow_symlinks=True
+                        if not entry.is_dir(follow_symlinks=True):
+                            continue
+                        is_symlink = entry.is_symlink()
+                        child_real = os.path.realpath(entry.path) if is_symlink else os.path.join(real_path, entry.name)
+                        candidates.append((entry.path, is_symlink, child_real))
+                    except (OSError, PermissionError) as e:
+                        logger.warning(f"Skipped entry '{entry.name}' in {path}: {type(e).__name__}: {e}")
+        except (OSError, PermissionError) as e:
+            logger.error(f"Cannot read directory {path}: {type(e).__name__}: {e}")
+            return []
+        return candidates
+
+    def _cached_subdirs(self, path: str, real_path: str, record) -> Optional[List[tuple]]:
+        """Subdirectories from the previous snapshot, or None if it cannot answer for every child."""
+        candidates = []
+        for name in record.children:
+            child_path = os.path.join(path, name)
+            child = self.previous.get(child_path)
+            if child is None:
+                return None
+            child_real = child.link_target or os.path.join(real_path, name)
+            candidates.append((child_path, child.link_target is not None, child_real))
+        return candidates
+
+    def _claim(self, candidates: List[tuple]) -> List[tuple]:
+        """Claim subdirectories in the shared visited set; returns (path, is_symlink, real_path, descend)."""
+        children = []
+        with self._visited_lock:
+            for child_path, is_symlink, child_real in candidates:
+                already_visited = child_real in self._visited_real_paths
+                if already_visited and not is_symlink:
+                    logger.info(f"Skipped child hierarchy for '{os.path.basename(child_path)}' (already visited)")
+                    continue
+                # Symlinks to already-visited targets are shown but not descended into
+                self._visited_real_paths.add(child_real)
+                children.append((child_path, is_symlink, child_real, not already_visited))
+        return children
+
+    def _scan_task(self, results: queue.Queue, node: DirectoryHierarchy, real_path: str):
+        """Pool worker: do the filesystem work for one node and hand the result to the coordinator.
+
+        One stat() per directory; when a previous snapshot has the same mtime the
+        cached subdirectory names are reused instead of listing the directory.
+        """
+        mtime_ns, outcome, relisted = None, None, False
+        try:
+            if not self._cancelled:
+                path = str(node.root.path)
+                if not self.fast_mode:
+                    node.root.ensure_metadata_loaded(check_empty=False)
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    pass
+
+                record = self.previous.get(path) if self.previous is not None else None
+                # Symlinked dirs are always re-listed: their visited/descend state depends on scan order
+                unchanged = (record is not None and mtime_ns is not None
+                             and record.mtime_ns == mtime_ns and record.link_target is None)
+
+                descend = node.depth < node.max_depth
+                if descend and self.lazy_depth is not None and node.depth >= self.lazy_depth:
+                    # Nobody expanded this directory last time - keep it unlisted until they do
+                    descend = record is not None and not record.shallow
+
+                if descend:
+                    candidates = None
+                    if unchanged and not record.shallow:
+                        candidates = self._cached_subdirs(path, real_path, record)
+                    if candidates is None:
+                        candidates = self._list_subdirs(path, real_path)
+                        relisted = True
+                    outcome = self._claim(candidates)
+                elif unchanged:
+                    outcome = record.shallow or bool(record.children)
+                else:
+                    # Stopped due to depth limit — only mark shallow if subdirectories exist
+                    try:
+                        with os.scandir(path) as entries:
+                            outcome = any(e.is_dir(follow_symlinks=True) for e in entries)
+                    except (OSError, PermissionError):
+                        outcome = True  # Assume children exist if can't check
+        except Exception as e:
+            logger.warning(f"Failed to scan '{node.root.path}': {type(e).__name__}: {e}")
+        finally:
+            results.put((node, mtime_ns, outcome, relisted))
+
+    def _record_changes(self, node: DirectoryHierarchy, outcome, relisted: bool):
+        """Diff one scanned node against the previous snapshot."""
+        info = node.root
+        path = str(info.path)
+        old = self.previous.get(path)
+        if old is None:
+            if info.modified_time:
+                self.changes.append(DirectoryChange(info.path, None, info.modified_time, "new"))
+            return
+
+        if info._mtime_ns is not None and info._mtime_ns != old.mtime_ns:
+            self.changes.append(DirectoryChange(
+                info.path, datetime.fromtimestamp(old.mtime_ns / 1e9), info.modified_time, "modified"))
+
+        if relisted and not old.shallow and node.depth < node.max_depth:
+            current = {os.path.basename(child[0]) for child in outcome or ()}
+            for name in old.children:
+                if name not in current:
+                    removed = info.path / name
+                    self.changes.append(DirectoryChange(removed, None, None, "removed"))
+
+    def _scan_parallel(self) -> Optional[DirectoryHierarchy]:
+        """Scan the hierarchy with directory listings fanned out to a bounded thread pool.
+
+        Workers only do I/O (scandir, symlink resolution, visited-set claims);
+        this thread merges their results into the DirectoryHierarchy, so the tree
+        itself is only ever mutated from one thread. Same cycle/symlink rules as
+        _scan_with_progress.
+        """
+        base = str(self.base_path)
+        try:
+            root_real = os.path.realpath(base)
+        except (OSError, PermissionError):
+            return None
+        self._visited_real_paths.add(root_real)
+        if self.previous is not None:
+            self.changes = []
+
+        root = DirectoryHierarchy(root=DirectoryInfo(self.base_path), depth=0, max_depth=self.max_depth)
+        results = queue.Queue()
+        outstanding = [0] * (self.max_depth + 1)  # Unfinished tasks per depth
+        levels_emitted = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="treem-scan") as pool:
+            def submit(node: DirectoryHierarchy, real_path: str):
+                outstanding[node.depth] += 1
+                pool.submit(self._scan_task, results, node, real_path)
+
+            submit(root, root_real)
+            while any(outstanding):
+                node, mtime_ns, outcome, relisted = results.get()
+                outstanding[node.depth] -= 1
+                if self._cancelled:
+                    continue  # Drain remaining tasks; workers return immediately
+
+                self._report_progress(str(node.root.path), node.depth)
+
+                if mtime_ns is not None:
+                    node.root._mtime_ns = mtime_ns
+                    node.root.modified_time = datetime.fromtimestamp(mtime_ns / 1e9)
+                if self.changes is not None:
+                    self._record_changes(node, outcome, relisted)
+
+                if node.depth >= node.max_depth or isinstance(outcome, bool):
+                    node.is_shallow = bool(outcome)
+                else:
+                    for child_path, is_symlink, child_real, descend in outcome or ():
+                        path = Path(child_path)
+                        child = DirectoryHierarchy(
+                            root=DirectoryInfo(path, symlink_hint=is_symlink),
+                            depth=node.depth + 1,
+                            max_depth=node.max_depth
+                        )
+                        if is_symlink:
+                            child.root._link_target = child_real
+                        node.children[path] = child
+                        if descend:
+                            submit(child, child_real)
+                        elif not self.fast_mode:
+                            child.root.ensure_metadata_loaded(check_empty=False)
+
+                # Every directory down to `levels_emitted` is listed: stream that partial tree
+                while (self.stream_levels and levels_emitted < self.max_depth
+                       and any(outstanding) and not any(outstanding[:levels_emitted + 1])):
+                    levels_emitted += 1
+                    self.level_completed.emit(root.snapshot())
+
+        return None if self._cancelled else root
+
     def run(self):
         """Run the directory scanning in background with detailed progress."""
         try:
@@ -219,7 +431,10 @@ class DirectoryScanner(QThread):
                 return
 
             # Skip estimation in fast mode - it's slow!
-            if self.fast_mode:
+            if self.previous is not None:
+                self.total_dirs_estimated = max(len(self.previous), 1)
+                self.progress_updated.emit("Revalidating cached directory tree...", 5)
+            elif self.fast_mode:
                 self.total_dirs_estimated = 1000  # Rough estimate to avoid division by zero
                 self.progress_updated.emit("Starting fast directory scan...", 5)
             else:
@@ -233,10 +448,13 @@ class DirectoryScanner(QThread):
             self.dirs_processed = 0
 
             # Perform the actual scan
-            hierarchy = self._scan_with_progress(
-                self.base_path,
-                max_depth=self.max_depth
-            )
+            if self.workers > 1:
+                hierarchy = self._scan_parallel()
+            else:
+                hierarchy = self._scan_with_progress(
+                    self.base_path,
+                    max_depth=self.max_depth
+                )
 
             if not self._cancelled and hierarchy:
                 self.progress_updated.emit("Finalizing directory tree...", 98)
@@ -258,16 +476,22 @@ class DirectoryService(QObject):
     hierarchy_updated = pyqtSignal(DirectoryHierarchy)
     operation_completed = pyqtSignal(str, bool)  # operation_name, success
     progress_updated = pyqtSignal(str, int)
+    partial_hierarchy_updated = pyqtSignal(DirectoryHierarchy)  # Levels scanned so far (foreground scan)
+    cached_tree_loaded = pyqtSignal(object)  # FlatDirectoryTree from the on-disk snapshot, before revalidation
     subtree_scan_completed = pyqtSignal(object, object)  # (Path, DirectoryHierarchy)
+    subtree_scan_failed = pyqtSignal(object, str)  # (Path, error message)
     background_scan_completed = pyqtSignal(DirectoryHierarchy)  # Silent deep scan result
 
     def __init__(self, config: AppConfig):
         super().__init__()
         self.config = config
-        self._current_hierarchy: Optional[DirectoryHierarchy] = None
+        self._current_base: Optional[Path] = None  # Base the search index was built for
         self._scanner: Optional[DirectoryScanner] = None
         self._subtree_scanners: Dict[Path, DirectoryScanner] = {}  # Active on-demand scans
         self._background_scanner: Optional[DirectoryScanner] = None  # Silent deep scan
+        self._snapshots: Dict[str, DirectorySnapshot] = {}  # Base path -> last saved snapshot
+        self.last_scan_changes: Optional[List[DirectoryChange]] = None  # Snapshot diff of the last foreground scan
+        self.search_index = DirectorySearchIndex()  # Name/trigram index of the current tree
 
     def scan_directory_async(self, base_path: Path, fast_mode: bool = True,
                              max_depth: Optional[int] = None):
@@ -288,34 +512,66 @@ class DirectoryService(QObject):
         # Cancel any background deep scan — foreground scan takes priority
         self.cancel_background_scan()
 
+        snapshot = self.load_snapshot(base_path) if self.config.ui.scan_workers > 1 else None
+        lazy_depth = None
+        if snapshot is not None:
+            # Revalidating a snapshot is mostly stat() calls, so cover everything that was
+            # loaded last time right away - but only list deeper directories that were
+            lazy_depth = max_depth
+            max_depth = max(max_depth, self.config.ui.max_directory_depth)
+            if self._current_base != base_path:
+                cached = FlatDirectoryTree.from_snapshot(snapshot, max_depth)
+                if cached is not None:
+                    self._current_base = base_path
+                    self.search_index.rebuild_tree(cached)
+                    self.cached_tree_loaded.emit(cached)
+
         self._scanner = DirectoryScanner(
             base_path,
             max_depth,
-            fast_mode=fast_mode
+            fast_mode=fast_mode,
+            workers=self.config.ui.scan_workers,
+            stream_levels=True,
+            previous=snapshot,
+            lazy_depth=lazy_depth
         )
         self._scanner.progress_updated.connect(self.progress_updated)
-        self._scanner.scan_completed.connect(self._on_scan_completed)
+        self._scanner.level_completed.connect(self.partial_hierarchy_updated)
+        self._scanner.scan_completed.connect(
+            lambda hier, s=self._scanner: self._on_scan_completed(hier, s.changes)
+        )
         self._scanner.scan_error.connect(self._on_scan_error)
         self._scanner.start()
 
-    def scan_subtree_async(self, path: Path, additional_depth: int = 6):
-        """Scan a subdirectory on demand when the user expands a shallow node.
+    def scan_subtree_async(self, path: Path, additional_depth: int = 6,
+                           previous: Optional[DirectorySnapshot] = None) -> bool:
+        """Scan a subdirectory on demand (shallow node expansion or filesystem change).
 
         Args:
             path: Directory to scan
             additional_depth: How many levels to scan from this node
+            previous: Snapshot to revalidate against (unchanged directories only cost a stat)
+
+        Returns:
+            False if a scan of this path is already running
         """
         # Skip if already scanning this path
         existing = self._subtree_scanners.get(path)
         if existing and existing.isRunning():
-            return
+            return False
 
-        scanner = DirectoryScanner(path, additional_depth, fast_mode=True)
+        scanner = DirectoryScanner(path, additional_depth, fast_mode=True,
+                                   workers=self.config.ui.scan_workers,
+                                   previous=previous)
         scanner.scan_completed.connect(
             lambda hier, p=path: self._on_subtree_scan_completed(p, hier)
         )
+        scanner.scan_error.connect(
+            lambda error, p=path: self._on_subtree_scan_error(p, error)
+        )
         scanner.start()
         self._subtree_scanners[path] = scanner
+        return True
 
     def scan_background_deep_async(self, base_path: Path):
         """Start a silent full-depth background scan after the initial shallow scan.
@@ -329,9 +585,10 @@ class DirectoryService(QObject):
             self._background_scanner.wait()
 
         max_depth = self.config.ui.max_directory_depth
-        self._background_scanner = DirectoryScanner(base_path, max_depth, fast_mode=True)
+        self._background_scanner = DirectoryScanner(base_path, max_depth, fast_mode=True,
+                                                    workers=self.config.ui.scan_workers)
         # No progress_updated connection — runs silently
-        self._background_scanner.scan_completed.connect(self.background_scan_completed)
+        self._background_scanner.scan_completed.connect(self._on_background_scan_completed)
         self._background_scanner.start()
 
     def cancel_background_scan(self):
@@ -342,11 +599,27 @@ class DirectoryService(QObject):
     def _on_subtree_scan_completed(self, path: Path, hierarchy: DirectoryHierarchy):
         """Handle completed on-demand subtree scan."""
         self._subtree_scanners.pop(path, None)
+        self.search_index.update_subtree(path, hierarchy)
         self.subtree_scan_completed.emit(path, hierarchy)
 
-    def _on_scan_completed(self, hierarchy: DirectoryHierarchy):
+    def _on_subtree_scan_error(self, path: Path, error: str):
+        """Handle failed on-demand subtree scan (e.g. the directory was removed)."""
+        self._subtree_scanners.pop(path, None)
+        logger.warning(f"Subtree scan of {path} failed: {error}")
+        self.subtree_scan_failed.emit(path, error)
+
+    def _on_background_scan_completed(self, hierarchy: DirectoryHierarchy):
+        """Handle completed background deep scan."""
+        self._current_base = hierarchy.root.path
+        self.search_index.rebuild(hierarchy)
+        self.background_scan_completed.emit(hierarchy)
+
+    def _on_scan_completed(self, hierarchy: DirectoryHierarchy,
+                           changes: Optional[List[DirectoryChange]] = None):
         """Handle completed directory scan."""
-        self._current_hierarchy = hierarchy
+        self._current_base = hierarchy.root.path
+        self.search_index.rebuild(hierarchy)
+        self.last_scan_changes = changes
         self.hierarchy_updated.emit(hierarchy)
         self.operation_completed.emit("directory_scan", True)
 
@@ -354,9 +627,35 @@ class DirectoryService(QObject):
         """Handle directory scan error."""
         self.operation_completed.emit(f"directory_scan_error: {error}", False)
 
-    def get_current_hierarchy(self) -> Optional[DirectoryHierarchy]:
-        """Get the current directory hierarchy."""
-        return self._current_hierarchy
+    def snapshot_path(self, base_path: Path) -> Path:
+        """On-disk snapshot file for a base directory."""
+        digest = hashlib.sha1(str(base_path).encode('utf-8')).hexdigest()[:16]
+        return self.config.paths.snapshot_dir / f"snapshot_{digest}.json.gz"
+
+    def load_snapshot(self, base_path: Path) -> Optional[DirectorySnapshot]:
+        """Get the last snapshot of a base directory (memory first, then disk)."""
+        snapshot = self._snapshots.get(str(base_path))
+        if snapshot is None:
+            snapshot = DirectorySnapshot.load(self.snapshot_path(base_path), base_path)
+            if snapshot is not None:
+                logger.info(f"Loaded snapshot of {base_path}: {len(snapshot)} dirs")
+                self._snapshots[str(base_path)] = snapshot
+        return snapshot
+
+    def save_snapshot(self, tree: FlatDirectoryTree):
+        """Capture the tree (on this thread) and write it to disk in the background."""
+        snapshot = DirectorySnapshot.from_tree(tree)
+        if not len(snapshot):
+            return  # Sequential scans don't record mtimes - nothing worth caching
+        self._snapshots[str(snapshot.base)] = snapshot
+
+        def write():
+            try:
+                snapshot.save(self.snapshot_path(snapshot.base))
+            except OSError as e:
+                logger.warning(f"Could not save directory snapshot for {snapshot.base}: {e}")
+
+        threading.Thread(target=write, name="treem-snapshot", daemon=True).start()
 
     # Fix for directory_service.py - apply_filter method
 
@@ -373,33 +672,9 @@ class DirectoryService(QObject):
                 # Show all directories when "Me only" is not selected
                 return True
 
-            dir_name = dir_info.name
-
-            # At root level, apply the "Me only" filter
+            # At root level, apply the "Me only" filter (only other users' works_ directories are hidden)
             if is_root_level:
-                # FIXED: Always include allowed directories (outfeeds, FastTrack, dbs)
-                if dir_name in filter_config.allowed_directories:
-                    return True
-
-                # Include current user's workspace
-                if filter_config.user_name:
-                    user_workspace = f"works_{filter_config.user_name}"
-                    if dir_name == user_workspace:
-                        return True
-
-                # FIXED: Exclude other users' workspaces but allow non-workspace directories
-                # Only filter out directories that start with "works_" but are NOT the current user's
-                if dir_name.startswith("works_"):
-                    # This is a workspace directory
-                    if filter_config.user_name:
-                        user_workspace = f"works_{filter_config.user_name}"
-                        return dir_name == user_workspace
-                    else:
-                        return False  # No user specified, hide all workspaces
-
-                # FIXED: Allow all other directories (like hawkeye_archive, etc.)
-                # The "Me only" filter should only hide OTHER USERS' works_ directories
-                return True
+                return filter_config.includes_top_level(dir_info.name)
 
             # For subdirectories (not root level), include everything
             return True
@@ -410,7 +685,8 @@ class DirectoryService(QObject):
             filtered = DirectoryHierarchy(
                 root=source_hierarchy.root,
                 depth=source_hierarchy.depth,
-                max_depth=source_hierarchy.max_depth
+                max_depth=source_hierarchy.max_depth,
+                is_shallow=source_hierarchy.is_shallow
             )
 
             # Filter children
@@ -427,48 +703,31 @@ class DirectoryService(QObject):
     def search_directories(
         self,
         query: str,
-        hierarchy: Optional[DirectoryHierarchy] = None
+        hierarchy: Optional[DirectoryHierarchy] = None,
+        limit: Optional[int] = 50
     ) -> List[SearchResult]:
-        """Search for directories matching query."""
-        if hierarchy is None:
-            hierarchy = self._current_hierarchy
+        """Search for directories matching query, best matches first.
 
-        if not hierarchy:
-            return []
+        Uses the search index of the current tree; an explicitly passed
+        hierarchy is indexed on the fly. Only the top `limit` results are
+        ranked (None for all).
+        """
+        if hierarchy is None:
+            index = self.search_index
+        else:
+            index = DirectorySearchIndex()
+            index.rebuild(hierarchy)
 
         results = []
-        query_lower = query.lower()
-
-        # Search in current directory
-        if query_lower in hierarchy.root.name.lower():
-            results.append(SearchResult(
-                path=hierarchy.root.path,
-                name=hierarchy.root.name,
-                match_type="name",
-                relevance_score=self._calculate_relevance(query, hierarchy.root.name)
-            ))
-
-        # Search in children
-        for child in hierarchy.children.values():
-            results.extend(self.search_directories(query, child))
-
-        # Sort by relevance
-        results.sort(key=lambda x: x.relevance_score, reverse=True)
+        for score, path in index.search(query, limit=limit):
+            match_type = "name" if score >= 0.6 else "fuzzy"
+            results.append(SearchResult(path=Path(path), name=os.path.basename(path),
+                                        match_type=match_type, relevance_score=score))
         return results
 
     def _calculate_relevance(self, query: str, text: str) -> float:
         """Calculate relevance score for search results."""
-        query_lower = query.lower()
-        text_lower = text.lower()
-
-        if text_lower == query_lower:
-            return 1.0
-        elif text_lower.startswith(query_lower):
-            return 0.8
-        elif query_lower in text_lower:
-            return 0.6
-        else:
-            return 0.0
+        return relevance(query.lower(), text.lower())
 
     def open_terminal(self, path: Path) -> bool:
         """Open terminal at specified path."""
@@ -509,3 +768,82 @@ class DirectoryService(QObject):
             return False
 
 
+if __name__ == "__main__":
+    # Benchmark: sequential walk vs thread-pooled scan on a synthetic deep tree,
+    # with per-syscall latency injected to mimic an NFS-mounted project base.
+    #   python3.12 -m treem_casino.services.directory_service --fanout 4 --depth 5 --latency-ms 1
+    import argparse
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark DirectoryScanner on a synthetic tree")
+    parser.add_argument('--fanout', type=int, default=4, help="Subdirectories per directory")
+    parser.add_argument('--depth', type=int, default=5, help="Tree depth (also the scan depth)")
+    parser.add_argument('--latency-ms', type=float, default=1.0, help="Injected latency per stat/scandir call")
+    parser.add_argument('--workers', type=int, default=16, help="Pool size for the parallel scan")
+    args = parser.parse_args()
+
+    def build_tree(root: str, fanout: int, depth: int) -> int:
+        count = 0
+        level = [root]
+        for _ in range(depth):
+            next_level = []
+            for parent in level:
+                for i in range(fanout):
+                    child = os.path.join(parent, f"dir_{i}")
+                    os.mkdir(child)
+                    next_level.append(child)
+            count += len(next_level)
+            level = next_level
+        # A symlink cycle and a symlink to an already-scanned subtree
+        os.symlink(root, os.path.join(root, "dir_0", "loop_to_root"))
+        os.symlink(os.path.join(root, "dir_1"), os.path.join(root, "link_to_dir_1"))
+        return count
+
+    def with_latency(func, delay: float):
+        def slow(*a, **kw):
+            time.sleep(delay)
+            return func(*a, **kw)
+        return slow
+
+    with tempfile.TemporaryDirectory(prefix="treem_scan_bench_") as tmp:
+        total = build_tree(tmp, args.fanout, args.depth)
+        print(f"Synthetic tree: {total} directories, fanout {args.fanout}, depth {args.depth}, "
+              f"{args.latency_ms} ms per syscall")
+
+        delay = args.latency_ms / 1000.0
+        real_calls = os.scandir, os.stat, os.lstat
+        os.scandir, os.stat, os.lstat = (with_latency(f, delay) for f in real_calls)
+        try:
+            timings, trees = {}, {}
+            for label, workers in (("sequential", 1), (f"parallel x{args.workers}", args.workers)):
+                scanner = DirectoryScanner(Path(tmp), args.depth, fast_mode=True, workers=workers)
+                scanner.total_dirs_estimated = total
+                start = time.perf_counter()
+                if workers > 1:
+                    hierarchy = scanner._scan_parallel()
+                else:
+                    hierarchy = scanner._scan_with_progress(Path(tmp), max_depth=args.depth)
+                timings[label] = time.perf_counter() - start
+                trees[label] = {str(p) for p in hierarchy.get_all_paths()}
+                print(f"  {label:<14} {timings[label]:7.2f}s  {len(trees[label])} nodes")
+
+            # Incremental rescan: snapshot of the parallel result, then one new and one removed dir
+            snapshot = DirectorySnapshot.from_hierarchy(hierarchy)
+            os.mkdir(os.path.join(tmp, "dir_0", "new_run"))
+            os.rmdir(os.path.join(tmp, *["dir_1"] * args.depth))
+            scanner = DirectoryScanner(Path(tmp), args.depth, fast_mode=True, workers=args.workers,
+                                       previous=snapshot)
+            start = time.perf_counter()
+            rescanned = scanner._scan_parallel()
+            timings["incremental"] = time.perf_counter() - start
+            print(f"  {'incremental':<14} {timings['incremental']:7.2f}s  "
+                  f"{len(rescanned.get_all_paths())} nodes, changes: "
+                  f"{sorted((c.change_type, c.path.name) for c in scanner.changes)}")
+        finally:
+            os.scandir, os.stat, os.lstat = real_calls
+
+        sequential, parallel = list(trees.values())[:2]
+        print(f"Same tree: {sequential == parallel}")
+        seq_time, par_time = timings["sequential"], timings[f"parallel x{args.workers}"]
+        print(f"Speedup: {seq_time / max(par_time, 1e-9):.1f}x")
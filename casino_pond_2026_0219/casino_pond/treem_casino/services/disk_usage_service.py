@@ -0,0 +1,409 @@
+"""
+Background disk-usage aggregation for directory trees.
+Computes recursive sizes (apparent and allocated bytes, hardlink-aware by
+inode) with a thread pool and caches per-directory results by mtime.
+"""
+
+import logging
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+
+from ..models.directory import DirectoryHierarchy, format_size
+from ..models.flat_tree import FlatDirectoryTree, NO_NODE, UNKNOWN
+from ..config.settings import AppConfig
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_INTERVAL = 0.5  # Seconds between progress signals
+
+
+@dataclass
+class DirectoryUsage:
+    """Recursive disk usage of one directory."""
+
+    apparent: int = 0  # Sum of file sizes (du --apparent-size)
+    allocated: int = 0  # Blocks on disk (du default)
+    files: int = 0
+    dirs: int = 0
+    errors: int = 0  # Unreadable directories/files below this one
+
+
+class LocalUsage(NamedTuple):
+    """Cached contents of a single directory (not recursive), valid while its mtime is unchanged."""
+
+    mtime_ns: int
+    apparent: int
+    allocated: int
+    files: int  # Files with a single link; multiply-linked ones are in `links`
+    subdirs: List[str]  # Subdirectory names (symlinks to directories are not followed)
+    links: List[Tuple[int, int, int, int]]  # (dev, ino, apparent, allocated) of files with st_nlink > 1
+    errors: int
+
+
+class DiskUsageScanner(QThread):
+    """Background thread computing recursive sizes of one or more directories.
+
+    Workers list directories (one scandir + one lstat per file); a directory
+    whose mtime matches the cache is not listed again, its cached totals and
+    subdirectory names are reused. Note that files growing in place do not
+    change their directory's mtime: use force=True to re-walk everything.
+    """
+
+    progress_updated = pyqtSignal(int, int)  # directories done, allocated bytes so far
+    usage_completed = pyqtSignal(object, object, bool)  # totals {path: DirectoryUsage}, records {path: LocalUsage}, cancelled
+
+    def __init__(self, roots: List[Path], cache: Dict[str, LocalUsage],
+                 wanted: Optional[Set[str]] = None, workers: int = 8, force: bool = False):
+        super().__init__()
+        self.roots = [str(root) for root in roots]
+        self.cache = cache  # Read-only here; the service merges `records` on completion
+        self.wanted = wanted  # Paths to report totals for (None = every directory)
+        self.workers = max(1, workers)
+        self.force = force
+        self._cancelled = False
+
+    def cancel(self):
+        """Cancel the computation."""
+        self._cancelled = True
+
+    def _list_task(self, results: queue.Queue, path: str, is_root: bool):
+        """Pool worker: local usage of one directory (from the cache when its mtime is unchanged)."""
+        record = None
+        try:
+            if not self._cancelled:
+                # Roots may be symlinks (shown as "(ln)" in the tree); nothing below them is followed
+                st = os.stat(path) if is_root else os.lstat(path)
+                cached = None if self.force else self.cache.get(path)
+                if cached is not None and cached.mtime_ns == st.st_mtime_ns:
+                    record = cached
+                else:
+                    record = self._scan_directory(path, st)
+        except OSError as e:
+            logger.debug(f"Disk usage: cannot stat {path}: {e}")
+            record = LocalUsage(0, 0, 0, 0, [], [], 1)
+        finally:
+            results.put((path, record))
+
+    @staticmethod
+    def _block_bytes(st: os.stat_result) -> int:
+        blocks = getattr(st, 'st_blocks', None)
+        return blocks * 512 if blocks is not None else st.st_size
+
+    def _scan_directory(self, path: str, dir_st: os.stat_result) -> LocalUsage:
+        # The directory's own entry blocks count too, as in du
+        apparent, allocated = dir_st.st_size, self._block_bytes(dir_st)
+        files = errors = 0
+        subdirs, links = [], []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        errors += 1
+                        continue
+                    file_allocated = self._block_bytes(st)
+                    if st.st_nlink > 1:
+                        # Counted (bytes and file) once per inode when the totals are aggregated
+                        links.append((st.st_dev, st.st_ino, st.st_size, file_allocated))
+                    else:
+                        files += 1
+                        apparent += st.st_size
+                        allocated += file_allocated
+        except OSError as e:
+            logger.debug(f"Disk usage: cannot list {path}: {e}")
+            errors += 1
+        return LocalUsage(dir_st.st_mtime_ns, apparent, allocated, files, subdirs, links, errors)
+
+    def run(self):
+        """Walk all roots with the pool, then aggregate bottom-up on this thread."""
+        records: Dict[str, LocalUsage] = {}  # Every directory visited, for the cache
+        parents: Dict[str, Optional[str]] = {}
+        order: List[str] = []  # Visit order: parents always before their children
+        results = queue.Queue()
+        outstanding = 0
+        allocated_so_far = 0
+        last_progress = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="treem-du") as pool:
+            for root in dict.fromkeys(self.roots):
+                parents[root] = None
+                outstanding += 1
+                pool.submit(self._list_task, results, root, True)
+
+            while outstanding:
+                path, record = results.get()
+                outstanding -= 1
+                if self._cancelled:
+                    continue  # Drain the tasks already submitted
+                records[path] = record
+                order.append(path)
+                allocated_so_far += record.allocated
+                for name in record.subdirs:
+                    child = os.path.join(path, name)
+                    if child in parents:
+                        continue  # Nested roots are walked once
+                    parents[child] = path
+                    outstanding += 1
+                    pool.submit(self._list_task, results, child, False)
+
+                now = time.monotonic()
+                if now - last_progress >= PROGRESS_INTERVAL:
+                    last_progress = now
+                    self.progress_updated.emit(len(records), allocated_so_far)
+
+        if self._cancelled:
+            # Fully listed directories are still valid cache entries
+            self.usage_completed.emit({}, records, True)
+            return
+
+        self.usage_completed.emit(self._aggregate(records, parents, order), records, False)
+
+    def _aggregate(self, records: Dict[str, LocalUsage], parents: Dict[str, Optional[str]],
+                   order: List[str]) -> Dict[str, DirectoryUsage]:
+        """Sum local usage bottom-up; a multiply-linked inode counts once per subtree containing it."""
+        totals: Dict[str, DirectoryUsage] = {}
+        inode_dirs: Dict[Tuple[int, int], Tuple[int, int, Set[str]]] = {}
+
+        for path in reversed(order):
+            record = records[path]
+            usage = totals.setdefault(path, DirectoryUsage())
+            usage.apparent += record.apparent
+            usage.allocated += record.allocated
+            usage.files += record.files
+            usage.errors += record.errors
+            for dev, ino, apparent, allocated in record.links:
+                inode_dirs.setdefault((dev, ino), (apparent, allocated, set()))[2].add(path)
+
+            parent = parents.get(path)
+            if parent is not None:
+                parent_usage = totals.setdefault(parent, DirectoryUsage())
+                parent_usage.apparent += usage.apparent
+                parent_usage.allocated += usage.allocated
+                parent_usage.files += usage.files
+                parent_usage.dirs += usage.dirs + 1
+                parent_usage.errors += usage.errors
+
+        for apparent, allocated, dirs in inode_dirs.values():
+            counted = set()
+            for path in dirs:
+                while path is not None and path not in counted:
+                    counted.add(path)
+                    usage = totals[path]
+                    usage.apparent += apparent
+                    usage.allocated += allocated
+                    usage.files += 1
+                    path = parents.get(path)
+
+        if self.wanted is not None:
+            keep = self.wanted.union(self.roots)
+            totals = {path: usage for path, usage in totals.items() if path in keep}
+        return totals
+
+
+class DiskUsageService(QObject):
+    """Owns the disk-usage cache and runs one DiskUsageScanner at a time."""
+
+    # Signals
+    usage_updated = pyqtSignal(object)  # {path: DirectoryUsage} of the computation that just finished
+    progress_updated = pyqtSignal(str)
+    computation_finished = pyqtSignal(bool)  # cancelled
+
+    def __init__(self, config: AppConfig):
+        super().__init__()
+        self.config = config
+        self._usage: Dict[str, DirectoryUsage] = {}  # Recursive totals of tree directories
+        self._cache: Dict[str, LocalUsage] = {}  # Per-directory local usage keyed by path
+        self._scanner: Optional[DiskUsageScanner] = None
+
+    def is_running(self) -> bool:
+        return self._scanner is not None and self._scanner.isRunning()
+
+    def get(self, path) -> Optional[DirectoryUsage]:
+        """Recursive usage of a directory, if computed."""
+        return self._usage.get(str(path))
+
+    def compute(self, roots: Iterable[Path], tree: Optional[FlatDirectoryTree] = None,
+                force: bool = False) -> bool:
+        """Start computing sizes of `roots`; totals are reported for directories in `tree`.
+
+        Returns False if a computation is already running.
+        """
+        if self.is_running():
+            return False
+
+        roots = [Path(root) for root in roots]
+        # A root inside another root is covered by the outer walk
+        roots = [root for root in roots if not any(parent in roots for parent in root.parents)]
+        wanted = None
+        if tree is not None:
+            wanted = set()
+            for root in roots:
+                node = tree.find(root)
+                if node != NO_NODE:
+                    wanted.update(path for _, path in tree.walk(node))
+
+        self._scanner = DiskUsageScanner(roots, self._cache, wanted,
+                                         workers=self.config.ui.disk_usage_workers, force=force)
+        self._scanner.progress_updated.connect(self._on_progress)
+        self._scanner.usage_completed.connect(self._on_usage_completed)
+        self._scanner.start()
+        return True
+
+    def cancel(self):
+        """Cancel the running computation (its fully listed directories stay cached)."""
+        if self.is_running():
+            self._scanner.cancel()
+
+    def _on_progress(self, dirs_done: int, allocated: int):
+        self.progress_updated.emit(f"Disk usage: {dirs_done} dirs, {format_size(allocated)} so far...")
+
+    def _on_usage_completed(self, totals: Dict[str, DirectoryUsage],
+                            records: Dict[str, LocalUsage], cancelled: bool):
+        roots = self._scanner.roots if self._scanner else []
+        self._scanner = None
+        self._merge_records(records)
+
+        if not cancelled:
+            # Ancestors of a recomputed root now hold stale totals
+            for root in roots:
+                for ancestor in Path(root).parents:
+                    self._usage.pop(str(ancestor), None)
+            self._usage.update(totals)
+            self.usage_updated.emit(totals)
+        self.computation_finished.emit(cancelled)
+
+    def _merge_records(self, records: Dict[str, LocalUsage]):
+        """Store new local records and forget subdirectories that no longer exist."""
+        for path, record in records.items():
+            old = self._cache.get(path)
+            if old is not None and old is not record:
+                stack = [os.path.join(path, name) for name in set(old.subdirs) - set(record.subdirs)]
+                while stack:
+                    gone = stack.pop()
+                    self._usage.pop(gone, None)
+                    gone_record = self._cache.pop(gone, None)
+                    if gone_record is not None:
+                        stack.extend(os.path.join(gone, name) for name in gone_record.subdirs)
+            self._cache[path] = record
+
+    def apply_sizes(self, hierarchy: DirectoryHierarchy):
+        """Copy computed allocated sizes into DirectoryInfo.size for a (sub)tree."""
+        if not self._usage:
+            return
+        stack = [hierarchy]
+        while stack:
+            node = stack.pop()
+            usage = self._usage.get(str(node.root.path))
+            node.root.size = usage.allocated if usage is not None else None
+            stack.extend(node.children.values())
+
+    def apply_tree_sizes(self, tree: FlatDirectoryTree):
+        """Copy computed allocated sizes into the size array of a flat tree."""
+        if not self._usage:
+            return
+        size = tree.size
+        for node, path in tree.walk():
+            usage = self._usage.get(path)
+            size[node] = usage.allocated if usage is not None else UNKNOWN
+
+    def largest_runs(self, tree: FlatDirectoryTree, node: int = 0,
+                     limit: int = 30) -> List[Tuple[Path, DirectoryUsage]]:
+        """Largest leaf directories under `node` (run directories) with computed sizes, biggest first."""
+        runs = []
+        for leaf, path in tree.walk(node):
+            if tree.child_count[leaf]:
+                continue
+            usage = self._usage.get(path)
+            if usage is not None:
+                runs.append((Path(path), usage))
+        runs.sort(key=lambda item: item[1].allocated, reverse=True)
+        return runs[:limit]
+
+
+if __name__ == "__main__":
+    # Self-check against du: python -m treem_casino.services.disk_usage_service <dir> [--workers N]
+    # Hard-link check: python -m treem_casino.services.disk_usage_service --selftest
+    import argparse
+    import subprocess
+    import sys
+    import tempfile
+    from PyQt5.QtCore import QCoreApplication
+
+    parser = argparse.ArgumentParser(description="Disk usage engine benchmark")
+    parser.add_argument("directory", nargs="?")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--selftest", action="store_true", help="Check hard-link accounting on a temporary tree")
+    args = parser.parse_args()
+    if not args.directory and not args.selftest:
+        parser.error("directory is required")
+
+    app = QCoreApplication(sys.argv)
+    cache: Dict[str, LocalUsage] = {}
+
+    def scan(root: str) -> Dict[str, DirectoryUsage]:
+        scanner = DiskUsageScanner([Path(root)], cache, workers=args.workers)
+        out = {}
+
+        def done(totals, records, cancelled):
+            out.update(totals)
+            cache.update(records)
+
+        scanner.usage_completed.connect(done)
+        scanner.start()
+        while not scanner.wait(20):
+            app.processEvents()
+        app.processEvents()
+        return out
+
+    if args.selftest:
+        with tempfile.TemporaryDirectory() as work_dir:
+            # One 4 KB inode linked from three directories, plus two ordinary files
+            for sub in ("a/b", "c"):
+                os.makedirs(os.path.join(work_dir, sub))
+            linked = os.path.join(work_dir, "a", "linked")
+            with open(linked, "wb") as f:
+                f.write(b"x" * 4096)
+            os.link(linked, os.path.join(work_dir, "a", "b", "linked"))
+            os.link(linked, os.path.join(work_dir, "c", "linked"))
+            for name in ("a/one", "c/two"):
+                with open(os.path.join(work_dir, name), "wb") as f:
+                    f.write(b"y" * 100)
+
+            totals = scan(work_dir)
+            # (files, file bytes) per subtree; directory entries add their own st_size
+            expected = {"": (3, 4296), "a": (2, 4196), "a/b": (1, 4096), "c": (2, 4196)}
+            for sub, (files, file_bytes) in expected.items():
+                path = os.path.join(work_dir, sub).rstrip(os.sep)
+                dir_bytes = sum(os.stat(d).st_size for d, _, _ in os.walk(path))
+                usage = totals[path]
+                assert (usage.files, usage.apparent) == (files, file_bytes + dir_bytes), (sub, usage)
+        print("self-check ok")
+        sys.exit(0)
+
+    root = os.path.abspath(args.directory)
+
+    def run_once(label: str) -> Dict[str, DirectoryUsage]:
+        start = time.perf_counter()
+        out = scan(root)
+        usage = out[root]
+        print(f"{label}: {time.perf_counter() - start:.2f}s  allocated={format_size(usage.allocated)} "
+              f"apparent={format_size(usage.apparent)} files={usage.files} dirs={usage.dirs}")
+        return out
+
+    run_once("cold")
+    run_once("cached")
+    try:
+        du = subprocess.run(["du", "-s", "-B1", root], capture_output=True, text=True).stdout.split()[0]
+        print(f"du -s -B1: {format_size(int(du))} ({du} bytes)")
+    except (OSError, IndexError, ValueError):
+        pass
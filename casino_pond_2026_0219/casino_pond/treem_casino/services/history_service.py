@@ -1,18 +1,23 @@
 """
 Complete directory history service for tracking navigation and operations.
 Provides back/forward navigation and operation history with terminal operation tracking.
-History files are stored in the casino project directory with user-specific naming.
+History files are stored in the casino project directory with user-specific naming,
+as an append-only journal (one JSON record per operation) that is compacted periodically.
 """
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
 from PyQt5.QtCore import QObject, pyqtSignal, QFileSystemWatcher
 import json
 import getpass
+import uuid
 
 from ..config.settings import AppConfig
+from ..utils.journal import Journal
+
+HISTORY_VERSION = '3.0'
 
 
 @dataclass
@@ -87,6 +92,10 @@ class DirectoryHistoryService(QObject):
         self.history: List[HistoryEntry] = []
         self.current_index: int = -1
 
+        # Journal of history operations; records we write carry our session id
+        self._session = uuid.uuid4().hex[:12]
+        self.journal = Journal(self.get_history_file_path(), config.ui.journal_compact_after)
+
         # File watcher for automatic reload when history file changes
         self.file_watcher = QFileSystemWatcher()
         self._setup_file_watcher()
@@ -117,7 +126,7 @@ class DirectoryHistoryService(QObject):
         if history_file.exists() and str(history_file) not in self.file_watcher.files():
             self.file_watcher.addPath(str(history_file))
 
-        self.load_history()
+        self._sync_history()
 
     def _on_history_directory_changed(self, path: str):
         """Handle directory change (file created/deleted)."""
@@ -126,17 +135,21 @@ class DirectoryHistoryService(QObject):
             # File was created, start watching it
             self.file_watcher.addPath(str(history_file))
             print(f"[History] Started watching new history file: {history_file}")
-            self.load_history()
+            self._sync_history()
 
     def get_history_file_path(self) -> Path:
-        """Get user-specific history file path in project directory."""
+        """Get user-specific history journal path in project directory."""
         # Use project base directory: $casino_prj_base/$casino_prj_name
         if self.config.paths.base_directory.exists():
             # Store in project directory with user-specific filename
-            return self.config.paths.base_directory / f".directory_history_{self.current_user}.json"
+            return self.config.paths.base_directory / f".directory_history_{self.current_user}.jsonl"
         else:
             # Fallback to user's home directory if project directory doesn't exist
-            return Path.home() / f".treem_casino_history_{self.current_user}.json"
+            return Path.home() / f".treem_casino_history_{self.current_user}.jsonl"
+
+    def get_legacy_history_file_path(self) -> Path:
+        """Get the pre-journal (whole-file JSON) history path, imported on first use."""
+        return self.get_history_file_path().with_suffix('.json')
 
     def add_entry(self, path: Path, operation: str = "navigate", details: Optional[str] = None):
         """Add a new history entry with user information."""
@@ -161,22 +174,8 @@ class DirectoryHistoryService(QObject):
             user=self.current_user
         )
 
-        # If we're in the middle of history, remove everything after current position
-        if self.current_index < len(self.history) - 1:
-            self.history = self.history[:self.current_index + 1]
-
-        # Add new entry
-        self.history.append(entry)
-        self.current_index = len(self.history) - 1
-
-        # Trim history if too long
-        if len(self.history) > self.max_history:
-            removed_count = len(self.history) - self.max_history
-            self.history = self.history[removed_count:]
-            self.current_index -= removed_count
-
-        # Save and emit signals
-        self.save_history()
+        # Branching from the middle of history drops everything after the current position
+        self._commit({'op': 'add', 'entry': entry.to_dict(), 'branch': True})
         self.history_changed.emit()
         self.current_changed.emit(path, operation)
 
@@ -191,9 +190,11 @@ class DirectoryHistoryService(QObject):
     def go_back(self) -> Optional[HistoryEntry]:
         """Go back one step in history."""
         if self.can_go_back():
-            self.current_index -= 1
-            entry = self.history[self.current_index]
+            self._commit({'op': 'move', 'delta': -1})
+            entry = self.get_current_entry()
             self.history_changed.emit()
+            if entry is None:
+                return None  # Cleared by another writer meanwhile
             self.current_changed.emit(entry.path, "navigate_back")
             return entry
         return None
@@ -201,9 +202,11 @@ class DirectoryHistoryService(QObject):
     def go_forward(self) -> Optional[HistoryEntry]:
         """Go forward one step in history."""
         if self.can_go_forward():
-            self.current_index += 1
-            entry = self.history[self.current_index]
+            self._commit({'op': 'move', 'delta': 1})
+            entry = self.get_current_entry()
             self.history_changed.emit()
+            if entry is None:
+                return None  # Cleared by another writer meanwhile
             self.current_changed.emit(entry.path, "navigate_forward")
             return entry
         return None
@@ -254,7 +257,7 @@ class DirectoryHistoryService(QObject):
         """Jump to a specific history entry."""
         try:
             index = self.history.index(entry)
-            self.current_index = index
+            self._commit({'op': 'move', 'delta': index - self.current_index})
             self.history_changed.emit()
             self.current_changed.emit(entry.path, "navigate_jump")
             return True
@@ -263,63 +266,160 @@ class DirectoryHistoryService(QObject):
 
     def clear_history(self):
         """Clear all history."""
-        self.history.clear()
-        self.current_index = -1
-        self.save_history()
+        self._commit({'op': 'clear'})
+        self._compact()
         self.history_changed.emit()
 
-    def save_history(self):
-        """Save user-specific history to project directory."""
+    def _commit(self, record: Dict[str, Any]):
+        """Append an operation to the journal and apply it (with any records from other writers)."""
+        record['session'] = self._session
         try:
-            history_file = self.get_history_file_path()
-            history_file.parent.mkdir(parents=True, exist_ok=True)
+            self.journal.append([record], initial=self._legacy_snapshot)
+        except Exception as e:
+            print(f"Warning: Could not save history for user {self.current_user}: {e}")
+            self._apply_records([record])  # Keep navigating in memory
+            return
+
+        # Apply in file order so concurrent appends (e.g. run creation) interleave consistently
+        self._sync_history(notify=False)
+        if self.journal.needs_compaction:
+            self._compact()
+
+    def _sync_history(self, notify: bool = True):
+        """Apply records appended to the journal since the last read."""
+        try:
+            reset, records = self.journal.read_new()
+        except Exception as e:
+            print(f"Warning: Could not read history for user {self.current_user}: {e}")
+            return
+        if not reset and not records:
+            return
 
-            # Save with user and project metadata
-            data = {
-                'user': self.current_user,
-                'project_base': str(self.config.paths.project_base),
-                'project_name': self.config.paths.project_name,
-                'history': [entry.to_dict() for entry in self.history],
-                'current_index': self.current_index,
-                'saved_at': datetime.now().isoformat(),
-                'version': '2.0'
-            }
+        if reset:
+            self.history, self.current_index = [], -1
+        external_run = self._apply_records(records)
 
-            with open(history_file, 'w') as f:
-                json.dump(data, f, indent=2)
+        if notify:
+            self.history_changed.emit()
+        if external_run:
+            # A run was created outside this session (e.g. by wsm_casino)
+            self.tree_refresh_needed.emit()
+
+    def _apply_records(self, records: List[Dict[str, Any]]) -> bool:
+        """Apply journal records to the in-memory history; True if another writer created a run."""
+        self.history, self.current_index, external_run = self._replay(records, self.history, self.current_index)
+        return external_run
+
+    def _replay(self, records: List[Dict[str, Any]], history: List[HistoryEntry],
+                current_index: int) -> Tuple[List[HistoryEntry], int, bool]:
+        """Replay journal records onto (history, current_index)."""
+        history = list(history)
+        external_run = False
+        for record in records:
+            op = record.get('op')
+            if op == 'add':
+                try:
+                    entry = HistoryEntry.from_dict(record['entry'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if record.get('branch') and current_index < len(history) - 1:
+                    del history[current_index + 1:]
+                history.append(entry)
+                current_index = len(history) - 1
+                if len(history) > self.max_history:
+                    removed_count = len(history) - self.max_history
+                    del history[:removed_count]
+                    current_index -= removed_count
+                if entry.operation == "create_run" and record.get('session') != self._session:
+                    external_run = True
+            elif op == 'move':
+                if history:
+                    current_index = max(0, min(len(history) - 1, current_index + record.get('delta', 0)))
+            elif op == 'clear':
+                history, current_index = [], -1
+            elif op == 'snapshot':
+                # Verify this history belongs to current user
+                saved_user = record.get('user', self.current_user)
+                if saved_user != self.current_user:
+                    print(f"Warning: History snapshot belongs to {saved_user}, not {self.current_user}")
+                    continue
+                history = []
+                for entry_data in record.get('history', []):
+                    try:
+                        history.append(HistoryEntry.from_dict(entry_data))
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                history = history[-self.max_history:]
+                current_index = min(record.get('current_index', len(history) - 1), len(history) - 1)
+        return history, current_index, external_run
+
+    def _snapshot_record(self, history: List[HistoryEntry], current_index: int) -> Dict[str, Any]:
+        """Journal record holding a complete history state, with user and project metadata."""
+        return {
+            'op': 'snapshot',
+            'user': self.current_user,
+            'project_base': str(self.config.paths.project_base),
+            'project_name': self.config.paths.project_name,
+            'history': [entry.to_dict() for entry in history],
+            'current_index': current_index,
+            'saved_at': datetime.now().isoformat(),
+            'version': HISTORY_VERSION
+        }
 
-            print(f"Saved {len(self.history)} history entries for user {self.current_user} to {history_file}")
+    def _compact(self):
+        """Fold the journal into a single snapshot record."""
+        def fold(records):
+            history, current_index, _ = self._replay(records, [], -1)
+            return [self._snapshot_record(history, current_index)]
 
+        try:
+            self.journal.compact(fold)
+            print(f"Compacted history journal for user {self.current_user}")
         except Exception as e:
-            print(f"Warning: Could not save history for user {self.current_user}: {e}")
+            print(f"Warning: Could not compact history for user {self.current_user}: {e}")
 
-    def load_history(self):
-        """Load user-specific history from project directory."""
+    def _legacy_snapshot(self) -> List[Dict[str, Any]]:
+        """Snapshot record of the pre-journal history file, if there is one."""
+        legacy_file = self.get_legacy_history_file_path()
         try:
-            history_file = self.get_history_file_path()
-            if not history_file.exists():
-                print(f"No history file found for user {self.current_user} at {history_file}")
-                # Try to migrate from old shared location
-                self.migrate_shared_history()
-                return
-
-            with open(history_file, 'r') as f:
+            with open(legacy_file, 'r') as f:
                 data = json.load(f)
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            print(f"Warning: Could not import history from {legacy_file}: {e}")
+            return []
 
-            # Verify this history belongs to current user
-            saved_user = data.get('user', 'unknown')
-            if saved_user != self.current_user:
-                print(f"Warning: History file belongs to {saved_user}, not {self.current_user}")
-                # Start fresh for security
-                return
+        record = dict(data, op='snapshot')
+        record.setdefault('user', 'unknown')
+        print(f"Imported {len(data.get('history', []))} history entries from {legacy_file}")
+        return [record]
 
-            # Load history entries
-            self.history = [HistoryEntry.from_dict(entry_data) for entry_data in data.get('history', [])]
-            self.current_index = data.get('current_index', -1)
+    def save_history(self):
+        """Record the full in-memory history in the journal as a snapshot."""
+        try:
+            snapshot = self._snapshot_record(self.history, self.current_index)
+            snapshot['session'] = self._session
+            self.journal.append([snapshot], initial=self._legacy_snapshot)
+            print(f"Saved {len(self.history)} history entries for user {self.current_user} to {self.journal.path}")
 
-            # Validate current_index
-            if self.current_index >= len(self.history):
-                self.current_index = len(self.history) - 1
+        except Exception as e:
+            print(f"Warning: Could not save history for user {self.current_user}: {e}")
+
+    def load_history(self):
+        """Load user-specific history by replaying the journal in the project directory."""
+        try:
+            if not self.journal.exists():
+                if not self.get_legacy_history_file_path().exists():
+                    print(f"No history file found for user {self.current_user} at {self.journal.path}")
+                    # Try to migrate from old shared location
+                    self.migrate_shared_history()
+                    return
+                # First run with the journal: import the whole-file history
+                self.journal.append([], initial=self._legacy_snapshot)
+
+            records = self.journal.read_all()
+            self.history, self.current_index, _ = self._replay(records, [], -1)
 
             print(f"Loaded {len(self.history)} history entries for user {self.current_user}")
 
@@ -329,7 +429,7 @@ class DirectoryHistoryService(QObject):
             # Check if the most recent entry is a create_run operation
             # If so, emit tree refresh signal to update directory tree
             if self.history and self.history[-1].operation == "create_run":
-                print(f"[History] Detected new run creation, triggering tree refresh")
+                print("[History] Detected new run creation, triggering tree refresh")
                 self.tree_refresh_needed.emit()
 
         except Exception as e:
@@ -1,6 +1,8 @@
 """
 Memo service for managing directory memos.
 Handles persistent storage, real-time sync, and memo operations.
+Memos are stored as an append-only journal shared by the team: each edit
+appends one record, and change notifications apply only the new records.
 """
 
 import yaml
@@ -10,6 +12,7 @@ from PyQt5.QtCore import QObject, pyqtSignal, QFileSystemWatcher, QTimer
 
 from ..models.memo import Memo, MemoCollection
 from ..config.settings import AppConfig
+from ..utils.journal import Journal
 
 
 class MemoService(QObject):
@@ -26,6 +29,7 @@ class MemoService(QObject):
         super().__init__()
         self.config = config
         self.memo_collection = MemoCollection()
+        self.journal = Journal(config.paths.memo_journal, config.ui.journal_compact_after)
         self.file_watcher = QFileSystemWatcher()
 
         # Timer for debouncing file changes
@@ -40,63 +44,112 @@ class MemoService(QObject):
         self.load_memos()
 
     def _setup_file_watcher(self):
-        """Setup file system watcher for memo file."""
-        memo_dir = self.config.paths.memo_file.parent
+        """Setup file system watcher for the memo journal."""
+        memo_dir = self.journal.path.parent
 
         # Ensure directory exists
         self.config.ensure_shared_directory()
 
-        # Watch directory and file
+        # Watch directory (journal created or compacted) and file (appends)
         if memo_dir.exists():
             self.file_watcher.addPath(str(memo_dir))
-            if self.config.paths.memo_file.exists():
-                self.file_watcher.addPath(str(self.config.paths.memo_file))
+        self._watch_journal()
 
         # Connect signals
         self.file_watcher.directoryChanged.connect(self._on_file_changed)
         self.file_watcher.fileChanged.connect(self._on_file_changed)
 
+    def _watch_journal(self):
+        """(Re-)watch the journal; compaction replaces the file, which drops the watch."""
+        journal_path = str(self.journal.path)
+        if journal_path not in self.file_watcher.files() and self.journal.exists():
+            self.file_watcher.addPath(journal_path)
+
     def _on_file_changed(self, path: str):
         """Handle file system changes with debouncing."""
         # Debounce file changes to avoid multiple rapid reloads
         self.sync_timer.start(self.config.ui.file_watch_delay)
 
     def load_memos(self) -> bool:
-        """Load memos from file."""
+        """Load memos by replaying the journal (importing the legacy YAML on first use)."""
         try:
-            if self.config.paths.memo_file.exists():
-                with open(self.config.paths.memo_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
+            if not self.journal.exists() and self.config.paths.memo_file.exists():
+                self.journal.append([], initial=self._legacy_snapshot)
+                self._watch_journal()
 
-                self.memo_collection = MemoCollection.from_dict(data)
-                self.memos_loaded.emit(self.memo_collection)
-                return True
-            else:
-                # Initialize empty collection
-                self.memo_collection = MemoCollection()
-                self.memos_loaded.emit(self.memo_collection)
-                return True
+            collection = MemoCollection()
+            for record in self.journal.read_all():
+                self._apply_record(collection, record)
+
+            self.memo_collection = collection
+            self.memos_loaded.emit(self.memo_collection)
+            return True
 
         except Exception as e:
             self.sync_error.emit(f"Error loading memos: {e}")
             return False
 
+    def _legacy_snapshot(self) -> List[dict]:
+        """Snapshot record of the pre-journal YAML memo file."""
+        with open(self.config.paths.memo_file, 'r', encoding='utf-8') as f:
+            data = yaml.safe_load(f) or {}
+        return [{'op': 'snapshot', 'memos': MemoCollection.from_dict(data).to_dict()}]
+
     def _reload_memos(self):
-        """Reload memos from file (called by timer)."""
+        """Apply journal records appended since the last read (called by timer)."""
         try:
-            if self.config.paths.memo_file.exists():
-                with open(self.config.paths.memo_file, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f) or {}
-
-                new_collection = MemoCollection.from_dict(data)
-
-                # Check for changes and emit appropriate signals
+            self._watch_journal()
+            reset, records = self.journal.read_new()
+
+            if reset:
+                # Journal was compacted or recreated: replay it and diff against what we show
+                new_collection = MemoCollection()
+                for record in records:
+                    self._apply_record(new_collection, record)
                 self._detect_changes(new_collection)
-
                 self.memo_collection = new_collection
+                return
+
+            for record in records:
+                if record.get('op') == 'snapshot':
+                    new_collection = MemoCollection()
+                    self._apply_record(new_collection, record)
+                    self._detect_changes(new_collection)
+                    self.memo_collection = new_collection
+                    continue
+
+                change = self._apply_record(self.memo_collection, record)
+                if change is None:
+                    continue  # Already applied (our own append) or a no-op
+                path = Path(record['path'])
+                if change == 'added':
+                    self.memo_added.emit(path, self.memo_collection.get_memo(path))
+                elif change == 'updated':
+                    self.memo_updated.emit(path, self.memo_collection.get_memo(path))
+                else:
+                    self.memo_removed.emit(path)
         except Exception as e:
             self.sync_error.emit(f"Error reloading memos: {e}")
 
+    @staticmethod
+    def _apply_record(collection: MemoCollection, record: dict) -> Optional[str]:
+        """Apply one journal record; returns the kind of change it made, if any."""
+        op = record.get('op')
+        if op == 'set':
+            path = Path(record['path'])
+            memo = Memo.from_dict(record.get('memo', {}))
+            old_memo = collection.get_memo(path)
+            collection.memos[path] = memo
+            if old_memo is None:
+                return 'added'
+            return 'updated' if old_memo.to_dict() != memo.to_dict() else None
+        if op == 'remove':
+            return 'removed' if collection.remove_memo(Path(record['path'])) else None
+        if op == 'snapshot':
+            collection.memos = MemoCollection.from_dict(record.get('memos', {})).memos
+            return 'snapshot'
+        return None
+
     def _detect_changes(self, new_collection: MemoCollection):
         """Detect changes between old and new memo collections."""
         old_paths = set(self.memo_collection.memos.keys())
@@ -118,47 +171,40 @@ class MemoService(QObject):
             if old_memo.to_dict() != new_memo.to_dict():
                 self.memo_updated.emit(path, new_memo)
 
-    def save_memos(self) -> bool:
-        """Save memos to file."""
+    def _append(self, record: dict) -> bool:
+        """Append one record to the shared journal, compacting it when it has grown long."""
         try:
-            # Temporarily remove file watcher to avoid triggering our own changes
-            if self.config.paths.memo_file.exists():
-                self.file_watcher.removePath(str(self.config.paths.memo_file))
-
-            # Ensure directory exists
             self.config.ensure_shared_directory()
+            self.journal.append([record])
+            self._watch_journal()
 
-            # Save memos
-            with open(self.config.paths.memo_file, 'w', encoding='utf-8') as f:
-                yaml.dump(
-                    self.memo_collection.to_dict(),
-                    f,
-                    default_flow_style=False,
-                    sort_keys=False,
-                    allow_unicode=True
-                )
-
-            # Re-add file watcher
-            if self.config.paths.memo_file.exists():
-                self.file_watcher.addPath(str(self.config.paths.memo_file))
-
+            # Our own record is picked up (idempotently) by the next tail read
+            if self.journal.needs_compaction:
+                self.journal.compact(self._compact_records)
             return True
 
         except Exception as e:
-            # Ensure watcher is re-added even on error
-            if self.config.paths.memo_file.exists():
-                self.file_watcher.addPath(str(self.config.paths.memo_file))
-
             self.sync_error.emit(f"Error saving memos: {e}")
             return False
 
+    def _compact_records(self, records: List[dict]) -> List[dict]:
+        """Fold the whole journal into a single snapshot record."""
+        collection = MemoCollection()
+        for record in records:
+            self._apply_record(collection, record)
+        return [{'op': 'snapshot', 'memos': collection.to_dict()}]
+
+    def save_memos(self) -> bool:
+        """Write the current collection to the journal as a snapshot (replaces all memos)."""
+        return self._append({'op': 'snapshot', 'memos': self.memo_collection.to_dict()})
+
     def add_memo(self, path: Path, text: str) -> bool:
         """Add or update a memo for a directory."""
         try:
             memo = Memo(text=text)
             self.memo_collection.add_memo(path, memo)
 
-            if self.save_memos():
+            if self._append({'op': 'set', 'path': str(path), 'memo': memo.to_dict()}):
                 self.memo_added.emit(path, memo)
                 return True
             return False
@@ -178,8 +224,9 @@ class MemoService(QObject):
                 memo = Memo(text=text)
                 self.memo_collection.add_memo(path, memo)
 
-            if self.save_memos():
-                self.memo_updated.emit(path, self.memo_collection.get_memo(path))
+            memo = self.memo_collection.get_memo(path)
+            if self._append({'op': 'set', 'path': str(path), 'memo': memo.to_dict()}):
+                self.memo_updated.emit(path, memo)
                 return True
             return False
 
@@ -191,7 +238,7 @@ class MemoService(QObject):
         """Remove a memo for a directory."""
         try:
             if self.memo_collection.remove_memo(path):
-                if self.save_memos():
+                if self._append({'op': 'remove', 'path': str(path)}):
                     self.memo_removed.emit(path)
                     return True
             return False
@@ -3,17 +3,39 @@ CloneDialog that matches the original implementation exactly.
 """
 
 import os
-import shutil
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QTreeWidget,
-    QTreeWidgetItem, QPushButton, QProgressBar, QRadioButton, QWidget, QMessageBox
+    QTreeWidgetItem, QPushButton, QProgressBar, QRadioButton, QWidget, QMessageBox,
+    QComboBox
 )
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
 from PyQt5.QtGui import QFont
 
 from ..config.settings import AppConfig
+from ..models.directory import format_size
+from ..utils.copy_engine import COPY, REFLINK, HARDLINK, CopyEngine, CopyStats, parse_patterns
+
+
+class CloneWorker(QThread):
+    """Runs a CopyEngine off the UI thread."""
+
+    progress_updated = pyqtSignal(object, object, int, int)  # bytes done, bytes total, files done, files total
+    clone_completed = pyqtSignal(object)  # CopyStats
+
+    def __init__(self, engine: CopyEngine, jobs: List[Tuple[str, str]], parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.engine.progress = self.progress_updated.emit
+        self.jobs = jobs
+
+    def run(self):
+        try:
+            stats = self.engine.copy(self.jobs)
+        except Exception as e:
+            stats = CopyStats(errors=[f"Clone failed: {e}"])
+        self.clone_completed.emit(stats)
 
 
 class CloneDialog(QDialog):
@@ -102,6 +124,30 @@ class CloneDialog(QDialog):
         self.selected_items_label.setFont(font)
         layout.addWidget(self.selected_items_label)
 
+        # Copy options
+        options_layout = QHBoxLayout()
+        mode_label = QLabel("File data:")
+        mode_label.setFont(font)
+        options_layout.addWidget(mode_label)
+        self.copy_mode_combo = QComboBox()
+        self.copy_mode_combo.setFont(font)
+        self.copy_mode_combo.addItem("Copy", COPY)
+        self.copy_mode_combo.addItem("Reflink (copy-on-write)", REFLINK)
+        self.copy_mode_combo.addItem("Hardlink read-only files", HARDLINK)
+        self.copy_mode_combo.setToolTip("Reflink and hardlink fall back to a normal copy where the filesystem can't")
+        options_layout.addWidget(self.copy_mode_combo)
+        exclude_label = QLabel("Exclude:")
+        exclude_label.setFont(font)
+        options_layout.addWidget(exclude_label)
+        self.exclude_input = QLineEdit()
+        self.exclude_input.setFont(font)
+        self.exclude_input.setPlaceholderText("e.g. *.log, logs, reports")
+        self.exclude_input.setToolTip("Patterns skipped inside copied directories (name or relative path)")
+        options_layout.addWidget(self.exclude_input)
+        layout.addLayout(options_layout)
+
+        self.clone_worker = None
+
         # Progress bar
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
@@ -159,7 +205,7 @@ class CloneDialog(QDialog):
 
         self.cancel_button = QPushButton("Cancel")
         self.cancel_button.setFont(font)
-        self.cancel_button.clicked.connect(self.reject)
+        self.cancel_button.clicked.connect(self.cancel_or_close)
 
         buttons_layout.addWidget(self.clone_button)
         buttons_layout.addWidget(self.cancel_button)
@@ -514,7 +560,8 @@ class CloneDialog(QDialog):
         if os.path.exists(dest_dir_path):
             reply = QMessageBox.question(
                 self, "Directory Exists",
-                f"The directory '{dest_dir_name}' already exists. Continue and overwrite existing files?",
+                f"The directory '{dest_dir_name}' already exists. Continue and overwrite existing files?\n"
+                "(Files already identical to the source are skipped, so this also resumes a stopped clone.)",
                 QMessageBox.Yes | QMessageBox.No,
                 QMessageBox.No
             )
@@ -532,15 +579,13 @@ class CloneDialog(QDialog):
             QMessageBox.warning(self, "Error", "No items selected for cloning.")
             return
 
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setMaximum(len(selected_items))
-        self.progress_bar.setValue(0)
-        self.progress_bar.setFormat("Cloning %p%")
-
         errors = []
-        processed_count = 0
+        copy_jobs = []
 
         for src_path, info in selected_items.items():
+            # A selected directory copy already covers everything below it
+            if self._covered_by_copied_parent(src_path, selected_items):
+                continue
             try:
                 relative_path = os.path.relpath(src_path, self.dir_path)
                 dest_item_path = os.path.join(dest_dir_path, relative_path)
@@ -550,57 +595,86 @@ class CloneDialog(QDialog):
                     print(f"Skipping {src_path} because source and destination are the same file.")
                     continue
 
-                # Handle symlinks
-                if os.path.islink(src_path):
-                    # Create parent directory if needed
+                # Symlinks are recreated, copies go to the copy engine in one batch
+                if os.path.islink(src_path) or info['action'] == 'copy':
+                    copy_jobs.append((src_path, dest_item_path))
+
+                elif info['action'] == 'link':
+                    # Create symlink to directory or file
                     os.makedirs(os.path.dirname(dest_item_path), exist_ok=True)
-                    link_target = os.readlink(src_path)
                     if not os.path.exists(dest_item_path):
-                        os.symlink(link_target, dest_item_path)
-                    print(f"Processing symlink: {src_path}")
-
-                # Handle directories
-                elif os.path.isdir(src_path):
-                    if info['action'] == 'copy':
-                        # Copy entire directory tree with all contents
-                        if not os.path.exists(dest_item_path):
-                            shutil.copytree(src_path, dest_item_path, symlinks=True)
-                            print(f"Copied directory tree: {src_path} -> {dest_item_path}")
-                        else:
-                            # Directory exists, copy contents recursively
-                            self._copy_directory_contents(src_path, dest_item_path)
-                            print(f"Merged directory contents: {src_path} -> {dest_item_path}")
-                    elif info['action'] == 'link':
-                        # Create symlink to directory
-                        os.makedirs(os.path.dirname(dest_item_path), exist_ok=True)
-                        if not os.path.exists(dest_item_path):
-                            os.symlink(src_path, dest_item_path)
-                            print(f"Created directory symlink: {src_path} -> {dest_item_path}")
-
-                # Handle regular files
-                else:
-                    # Create parent directory if needed
-                    os.makedirs(os.path.dirname(dest_item_path), exist_ok=True)
-
-                    if info['action'] == 'copy':
-                        shutil.copy2(src_path, dest_item_path)
-                        print(f"Copied file: {src_path} -> {dest_item_path}")
-                    elif info['action'] == 'link':
-                        if not os.path.exists(dest_item_path):
-                            os.symlink(src_path, dest_item_path)
-                            print(f"Created file symlink: {src_path} -> {dest_item_path}")
+                        os.symlink(src_path, dest_item_path)
+                        print(f"Created symlink: {src_path} -> {dest_item_path}")
 
-                processed_count += 1
-                self.progress_bar.setValue(processed_count)
+                elif info['action'] == 'create_dir':
+                    os.makedirs(dest_item_path, exist_ok=True)
 
             except Exception as e:
                 errors.append(f"Failed to process {src_path}: {e}")
                 print(f"Error processing {src_path}: {e}")
 
-        self.progress_bar.setValue(len(selected_items))
+        if not copy_jobs:
+            self._finish_clone(dest_dir_name, errors)
+            return
+
+        engine = CopyEngine(
+            link_mode=self.copy_mode_combo.currentData(),
+            exclude=parse_patterns(self.exclude_input.text()),
+            workers=self.config.ui.copy_workers
+        )
+        self.clone_worker = CloneWorker(engine, copy_jobs, self)
+        self.clone_worker.progress_updated.connect(self._on_clone_progress)
+        self.clone_worker.clone_completed.connect(
+            lambda stats: self._on_clone_completed(stats, dest_dir_name, errors))
+
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setMaximum(1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("Scanning source...")
+        self.clone_button.setEnabled(False)
+        self.cancel_button.setText("Stop")
+        self.clone_worker.start()
+
+    @staticmethod
+    def _covered_by_copied_parent(path: str, selected_items: Dict[str, Any]) -> bool:
+        parent = os.path.dirname(path)
+        while parent and parent != os.path.dirname(parent):
+            info = selected_items.get(parent)
+            if info is not None and info['action'] == 'copy' and not os.path.islink(parent):
+                return True
+            parent = os.path.dirname(parent)
+        return False
+
+    def _on_clone_progress(self, bytes_done, bytes_total, files_done, files_total):
+        """Progress by bytes; the file count is shown alongside."""
+        if bytes_total:
+            self.progress_bar.setValue(int(1000 * bytes_done / bytes_total))
+        self.progress_bar.setFormat(
+            f"Cloning %p% ({format_size(bytes_done)} of {format_size(bytes_total)}, "
+            f"{files_done}/{files_total} files)")
+
+    def _on_clone_completed(self, stats: CopyStats, dest_dir_name: str, errors: List[str]):
+        self.clone_worker = None
+        self.clone_button.setEnabled(True)
+        self.cancel_button.setText("Cancel")
+        print(f"Clone finished: {stats.files} copied, {stats.reflinked} reflinked, "
+              f"{stats.hardlinked} hardlinked, {stats.skipped} up to date, {stats.symlinks} symlinks")
+
+        if stats.cancelled:
+            self.progress_bar.setVisible(False)
+            QMessageBox.information(
+                self, "Clone Stopped",
+                f"Cloning to '{dest_dir_name}' was stopped.\n"
+                "Start the clone again with the same name to resume; finished files are kept.")
+            return
+        self._finish_clone(dest_dir_name, errors + stats.errors)
+
+    def _finish_clone(self, dest_dir_name: str, errors: List[str]):
+        self.progress_bar.setValue(self.progress_bar.maximum())
 
         if errors:
-            QMessageBox.warning(self, "Errors Occurred", "\n".join(errors))
+            shown = errors[:20] + ([f"... and {len(errors) - 20} more"] if len(errors) > 20 else [])
+            QMessageBox.warning(self, "Errors Occurred", "\n".join(shown))
         else:
             QMessageBox.information(self, "Clone Completed", f"Cloning completed successfully to '{dest_dir_name}'.")
 
@@ -609,30 +683,77 @@ class CloneDialog(QDialog):
         if not errors:
             self.accept()
 
-    def _copy_directory_contents(self, src_dir, dest_dir):
-        """Recursively copy directory contents, merging with existing destination."""
-        try:
-            for item in os.listdir(src_dir):
-                src_item = os.path.join(src_dir, item)
-                dest_item = os.path.join(dest_dir, item)
-
-                if os.path.islink(src_item):
-                    # Copy symlink
-                    if not os.path.exists(dest_item):
-                        link_target = os.readlink(src_item)
-                        os.symlink(link_target, dest_item)
-
-                elif os.path.isdir(src_item):
-                    # Recursively copy subdirectory
-                    if not os.path.exists(dest_item):
-                        shutil.copytree(src_item, dest_item, symlinks=True)
-                    else:
-                        self._copy_directory_contents(src_item, dest_item)
+    def cancel_or_close(self):
+        """Stop a running copy, or close the dialog."""
+        if self.clone_worker is not None:
+            self.clone_worker.engine.cancel()
+        else:
+            self.reject()
 
-                else:
-                    # Copy file
-                    shutil.copy2(src_item, dest_item)
+    def reject(self):
+        """Closing the dialog stops a running copy first."""
+        if self.clone_worker is not None:
+            self.clone_worker.clone_completed.disconnect()
+            self.clone_worker.engine.cancel()
+            self.clone_worker.wait()
+            self.clone_worker = None
+        super().reject()
 
-        except Exception as e:
-            print(f"Error copying directory contents from {src_dir} to {dest_dir}: {e}")
-            raise
+
+class LargestRunsDialog(QDialog):
+    """Report of the largest run directories under a selected directory."""
+
+    def __init__(self, config: AppConfig, base_path, runs, parent=None):
+        """runs: [(Path, DirectoryUsage)] sorted biggest first (see DiskUsageService.largest_runs)."""
+        super().__init__(parent)
+        self.config = config
+        self.base_path = Path(base_path)
+
+        font = QFont("Terminus", 10)
+        self.setFont(font)
+        self.setWindowTitle("Largest Runs")
+        self.resize(700, 500)
+
+        layout = QVBoxLayout(self)
+
+        total = sum(usage.allocated for _, usage in runs)
+        summary = QLabel(f"Largest runs under:\n{self.base_path}\n"
+                         f"Top {len(runs)}: {format_size(total)} on disk")
+        summary.setFont(font)
+        summary.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(summary)
+
+        self.tree_widget = QTreeWidget()
+        self.tree_widget.setFont(font)
+        self.tree_widget.setRootIsDecorated(False)
+        self.tree_widget.setHeaderLabels(["Run", "On disk", "Apparent", "Files"])
+        for path, usage in runs:
+            try:
+                label = str(path.relative_to(self.base_path))
+            except ValueError:
+                label = str(path)
+            item = QTreeWidgetItem([label, format_size(usage.allocated),
+                                    format_size(usage.apparent), str(usage.files)])
+            item.setData(0, Qt.UserRole, str(path))
+            for column in (1, 2, 3):
+                item.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+            self.tree_widget.addTopLevelItem(item)
+        self.tree_widget.setColumnWidth(0, 400)
+        self.tree_widget.itemDoubleClicked.connect(self.handle_item_double_clicked)
+        layout.addWidget(self.tree_widget)
+
+        tip_label = QLabel("Double-click a run to select it in the main tree")
+        tip_label.setFont(QFont("Terminus", 9))
+        tip_label.setStyleSheet("color: #666; font-style: italic; padding: 2px;")
+        layout.addWidget(tip_label)
+
+        close_button = QPushButton("Close")
+        close_button.setFont(font)
+        close_button.clicked.connect(self.accept)
+        layout.addWidget(close_button)
+
+    def handle_item_double_clicked(self, item, column):
+        """Select the run in the parent tree manager."""
+        path = item.data(0, Qt.UserRole)
+        if path and self.parent() and hasattr(self.parent(), 'select_directory_path'):
+            self.parent().select_directory_path(path)
@@ -6,7 +6,7 @@ import getpass
 import os
 import shutil
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Tuple
 from datetime import datetime
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
@@ -18,10 +18,12 @@ from PyQt5.QtGui import QFont, QKeySequence, QClipboard
 
 from ..config.settings import AppConfig
 from ..models.directory import DirectoryHierarchy, DirectoryFilter
+from ..models.flat_tree import FlatDirectoryTree, NO_NODE
 from ..services.directory_service import DirectoryService
 from ..services.memo_service import MemoService
 from ..services.history_service import DirectoryHistoryService
 from ..services.change_detection_service import ChangeDetectionService, DirectoryChange
+from ..services.disk_usage_service import DiskUsageService
 from ..ui.widgets import (
     EnhancedTreeView, BlinkingDelegate, ProgressWidget,
     MemoDialog, MemoViewerDialog, StatusWidget, FilterControlWidget,
@@ -29,6 +31,7 @@ from ..ui.widgets import (
 )
 from ..ui.history_widgets import HistoryNavigationWidget, QuickHistoryWidget
 from ..utils.tree_model import DirectoryTreeModel
+from ..utils.metadata_loader import MetadataLoader
 from ..utils.logger import get_logger
 
 
@@ -48,6 +51,9 @@ class MainWindow(QMainWindow):
         self.directory_service = DirectoryService(config)
         self.memo_service = MemoService(config)
         self.change_service = ChangeDetectionService()
+        self.disk_usage_service = DiskUsageService(config)
+        self.metadata_loader = MetadataLoader(self)  # Shared by every tree model built below
+        self._pending_usage_report: Optional[Path] = None  # Show the largest-runs report once sizes land
 
         # UI components
         self.tree_view: Optional[EnhancedTreeView] = None
@@ -56,16 +62,18 @@ class MainWindow(QMainWindow):
         self.history_navigation: Optional[HistoryNavigationWidget] = None
         self.quick_history: Optional[QuickHistoryWidget] = None
         # State
-        self.current_hierarchy: Optional[DirectoryHierarchy] = None
+        self.current_tree: Optional[FlatDirectoryTree] = None  # Shown by tree_model; scans are flattened into it
         self.current_filter = DirectoryFilter()
         self.current_depth = 0
         self.max_depth = 0
         self.programmatic_navigation = False
         self._pending_nav_path: Optional[Path] = None
+        # Path waiting for its ancestor chain to be scanned, and what to do with its row
+        self._pending_reveal: Optional[Tuple[Path, Callable[[QModelIndex], None]]] = None
 
-        # Shallow expansion queue — limits concurrent subtree scan threads
+        # Prefetch queue (shallow children of expanded rows) — limits concurrent subtree scan threads
         self._shallow_queue: List[Path] = []
-        self._shallow_queue_depth: int = 3
+        self._shallow_queue_depth: int = 1  # One level ahead of what is visible
         self._MAX_CONCURRENT_SUBTREE = 8
 
         # Auto-refresh filesystem watcher
@@ -74,6 +82,8 @@ class MainWindow(QMainWindow):
         self._fs_debounce_timer.setSingleShot(True)
         self._fs_debounce_timer.setInterval(1000)  # 1s debounce
         self._fs_debounce_timer.timeout.connect(self._on_fs_debounce_timeout)
+        self._fs_pending: set = set()  # Changed directories waiting for the debounce
+        self._fs_refreshing: set = set()  # Subtrees being rescanned by auto-refresh
 
         # Setup
         self.setup_ui()
@@ -130,7 +140,7 @@ class MainWindow(QMainWindow):
 
         self.goto_input = QLineEdit()
         self.goto_input.setFont(QFont(*self.config.fonts.get_font_tuple(8)))
-        self.goto_input.setPlaceholderText("Type a path under base dir and press Enter")
+        self.goto_input.setPlaceholderText("Type a path under base dir (or a directory name) and press Enter")
         self.goto_input.setClearButtonEnabled(True)
         self.goto_input.returnPressed.connect(self.go_to_directory)
         goto_layout.addWidget(self.goto_input)
@@ -319,6 +329,7 @@ class MainWindow(QMainWindow):
         self.tree_view.enter_pressed.connect(self.go_to_selected_directory)
         self.tree_view.customContextMenuRequested.connect(self.show_context_menu)
         self.tree_view.selection_changed_custom.connect(self.on_selection_changed)
+        self.tree_view.header().sectionClicked.connect(self.on_header_clicked)
 
         # Filter connections
         self.filter_controls.user_filter_toggled.connect(self.on_user_filter_toggled)
@@ -340,6 +351,11 @@ class MainWindow(QMainWindow):
         # Change detection connections
         self.change_service.changes_detected.connect(self.on_changes_detected)
 
+        # Disk usage connections
+        self.disk_usage_service.usage_updated.connect(self.on_disk_usage_updated)
+        self.disk_usage_service.progress_updated.connect(lambda msg: self.show_status_message(msg, 1500))
+        self.disk_usage_service.computation_finished.connect(self.on_disk_usage_finished)
+
         # History service signals
         self.history_service.history_changed.connect(self.update_history_button_states)
         self.history_service.current_changed.connect(self.on_history_current_changed)
@@ -348,10 +364,13 @@ class MainWindow(QMainWindow):
         self.directory_service.hierarchy_updated.connect(self.on_hierarchy_updated)
         self.directory_service.operation_completed.connect(self.on_operation_completed)
         self.directory_service.progress_updated.connect(self.on_progress_updated)
+        self.directory_service.partial_hierarchy_updated.connect(self._on_partial_hierarchy)
+        self.directory_service.cached_tree_loaded.connect(self._on_cached_tree)
         self.directory_service.subtree_scan_completed.connect(self._on_subtree_scan_completed)
+        self.directory_service.subtree_scan_failed.connect(self._on_subtree_scan_failed)
         self.directory_service.background_scan_completed.connect(self._on_background_scan_completed)
 
-        # Lazy on-demand deep scan when user expands a shallow node
+        # Prefetch one level ahead of rows the user expands (shallow rows fetch via the model)
         self.tree_view.expanded.connect(self._on_tree_item_expanded)
 
         # Memo service connections
@@ -464,8 +483,8 @@ class MainWindow(QMainWindow):
 
         logger.info(f"Refreshing directory tree from: {base_path}")
 
-        # Capture current state before refresh (if we have a hierarchy)
-        if self.current_hierarchy:
+        # Capture current state before refresh (if we have a tree)
+        if self.current_tree:
             logger.info("Capturing state for change detection")
 
         # Show scan progress immediately
@@ -485,7 +504,8 @@ class MainWindow(QMainWindow):
     def schedule_navigation(self, path_str: str):
         """Store a pending navigation path and trigger refresh to load newly-created dirs.
 
-        Navigation fires in _on_subtree_scan_completed once depth 4-6 are fully loaded.
+        Navigation fires once the scan completes; directories below the scanned
+        depth are then listed along the path only (see _reveal_path).
         """
         self._pending_nav_path = Path(path_str)
         self.programmatic_navigation = True
@@ -494,6 +514,7 @@ class MainWindow(QMainWindow):
     def go_to_directory(self):
         """Navigate to the path typed in the Go-to input (within the tree only).
 
+        A bare directory name (no '/') jumps to the best match from the search index.
         Never changes the base directory or triggers a rescan.
         Rejects any path outside the current base directory.
         """
@@ -501,8 +522,15 @@ class MainWindow(QMainWindow):
         if not path_str:
             return
 
-        target = Path(path_str)
         base_dir = Path(self.base_dir_input.text())
+        if os.sep not in path_str:
+            results = self.directory_service.search_directories(path_str, limit=1)
+            if not results:
+                self.show_status_message(f"No directory matching: {path_str}", 3000)
+                return
+            path_str = str(results[0].path)
+
+        target = Path(path_str)
 
         # Enforce: must stay within base directory
         try:
@@ -513,16 +541,16 @@ class MainWindow(QMainWindow):
             return
 
         # Find in tree and scroll to it — no rescan, no base-dir change
-        if self.tree_model:
-            idx = self.tree_model.find_path_index(target)
-            if idx and idx.isValid():
-                self.tree_view.setCurrentIndex(idx)
-                self.tree_view.scrollTo(idx, QAbstractItemView.PositionAtCenter)
-                self.tree_view.expand(idx)
-                self.show_status_message(f"Navigated to: {target.name}", 2000)
-            else:
-                self.show_status_message(
-                    f"Not found in tree: {target.name}", 3000)
+        # (directories not loaded yet are listed along the path only)
+        def select(idx: QModelIndex):
+            self.tree_view.setCurrentIndex(idx)
+            self.tree_view.scrollTo(idx, QAbstractItemView.PositionAtCenter)
+            self.tree_view.expand(idx)
+            self.show_status_message(f"Navigated to: {target.name}", 2000)
+
+        if self.tree_model and not self._reveal_path(target, select):
+            self.show_status_message(
+                f"Not found in tree: {target.name}", 3000)
 
     def go_back(self):
         """Go back in history."""
@@ -611,15 +639,39 @@ class MainWindow(QMainWindow):
             print(f"DEBUG: Skipping history add - programmatic navigation")
 
     def navigate_to_directory(self, target_dir):
-        """Navigate to directory."""
+        """Navigate to directory (scanning the part of its path that is not loaded yet)."""
         if not self.tree_model:
             return
 
-        index = self.tree_model.find_path_index(Path(target_dir))
-        if index and index.isValid():
+        target = Path(target_dir)
+        record_history = not self.programmatic_navigation  # The row may arrive after the flag is reset
+
+        def select(index: QModelIndex):
             self.tree_view.setCurrentIndex(index)
             self.tree_view.scrollTo(index)
-            self.add_navigation_history(Path(target_dir))
+            if record_history:
+                self.add_navigation_history(target)
+
+        self._reveal_path(target, select)
+
+    def _reveal_path(self, target: Path, on_found: Callable[[QModelIndex], None]) -> bool:
+        """Call on_found with the row of `target`, first scanning the missing part of its path.
+
+        Only the ancestors on the way are listed, one level per scan; the
+        next step starts from _on_subtree_scan_completed. Returns False if the
+        path cannot be in the tree.
+        """
+        index = self.tree_model.find_path_index(target)
+        if index and index.isValid():
+            self._pending_reveal = None
+            on_found(index)
+            return True
+        if self.tree_model.fetch_path(target):
+            self._pending_reveal = (target, on_found)
+            self.show_status_message(f"Loading path to {target.name}...", 2000)
+            return True
+        self._pending_reveal = None
+        return False
 
     # CHANGE DETECTION METHODS
 
@@ -646,46 +698,119 @@ class MainWindow(QMainWindow):
         if not base_path:
             return
 
-        # Already watching this base path — skip rebuild
-        if self.fs_watcher and base_path in (self.fs_watcher.directories() or []):
-            return
+        # New base path — drop the old watcher and anything still pending for it
+        if not self.fs_watcher or base_path not in (self.fs_watcher.directories() or []):
+            if self.fs_watcher:
+                self.fs_watcher.directoryChanged.disconnect()
+                self.fs_watcher.deleteLater()
+            self._fs_pending.clear()
+            self.fs_watcher = QFileSystemWatcher(self)
+            self.fs_watcher.addPath(base_path)
+            self.fs_watcher.directoryChanged.connect(self._on_fs_directory_changed)
+            logger.info(f"Filesystem watcher set on: {base_path}")
 
-        # Remove old watcher if any
-        if self.fs_watcher:
-            self.fs_watcher.directoryChanged.disconnect()
-            self.fs_watcher.deleteLater()
+        self._update_fs_watches()
 
-        self.fs_watcher = QFileSystemWatcher(self)
-        self.fs_watcher.addPath(base_path)
+    def _update_fs_watches(self):
+        """Watch the scanned tree down to fs_watch_depth, within fs_watch_budget directories.
 
-        # Also watch immediate subdirectories (depth 1) for create/delete detection
-        try:
-            import os
-            with os.scandir(base_path) as entries:
-                for entry in entries:
-                    if entry.is_dir(follow_symlinks=True):
-                        self.fs_watcher.addPath(entry.path)
-        except (OSError, PermissionError):
-            pass
+        Each watched directory costs one inotify watch, so the user's own
+        workspace is watched first and shallower levels win over deeper ones.
+        """
+        if not self.fs_watcher or not self.current_tree:
+            return
 
-        self.fs_watcher.directoryChanged.connect(self._on_fs_directory_changed)
-        logger.info(f"Filesystem watcher set on: {base_path}")
+        tree = self.current_tree
+        base = tree.base
+        user_pattern = self.config.get_user_workspace_pattern()
+        max_depth = self.config.ui.fs_watch_depth
+
+        candidates = []  # (not in user workspace, depth, path)
+        stack = [(0, str(base), 0, False)]
+        while stack:
+            node, path, depth, in_user_ws = stack.pop()
+            candidates.append((not in_user_ws, depth, path))
+            if depth < max_depth:
+                for child in tree.children(node):
+                    name = tree.name(child)
+                    child_in_user_ws = in_user_ws or (depth == 0 and user_pattern in name)
+                    stack.append((child, os.path.join(path, name), depth + 1, child_in_user_ws))
+        candidates.sort()
+
+        wanted = {path for _, _, path in candidates[:self.config.ui.fs_watch_budget]}
+        wanted.add(str(base))
+        watched = set(self.fs_watcher.directories() or [])
+
+        stale = watched - wanted
+        if stale:
+            self.fs_watcher.removePaths(list(stale))
+        missing = [path for path in wanted - watched if os.path.isdir(path)]
+        if missing:
+            self.fs_watcher.addPaths(missing)
+        if len(candidates) > len(wanted):
+            logger.info(f"Watch budget reached: watching {len(wanted)} of {len(candidates)} directories")
 
     def _on_fs_directory_changed(self, path: str):
-        """Handle filesystem change — debounce to avoid rapid-fire rescans."""
+        """Handle filesystem change — collect the directory and debounce to coalesce bursts."""
         logger.info(f"Filesystem change detected: {path}")
-        # Skip if a scan is already running — it will capture the new state
-        scanner = self.directory_service._scanner
-        if scanner and scanner.isRunning():
-            return
+        self._fs_pending.add(path)
         # Reset debounce timer (restarts the 1s countdown)
         self._fs_debounce_timer.start()
 
+    def _coalesce_fs_changes(self, paths) -> List[Path]:
+        """Map changed paths to directories in the tree and drop those covered by an ancestor."""
+        base = self.current_tree.base
+        targets = set()
+        for raw in paths:
+            path = Path(raw)
+            # Deleted or not-yet-scanned directories are refreshed through their nearest known parent
+            while path != base and (self.current_tree.find(path) == NO_NODE
+                                    or not path.is_dir()):
+                if base not in path.parents:
+                    path = None
+                    break
+                path = path.parent
+            if path is not None:
+                targets.add(path)
+
+        return sorted(path for path in targets
+                      if not any(parent in targets for parent in path.parents))
+
     def _on_fs_debounce_timeout(self):
-        """Debounced auto-refresh after filesystem changes."""
-        logger.info("Auto-refreshing after filesystem change")
-        self.show_status_message("Auto-refreshing: filesystem change detected...", 3000)
-        self.refresh_directory_tree()
+        """Debounced auto-refresh: rescan only the subtrees that changed."""
+        if not self._fs_pending or not self.current_tree:
+            return
+
+        # Foreground scan in progress — retry once it has finished
+        scanner = self.directory_service._scanner
+        if scanner and scanner.isRunning():
+            self._fs_debounce_timer.start()
+            return
+
+        pending, self._fs_pending = self._fs_pending, set()
+        base = self.current_tree.base
+        snapshot = self.directory_service.load_snapshot(base)
+        max_depth = self.config.ui.max_directory_depth
+
+        started = 0
+        for path in self._coalesce_fs_changes(pending):
+            remaining_depth = max_depth - len(path.relative_to(base).parts)
+            if remaining_depth <= 0:
+                continue  # Children of this directory are beyond the displayed depth
+            if self.directory_service.scan_subtree_async(path, additional_depth=remaining_depth,
+                                                         previous=snapshot):
+                self._fs_refreshing.add(path)
+                started += 1
+            else:
+                # Still rescanning from an earlier change — pick it up on the next round
+                self._fs_pending.add(str(path))
+
+        if self._fs_pending:
+            self._fs_debounce_timer.start()
+        if started:
+            logger.info(f"Auto-refreshing {started} changed directories")
+            self.show_status_message(f"Auto-refreshing {started} changed director"
+                                     f"{'y' if started == 1 else 'ies'}...", 3000)
 
     # HIERARCHY AND UI UPDATE METHODS
 
@@ -694,14 +819,15 @@ class MainWindow(QMainWindow):
         """Handle updated directory hierarchy with change detection."""
         logger.info(f"Directory hierarchy updated, max depth: {hierarchy.calculate_max_depth()}")
 
-        # Detect changes from previous hierarchy
-        if self.current_hierarchy:
-            self.change_service.detect_changes(hierarchy)
+        # Detect changes from previous hierarchy (snapshot diff from the scanner when available)
+        if self.current_tree:
+            self.change_service.detect_changes(hierarchy, self.directory_service.last_scan_changes)
         else:
             # First load - just capture state
             self.change_service.capture_state(hierarchy)
 
-        self.current_hierarchy = hierarchy
+        # Only the flat tree is kept - the scanned hierarchy is dropped after this handler
+        self.current_tree = FlatDirectoryTree.from_hierarchy(hierarchy)
         self.max_depth = self.config.ui.max_directory_depth  # Always show full range 0–max
 
         self.depth_controls.update_depth_buttons(self.max_depth)
@@ -713,21 +839,12 @@ class MainWindow(QMainWindow):
         # Setup filesystem watcher on base directory for auto-refresh
         self._setup_fs_watcher()
 
-        # If initial scan was shallow, expand only the leaf nodes that need it —
-        # avoids re-scanning depths 0-3 (the main performance saving)
-        if hierarchy.calculate_max_depth() < self.config.ui.max_directory_depth:
-            shallow_paths = hierarchy.collect_shallow_leaves()
-            if shallow_paths:
-                remaining_depth = (self.config.ui.max_directory_depth
-                                   - self.config.ui.initial_scan_depth)
-                self._shallow_queue = list(shallow_paths)
-                self._shallow_queue_depth = remaining_depth
-                blink_msg = f"Expanding {len(shallow_paths)} dirs (depth 4~6)..."
-                self.status_widget.start_blinking(blink_msg)
-                QTimer.singleShot(300, self._drain_shallow_queue)
-
-        # If no shallow expansion queued, navigate to pending path immediately
-        if self._pending_nav_path and not self._shallow_queue:
+        # Deeper levels are listed when rows are expanded (DirectoryTreeModel.fetchMore), not up front.
+        # Persist the tree for instant display next time
+        self._shallow_queue.clear()
+        self.directory_service.save_snapshot(self.current_tree)
+
+        if self._pending_nav_path:
             pending = self._pending_nav_path
             self._pending_nav_path = None
             QTimer.singleShot(100, lambda: self.navigate_to_directory(str(pending)))
@@ -762,30 +879,46 @@ class MainWindow(QMainWindow):
             if index and index.isValid():
                 self.tree_view.setExpanded(index, True)
 
+    def _on_cached_tree(self, tree: FlatDirectoryTree):
+        """Show the tree from the last snapshot instantly; the running scan revalidates it."""
+        self.current_tree = tree
+        self.max_depth = self.config.ui.max_directory_depth
+        self.update_tree_view()
+        self.show_status_message("Showing cached tree - checking for changes...", 3000)
+
+    def _on_partial_hierarchy(self, hierarchy: DirectoryHierarchy):
+        """Show the levels scanned so far while the first scan of a base directory runs."""
+        if self.current_tree and self.current_tree.base == hierarchy.root.path:
+            return  # Refresh of the tree already on screen - keep it until the scan completes
+
+        self._set_tree_model(FlatDirectoryTree.from_hierarchy(hierarchy))
+
+    def _set_tree_model(self, tree: FlatDirectoryTree):
+        """Show a tree in the tree view with a new model (the model applies current_filter)."""
+        self.tree_model = DirectoryTreeModel(
+            tree,
+            self.current_filter,
+            self.memo_service.memo_collection,
+            self.config,
+            search_index=self.directory_service.search_index,
+            metadata_loader=self.metadata_loader
+        )
+        self.tree_model.fetch_requested.connect(self._on_fetch_requested)
+        self.tree_view.setModel(self.tree_model)
+
     def update_tree_view(self):
-        """Update tree view with current hierarchy and filter."""
-        if not self.current_hierarchy:
+        """Update tree view with current tree and filter."""
+        if not self.current_tree:
             return
 
         # PERF: Save expand state before rebuilding
         saved_expanded = self.save_expand_state()
+        self.disk_usage_service.apply_tree_sizes(self.current_tree)
         saved_selection = None
         if self.tree_view.currentIndex().isValid():
             saved_selection = self.tree_view.currentIndex().data(Qt.UserRole)
 
-        filtered_hierarchy = self.directory_service.apply_filter(
-            self.current_hierarchy,
-            self.current_filter
-        )
-
-        self.tree_model = DirectoryTreeModel(
-            filtered_hierarchy,
-            self.current_filter,
-            self.memo_service.memo_collection,
-            self.config
-        )
-
-        self.tree_view.setModel(self.tree_model)
+        self._set_tree_model(self.current_tree)
 
         # Set column widths for multi-column view (all adjustable by user)
         header = self.tree_view.header()
@@ -795,6 +928,8 @@ class MainWindow(QMainWindow):
             header.setSectionResizeMode(0, QHeaderView.Stretch)       # Directories: auto-fills remaining width
             header.setSectionResizeMode(1, QHeaderView.Interactive)   # Modified: drag right edge to resize
             header.resizeSection(1, 120)  # Modified minimal default
+            header.setSectionResizeMode(2, QHeaderView.Interactive)   # Size: empty until computed
+            header.resizeSection(2, 70)
 
         self.apply_highlighting()
 
@@ -873,6 +1008,13 @@ class MainWindow(QMainWindow):
         self.update_tree_view()
         logger.info(f"Sort order changed: {sort_order}")
 
+    def on_header_clicked(self, section: int):
+        """Sort by the clicked column (Directories, Modified, Size)."""
+        sort_order = {0: "name", 1: "mtime", 2: "size"}.get(section)
+        if sort_order and sort_order != self.current_filter.sort_by:
+            self.filter_controls.set_sort_order(sort_order)
+            self.on_sort_order_changed(sort_order)
+
     @pyqtSlot(int)
     def set_depth_level(self, level: int):
         """Set tree expansion depth level."""
@@ -907,58 +1049,107 @@ class MainWindow(QMainWindow):
 
     @pyqtSlot(QModelIndex)
     def _on_tree_item_expanded(self, index: QModelIndex):
-        """Trigger on-demand background scan when the user expands a shallow node."""
+        """Fetch an expanded shallow row and prefetch its shallow children so expanding them is instant.
+
+        The view calls DirectoryTreeModel.fetchMore itself for rows it has laid
+        out; rows expanded programmatically before layout are fetched here.
+        """
         if not index.isValid() or not self.tree_model:
             return
 
-        item = index.internalPointer()
-        if not hasattr(item, 'directory_hierarchy'):
-            return
+        if self.tree_model.canFetchMore(index):
+            self.tree_model.fetchMore(index)
+        self._queue_prefetch(index)
 
-        hierarchy = item.directory_hierarchy
-        if not hierarchy.is_shallow:
-            return  # Already fully scanned — nothing to do
+    def _queue_prefetch(self, index: QModelIndex):
+        """Queue the shallow children of a visible expanded row for listing one level ahead."""
+        for path in self.tree_model.prefetch_candidates(index):
+            if path not in self._shallow_queue:
+                self._shallow_queue.append(path)
+        self._drain_shallow_queue()
 
-        # Scan one level at a time — user sees children appear and can keep going deeper
-        self.directory_service.scan_subtree_async(hierarchy.root.path, additional_depth=1)
+    def _on_fetch_requested(self, path: Path, levels: int):
+        """List a row the user is waiting on right away (not through the prefetch queue)."""
+        snapshot = (self.directory_service.load_snapshot(self.current_tree.base)
+                    if self.current_tree else None)
+        self.directory_service.scan_subtree_async(path, additional_depth=levels, previous=snapshot)
 
     def _drain_shallow_queue(self):
-        """Launch up to _MAX_CONCURRENT_SUBTREE subtree scans from the queue."""
+        """Launch up to _MAX_CONCURRENT_SUBTREE prefetch scans from the queue."""
         active = len(self.directory_service._subtree_scanners)
         while self._shallow_queue and active < self._MAX_CONCURRENT_SUBTREE:
             path = self._shallow_queue.pop(0)
-            self.directory_service.scan_subtree_async(
-                path, additional_depth=self._shallow_queue_depth)
-            active += 1
+            if not self.tree_model or not self.tree_model.needs_fetch(path):
+                continue  # Fetched meanwhile (the user expanded it) or no longer in the tree
+            if self.directory_service.scan_subtree_async(
+                    path, additional_depth=self._shallow_queue_depth):
+                active += 1
 
     def _on_subtree_scan_completed(self, path, new_hierarchy):
         """Merge completed on-demand subtree scan into the model without full rebuild."""
         from pathlib import Path as _Path
         actual_path = _Path(path) if isinstance(path, str) else path
 
-        # Patch the canonical current_hierarchy so that update_tree_view()
-        # (triggered by filter/sort toggles) rebuilds with full depth data,
-        # not just the initial 3-level shallow scan.
-        if self.current_hierarchy:
-            node = self.current_hierarchy.find_directory(actual_path)
-            if node:
-                node.children = new_hierarchy.children
-                node.is_shallow = False
+        auto_refresh = actual_path in self._fs_refreshing
+        self._fs_refreshing.discard(actual_path)
 
         if self.tree_model:
+            # Rows under the subtree are rebuilt — keep what the user had expanded and selected
+            is_base = actual_path == self.tree_model.tree.base
+            expanded = set()
+            subtree_index = QModelIndex() if is_base else self.tree_model.find_path_index(actual_path)
+            if subtree_index is not None:
+                if subtree_index.isValid() and self.tree_view.isExpanded(subtree_index):
+                    expanded.add(actual_path)
+                self._collect_expanded_paths(subtree_index, expanded)
+            saved_selection = None
+            if self.tree_view.currentIndex().isValid():
+                saved_selection = self.tree_view.currentIndex().data(Qt.UserRole)
+
+            # The model's tree is current_tree: filter/sort rebuilds keep the rows loaded so far
+            self.disk_usage_service.apply_sizes(new_hierarchy)
             self.tree_model.update_subtree(actual_path, new_hierarchy)
 
-        # Drain next batch from the shallow expansion queue
+            self.restore_expand_state(expanded)
+            # New rows under an expanded row are visible: keep listing one level ahead of them
+            if actual_path in expanded:
+                self._queue_prefetch(self.tree_model.find_path_index(actual_path))
+            if saved_selection and not self.tree_view.currentIndex().isValid():
+                index = self.tree_model.find_path_index(Path(saved_selection))
+                if index and index.isValid():
+                    self.tree_view.setCurrentIndex(index)
+
+        if auto_refresh:
+            self._update_fs_watches()
+
+        # Next step of a navigation into directories that were not loaded yet
+        if self._pending_reveal and self.tree_model:
+            target, on_found = self._pending_reveal
+            if not self._reveal_path(target, on_found):
+                self.show_status_message(f"Not found in tree: {target.name}", 3000)
+
+        # Drain next batch from the prefetch queue
         self._drain_shallow_queue()
-        # Stop blinking once all background expansions are fully done
         if not self.directory_service._subtree_scanners and not self._shallow_queue:
-            self.status_widget.set_help_text("")
-            self.show_status_message("Tree fully loaded", 2000)
-            # Navigate to pending path (set by schedule_navigation) now that depth 4-6 are loaded
-            if self._pending_nav_path:
-                pending = self._pending_nav_path
-                self._pending_nav_path = None
-                QTimer.singleShot(100, lambda: self.navigate_to_directory(str(pending)))
+            if auto_refresh:
+                self.show_status_message("Auto-refresh complete", 2000)
+            # Persist what has been loaded so far for instant display next time
+            if self.current_tree:
+                self.directory_service.save_snapshot(self.current_tree)
+
+    def _on_subtree_scan_failed(self, path: Path, error: str):
+        """Release a failed on-demand scan: its row, a navigation waiting on it and its queue slot."""
+        if self.tree_model:
+            self.tree_model.fetch_failed(path)
+        self._fs_refreshing.discard(path)
+
+        if self._pending_reveal:
+            target, _ = self._pending_reveal
+            if target == path or path in target.parents:
+                self._pending_reveal = None
+                self.show_status_message(f"Cannot load path to {target.name}: {error}", 3000)
+
+        self._drain_shallow_queue()
 
     @pyqtSlot(object)
     def _on_background_scan_completed(self, hierarchy: DirectoryHierarchy):
@@ -968,9 +1159,10 @@ class MainWindow(QMainWindow):
         initial fast 3-level startup scan.  Preserves expand state and selection.
         """
         logger.info(f"Background deep scan complete, max depth: {hierarchy.calculate_max_depth()}")
-        self.current_hierarchy = hierarchy
+        self.current_tree = FlatDirectoryTree.from_hierarchy(hierarchy)
         # update_tree_view() already saves/restores expand state and selection
         self.update_tree_view()
+        self.directory_service.save_snapshot(self.current_tree)
         self.show_status_message("Tree fully loaded (depth 1-6)", 3000)
 
     @pyqtSlot(str, bool)
@@ -1067,8 +1259,69 @@ class MainWindow(QMainWindow):
                 show_real_path_action = menu.addAction("Show Real Path")
                 show_real_path_action.triggered.connect(lambda: self.show_real_path(path))
 
+        # Disk usage actions
+        menu.addSeparator()
+        if self.disk_usage_service.is_running():
+            cancel_usage_action = menu.addAction("Cancel Disk Usage")
+            cancel_usage_action.triggered.connect(self.disk_usage_service.cancel)
+        else:
+            usage_action = menu.addAction("Compute Disk Usage")
+            usage_action.triggered.connect(lambda: self.compute_disk_usage(selected_paths))
+            full_usage_action = menu.addAction("Recompute Disk Usage (full)")
+            full_usage_action.triggered.connect(lambda: self.compute_disk_usage(selected_paths, force=True))
+            if len(selected_paths) == 1:
+                report_action = menu.addAction("Largest Runs...")
+                report_action.triggered.connect(lambda: self.show_largest_runs(selected_paths[0]))
+
         menu.exec_(self.tree_view.viewport().mapToGlobal(position))
 
+    # DISK USAGE
+
+    def compute_disk_usage(self, paths: List[Path], force: bool = False) -> bool:
+        """Compute recursive sizes of the selected directories in the background."""
+        if not self.disk_usage_service.compute(paths, self.current_tree, force=force):
+            self.show_status_message("Disk usage computation already running", 3000)
+            return False
+        self.show_status_message(f"Computing disk usage of {len(paths)} director"
+                                 f"{'y' if len(paths) == 1 else 'ies'}...", 3000)
+        return True
+
+    def show_largest_runs(self, path: Path):
+        """Show the largest runs under a directory, computing sizes first if needed."""
+        if self.disk_usage_service.get(path) is None:
+            if self.compute_disk_usage([path]):
+                self._pending_usage_report = path
+            return
+
+        node = self.current_tree.find(path) if self.current_tree else NO_NODE
+        if node == NO_NODE:
+            return
+        from ..ui.dialogs import LargestRunsDialog
+        runs = self.disk_usage_service.largest_runs(self.current_tree, node)
+        dialog = LargestRunsDialog(self.config, path, runs, self)
+        dialog.show()
+
+    def on_disk_usage_updated(self, totals: Dict):
+        """Show new sizes in the tree (re-sorting when sorted by size)."""
+        if not self.current_tree:
+            return
+        if self.current_filter.sort_by == "size":
+            self.update_tree_view()  # Applies sizes before rebuilding
+        else:
+            self.disk_usage_service.apply_tree_sizes(self.current_tree)  # Shared with tree_model
+            self.tree_view.viewport().update()
+
+    def on_disk_usage_finished(self, cancelled: bool):
+        """Report the end of a disk usage computation."""
+        if cancelled:
+            self._pending_usage_report = None
+            self.show_status_message("Disk usage computation cancelled", 3000)
+            return
+        self.show_status_message("Disk usage updated", 2000)
+        if self._pending_usage_report is not None:
+            path, self._pending_usage_report = self._pending_usage_report, None
+            self.show_largest_runs(path)
+
     def copy_full_paths_to_clipboard(self, paths: List[Path]):
         """Copy selected full paths to clipboard."""
         try:
@@ -1543,7 +1796,7 @@ class MainWindow(QMainWindow):
 
         self.tree_view.setModel(None)
         self.memo_service.load_memos()
-        self.current_hierarchy = None
+        self.current_tree = None
         self.refresh_directory_tree()
 
         if selected_path:
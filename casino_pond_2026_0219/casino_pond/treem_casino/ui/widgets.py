@@ -600,7 +600,7 @@ class FilterControlWidget(QWidget):
 
     # Signals
     user_filter_toggled = pyqtSignal(bool)
-    sort_order_changed = pyqtSignal(str)  # "mtime" or "name"
+    sort_order_changed = pyqtSignal(str)  # "mtime", "name" or "size"
 
     def __init__(self, config: AppConfig, parent=None):
         super().__init__(parent)
@@ -653,16 +653,29 @@ class FilterControlWidget(QWidget):
 
     def _on_sort_toggled(self, checked: bool):
         """Handle sort order toggle."""
-        if checked:
-            sort_order = "mtime"
+        sort_order = "mtime" if checked else "name"
+        self._apply_sort_style(sort_order)
+        self.sort_order_changed.emit(sort_order)
+
+    def _apply_sort_style(self, sort_order: str):
+        """Show the sort order on the toggle button."""
+        if sort_order == "mtime":
             self.sort_button.setText("mTime")
             self.sort_button.setStyleSheet(f"background-color: {self.config.colors.tan}; color: white;")
+        elif sort_order == "size":
+            self.sort_button.setText("Size")
+            self.sort_button.setStyleSheet(f"background-color: {self.config.colors.ebony}; color: white;")
         else:
-            sort_order = "name"
             self.sort_button.setText("Name")
             self.sort_button.setStyleSheet("background-color: #A7A88A; color: black;")
 
-        self.sort_order_changed.emit(sort_order)
+    def set_sort_order(self, sort_order: str):
+        """Reflect a sort order chosen elsewhere (e.g. a header click) without emitting."""
+        self.sort_button.blockSignals(True)
+        # "size" leaves the toggle unchecked so the next click goes back to mTime
+        self.sort_button.setChecked(sort_order == "mtime")
+        self.sort_button.blockSignals(False)
+        self._apply_sort_style(sort_order)
 
 
 class DepthControlWidget(QWidget):
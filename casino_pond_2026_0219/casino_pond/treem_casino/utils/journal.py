@@ -0,0 +1,173 @@
+"""
+Append-only JSON-lines journal shared between processes (and users on NFS).
+Writers append one record per line under an exclusive lock; readers tail the
+file from their last offset so a change notification costs only the new
+bytes. Compaction folds the journal into a few snapshot records and swaps it
+in with an atomic rename, which readers detect and answer with a full replay.
+"""
+
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; appends are then unlocked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+Record = dict
+
+
+class Journal:
+    """One JSON object per line, appended under a POSIX record lock.
+
+    lockf (fcntl) locks are used rather than flock because they are honoured
+    by NFS servers across clients.
+    """
+
+    def __init__(self, path: Path, compact_after: int = 500):
+        self.path = path
+        self.compact_after = compact_after  # Records read before compaction is worthwhile
+        self.line_count = 0  # Records in the file as far as this reader has read
+        self._appended = 0  # Records we appended since the last read
+        self._offset = 0
+        self._inode: Optional[Tuple[int, int]] = None
+
+    @property
+    def needs_compaction(self) -> bool:
+        return self.line_count + self._appended >= self.compact_after
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def append(self, records: Iterable[Record],
+               initial: Optional[Callable[[], List[Record]]] = None):
+        """Append records atomically with respect to other writers.
+
+        `initial` seeds a new (empty) journal, e.g. with a snapshot of a legacy
+        file; it is only called while holding the lock, so concurrent first
+        writers do not both seed it. Raises OSError on failure.
+        """
+        with self._locked_file() as f:
+            lines = []
+            if initial is not None and os.fstat(f.fileno()).st_size == 0:
+                lines.extend(self._encode(record) for record in initial())
+            lines.extend(self._encode(record) for record in records)
+            if lines:
+                f.seek(0, os.SEEK_END)
+                f.write(b''.join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+                self._appended += len(lines)
+
+    def read_new(self) -> Tuple[bool, List[Record]]:
+        """Records appended since the last call.
+
+        Returns (reset, records): reset is True when the journal was replaced
+        (compacted) or truncated and records therefore start from the top.
+        A trailing partial line (a write in progress) is left for next time.
+        """
+        self._appended = 0  # Read below, along with everyone else's
+        try:
+            with open(self.path, 'rb') as f:
+                st = os.fstat(f.fileno())
+                inode = (st.st_dev, st.st_ino)
+                reset = inode != self._inode or st.st_size < self._offset
+                if reset:
+                    self._inode = inode
+                    self._offset = 0
+                    self.line_count = 0
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            reset = self._inode is not None
+            self._inode = None
+            self._offset = 0
+            self.line_count = 0
+            return reset, []
+
+        end = data.rfind(b'\n') + 1
+        self._offset += end
+        records = self._decode(data[:end])
+        self.line_count += len(records)
+        return reset, records
+
+    def read_all(self) -> List[Record]:
+        """All records from the top (resets the tail position)."""
+        self._inode = None
+        return self.read_new()[1]
+
+    def compact(self, fold: Callable[[List[Record]], List[Record]]):
+        """Replace the journal with fold(all records), holding the writer lock.
+
+        The fold sees the file's current contents rather than this process's
+        view, so records appended by others are never lost. Raises OSError.
+        """
+        with self._locked_file() as f:
+            f.seek(0)
+            records = fold(self._decode(f.read()))
+            fd, tmp_path = tempfile.mkstemp(dir=str(self.path.parent), prefix='.journal_')
+            try:
+                with os.fdopen(fd, 'wb') as tmp:
+                    tmp.write(b''.join(self._encode(record) for record in records))
+                    tmp.flush()
+                    os.fsync(tmp.fileno())
+                os.chmod(tmp_path, os.stat(self.path).st_mode & 0o777)
+                os.replace(tmp_path, self.path)
+                # Our tail position is on the old file, so the next read is a full replay
+                self.line_count, self._appended = len(records), 0
+            except BaseException:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+                raise
+
+    def _locked_file(self):
+        """Open the journal for append with an exclusive lock on the live file.
+
+        A compaction may rename a new file into place while we wait for the
+        lock; the lock is then held on the orphaned inode, so re-check and
+        retry until the locked file is the one at the path.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        while True:
+            f = open(self.path, 'ab+')
+            if fcntl is None:
+                return f
+            try:
+                fcntl.lockf(f.fileno(), fcntl.LOCK_EX)
+                st = os.fstat(f.fileno())
+                try:
+                    current = os.stat(self.path)
+                except FileNotFoundError:
+                    current = None
+                if current is not None and (current.st_dev, current.st_ino) == (st.st_dev, st.st_ino):
+                    return f  # Lock is released when the file is closed
+            except BaseException:
+                f.close()
+                raise
+            f.close()
+
+    @staticmethod
+    def _encode(record: Record) -> bytes:
+        return (json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8')
+
+    def _decode(self, data: bytes) -> List[Record]:
+        records = []
+        for line in data.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line.decode('utf-8'))
+            except ValueError:
+                logger.warning(f"Skipped malformed journal line in {self.path}")
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
@@ -0,0 +1,85 @@
+"""
+Background metadata loading for tree rows.
+Rows request their parent directory; the worker lists it once with scandir
+and stats the requested children, so a runs directory with thousands of
+entries costs one listing instead of thousands of UI-thread stat calls.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from ..models.directory import owner_name
+
+logger = logging.getLogger(__name__)
+
+# (child name, stat result or None if unreadable, is_symlink)
+MetadataEntry = Tuple[str, Optional[os.stat_result], bool]
+
+
+class MetadataLoader(QObject):
+    """Loads DirectoryInfo metadata per parent directory on a daemon thread.
+
+    batch_loaded is emitted from the worker thread; Qt queues it to the
+    receiver's (UI) thread, where the results are applied.
+    """
+
+    batch_loaded = pyqtSignal(object, list)  # (parent Path, [MetadataEntry])
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending: "OrderedDict[Path, Set[str]]" = OrderedDict()  # Parent -> child names, oldest first
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self, parent: Path, names):
+        """Queue children of `parent` for loading (merged with any pending request for it)."""
+        with self._condition:
+            pending = self._pending.get(parent)
+            if pending is None:
+                self._pending[parent] = set(names)
+            else:
+                pending.update(names)
+            self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="treem-metadata", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                parent, names = self._pending.popitem(last=False)
+            try:
+                self.batch_loaded.emit(parent, self._load(parent, names))
+            except Exception as e:
+                logger.warning(f"Metadata batch for {parent} failed: {type(e).__name__}: {e}")
+
+    @staticmethod
+    def _load(parent: Path, names: Set[str]) -> List[MetadataEntry]:
+        """One scandir of the parent; stat only the requested children."""
+        entries = []
+        try:
+            with os.scandir(parent) as it:
+                for entry in it:
+                    if entry.name not in names:
+                        continue
+                    names.discard(entry.name)
+                    try:
+                        is_symlink = entry.is_symlink()  # From d_type, no syscall on most filesystems
+                        st = entry.stat(follow_symlinks=True)
+                    except OSError:
+                        entries.append((entry.name, None, False))
+                        continue
+                    owner_name(st.st_uid)  # Warm the uid cache here rather than on the UI thread
+                    entries.append((entry.name, st, is_symlink))
+        except OSError as e:
+            logger.debug(f"Cannot list {parent} for metadata: {e}")
+        # Children that vanished (or an unreadable parent) are reported too so they are not re-requested
+        entries.extend((name, None, False) for name in names)
+        return entries
@@ -1,289 +1,255 @@
 """
 Tree model implementation with FIXED color highlighting logic and memo tooltips.
 Supports proper priority handling for overlapping patterns and recursive coloring.
-Performance optimized: cached username, workspace flags, row numbers, highlight colors, path index.
+Performance optimized: rows index a FlatDirectoryTree by node id (no per-row objects),
+cached username, lazily sorted sibling order, highlight colors per node.
 """
 
 import getpass
+import os
+import stat
+from array import array
 from pathlib import Path
-from typing import Optional, Any, Dict, List, Set
-from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt, QVariant
+from typing import Optional, Any, Dict, List, Set, Tuple, Union
+from PyQt5.QtCore import QAbstractItemModel, QModelIndex, Qt, QVariant, pyqtSignal
 from PyQt5.QtGui import QFont, QColor, QBrush
 
-from ..models.directory import DirectoryHierarchy, DirectoryFilter
+from ..models.directory import DirectoryHierarchy, DirectoryFilter, format_size
+from ..models.flat_tree import FlatDirectoryTree, FLAG_METADATA, FLAG_SHALLOW, FLAG_SYMLINK, NO_NODE, UNKNOWN
 from ..models.memo import MemoCollection
+from ..models.search_index import DirectorySearchIndex
+from .metadata_loader import MetadataLoader
 from ..config.settings import AppConfig
 
+ROOT = 0  # Node id of the (invisible) root
+FETCH_LEVELS = 2  # Levels scanned when a node is expanded: its children plus one level ahead
 
-class TreeItem:
-    """A tree item that holds directory information - with lazy loading optimization."""
 
-    def __init__(self, directory_hierarchy: DirectoryHierarchy, parent: Optional['TreeItem'] = None):
-        self.directory_hierarchy = directory_hierarchy
-        self.parent_item = parent
-        self.child_items: List['TreeItem'] = []
-        self.memo_collection: Optional[MemoCollection] = None
-
-        # OPTIMIZATION: Lazy loading - don't create children until needed
-        self._children_loaded = False
-        self._children_sorted = False  # Track if children have been sorted
-
-        # PERF: Cached values (set during child loading or model init)
-        self._row_cache: int = 0  # Cached row index in parent
-        self._is_under_user_workspace: bool = False  # Cached workspace flag
-
-    def _ensure_children_loaded(self):
-        """Ensure children are loaded. Called by all methods that access children."""
-        if self._children_loaded:
-            return  # Already loaded
-
-        # Get model reference for caching
-        model = getattr(self, '_model', None)
-        user_ws_pattern = model._user_workspace_pattern if model else ''
-
-        # Load children now
-        for idx, child_hierarchy in enumerate(self.directory_hierarchy.children.values()):
-            child_item = TreeItem(child_hierarchy, self)
-            child_item._row_cache = idx  # PERF: Cache row number
-
-            # PERF: Propagate workspace flag (parent is under ws, or child name matches)
-            child_item._is_under_user_workspace = (
-                self._is_under_user_workspace or
-                user_ws_pattern in child_hierarchy.root.name
-            )
-
-            if self.memo_collection:
-                child_item.memo_collection = self.memo_collection
-            if model:
-                child_item._model = model
-                # PERF: Register in path index map for O(1) lookup
-                model._path_index_map[child_hierarchy.root.path] = child_item
-            self.child_items.append(child_item)
-
-        # Mark as loaded BEFORE sorting to avoid recursion
-        self._children_loaded = True
-
-    def _ensure_children_sorted(self):
-        """Ensure children are sorted. Called separately from loading."""
-        if not self._children_loaded:
-            return  # Can't sort if not loaded yet
-
-        if self._children_sorted:
-            return  # Already sorted
-
-        # Only sort if we have a model reference with filter config
-        if hasattr(self, '_model') and self._model:
-            try:
-                sort_key = lambda item: self._model.filter_config.get_sort_key(item.directory_hierarchy.root)
-                self.child_items.sort(key=sort_key)
-                # PERF: Re-cache row numbers after sort
-                for idx, child in enumerate(self.child_items):
-                    child._row_cache = idx
-                self._children_sorted = True  # Mark as sorted
-            except Exception:
-                pass  # If sorting fails, just leave unsorted
-
-    def child(self, row: int) -> Optional['TreeItem']:
-        """Get child item at row - loads and sorts children if needed."""
-        self._ensure_children_loaded()  # Lazy load trigger
-        self._ensure_children_sorted()  # Lazy sort trigger
-
-        if 0 <= row < len(self.child_items):
-            return self.child_items[row]
-        return None
-
-    def child_count(self) -> int:
-        """Get number of child items - returns count without loading children."""
-        # OPTIMIZATION: Can return count from hierarchy without creating TreeItems
-        if not self._children_loaded:
-            return len(self.directory_hierarchy.children)
-        return len(self.child_items)
-
-    def column_count(self) -> int:
-        """Get number of columns."""
-        return 2  # Name, Modified
-
-    def data(self, column: int = 0) -> Any:
-        """Get data for column."""
-        if column == 0:
-            name = self.directory_hierarchy.root.display_name
-            # Add memo first line instead of "*"
-            if self.memo_collection and self.memo_collection.has_memo(self.directory_hierarchy.root.path):
-                memo = self.memo_collection.get_memo(self.directory_hierarchy.root.path)
-                if memo:
-                    first_line = memo.text.split('\n')[0].strip()
-                    if len(first_line) > 50:
-                        first_line = first_line[:47] + "..."
-                    return f"{name} : {first_line}"
-            return name
-        elif column == 1:
-            # Modified time - lazy load metadata on first access
-            dir_info = self.directory_hierarchy.root
-            dir_info.ensure_metadata_loaded()
-            if dir_info.modified_time:
-                return dir_info.modified_time.strftime("%Y-%m-%d %H:%M")
-            return ""
-        return None
-
-    def parent(self) -> Optional['TreeItem']:
-        """Get parent item."""
-        return self.parent_item
-
-    def row(self) -> int:
-        """Get row number in parent - uses cached value (O(1) instead of O(n))."""
-        if self.parent_item:
-            self.parent_item._ensure_children_loaded()
-            return self._row_cache
-        return 0
-
-    def path(self) -> Path:
-        """Get directory path."""
-        return self.directory_hierarchy.root.path
-
-    def set_memo_collection(self, memo_collection: MemoCollection):
-        """Set memo collection for memo indicators - propagates to loaded children only."""
-        self.memo_collection = memo_collection
+class DirectoryTreeModel(QAbstractItemModel):
+    """Qt model for directory tree display with proper color highlighting and memo tooltips.
 
-        # Only propagate to children if they're already loaded
-        # When children are loaded later, they'll inherit from parent
-        if self._children_loaded:
-            for child in self.child_items:
-                child.set_memo_collection(memo_collection)
-                # Also pass model reference if we have it
-                if hasattr(self, '_model'):
-                    child._model = self._model
+    Every QModelIndex carries its FlatDirectoryTree node id as internalId().
+    Children keep the tree's storage order; the display order of a parent's
+    children is sorted on first access and kept in _order, with each
+    child's row in _row. The "Me only" filter applies to the base's
+    children only, so hidden rows are simply left out of _order[ROOT].
 
+    Shallow nodes (not listed yet) are fetched lazily: the view calls
+    fetchMore() when one is expanded, the model emits fetch_requested and
+    the owner scans the directory and hands the result to update_subtree().
+    """
 
-class DirectoryTreeModel(QAbstractItemModel):
-    """Qt model for directory tree display with proper color highlighting and memo tooltips."""
+    fetch_requested = pyqtSignal(object, int)  # (Path, levels to scan)
 
-    def __init__(self, hierarchy: DirectoryHierarchy, filter_config: DirectoryFilter,
-                 memo_collection: MemoCollection, config: AppConfig, parent=None):
+    def __init__(self, hierarchy: Union[DirectoryHierarchy, FlatDirectoryTree], filter_config: DirectoryFilter,
+                 memo_collection: MemoCollection, config: AppConfig,
+                 search_index: Optional[DirectorySearchIndex] = None,
+                 metadata_loader: Optional[MetadataLoader] = None, parent=None):
         super().__init__(parent)
         self.config = config
         self.filter_config = filter_config
         self.memo_collection = memo_collection
+        self.search_index = search_index  # Name index of the full tree, kept by DirectoryService
+
+        # PERF: Compact array tree instead of one TreeItem per directory
+        if isinstance(hierarchy, FlatDirectoryTree):
+            self.tree = hierarchy
+        else:
+            self.tree = FlatDirectoryTree.from_hierarchy(hierarchy)
+        self._order: Dict[int, array] = {}  # Parent node -> child node ids in display order
+        self._row = array('i', [0]) * len(self.tree)  # Node -> row under its parent (once ordered)
+
+        # PERF: Row metadata (mtime/symlink) is loaded per parent on a worker thread
+        self.metadata_loader = metadata_loader
+        self._metadata_requested: Dict[Path, int] = {}  # Parents with a batch in flight -> node
+        if metadata_loader is not None:
+            metadata_loader.batch_loaded.connect(self._on_metadata_batch)
+
+        # PERF: Fonts and brushes are built once, not on every data() call
+        base_font = QFont(*self.config.fonts.get_font_tuple())
+        self._font_default = QFont(base_font)
+        self._font_bold = QFont(base_font)
+        self._font_bold.setBold(True)
+        self._font_memo = QFont(base_font)
+        self._font_memo.setPointSize(base_font.pointSize() - 2)
+        self._font_memo.setItalic(True)
+        self._font_meta = QFont(base_font)
+        self._font_meta.setPointSize(base_font.pointSize() - 3)
+        self._header_font = QFont(base_font)
+        self._header_font.setBold(False)
+        self._brush_meta = QBrush(QColor("#666666"))  # Gray for metadata columns
+        self._brush_symlink = QBrush(QColor("#9932CC"))  # Violet
+        self._brush_user_workspace = QBrush(QColor("brown"))
+        self._brush_default = QBrush(QColor(self.config.colors.text_primary))
+        self._pattern_brushes: Dict[str, QBrush] = {}  # Highlight color -> brush
 
         # PERF: Cache username once (avoids getpass.getuser() on every paint)
         self._username = getpass.getuser()
         self._user_workspace_pattern = f"works_{self._username}"
 
-        # Create root item (with reference to model for lazy sorting)
-        self.root_item = TreeItem(hierarchy)
-        self.root_item.set_memo_collection(memo_collection)
-        self.root_item._model = self  # Pass model reference for sorting
-
-        # PERF: Seed workspace flag on root item
-        root_name = hierarchy.root.name
-        self.root_item._is_under_user_workspace = (self._user_workspace_pattern in root_name)
-
-        # OPTIMIZATION: Don't sort upfront! Sorting will happen lazily when children are loaded
-        # Old code (removed - this was causing the 95% hang):
-        # self._sort_items()
-
         # Highlighting patterns with priorities
         self.highlight_patterns: Dict[str, Dict[str, Any]] = {}  # pattern -> {color: str, priority: int}
 
-        # PERF: Cache highlight color per item path (invalidated on pattern change)
-        self._highlight_cache: Dict[Path, Optional[QBrush]] = {}
-
-        # PERF: Path→TreeItem index for O(1) navigation lookup
-        self._path_index_map: Dict[Path, TreeItem] = {}
-        self._path_index_map[hierarchy.root.path] = self.root_item
-
-    def _sort_items(self):
-        """Sort tree items according to filter configuration."""
-        def sort_key(item: TreeItem):
-            return self.filter_config.get_sort_key(item.directory_hierarchy.root)
-
-        self._sort_item_recursive(self.root_item, sort_key)
-
-    def _sort_item_recursive(self, item: TreeItem, sort_key_func):
-        """Recursively sort tree items - loads children if needed."""
-        # Trigger lazy loading before sorting
-        item._ensure_children_loaded()
-
-        # Sort the items
-        item.child_items.sort(key=sort_key_func)
-        # PERF: Re-cache row numbers after sort
-        for idx, child in enumerate(item.child_items):
-            child._row_cache = idx
-        item._children_sorted = True  # Mark as sorted
-
-        # Recurse into children
-        for child in item.child_items:
-            self._sort_item_recursive(child, sort_key_func)
+        # PERF: Cache highlight color per node (invalidated on pattern change)
+        self._highlight_cache: Dict[int, QBrush] = {}
+
+        # Lazy loading: nodes with a scan in flight, and depth expansions waiting for one
+        self._fetching: Set[int] = set()
+        self._deferred_expand: Dict[int, Tuple[Any, int, int]] = {}  # Node -> (view, depth, target depth)
+
+    def _children_order(self, node: int) -> array:
+        """Child node ids of `node` in display order - sorted on first access."""
+        order = self._order.get(node)
+        if order is None:
+            children = self.tree.children(node)
+            if node == ROOT and self.filter_config.show_only_user_workspace:
+                includes, tree = self.filter_config.includes_top_level, self.tree
+                children = [child for child in children if includes(tree.name(child))]
+            order = array('i', children)
+            if len(order) > 1:
+                tree = self.tree
+                names, name_id, mtime_ns, size = tree.names, tree.name_id, tree.mtime_ns, tree.size
+                get_key = self.filter_config.get_sort_key_for
+                try:
+                    order = array('i', sorted(children, key=lambda n: get_key(
+                        names[name_id[n]],
+                        mtime_ns[n] / 1e9 if mtime_ns[n] != UNKNOWN else None,
+                        size[n] if size[n] != UNKNOWN else None)))
+                except Exception:
+                    pass  # If sorting fails, just leave unsorted
+            for row, child in enumerate(order):
+                self._row[child] = row
+            self._order[node] = order
+        return order
+
+    def _node_index(self, node: int, column: int = 0) -> QModelIndex:
+        """Index of a node, ordering its ancestors' children as needed."""
+        if node <= ROOT:
+            return QModelIndex()
+        chain = []
+        parent = self.tree.parent[node]
+        while parent != NO_NODE:
+            chain.append(parent)
+            parent = self.tree.parent[parent]
+        for ancestor in reversed(chain):
+            self._children_order(ancestor)
+        if self._is_filtered_out(chain[-2] if len(chain) > 1 else node):
+            return QModelIndex()
+        return self.createIndex(self._row[node], column, node)
+
+    def _is_filtered_out(self, node: int) -> bool:
+        """True for a child of the base hidden by the "Me only" filter."""
+        return (self.tree.parent[node] == ROOT and self.filter_config.show_only_user_workspace
+                and not self.filter_config.includes_top_level(self.tree.name(node)))
+
+    def _node(self, index: QModelIndex) -> int:
+        return index.internalId() if index.isValid() else ROOT
+
+    def _memo_for(self, node: int):
+        if not self.memo_collection.memos:
+            return None
+        return self.memo_collection.get_memo(self.tree.path(node))
+
+    def _display_name(self, node: int) -> str:
+        """Name column text: display name plus the memo's first line."""
+        name = self.tree.display_name(node)
+        memo = self._memo_for(node)
+        if memo:
+            first_line = memo.text.split('\n')[0].strip()
+            if len(first_line) > 50:
+                first_line = first_line[:47] + "..."
+            return f"{name} : {first_line}"
+        return name
+
+    def _modified_text(self, node: int) -> str:
+        """Modified column - lazy load metadata on first access (batched off the UI thread when possible)."""
+        tree = self.tree
+        if not tree.flags[node] & FLAG_METADATA and not self.request_metadata(node):
+            path = tree.path_str(node)
+            try:
+                lstat_info = os.lstat(path)
+                is_symlink = stat.S_ISLNK(lstat_info.st_mode)
+                tree.set_stat(node, os.stat(path) if is_symlink else lstat_info, is_symlink)
+            except OSError:
+                tree.set_stat(node, None, False)
+        modified_time = tree.modified_time(node)
+        return modified_time.strftime("%Y-%m-%d %H:%M") if modified_time else ""
+
+    def _is_under_user_workspace(self, node: int) -> bool:
+        tree = self.tree
+        while node > ROOT:
+            if self._user_workspace_pattern in tree.name(node):
+                return True
+            node = tree.parent[node]
+        return self._user_workspace_pattern in os.path.basename(tree.name(ROOT))
 
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """Get number of columns."""
-        return 2  # Name, Modified
+        return 3  # Name, Modified, Size
 
     def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
         """Get data for model index with FIXED tooltip behavior."""
         if not index.isValid():
             return QVariant()
 
-        item = index.internalPointer()
-        if not isinstance(item, TreeItem):
-            return QVariant()
+        node = index.internalId()
+        column = index.column()
 
         if role == Qt.DisplayRole:
-            return item.data(index.column())
+            if column == 0:
+                return self._display_name(node)
+            elif column == 1:
+                return self._modified_text(node)
+            elif column == 2:
+                # Recursive size - empty until computed by DiskUsageService
+                size = self.tree.size[node]
+                return format_size(size if size != UNKNOWN else None)
+            return None
 
         elif role == Qt.UserRole:
             # Return path as string for external use
-            return str(item.path())
+            return self.tree.path_str(node)
 
-        elif role == Qt.FontRole:
-            font = QFont(*self.config.fonts.get_font_tuple())
-
-            # Column 1 (Modified): use smaller font, no special styling
-            if index.column() > 0:
-                font.setPointSize(font.pointSize() - 3)
-                return font
+        elif role == Qt.TextAlignmentRole:
+            if column == 2:
+                return int(Qt.AlignRight | Qt.AlignVCenter)
+            return QVariant()
 
-            item_text = item.data(0) or ""
+        elif role == Qt.FontRole:
+            # Metadata columns: smaller font, no special styling
+            if column > 0:
+                return self._font_meta
 
-            # Check if this item has memo text (contains " : ")
-            if " : " in item_text:
-                font.setPointSize(font.pointSize() - 2)
-                font.setItalic(True)
-                return font
+            # Memo text is shown after the name
+            if self._memo_for(node):
+                return self._font_memo
 
             # Bold font ONLY for current user's workspace
-            dir_name_part = item_text.split(" : ")[0] if " : " in item_text else item_text
-            if dir_name_part == self._user_workspace_pattern or self._user_workspace_pattern in dir_name_part:
-                font.setBold(True)
+            if self._user_workspace_pattern in self.tree.display_name(node):
+                return self._font_bold
 
-            return font
+            return self._font_default
 
         elif role == Qt.ForegroundRole:
             # Only apply color logic to column 0 (Name)
-            if index.column() > 0:
-                return QBrush(QColor("#666666"))  # Gray for metadata columns
-
-            item_path = item.path()
+            if column > 0:
+                return self._brush_meta
 
             # PERF: Check highlight cache first
-            cached = self._highlight_cache.get(item_path)
+            cached = self._highlight_cache.get(node)
             if cached is not None:
                 return cached
 
-            item_text = item.data(index.column()) or ""
-
             # Check if this is a symlink - give it special color (highest priority)
-            if item.directory_hierarchy.root.is_symlink:
-                brush = QBrush(QColor("#9932CC"))  # Violet color
-                self._highlight_cache[item_path] = brush
+            if self.tree.flags[node] & FLAG_SYMLINK:
+                brush = self._brush_symlink
+                self._highlight_cache[node] = brush
                 return brush
 
-            # PERF: Use cached workspace flag instead of walking path hierarchy
-            is_under_user_workspace = getattr(item, '_is_under_user_workspace', False)
-
             # Find the highest priority matching pattern
             best_match = None
             highest_priority = -1
-            dir_name_part = item_text.split(" : ")[0] if " : " in item_text else item_text
+            dir_name_part = self.tree.display_name(node)
 
             for pattern, pattern_info in self.highlight_patterns.items():
                 is_exact_match = pattern_info.get('exact_match', False)
@@ -300,33 +266,27 @@ class DirectoryTreeModel(QAbstractItemModel):
                         best_match = pattern_info
 
             if best_match:
-                brush = QBrush(QColor(best_match['color']))
-                self._highlight_cache[item_path] = brush
-                return brush
-
-            # Apply recursive brown color for items under user workspace
-            if is_under_user_workspace:
-                brush = QBrush(QColor("brown"))
-                self._highlight_cache[item_path] = brush
-                return brush
-
-            # Default text color
-            brush = QBrush(QColor(self.config.colors.text_primary))
-            self._highlight_cache[item_path] = brush
+                brush = self._pattern_brushes.get(best_match['color'])
+                if brush is None:
+                    brush = self._pattern_brushes[best_match['color']] = QBrush(QColor(best_match['color']))
+            elif self._is_under_user_workspace(node):
+                # Apply recursive brown color for items under user workspace
+                brush = self._brush_user_workspace
+            else:
+                # Default text color
+                brush = self._brush_default
+            self._highlight_cache[node] = brush
             return brush
 
         elif role == Qt.ToolTipRole:
             # FIXED: Show ONLY memo information in tooltip when hovering
-            item_path = item.path()
-
-            if self.memo_collection.has_memo(item_path):
-                memo = self.memo_collection.get_memo(item_path)
-                if memo:
-                    # Show only memo information - more concise
-                    tooltip_parts = []
-                    tooltip_parts.append(f"Memo by {memo.user} ({memo.formatted_timestamp}):")
-                    tooltip_parts.append(memo.text)
-                    return "\n".join(tooltip_parts)
+            memo = self._memo_for(node)
+            if memo:
+                # Show only memo information - more concise
+                tooltip_parts = []
+                tooltip_parts.append(f"Memo by {memo.user} ({memo.formatted_timestamp}):")
+                tooltip_parts.append(memo.text)
+                return "\n".join(tooltip_parts)
 
             # No tooltip if no memo - let users hover only when needed
             return QVariant()
@@ -335,23 +295,11 @@ class DirectoryTreeModel(QAbstractItemModel):
 
     def hasChildren(self, parent: QModelIndex = QModelIndex()) -> bool:
         """Override to show expand arrow for shallow (not yet scanned) nodes."""
-        if not parent.isValid():
-            return self.root_item.child_count() > 0
-
-        item = parent.internalPointer()
-        if not isinstance(item, TreeItem):
-            return False
-
-        # Actual loaded children take priority
-        if item._children_loaded:
-            return len(item.child_items) > 0
-
-        # Hierarchy already has children data
-        if len(item.directory_hierarchy.children) > 0:
+        node = self._node(parent)
+        if self.tree.child_count[node] > 0:
             return True
-
         # Shallow node: scan stopped here, might have children on disk
-        return item.directory_hierarchy.is_shallow
+        return bool(self.tree.flags[node] & FLAG_SHALLOW)
 
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
         """Get item flags."""
@@ -363,13 +311,11 @@ class DirectoryTreeModel(QAbstractItemModel):
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
         """Get header data."""
         if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            headers = ["Directories", "Modified"]
+            headers = ["Directories", "Modified", "Size"]
             if 0 <= section < len(headers):
                 return headers[section]
         if orientation == Qt.Horizontal and role == Qt.FontRole:
-            font = QFont(*self.config.fonts.get_font_tuple())
-            font.setBold(False)
-            return font
+            return self._header_font
         return QVariant()
 
     def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
@@ -377,41 +323,91 @@ class DirectoryTreeModel(QAbstractItemModel):
         if not self.hasIndex(row, column, parent):
             return QModelIndex()
 
-        if not parent.isValid():
-            parent_item = self.root_item
-        else:
-            parent_item = parent.internalPointer()
-
-        child_item = parent_item.child(row)
-        if child_item:
-            return self.createIndex(row, column, child_item)
-        else:
-            return QModelIndex()
+        order = self._children_order(self._node(parent))
+        return self.createIndex(row, column, order[row])
 
     def parent(self, index: QModelIndex) -> QModelIndex:
         """Get parent model index."""
         if not index.isValid():
             return QModelIndex()
 
-        child_item = index.internalPointer()
-        parent_item = child_item.parent()
-
-        if parent_item == self.root_item or parent_item is None:
+        parent_node = self.tree.parent[index.internalId()]
+        if parent_node <= ROOT:
             return QModelIndex()
 
-        return self.createIndex(parent_item.row(), 0, parent_item)
+        # The parent's row is known: its own parent was ordered to create it
+        return self.createIndex(self._row[parent_node], 0, parent_node)
 
     def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
         """Get number of rows."""
         if parent.column() > 0:
             return 0
 
-        if not parent.isValid():
-            parent_item = self.root_item
-        else:
-            parent_item = parent.internalPointer()
+        node = self._node(parent)
+        if node == ROOT:
+            return len(self._children_order(ROOT))  # Filtered
+        return self.tree.child_count[node]
+
+    def canFetchMore(self, parent: QModelIndex) -> bool:
+        """True for a shallow node whose children have not been requested yet."""
+        node = self._node(parent)
+        return bool(self.tree.flags[node] & FLAG_SHALLOW) and node not in self._fetching
+
+    def fetchMore(self, parent: QModelIndex):
+        """Ask for the children of an expanded shallow node (rows arrive via update_subtree)."""
+        self._request_fetch(self._node(parent), FETCH_LEVELS)
+
+    def _request_fetch(self, node: int, levels: int) -> bool:
+        if node in self._fetching or not self.tree.flags[node] & FLAG_SHALLOW:
+            return False
+        self._fetching.add(node)
+        self.fetch_requested.emit(self.tree.path(node), levels)
+        return True
+
+    def fetch_failed(self, path: Path):
+        """Forget a fetch whose scan failed, so the row can be requested again."""
+        node = self.tree.find(path)
+        if node != NO_NODE:
+            self._fetching.discard(node)
+            self._deferred_expand.pop(node, None)
+
+    def needs_fetch(self, path: Path) -> bool:
+        """True if `path` is a shallow node with no scan in flight."""
+        node = self.tree.find(path)
+        return node != NO_NODE and bool(self.tree.flags[node] & FLAG_SHALLOW) and node not in self._fetching
+
+    def prefetch_candidates(self, index: QModelIndex) -> List[Path]:
+        """Shallow children of an expanded node - now visible, so worth listing one level ahead."""
+        tree = self.tree
+        return [tree.path(child) for child in self._children_order(self._node(index))
+                if tree.flags[child] & FLAG_SHALLOW and child not in self._fetching]
+
+    def fetch_path(self, target_path: Path) -> bool:
+        """Scan the next missing directory on the way to `target_path`.
+
+        Only the chain of ancestors is listed, one level per call; call again
+        once the rows have arrived. Returns False when the path cannot be in
+        the tree (outside the base, or an ancestor is fully listed without it).
+        """
+        node, missing = self.tree.deepest(target_path)
+        if node == NO_NODE or not missing:
+            return False
+        if node in self._fetching:
+            return True
+        return self._request_fetch(node, 1)
+
+    def path_of(self, index: QModelIndex) -> Path:
+        """Directory path of an index (the base for the invisible root)."""
+        return self.tree.path(self._node(index))
+
+    def is_shallow(self, index: QModelIndex) -> bool:
+        """True if the scan stopped at this row - children may exist on disk."""
+        return bool(self.tree.flags[self._node(index)] & FLAG_SHALLOW)
 
-        return parent_item.child_count()
+    def _refresh_top_level(self, roles: List[int]):
+        row_count = self.rowCount()
+        if row_count > 0:
+            self.dataChanged.emit(self.index(0, 0), self.index(row_count - 1, 0), roles)
 
     def highlight_pattern(self, pattern: str, color_string: str, priority: int = 1, exact_match: bool = False):
         """Add pattern highlighting with priority and exact match support."""
@@ -425,13 +421,7 @@ class DirectoryTreeModel(QAbstractItemModel):
         self._highlight_cache.clear()
 
         # Emit data changed for all items
-        row_count = self.rowCount()
-        if row_count > 0:
-            self.dataChanged.emit(
-                self.index(0, 0),
-                self.index(row_count - 1, 0),
-                [Qt.ForegroundRole, Qt.FontRole]
-            )
+        self._refresh_top_level([Qt.ForegroundRole, Qt.FontRole])
 
     def clear_highlighting(self):
         """Clear all pattern highlighting."""
@@ -441,38 +431,26 @@ class DirectoryTreeModel(QAbstractItemModel):
         self._highlight_cache.clear()
 
         # Emit data changed for all items
-        row_count = self.rowCount()
-        if row_count > 0:
-            self.dataChanged.emit(
-                self.index(0, 0),
-                self.index(row_count - 1, 0),
-                [Qt.ForegroundRole, Qt.FontRole]
-            )
+        self._refresh_top_level([Qt.ForegroundRole, Qt.FontRole])
 
     def find_pattern_indexes(self, pattern: str) -> List[QModelIndex]:
         """Find all indexes matching a pattern.
-        PERF: First searches DirectoryHierarchy data to find matching paths,
-        then only loads TreeItems for matches (preserves lazy loading for non-matches).
+        PERF: Matching paths come from the name index (or a scan of the name arrays),
+        only matches are resolved to indexes.
         """
-        # Step 1: Find matching paths from the raw hierarchy data (no TreeItem creation)
-        matching_paths = []
-        self._find_pattern_in_hierarchy(self.root_item.directory_hierarchy, pattern, matching_paths)
-
-        # Step 2: Resolve matching paths to QModelIndex via path lookup
-        matches = []
-        for path in matching_paths:
-            index = self.find_path_index(path)
-            if index and index.isValid():
-                matches.append(index)
-        return matches
-
-    def _find_pattern_in_hierarchy(self, hierarchy: DirectoryHierarchy, pattern: str, matches: List[Path]):
-        """Search DirectoryHierarchy data without creating TreeItems."""
-        name = hierarchy.root.display_name
-        if pattern in name:
-            matches.append(hierarchy.root.path)
-        for child_hierarchy in hierarchy.children.values():
-            self._find_pattern_in_hierarchy(child_hierarchy, pattern, matches)
+        root_path = self.tree.base
+        if self.search_index is not None and root_path in self.search_index:
+            prefix = str(root_path).rstrip(os.sep) + os.sep
+            matching_paths = sorted(
+                (Path(p) for p in self.search_index.find_paths(pattern)
+                 if p.startswith(prefix) and pattern in os.path.basename(p)),
+                key=lambda p: (len(p.parts), p)
+            )
+            matches = [self.find_path_index(path) for path in matching_paths]
+        else:
+            matches = [self._node_index(node) for node, _ in self.tree.walk()
+                       if node > ROOT and pattern in self.tree.display_name(node)]
+        return [index for index in matches if index and index.isValid()]
 
     def find_pattern_index(self, pattern: str) -> Optional[QModelIndex]:
         """Find first index matching a pattern."""
@@ -480,56 +458,21 @@ class DirectoryTreeModel(QAbstractItemModel):
         return matches[0] if matches else None
 
     def find_path_index(self, target_path: Path) -> Optional[QModelIndex]:
-        """Find index for a specific path — O(1) via cached path map, falls back to recursive."""
-        # PERF: Try cached lookup first
-        item = self._path_index_map.get(target_path)
-        if item is not None:
-            return self.createIndex(item.row(), 0, item)
-
-        # Fallback: walk path components top-down instead of brute-force
-        return self._find_path_by_components(target_path)
-
-    def _find_path_by_components(self, target_path: Path) -> Optional[QModelIndex]:
-        """Navigate tree by matching path components top-down (avoids full tree traversal)."""
-        # Find common ancestor by checking path parts
-        root_path = self.root_item.path()
-        try:
-            relative = target_path.relative_to(root_path)
-        except ValueError:
-            return None  # target not under root
-
-        # Walk down the tree following path components
-        current_item = self.root_item
-        for part in relative.parts:
-            current_item._ensure_children_loaded()
-            current_item._ensure_children_sorted()
-            found = False
-            for child in current_item.child_items:
-                if child.directory_hierarchy.root.name == part:
-                    current_item = child
-                    found = True
-                    break
-            if not found:
-                return None
-
-        if current_item != self.root_item:
-            return self.createIndex(current_item.row(), 0, current_item)
-        return None
+        """Find index for a specific path by walking its components down the name arrays."""
+        node = self.tree.find(target_path)
+        if node <= ROOT:
+            return None
+        index = self._node_index(node)
+        return index if index.isValid() else None
 
     def get_item_depth(self, index: QModelIndex) -> int:
         """Get depth of item in tree."""
-        depth = 0
-        current = index
-
-        while current.isValid():
-            current = self.parent(current)
-            depth += 1
-
-        return depth
+        return self.tree.depth(self._node(index))
 
     def expand_to_depth(self, tree_view, target_depth: int):
         """Expand tree view to specified depth."""
         tree_view.collapseAll()
+        self._deferred_expand.clear()
 
         if target_depth <= 0:
             return
@@ -552,73 +495,156 @@ class DirectoryTreeModel(QAbstractItemModel):
             child_index = self.index(row, 0, parent_index)
             if child_index.isValid():
                 # Check if we should expand this item
-                item = child_index.internalPointer()
-                if item:
-                    item_text = item.data(0) or ""
-
-                    # Special handling for user workspace
-                    if current_depth == 0 and not item_text.startswith("works_"):
-                        continue  # Skip non-workspace directories at root level
-
-                    # Expand if within depth limit or if it's a runs directory
-                    if current_depth < target_depth or "runs" in item_text:
-                        self._expand_to_depth_recursive(tree_view, child_index, current_depth + 1, target_depth)
+                item_text = self._display_name(child_index.internalId())
+
+                # Special handling for user workspace
+                if current_depth == 0 and not item_text.startswith("works_"):
+                    continue  # Skip non-workspace directories at root level
+
+                # Expand if within depth limit or if it's a runs directory
+                if current_depth < target_depth or "runs" in item_text:
+                    node = child_index.internalId()
+                    if self.tree.flags[node] & FLAG_SHALLOW:
+                        # Not listed yet: scan just the levels still to expand, continue when they arrive
+                        self._deferred_expand[node] = (tree_view, current_depth + 1, target_depth)
+                        self._request_fetch(node, max(1, target_depth - current_depth))
+                        tree_view.setExpanded(child_index, True)
+                        continue
+                    self._expand_to_depth_recursive(tree_view, child_index, current_depth + 1, target_depth)
 
     def update_memo_collection(self, memo_collection: MemoCollection):
         """Update memo collection and refresh display."""
         self.memo_collection = memo_collection
-        self.root_item.set_memo_collection(memo_collection)
 
         # Emit data changed to update memo indicators
-        self.dataChanged.emit(
-            self.index(0, 0),
-            self.index(self.rowCount() - 1, 0),
-            [Qt.DisplayRole, Qt.ToolTipRole]
-        )
+        self._refresh_top_level([Qt.DisplayRole, Qt.ToolTipRole])
+
+    def request_metadata(self, node: int) -> bool:
+        """Queue metadata for a node and its siblings; False if it must be loaded synchronously."""
+        parent_node = self.tree.parent[node]
+        if self.metadata_loader is None or parent_node == NO_NODE:
+            return False
+        parent_path = self.tree.path(parent_node)
+        if parent_path not in self._metadata_requested:
+            self._metadata_requested[parent_path] = parent_node
+            flags = self.tree.flags
+            names = [self.tree.name(child) for child in self.tree.children(parent_node)
+                     if not flags[child] & FLAG_METADATA]
+            self.metadata_loader.request(parent_path, names)
+        return True
+
+    def _on_metadata_batch(self, parent_path: Path, entries: list):
+        """Apply a loaded batch and repaint the affected rows as one range."""
+        parent_node = self._metadata_requested.pop(parent_path, None)
+        if parent_node is None or self.tree.find(parent_path) != parent_node:
+            return  # Subtree was replaced since the request
+
+        tree = self.tree
+        loaded = {name: (stat_info, is_symlink) for name, stat_info, is_symlink in entries}
+        rows = []
+        for child in tree.children(parent_node):
+            result = loaded.get(tree.name(child))
+            if result is None or tree.flags[child] & FLAG_METADATA:
+                continue
+            tree.set_stat(child, *result)
+            self._highlight_cache.pop(child, None)  # Symlink color may change
+            if not self._is_filtered_out(child):
+                rows.append(self._row[child])
+
+        if rows and parent_node in self._order:
+            parent_index = self._node_index(parent_node)
+            self.dataChanged.emit(self.index(min(rows), 0, parent_index),
+                                  self.index(max(rows), self.columnCount() - 1, parent_index),
+                                  [Qt.DisplayRole, Qt.ForegroundRole])
+
+    def _compact(self):
+        """Drop the tree's orphaned ids; rows are unchanged, persistent indexes get the new ids."""
+        self.layoutAboutToBeChanged.emit()
+        remap = self.tree.compact()
+        old_indexes = self.persistentIndexList()
+        new_indexes = []
+        for index in old_indexes:
+            node = remap[index.internalId()]
+            new_indexes.append(self.createIndex(index.row(), index.column(), node) if node != NO_NODE
+                               else QModelIndex())
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+        row = array('i', [0]) * len(self.tree)
+        for old, new in enumerate(remap):
+            if new != NO_NODE:
+                row[new] = self._row[old]
+        self._row = row
+        self._order = {remap[node]: array('i', (remap[child] for child in order))
+                       for node, order in self._order.items() if remap[node] != NO_NODE}
+        self._highlight_cache = {remap[node]: brush for node, brush in self._highlight_cache.items()
+                                 if remap[node] != NO_NODE}
+        self._fetching = {remap[node] for node in self._fetching if remap[node] != NO_NODE}
+        self._deferred_expand = {remap[node]: pending for node, pending in self._deferred_expand.items()
+                                 if remap[node] != NO_NODE}
+        self._metadata_requested = {path: remap[node] for path, node in self._metadata_requested.items()
+                                    if remap[node] != NO_NODE}
+        self.layoutChanged.emit()
 
     def update_subtree(self, path, new_hierarchy):
         """Merge on-demand subtree scan results into the existing model.
 
-        Called when the user expands a shallow node and the background scan completes.
-        Updates the node's children in-place without rebuilding the whole model.
+        Called when the user expands a shallow node and the background scan completes,
+        and for auto-refresh of a changed directory (which may be the base itself).
+        Replaces the node's children in-place without rebuilding the whole model.
         """
-        item = self._path_index_map.get(path)
-        if not item:
+        node = self.tree.find(path)
+        if node == NO_NODE:
             return
 
-        parent_index = self.createIndex(item.row(), 0, item)
-
-        # Count existing children (may be 0 for a shallow node)
-        old_child_count = (len(item.child_items) if item._children_loaded
-                           else len(item.directory_hierarchy.children))
+        parent_index = self._node_index(node)
+        self._fetching.discard(node)
+        shown = node == ROOT or parent_index.isValid()  # Not under a filtered-out directory
 
         # Remove old rows from model (usually 0 for shallow nodes)
+        old_child_count = self.tree.child_count[node]
+        old_rows = self.rowCount(parent_index) if shown else 0
         if old_child_count > 0:
-            self.beginRemoveRows(parent_index, 0, old_child_count - 1)
-            # Remove old paths from index map
-            for child_path in list(item.directory_hierarchy.children.keys()):
-                self._path_index_map.pop(child_path, None)
-            item.child_items.clear()
-            item._children_loaded = False
-            item._children_sorted = False
-            self.endRemoveRows()
-        else:
-            item._children_loaded = False
-            item._children_sorted = False
-
-        # Swap in the new hierarchy data
-        item.directory_hierarchy.children = new_hierarchy.children
-        item.directory_hierarchy.is_shallow = False  # Now fully scanned
-
-        # Insert new children into the model
-        new_count = len(new_hierarchy.children)
-        if new_count > 0:
-            self.beginInsertRows(parent_index, 0, new_count - 1)
-            item._ensure_children_loaded()  # Creates TreeItems + populates path index map
+            if old_rows > 0:
+                self.beginRemoveRows(parent_index, 0, old_rows - 1)
+            # Orphaned descendants drop their cached order and colors
+            stack = list(self.tree.children(node))
+            while stack:
+                child = stack.pop()
+                self._highlight_cache.pop(child, None)
+                self._fetching.discard(child)
+                self._deferred_expand.pop(child, None)
+                if self._order.pop(child, None) is not None:
+                    stack.extend(self.tree.children(child))
+            self.tree.detach_children(node)
+            self._order.pop(node, None)
+            if old_rows > 0:
+                self.endRemoveRows()
+
+        # Insert the new children (appended to the arrays as a fresh block)
+        new_rows = 0
+        if shown:
+            new_rows = len(new_hierarchy.children)
+            if node == ROOT and self.filter_config.show_only_user_workspace:
+                new_rows = sum(1 for child in new_hierarchy.children.values()
+                               if self.filter_config.includes_top_level(child.root.name))
+        if new_rows > 0:
+            self.beginInsertRows(parent_index, 0, new_rows - 1)
+        self.tree.replace_children(node, new_hierarchy)
+        self._row.extend(array('i', [0]) * (len(self.tree) - len(self._row)))
+        self._order.pop(node, None)
+        if new_rows > 0:
             self.endInsertRows()
 
-        # Invalidate highlight cache for this node
-        self._highlight_cache.pop(path, None)
-
+        if self.tree.needs_compaction():
+            self._compact()
+            node = self.tree.find(path)
+            parent_index = self._node_index(node)
 
+        # Invalidate highlight cache for this node
+        self._highlight_cache.pop(node, None)
 
+        # A depth-button expansion was waiting for these rows
+        deferred = self._deferred_expand.pop(node, None)
+        if deferred is not None:
+            tree_view, depth, target_depth = deferred
+            self._expand_to_depth_recursive(tree_view, parent_index, depth, target_depth)
@@ -8,6 +8,8 @@ import sys
 from prettytable import PrettyTable
 import re
 
+from treem_casino.utils.copy_engine import copy_tree
+
 # Default file paths
 pond_var = os.getenv('casino_pond')
 csh_file_path =            os.path.join(pond_var, 'config_casino.csh')
@@ -270,8 +272,10 @@ def copy_files_to_runs(ws_path):
         if os.path.exists(common_dest_path):
             shutil.rmtree(common_dest_path)
 
-        # Copy the entire source directory to the destination
-        shutil.copytree(src_common_dir, common_dest_path)
+        # Copy the entire source directory to the destination (parallel, follows symlinks like copytree)
+        stats = copy_tree(src_common_dir, common_dest_path, symlinks=False)
+        if stats.errors:
+            raise OSError(f"{len(stats.errors)} entries not copied, first: {stats.errors[0]}")
     except PermissionError as pe:
         sys.exit(1)
     except FileNotFoundError as fnfe:
@@ -306,8 +310,10 @@ def copy_files_to_runs_local(ws_path, run_ver):
         parent_dir = os.path.dirname(common_dest_path)
         os.makedirs(parent_dir, exist_ok=True)
 
-        # Copy the entire source directory to the destination
-        shutil.copytree(src_common_dir, common_dest_path)
+        # Copy the entire source directory to the destination (parallel, follows symlinks like copytree)
+        stats = copy_tree(src_common_dir, common_dest_path, symlinks=False)
+        if stats.errors:
+            raise OSError(f"{len(stats.errors)} entries not copied, first: {stats.errors[0]}")
     except PermissionError as pe:
         sys.exit(1)
     except FileNotFoundError as fnfe: